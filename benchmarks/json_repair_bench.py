@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON düzeltici karşılaştırma testi.
+
+Gerçek bozuk model çıktıları (results/ altındaki raw_response alanları ve
+static/analiz_sonuc_*.json içindeki _raw_text alanları) ile kaydedilmiş
+geçerli analiz sonuçlarından türetilen bozuk varyantlar üzerinde eski
+(find/rfind + replace + json.loads) yöntem ile repair_json karşılaştırılır.
+
+Kullanım:
+    python benchmarks/json_repair_bench.py [--tekrar 200]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.json_repair import repair_json
+
+
+def legacy_extract(text: str) -> Dict[str, Any]:
+    """Önceki OllamaConnector._extract_json davranışı (karşılaştırma için)"""
+    text = text.replace('```json', '').replace('```', '')
+    start, end = text.find('{'), text.rfind('}') + 1
+    if start == -1 or end <= start:
+        return {}
+    content = text[start:end]
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        try:
+            fixed = content.replace("'", '"').replace(",}", "}").replace(",]", "]")
+            return json.loads(fixed)
+        except json.JSONDecodeError:
+            return {}
+
+
+def _variants(valid: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Geçerli bir analiz sonucundan tipik model hatalarını içeren çıktılar üretir"""
+    pretty = json.dumps(valid, ensure_ascii=False, indent=2)
+    single_quoted = repr(valid)
+    return [
+        ("açıklama+markdown", f"İşte CV analizi:\n```json\n{pretty}\n```\nUmarım yardımcı olur."),
+        ("sondaki virgüller", pretty.replace("\n  }", ",\n  }").replace("\n  ]", ",\n  ]")),
+        ("python sözlüğü", single_quoted),
+        ("yarıda kesilmiş", pretty[: int(len(pretty) * 0.8)]),
+    ]
+
+
+def load_corpus() -> List[Tuple[str, str]]:
+    """Kayıtlı sonuçlardan (etiket, ham metin) çiftleri oluşturur"""
+    corpus = []
+    paths = sorted(glob.glob(os.path.join(ROOT, "results", "*.json"))) + \
+        sorted(glob.glob(os.path.join(ROOT, "static", "analiz_sonuc_*.json")))
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        name = os.path.basename(path)
+        raw = data.get("raw_response") or data.get("_raw_text")
+        if raw:
+            corpus.append((f"gerçek:{name}", raw))
+        elif "kisisel_bilgiler" in data:
+            clean = {k: v for k, v in data.items() if not k.startswith("_")}
+            corpus.extend((f"türetilmiş:{label}", text) for label, text in _variants(clean))
+    return corpus
+
+
+def _run(parse, corpus: List[Tuple[str, str]], repeat: int) -> Tuple[int, float]:
+    """Başarılı ayrıştırma sayısını ve ortalama süreyi (ms) döndürür"""
+    successes = sum(1 for _, text in corpus if parse(text))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text in corpus:
+            parse(text)
+    elapsed = (time.perf_counter() - start) / (repeat * len(corpus)) * 1000
+    return successes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON düzeltici karşılaştırması")
+    parser.add_argument("--tekrar", type=int, default=200, help="Süre ölçümü için tekrar sayısı")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"Korpus: {len(corpus)} çıktı")
+
+    results = {
+        "eski yöntem": _run(legacy_extract, corpus, args.tekrar),
+        "repair_json": _run(lambda text: repair_json(text)[0], corpus, args.tekrar),
+    }
+    print(f"{'Yöntem':<14}{'Başarılı':>10}{'Ort. süre (ms)':>18}")
+    for name, (successes, elapsed) in results.items():
+        print(f"{name:<14}{successes:>6}/{len(corpus):<3}{elapsed:>18.3f}")
+
+    print("\nÇıktı türüne göre başarı (eski / repair_json):")
+    groups: Dict[str, List[int]] = {}
+    for label, text in corpus:
+        counts = groups.setdefault(label, [0, 0, 0])
+        counts[0] += 1
+        counts[1] += bool(legacy_extract(text))
+        counts[2] += bool(repair_json(text)[0])
+    for label, (total, legacy_ok, repair_ok) in groups.items():
+        print(f"  {label:<42}{legacy_ok:>3}/{total:<3} {repair_ok:>3}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Uçtan uca LLM yük testi.
+
+Sahte Ollama sunucusu (benchmarks/mock_ollama.py) üzerinden FastAPI /analyze-cv,
+Flask /analyze-cv ve komut satırı aracını verilen eşzamanlılıkla çalıştırır;
+verim (istek/saniye) ve p50/p95/p99 gecikmelerini raporlar. GPU veya ağ
+gerektirmeden bağlantı yönetimi, yeniden deneme ve JSON onarımındaki
+gerilemeleri yakalamak için kullanılır.
+
+Kullanım:
+    python benchmarks/load_bench.py flask -c 8 -n 64 --mode mixed
+    python benchmarks/load_bench.py fastapi --url http://127.0.0.1:8000 -c 4 -n 32
+    python benchmarks/load_bench.py cli -c 2 -n 8
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mock_ollama import MockOllama
+
+DEFAULT_CV = os.path.join(ROOT, "cv_ornek.txt")
+# Flask uygulaması yalnızca PDF yüklemelerini kabul eder
+DEFAULT_PDF = os.path.join(ROOT, "uploads", "Furkan_Sevinc-3.pdf")
+TARGETS = ("fastapi", "flask", "cli")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """En yakın sıra (nearest-rank) yöntemiyle yüzdelik değer"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, analysis_failures: int, elapsed: float) -> Dict[str, Any]:
+    """Ölçümleri rapor sözlüğüne çevirir (gecikmeler milisaniye)"""
+    total = len(latencies) + errors
+    return {
+        "istek": total,
+        "basarili": len(latencies),
+        "hata": errors,
+        "analiz_hatasi": analysis_failures,
+        "sure_sn": round(elapsed, 3),
+        "verim_istek_sn": round(total / elapsed, 3) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+
+def run_load(call: Callable[[], Dict[str, Any]], requests_total: int, concurrency: int) -> Dict[str, Any]:
+    """
+    Bir isteği verilen eşzamanlılıkla tekrar tekrar çalıştırır
+
+    Args:
+        call (Callable): Tek bir isteği yapıp analiz sonucunu döndüren fonksiyon
+            (başarısız isteklerde istisna fırlatır)
+        requests_total (int): Toplam istek sayısı
+        concurrency (int): Aynı anda çalışacak istek sayısı
+
+    Returns:
+        Dict[str, Any]: summarize() raporu
+    """
+    latencies: List[float] = []
+    errors = 0
+    analysis_failures = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors, analysis_failures
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        latency = time.perf_counter() - start
+        with lock:
+            latencies.append(latency)
+            if not isinstance(result, dict) or result.get("error") or result.get("_error"):
+                analysis_failures += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests_total)))
+    return summarize(latencies, errors, analysis_failures, time.perf_counter() - start)
+
+
+def _serve_in_thread(server) -> None:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def start_flask() -> Tuple[str, Callable[[], None]]:
+    """Flask uygulamasını bu süreçte boş bir portta başlatır"""
+    from werkzeug.serving import make_server
+    from src.web.cv_analiz_web import app
+
+    app.config["UPLOAD_FOLDER"] = tempfile.mkdtemp(prefix="cv_bench_")
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    _serve_in_thread(server)
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+
+def start_fastapi() -> Tuple[str, Callable[[], None]]:
+    """FastAPI uygulamasını bu süreçte uvicorn ile boş bir portta başlatır"""
+    import socket
+    import uvicorn
+    from src.api.main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 60
+    while not server.started and time.time() < deadline:
+        time.sleep(0.05)
+
+    def stop():
+        server.should_exit = True
+
+    return f"http://127.0.0.1:{port}", stop
+
+
+def http_call(target: str, url: str, cv_path: str, model: Optional[str]) -> Callable[[], Dict[str, Any]]:
+    """Web hedefi için tek istek yapan fonksiyon (iş parçacığı başına bir oturum)"""
+    local = threading.local()
+    with open(cv_path, "rb") as f:
+        content = f.read()
+    filename = os.path.basename(cv_path)
+    data: Dict[str, Any] = {"use_llm": "true"} if target == "fastapi" else {}
+    if model:
+        data["model_name" if target == "fastapi" else "model"] = model
+
+    def call():
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.post(f"{url}/analyze-cv", files={"file": (filename, content)}, data=data, timeout=600)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    return call
+
+
+def cli_call(cv_path: str, model: Optional[str], env: Dict[str, str]) -> Callable[[], Dict[str, Any]]:
+    """Komut satırı aracını ayrı süreçte çalıştıran fonksiyon"""
+    script = os.path.join(ROOT, "src", "core", "gelismis_cv_analiz.py")
+
+    def call():
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "sonuc.json")
+            command = [sys.executable, script, cv_path, "-s", "-j", "-o", output]
+            if model:
+                command += ["-m", model]
+            subprocess.run(command, env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           timeout=600, check=True)
+            with open(output, encoding="utf-8") as f:
+                return json.load(f)
+
+    return call
+
+
+def main():
+    """Yük testini komut satırından çalıştırır"""
+    parser = argparse.ArgumentParser(description="Uçtan uca LLM yük testi")
+    parser.add_argument("target", choices=TARGETS, help="Test edilecek giriş noktası")
+    parser.add_argument("--url", help="Çalışan sunucunun adresi (verilmezse uygulama bu süreçte başlatılır)")
+    parser.add_argument("--cv", help="Gönderilecek CV dosyası (varsayılan: flask için PDF, diğerleri için metin)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("-n", "--requests", type=int, default=32)
+    parser.add_argument("-m", "--model", help="Kullanılacak model adı")
+    parser.add_argument("--ollama-url", help="Sahte sunucu yerine kullanılacak Ollama adresi")
+    parser.add_argument("--latency", type=float, default=0.05, help="Sahte sunucu gecikmesi (saniye)")
+    parser.add_argument("--tps", type=float, default=400.0, help="Sahte sunucu üretim hızı (token/saniye)")
+    parser.add_argument("--mode", choices=["valid", "malformed", "mixed"], default="valid")
+    parser.add_argument("--output", help="Raporun yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    mock = None
+    backend_url = args.ollama_url
+    if backend_url is None:
+        mock = MockOllama(latency=args.latency, tokens_per_sec=args.tps, mode=args.mode, seed=42).start()
+        backend_url = mock.url
+    # Uygulamalar içe aktarılmadan önce tüm LLM yolları sahte sunucuya yönlendirilir
+    os.environ["OLLAMA_HOSTS"] = backend_url
+    os.environ["LLM_SERVER_URL"] = backend_url
+
+    cv_path = args.cv or (DEFAULT_PDF if args.target == "flask" else DEFAULT_CV)
+    stop = None
+    try:
+        if args.target == "cli":
+            call = cli_call(cv_path, args.model, dict(os.environ))
+        else:
+            url = args.url
+            if url is None:
+                url, stop = start_flask() if args.target == "flask" else start_fastapi()
+            call = http_call(args.target, url, cv_path, args.model)
+
+        report = run_load(call, args.requests, args.concurrency)
+        report.update({"hedef": args.target, "eszamanlilik": args.concurrency, "mod": args.mode})
+        if mock is not None:
+            report["llm_istegi"] = mock.request_count
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    finally:
+        if stop:
+            stop()
+        if mock is not None:
+            mock.stop()
+
+
+if __name__ == "__main__":
+    main()
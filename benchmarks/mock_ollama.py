@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GPU ve ağ gerektirmeden LLM yollarını çalıştırmak için yerel sahte Ollama sunucusu.
+
+Ollama API'sinin /api/tags ve /api/generate (akışlı ve akışsız) uçlarını,
+LLM_SERVER_URL ile kullanılan llama-server uçlarını (/health, /props,
+/completion) ve Hugging Face Inference API'nin /models/<model> ucunu taklit eder. Gecikme, token/saniye hızı ve yanıt türü
+(geçerli JSON, bozuk JSON veya karışık) ayarlanabilir.
+
+Kullanım:
+    python benchmarks/mock_ollama.py --port 11434 --latency 0.2 --tps 40 --mode mixed
+    export OLLAMA_HOSTS=http://127.0.0.1:11434
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Geçerli bir CV analiz yanıtı (tüm şablonlardaki ortak alanlar)
+VALID_ANALYSIS: Dict[str, Any] = {
+    "kisisel_bilgiler": {
+        "isim": "Ayşe Yılmaz",
+        "email": "ayse.yilmaz@ornek.com",
+        "telefon": "+90 532 000 00 00",
+        "lokasyon": "İstanbul",
+    },
+    "egitim_bilgileri": [
+        {"okul": "Orta Doğu Teknik Üniversitesi", "bolum": "Bilgisayar Mühendisliği", "derece": "Lisans",
+         "tarih": "2013 - 2017"}
+    ],
+    "is_deneyimi": [
+        {"sirket": "Örnek Teknoloji A.Ş.", "pozisyon": "Kıdemli Yazılım Geliştirici", "tarih": "2020 - Günümüz",
+         "sorumluluklar": ["Mikroservis geliştirme"]}
+    ],
+    "beceriler": {
+        "teknik_beceriler": ["Docker", "Kubernetes"],
+        "yazilim_dilleri": ["Python", "SQL"],
+        "diller": ["Türkçe", "İngilizce"],
+        "soft_beceriler": ["Takım çalışması"],
+    },
+    "cv_puanlama": {"toplam_puan": 78, "egitim_puani": 80, "deneyim_puani": 75, "beceri_puani": 80,
+                    "proje_puani": 70},
+    "guclu_yonler": ["Backend deneyimi"],
+    "gelistirilmesi_gereken_yonler": ["Bulut sertifikası"],
+    "uygun_pozisyonlar": ["Backend Geliştirici"],
+    "yetenek_ozeti": "Python ağırlıklı backend geliştirici",
+}
+
+
+def malformed_outputs(data: Dict[str, Any]) -> List[str]:
+    """Modellerin sık ürettiği bozuk JSON çıktılarını üretir"""
+    pretty = json.dumps(data, ensure_ascii=False, indent=2)
+    return [
+        f"İşte analiz sonucu:\n```json\n{pretty}\n```\nBaşka sorunuz var mı?",
+        pretty.replace("\n  }", ",\n  }").replace("\n  ]", ",\n  ]"),
+        repr(data),
+        pretty[: int(len(pretty) * 0.85)],
+    ]
+
+
+class MockOllama:
+    """Ayarlanabilir gecikme ve çıktılarla çalışan sahte Ollama sunucusu"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 tokens_per_sec: float = 200.0, mode: str = "valid", malformed_rate: float = 0.5,
+                 models: Optional[List[str]] = None, responses: Optional[List[str]] = None,
+                 seed: Optional[int] = None, hf_loading: int = 0, hf_estimated_time: float = 0.1,
+                 status: int = 200, raw_body: Optional[str] = None, slots: int = 4):
+        """
+        Args:
+            host (str): Dinlenecek adres
+            port (int): Dinlenecek port (0 ise boş bir port seçilir)
+            latency (float): Her isteğe eklenen sabit gecikme (saniye, prefill benzetimi)
+            tokens_per_sec (float): Üretim hızı (yanıt süresi token sayısıyla orantılı)
+            mode (str): "valid", "malformed" veya "mixed"
+            malformed_rate (float): "mixed" modunda bozuk çıktı oranı
+            models (List[str], optional): /api/tags ile bildirilecek modeller
+            responses (List[str], optional): Sırayla döndürülecek hazır yanıtlar (mode'u geçersiz kılar)
+            seed (int, optional): Rastgele seçimler için tohum
+            hf_loading (int): İlk kaç HF isteğinin 503 "model yükleniyor" ile yanıtlanacağı
+            hf_estimated_time (float): 503 yanıtlarındaki estimated_time değeri (saniye)
+            status (int): Üretim uçlarının HTTP durumu (200 dışındaysa hata gövdesi döner)
+            raw_body (str, optional): Verilirse üretim uçları JSON yerine bu ham gövdeyle yanıt verir
+            slots (int): llama-server /props ucunda bildirilecek paralel slot sayısı
+        """
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.mode = mode
+        self.malformed_rate = malformed_rate
+        self.models = models or ["mock-model:latest", "llama3:8b", "deepseek-coder:6.7b-instruct-q4_K_M"]
+        self.responses = responses
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.hf_loading = hf_loading
+        self.hf_estimated_time = hf_estimated_time
+        self.hf_requests: List[Any] = []
+        self.status = status
+        self.raw_body = raw_body
+        self.slots = slots
+        # Üretim isteklerinin gövdeleri ve aynı anda işlenen en fazla istek sayısı
+        self.payloads: List[Dict[str, Any]] = []
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+        self.stopped = False
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockOllama":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stopped = True
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockOllama":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def next_output(self) -> str:
+        """Sıradaki yanıt metnini seçer"""
+        with self._lock:
+            index = self.request_count
+            self.request_count += 1
+            if self.responses:
+                return self.responses[index % len(self.responses)]
+            malformed = self.mode == "malformed" or (
+                self.mode == "mixed" and self.random.random() < self.malformed_rate)
+            if malformed:
+                return self.random.choice(malformed_outputs(VALID_ANALYSIS))
+        return json.dumps(VALID_ANALYSIS, ensure_ascii=False)
+
+    @staticmethod
+    def split_tokens(text: str) -> List[str]:
+        """Metni yaklaşık token parçalarına böler (4 karakter)"""
+        return [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def parse_request(self):
+                # Durdurulan sunucu açık kalan keep-alive bağlantılarına da yanıt vermez
+                if mock.stopped:
+                    self.close_connection = True
+                    return False
+                return super().parse_request()
+
+            def _send_json(self, code: int, body: Any) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_json(self) -> Dict[str, Any]:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": name, "size": 4 * 1024 ** 3} for name in mock.models]})
+                elif self.path == "/health":
+                    self._send_json(200, {"status": "ok"})
+                elif self.path == "/props":
+                    self._send_json(200, {"total_slots": mock.slots})
+                else:
+                    self._send_json(404, {"error": "bulunamadı"})
+
+            def do_POST(self):
+                payload = self._read_json()
+                with mock._lock:
+                    mock.payloads.append(payload)
+                    mock.active += 1
+                    mock.peak_active = max(mock.peak_active, mock.active)
+                try:
+                    self._dispatch(payload)
+                finally:
+                    with mock._lock:
+                        mock.active -= 1
+
+            def _dispatch(self, payload: Dict[str, Any]) -> None:
+                if mock.raw_body is not None:
+                    data = mock.raw_body.encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                elif mock.status != 200:
+                    time.sleep(mock.latency)
+                    self._send_json(mock.status, {"error": "sahte sunucu hatası"})
+                elif self.path == "/api/generate":
+                    if payload.get("model") not in mock.models and f"{payload.get('model')}:latest" not in mock.models:
+                        self._send_json(404, {"error": f"model '{payload.get('model')}' not found"})
+                    elif payload.get("stream", True):
+                        self._stream(payload)
+                    else:
+                        self._generate(payload, key="response")
+                elif self.path == "/completion":
+                    self._generate(payload, key="content")
+                elif self.path.startswith("/models/"):
+                    self._hf_generate(payload)
+                else:
+                    self._send_json(404, {"error": "bulunamadı"})
+
+            def _generate(self, payload: Dict[str, Any], key: str) -> None:
+                start = time.perf_counter()
+                output = mock.next_output()
+                tokens = mock.split_tokens(output)
+                time.sleep(mock.latency + len(tokens) / mock.tokens_per_sec)
+                elapsed = time.perf_counter() - start
+                self._send_json(200, {
+                    "model": payload.get("model", "mock-model"),
+                    key: output,
+                    "done": True,
+                    "eval_count": len(tokens),
+                    "eval_duration": int(len(tokens) / mock.tokens_per_sec * 1e9),
+                    "total_duration": int(elapsed * 1e9),
+                })
+
+            def _hf_generate(self, payload: Dict[str, Any]) -> None:
+                with mock._lock:
+                    mock.hf_requests.append(payload.get("inputs"))
+                    loading = len(mock.hf_requests) <= mock.hf_loading
+                if loading:
+                    self._send_json(503, {"error": "Model is currently loading",
+                                          "estimated_time": mock.hf_estimated_time})
+                    return
+                # Toplu girdilerde her girdi için ayrı bir sonuç listesi döner
+                inputs = payload.get("inputs")
+                batch = inputs if isinstance(inputs, list) else [inputs]
+                results = []
+                for _ in batch:
+                    output = mock.next_output()
+                    tokens = mock.split_tokens(output)
+                    time.sleep(len(tokens) / mock.tokens_per_sec)
+                    results.append([{"generated_text": output, "details": {"generated_tokens": len(tokens)}}])
+                time.sleep(mock.latency)
+                self._send_json(200, results if isinstance(inputs, list) else results[0])
+
+            def _stream(self, payload: Dict[str, Any]) -> None:
+                tokens = mock.split_tokens(mock.next_output())
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(mock.latency)
+                for token in tokens:
+                    time.sleep(1 / mock.tokens_per_sec)
+                    self._write_chunk({"model": payload.get("model"), "response": token, "done": False})
+                self._write_chunk({"model": payload.get("model"), "response": "", "done": True,
+                                   "eval_count": len(tokens),
+                                   "eval_duration": int(len(tokens) / mock.tokens_per_sec * 1e9)})
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, body: Dict[str, Any]) -> None:
+                data = (json.dumps(body, ensure_ascii=False) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    """Sahte sunucuyu komut satırından başlatır"""
+    parser = argparse.ArgumentParser(description="Yerel sahte Ollama sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.1, help="İstek başına sabit gecikme (saniye)")
+    parser.add_argument("--tps", type=float, default=50.0, help="Üretim hızı (token/saniye)")
+    parser.add_argument("--mode", choices=["valid", "malformed", "mixed"], default="valid")
+    parser.add_argument("--malformed-rate", type=float, default=0.5)
+    args = parser.parse_args()
+
+    mock = MockOllama(args.host, args.port, latency=args.latency, tokens_per_sec=args.tps,
+                      mode=args.mode, malformed_rate=args.malformed_rate)
+    print(f"Sahte Ollama sunucusu: {mock.url} (export OLLAMA_HOSTS={mock.url})")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
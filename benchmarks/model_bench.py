@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Model/backend karşılaştırma testi (verim ve kalite).
+
+Etiketli CV korpusundaki (benchmarks/corpus/*.json) her CV'yi yapılandırılan
+her model/backend ile analiz eder ve token/saniye, ilk token süresi (TTFT),
+toplam gecikme, tepe bellek (RSS) ile beklenen alanlara göre çıkarım
+doğruluğunu ölçer. Sonuçlar JSON rapora yazılır; model seçimi dosya adına
+göre değil maliyet/kalite dengesine göre yapılabilir.
+
+Backend tanımları "tür:hedef" biçimindedir:
+    ctransformers:models/model.gguf
+    llama_cpp:models/model.gguf
+    ollama:llama3:8b
+    hf:meta-llama/Meta-Llama-3-8B-Instruct
+
+Kullanım:
+    python benchmarks/model_bench.py -b ollama:llama3:8b -b ctransformers:models/model.gguf
+    python benchmarks/model_bench.py --mock -b ollama:llama3:8b -b hf:mock-model
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import psutil
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.load_bench import percentile
+from src.api.ollama_pool import DEFAULT_OLLAMA_URL, HOSTS_ENV
+from src.core.gelismis_cv_analiz import DETAILED_ANALYSIS_TEMPLATE
+from src.core.hf_batch_client import DEFAULT_HF_API_URL, HF_URL_ENV
+from src.core.token_budget import TokenBudgetPlanner
+from src.utils.json_repair import repair_json
+
+CORPUS_DIR = os.path.join(ROOT, "benchmarks", "corpus")
+DEFAULT_OUTPUT = os.path.join(ROOT, "results", "model_bench.json")
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+class Backend(ABC):
+    """Metni parça parça üreten backend arayüzü"""
+
+    kind = ""
+    # Model başka bir süreçte çalışıyorsa RSS yalnızca istemciyi kapsar
+    remote = False
+
+    def __init__(self, target: str):
+        self.target = target
+        # Sunucu üretilen token sayısını bildiriyorsa stream() sonrası ayarlanır
+        self.last_token_count: Optional[int] = None
+
+    def load(self) -> None:
+        """Modeli yükler (uzak backendlerde gerekmez)"""
+
+    @abstractmethod
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        """Promptu üretir ve metni parça parça döndürür"""
+
+
+class CTransformersBackend(Backend):
+    kind = "ctransformers"
+
+    def load(self) -> None:
+        from ctransformers import AutoModelForCausalLM
+        from src.core.autotune import load_tuned_config
+        from src.core.model_registry import inspect_model
+
+        info = inspect_model(self.target)
+        tuned = load_tuned_config(self.target) or {}
+        options = {key: tuned[key] for key in ("threads", "batch_size") if key in tuned}
+        self.model = AutoModelForCausalLM.from_pretrained(
+            self.target, model_type=info.model_type, context_length=tuned.get("context_length", 4096), **options
+        )
+
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        self.last_token_count = None
+        yield from self.model(prompt, max_new_tokens=max_tokens, temperature=0.1, stream=True)
+
+
+class LlamaCppBackend(Backend):
+    kind = "llama_cpp"
+
+    def load(self) -> None:
+        from llama_cpp import Llama
+        from src.core.autotune import load_tuned_config
+
+        tuned = load_tuned_config(self.target) or {}
+        self.model = Llama(model_path=self.target, n_ctx=tuned.get("context_length", 4096),
+                           n_batch=tuned.get("batch_size", 512), n_threads=tuned.get("threads"), verbose=False)
+
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        self.last_token_count = None
+        # Önceki CV'nin KV-cache'i TTFT ölçümünü etkilemesin
+        self.model.reset()
+        for chunk in self.model.create_completion(prompt, max_tokens=max_tokens, temperature=0.1, stream=True):
+            yield chunk["choices"][0]["text"]
+
+
+class OllamaBackend(Backend):
+    kind = "ollama"
+    remote = True
+
+    def __init__(self, target: str, base_url: str):
+        super().__init__(target)
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        self.last_token_count = None
+        payload = {"model": self.target, "prompt": prompt, "stream": True,
+                   "options": {"temperature": 0.1, "num_predict": max_tokens}}
+        with self.session.post(f"{self.base_url}/api/generate", json=payload, stream=True, timeout=600) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Ollama hatası: {response.status_code} - {response.text[:200]}")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("done"):
+                    self.last_token_count = chunk.get("eval_count")
+                    break
+                yield chunk.get("response", "")
+
+
+class HFBackend(Backend):
+    """Hugging Face Inference API (veya aynı arayüzü sunan yerel bir sunucu)"""
+
+    kind = "hf"
+    remote = True
+
+    def __init__(self, target: str, base_url: str, token: Optional[str] = None):
+        super().__init__(target)
+        self.url = f"{base_url.rstrip('/')}/{target}"
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def stream(self, prompt: str, max_tokens: int) -> Iterator[str]:
+        # API yanıtı tek parça döndürür; TTFT toplam gecikmeye eşit olur
+        self.last_token_count = None
+        payload = {"inputs": prompt, "parameters": {"max_new_tokens": max_tokens, "return_full_text": False,
+                                                    "details": True}}
+        response = self.session.post(self.url, json=payload, timeout=600)
+        if response.status_code != 200:
+            raise RuntimeError(f"API hatası: {response.status_code} - {response.text[:200]}")
+        result = response.json()
+        item = result[0] if isinstance(result, list) and result else {}
+        self.last_token_count = item.get("details", {}).get("generated_tokens")
+        yield item.get("generated_text", "")
+
+
+def create_backend(spec: str, ollama_url: str, hf_url: str) -> Backend:
+    """"tür:hedef" tanımından backend oluşturur"""
+    kind, _, target = spec.partition(":")
+    if not target:
+        raise ValueError(f"Geçersiz backend tanımı: {spec} (beklenen biçim tür:hedef)")
+    if kind == "ctransformers":
+        return CTransformersBackend(target)
+    if kind == "llama_cpp":
+        return LlamaCppBackend(target)
+    if kind == "ollama":
+        return OllamaBackend(target, ollama_url)
+    if kind == "hf":
+        return HFBackend(target, hf_url, os.environ.get("HF_API_TOKEN"))
+    raise ValueError(f"Bilinmeyen backend türü: {kind}")
+
+
+class PeakRSS:
+    """Blok süresince sürecin tepe bellek kullanımını örnekleyen bağlam yöneticisi"""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakRSS":
+        self.peak = self.process.memory_info().rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak / (1024 * 1024), 1)
+
+
+def _normalize(value: Any) -> str:
+    """Karşılaştırma için küçük harf, aksansız ve tek boşluklu metin"""
+    text = unicodedata.normalize("NFKD", str(value).casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).replace("ı", "i")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _matches(predicted: Any, expected: Any, field: str) -> bool:
+    """Tekil değer eşleşmesi (telefonlarda rakamlar, diğerlerinde içerme)"""
+    if field == "telefon":
+        digits = lambda value: re.sub(r"\D", "", str(value))[-10:]
+        return bool(digits(expected)) and digits(predicted) == digits(expected)
+    predicted, expected = _normalize(predicted), _normalize(expected)
+    return bool(predicted) and (expected in predicted or predicted in expected)
+
+
+def _list_f1(predicted: Any, expected: List[Any]) -> float:
+    """Liste alanları için F1 (sözlük öğelerinde beklenen anahtar karşılaştırılır)"""
+    if not isinstance(predicted, list):
+        predicted = []
+    if expected and isinstance(expected[0], dict):
+        key = next(iter(expected[0]))
+        expected = [item[key] for item in expected]
+        predicted = [item.get(key, "") for item in predicted if isinstance(item, dict)]
+    if not expected:
+        return 1.0 if not predicted else 0.0
+    hits = sum(1 for item in expected if any(_matches(p, item, "") for p in predicted))
+    correct = sum(1 for p in predicted if any(_matches(p, item, "") for item in expected))
+    recall = hits / len(expected)
+    precision = correct / len(predicted) if predicted else 0.0
+    return 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+
+def field_accuracy(predicted: Dict[str, Any], expected: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """
+    Beklenen her alan için 0-1 arası doğruluk puanı hesaplar
+
+    Args:
+        predicted (Dict[str, Any]): Modelin ürettiği analiz
+        expected (Dict[str, Any]): Etiketli beklenen alanlar
+        prefix (str): İç içe alanlar için yol öneki
+
+    Returns:
+        Dict[str, float]: "kisisel_bilgiler.email" gibi alan yolları ve puanları
+    """
+    scores: Dict[str, float] = {}
+    predicted = predicted if isinstance(predicted, dict) else {}
+    for field, value in expected.items():
+        path = f"{prefix}{field}"
+        if isinstance(value, dict):
+            scores.update(field_accuracy(predicted.get(field), value, f"{path}."))
+        elif isinstance(value, list):
+            scores[path] = round(_list_f1(predicted.get(field), value), 3)
+        else:
+            scores[path] = 1.0 if _matches(predicted.get(field, ""), value, field) else 0.0
+    return scores
+
+
+def load_corpus(corpus_dir: str) -> List[Dict[str, Any]]:
+    """Korpus dizinindeki etiket dosyalarını ve CV metinlerini yükler"""
+    corpus = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(corpus_dir, name), encoding="utf-8") as f:
+            label = json.load(f)
+        cv_path = label["cv"] if os.path.isabs(label["cv"]) else os.path.join(ROOT, label["cv"])
+        with open(cv_path, encoding="utf-8") as f:
+            corpus.append({"ad": os.path.splitext(name)[0], "metin": f.read(), "beklenen": label["beklenen"]})
+    return corpus
+
+
+def measure(backend: Backend, prompt: str, max_tokens: int, planner: TokenBudgetPlanner) -> Dict[str, Any]:
+    """Tek bir üretimi ölçer"""
+    start = time.perf_counter()
+    ttft = None
+    chunks: List[str] = []
+    for chunk in backend.stream(prompt, max_tokens):
+        if ttft is None and chunk:
+            ttft = time.perf_counter() - start
+        chunks.append(chunk)
+    total = time.perf_counter() - start
+    text = "".join(chunks)
+    ttft = total if ttft is None else ttft
+
+    tokens = backend.last_token_count or (len(chunks) if len(chunks) > 1 else planner.count(text))
+    # Akışlı yanıtlarda hız ilk tokendan sonraki üretim süresinden hesaplanır
+    decode_time = total - ttft if len(chunks) > 1 and total > ttft else total
+    return {
+        "metin": text,
+        "token": tokens,
+        "ttft_ms": round(ttft * 1000, 1),
+        "gecikme_ms": round(total * 1000, 1),
+        "token_sn": round(tokens / decode_time, 2) if decode_time > 0 else 0.0,
+    }
+
+
+def run_backend(backend: Backend, corpus: List[Dict[str, Any]], repeats: int = 1,
+                warmup: bool = True) -> Dict[str, Any]:
+    """
+    Bir backend'i tüm korpus üzerinde çalıştırır
+
+    Args:
+        backend (Backend): Ölçülecek backend
+        corpus (List[Dict[str, Any]]): load_corpus() çıktısı
+        repeats (int): Her CV için tekrar sayısı
+        warmup (bool): Ölçümden önce kısa bir ısınma üretimi yapılsın mı
+
+    Returns:
+        Dict[str, Any]: Örnek bazında ölçümler ve özet
+    """
+    planner = TokenBudgetPlanner()
+    samples: List[Dict[str, Any]] = []
+    entry: Dict[str, Any] = {"backend": backend.kind, "model": backend.target, "uzak": backend.remote}
+
+    with PeakRSS() as rss:
+        try:
+            load_start = time.perf_counter()
+            backend.load()
+            entry["yukleme_sn"] = round(time.perf_counter() - load_start, 3)
+            if warmup and corpus:
+                for _ in backend.stream(DETAILED_ANALYSIS_TEMPLATE.prefix, 8):
+                    pass
+
+            for item in corpus:
+                prompt = DETAILED_ANALYSIS_TEMPLATE.build(text=item["metin"], position_context="")
+                max_tokens = planner.estimate_output(DETAILED_ANALYSIS_TEMPLATE.prefix, item["metin"])
+                for _ in range(repeats):
+                    sample = measure(backend, prompt, max_tokens, planner)
+                    result, repairs = repair_json(sample.pop("metin"))
+                    scores = field_accuracy(result, item["beklenen"])
+                    sample.update({
+                        "cv": item["ad"],
+                        "json_ayristi": bool(result),
+                        "json_onarim": len(repairs),
+                        "alanlar": scores,
+                        "dogruluk": round(sum(scores.values()) / len(scores), 3) if scores else 0.0,
+                    })
+                    samples.append(sample)
+        except Exception as e:
+            entry["hata"] = str(e)
+
+    entry["tepe_rss_mb"] = rss.peak_mb
+    entry["ornekler"] = samples
+    entry["ozet"] = summarize_samples(samples)
+    return entry
+
+
+def summarize_samples(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Örnek ölçümlerini backend özeti haline getirir"""
+    if not samples:
+        return {}
+    mean = lambda key: round(sum(s[key] for s in samples) / len(samples), 3)
+    latency_sec = mean("gecikme_ms") / 1000
+    accuracy = mean("dogruluk")
+    return {
+        "ornek": len(samples),
+        "token_sn": mean("token_sn"),
+        "ttft_ms_p50": percentile([s["ttft_ms"] for s in samples], 50),
+        "gecikme_ms_ort": mean("gecikme_ms"),
+        "gecikme_ms_p95": percentile([s["gecikme_ms"] for s in samples], 95),
+        "dogruluk": accuracy,
+        "json_basari": round(sum(1 for s in samples if s["json_ayristi"]) / len(samples), 3),
+        # Saniye başına elde edilen doğruluk: maliyet/kalite karşılaştırması için
+        "dogruluk_saniye": round(accuracy / latency_sec, 4) if latency_sec > 0 else 0.0,
+    }
+
+
+def build_report(entries: List[Dict[str, Any]], corpus: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Makine bilgisi ve sıralama ile birlikte raporu oluşturur"""
+    ranked = sorted((e for e in entries if e.get("ozet")),
+                    key=lambda e: (-e["ozet"]["dogruluk"], e["ozet"]["gecikme_ms_ort"]))
+    return {
+        "tarih": datetime.now().isoformat(timespec="seconds"),
+        "makine": {
+            "platform": platform.platform(),
+            "islemci": platform.processor() or platform.machine(),
+            "fiziksel_cekirdek": psutil.cpu_count(logical=False),
+            "mantiksal_cekirdek": psutil.cpu_count(logical=True),
+            "bellek_gb": round(psutil.virtual_memory().total / 1024 ** 3, 1),
+        },
+        "korpus": [item["ad"] for item in corpus],
+        "siralama": [f"{e['backend']}:{e['model']}" for e in ranked],
+        "sonuclar": entries,
+    }
+
+
+def main():
+    """Karşılaştırmayı komut satırından çalıştırır"""
+    parser = argparse.ArgumentParser(description="Model/backend verim ve kalite karşılaştırması")
+    parser.add_argument("-b", "--backend", action="append", required=True,
+                        help="tür:hedef (ctransformers, llama_cpp, ollama, hf); birden fazla verilebilir")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Etiketli CV korpusu dizini")
+    parser.add_argument("--tekrar", type=int, default=1, help="Her CV için tekrar sayısı")
+    parser.add_argument("--isinma-yok", action="store_true", help="Isınma üretimini atla")
+    parser.add_argument("--ollama-url", help="Ollama adresi (varsayılan: OLLAMA_HOSTS'taki ilk sunucu)")
+    parser.add_argument("--hf-url", default=os.environ.get(HF_URL_ENV, DEFAULT_HF_API_URL),
+                        help="Hugging Face Inference API adresi (yerel yedek sunucu için değiştirilebilir)")
+    parser.add_argument("--mock", action="store_true", help="Ollama ve HF yerine sahte sunucu kullan")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="Rapor dosyası")
+    args = parser.parse_args()
+
+    ollama_url = args.ollama_url or os.environ.get(HOSTS_ENV, DEFAULT_OLLAMA_URL).split(",")[0].strip()
+    hf_url = args.hf_url
+    mock = None
+    if args.mock:
+        from benchmarks.mock_ollama import MockOllama
+        mock = MockOllama(latency=0.05, tokens_per_sec=200.0, mode="mixed", seed=42).start()
+        ollama_url, hf_url = mock.url, f"{mock.url}/models"
+
+    corpus = load_corpus(args.corpus)
+    entries = []
+    try:
+        for spec in args.backend:
+            backend = create_backend(spec, ollama_url, hf_url)
+            print(f"{spec} ölçülüyor ({len(corpus)} CV)...")
+            entry = run_backend(backend, corpus, repeats=args.tekrar, warmup=not args.isinma_yok)
+            print(json.dumps({"backend": spec, "hata": entry.get("hata"), **entry["ozet"]}, ensure_ascii=False))
+            entries.append(entry)
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    report = build_report(entries, corpus)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Sıralama: {', '.join(report['siralama'])}")
+    print(f"Rapor kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM destekli uç noktalar için kabul kontrolü (admission control).
+
+LLM çağrıları sınırlı sayıda eşzamanlı çalışır; bekleyen istek sayısı da
+sınırlıdır. Kuyruk doluysa veya istek kuyrukta çok beklerse hemen
+AdmissionRejected hatası verilir; API bunu Retry-After başlığıyla 429/503
+yanıtına veya (istemci isterse) regex tabanlı analize çevirir.
+
+Ayarlar ortam değişkenleriyle yapılabilir:
+    LLM_MAX_CONCURRENCY  Aynı anda çalışan LLM işi (varsayılan 1)
+    LLM_MAX_QUEUE        Kuyrukta bekleyebilecek en fazla istek (varsayılan 8)
+    LLM_QUEUE_TIMEOUT    Kuyrukta en fazla bekleme süresi, saniye (varsayılan 60)
+"""
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Henüz ölçüm yokken bir LLM işinin tahmini süresi (saniye)
+DEFAULT_SERVICE_TIME = 30.0
+# Yeni süre ölçümlerinin hareketli ortalamadaki ağırlığı
+SERVICE_TIME_SMOOTHING = 0.3
+
+
+class AdmissionRejected(Exception):
+    """İstek kabul edilmedi (kuyruk dolu veya bekleme süresi aşıldı)"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Eşzamanlılık ve kuyruk derinliği sınırlı LLM iş kuyruğu"""
+
+    def __init__(self, max_concurrency: int = 1, max_queue: int = 8, queue_timeout: float = 60.0):
+        """
+        Args:
+            max_concurrency (int): Aynı anda çalışabilecek iş sayısı
+            max_queue (int): Çalışan işlere ek olarak bekleyebilecek en fazla istek
+            queue_timeout (float): Bir isteğin kuyrukta bekleyebileceği en uzun süre (saniye)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.completed = 0
+        self.service_time = DEFAULT_SERVICE_TIME
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Ayarları ortam değişkenlerinden okur"""
+        return cls(
+            max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", 1)),
+            max_queue=int(os.environ.get("LLM_MAX_QUEUE", 8)),
+            queue_timeout=float(os.environ.get("LLM_QUEUE_TIMEOUT", 60)),
+        )
+
+    def retry_after(self) -> int:
+        """Kuyruğun boşalması için tahmini bekleme süresi (saniye)"""
+        rounds = (self.active + self.waiting) / self.max_concurrency
+        return max(1, math.ceil(rounds * self.service_time))
+
+    def stats(self) -> Dict[str, Any]:
+        """Anlık kuyruk durumunu döndürür"""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "avg_service_time": round(self.service_time, 2),
+        }
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Engelleyici bir LLM çağrısını kuyruk sırasıyla iş parçacığı havuzunda çalıştırır
+
+        Raises:
+            AdmissionRejected: Kuyruk doluysa (429) veya bekleme süresi aşıldıysa (503)
+        """
+        loop = asyncio.get_running_loop()
+        return await self.submit(lambda: loop.run_in_executor(None, lambda: func(*args, **kwargs)))
+
+    async def submit(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Verilen eşyordamı kabul kontrolünden geçirerek çalıştırır"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if self.active >= self.max_concurrency and self.waiting >= self.max_queue:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(f"LLM kuyruğu dolu ({self.active} çalışan, {self.waiting} bekleyen), istek reddedildi")
+            raise AdmissionRejected("LLM kuyruğu dolu", status_code=429, retry_after=retry_after)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejected("LLM kuyruğunda bekleme süresi aşıldı", status_code=503,
+                                    retry_after=self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        start = time.monotonic()
+        try:
+            return await factory()
+        finally:
+            elapsed = time.monotonic() - start
+            self.service_time = (1 - SERVICE_TIME_SMOOTHING) * self.service_time + SERVICE_TIME_SMOOTHING * elapsed
+            self.active -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+
+class SingleFlight:
+    """Aynı anda gelen çağrıların tek bir işlemi (ör. model yükleme) paylaşmasını sağlar"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def in_progress(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        İşlem sürüyorsa onun sonucunu bekler, sürmüyorsa yeni işlem başlatır
+
+        Args:
+            factory: Yeni işlem için eşyordam üreten fonksiyon
+
+        Returns:
+            Any: İşlemin sonucu
+        """
+        if not self.in_progress:
+            self._task = asyncio.ensure_future(factory())
+        # Bekleyen bir istemcinin iptali ortak işlemi iptal etmemeli
+        return await asyncio.shield(self._task)
@@ -8,7 +8,7 @@ from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query, Backg
 # FastAPI'nin Path'ini farklı bir isimle import et
 from fastapi.params import Path as FastAPIPath
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
@@ -23,8 +23,24 @@ from src.processors.document_processor import DocumentProcessor
 from src.models.cv_models import CV
 from src.core.platform_config import PlatformConfig
 from src.core.llm_manager import LLMManager
+from src.core.model_registry import get_registry
+from src.core.llm_backend import get_backend_manager
+from src.core.hf_llm_manager import get_shared_manager as get_hf_manager
+from src.core.candidate_store import CandidateStore, filter_mismatch
+from src.core.text_index import DocumentTerms, QueryError, text_index_from_env
+from src.core.vector_index import VectorIndex, position_text
+from src.core.talent_clusters import TalentClusters
+from src.processors.bulk_matching import match_positions
+from src.processors.position_matching import PositionProfile, compile_position
+from src.processors.batch_statistics import calculate_statistics
+from src.processors.cv_comparison import compare_cv_data
+from src.core.near_duplicate import (NearDuplicateIndex, POLICIES as DUPLICATE_POLICIES, POLICY_ANALYZE,
+                                     POLICY_UPDATE, contact_keys, merge_analysis, minhash_signature)
+from src.api.admission import AdmissionController, AdmissionRejected, SingleFlight
+from src.api.progressive import ResultStore, ProgressiveResult
 from pydantic import BaseModel
 import asyncio
+import functools
 from concurrent.futures import ThreadPoolExecutor
 import logging
 import platform
@@ -55,6 +71,27 @@ UPLOAD_DIR = PathLib("temp")
 OUTPUT_DIR = PathLib("output")
 llm_manager = None
 
+# LLM işleri sınırlı eşzamanlılık ve kuyruk derinliğiyle çalışır
+llm_admission = AdmissionController.from_env()
+# Eşzamanlı istekler modelin tek bir yüklemesini bekler
+model_loader = SingleFlight()
+# Aşamalı analizlerde LLM sonucu gelene kadar regex sonucu burada tutulur
+result_store = ResultStore()
+# Analiz edilen CV'ler pozisyon sıralaması için ters indeksli depoda tutulur
+candidate_store = CandidateStore.from_env()
+# CV metinleri anahtar kelime araması için BM25 indeksinde tutulur
+text_index = text_index_from_env()
+# Aynı adayın düzenlenmiş CV'lerini tanımak için MinHash/LSH indeksi
+near_duplicates = NearDuplicateIndex.from_env()
+# CV metinlerinin hash'lenmiş n-gram vektörleri, pozisyonlara anlamsal aday üretimi için
+vector_index = VectorIndex.from_env()
+# Aday havuzunun beceri/deneyim kümeleri; yeni CV'ler mevcut kümelere artımlı eklenir
+talent_clusters = TalentClusters.from_env()
+# /candidates/compare tek istekte en fazla bu kadar adayı karşılaştırır (N × N benzerlik)
+MAX_COMPARE_CANDIDATES = int(os.environ.get("MAX_COMPARE_CANDIDATES", 2000))
+# İndeks yazımları (SQLite, memmap) olay döngüsünü bloke etmez; tek iş parçacığı yazım sırasını korur
+index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aday-indeks")
+
 # Statik dosyaları ve şablonları yapılandırma
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
@@ -78,18 +115,29 @@ async def startup_event():
     
     # LLM modelini arka planda yükle
     logging.info("LLM modeli arka planda yükleniyor...")
-    asyncio.create_task(load_model_async())
+    asyncio.create_task(ensure_model_loaded())
+
+def _llm_ready() -> bool:
+    """Model bu süreçte yüklüyse veya çıkarım sunucusu kullanılıyorsa True"""
+    return bool(llm_manager and (llm_manager.has_model() or llm_manager.client))
+
+async def ensure_model_loaded() -> bool:
+    """Model yüklü değilse yükler; devam eden bir yükleme varsa onu bekler"""
+    if _llm_ready():
+        return True
+    await model_loader.run(load_model_async)
+    return _llm_ready()
 
 async def load_model_async():
     """LLM modelini arka planda비동기적으로 yükler"""
     global llm_manager
     
     try:
-        # LLM Manager oluştur
-        from src.core.llm_manager import LLMManager
+        # Süreç genelinde paylaşılan LLM Manager (backend yöneticisi de aynı örneği kullanır)
+        from src.core.llm_manager import get_shared_manager
         
-        llm_manager = LLMManager()
-        logging.info(f"LLM Manager başlatıldı, model: {llm_manager.model_path}")
+        llm_manager = get_shared_manager()
+        logging.info(f"LLM Manager başlatıldı, model: {llm_manager.server_url or llm_manager.model_path}")
         
         # Model yükleme işlemini başlat (ThreadPoolExecutor ile bloke etmeden)
         with ThreadPoolExecutor() as executor:
@@ -128,6 +176,11 @@ class MatchingOptions(BaseModel):
     language_weight: float = 0.05
     certification_weight: float = 0.05
 
+class PositionRankRequest(BaseModel):
+    k: int = 10
+    matching_options: Optional[MatchingOptions] = None
+    semantic_candidates: Optional[int] = None  # Yalnızca vektör indeksindeki en benzer N adayı puanla
+
 class BatchAnalysisOptions(BaseModel):
     filter_options: Optional[FilterOptions] = None
     search_options: Optional[SearchOptions] = None
@@ -138,6 +191,27 @@ class ComparisonOptions(BaseModel):
     comparison_fields: List[str] = ["skills", "experience", "education"]
     generate_charts: bool = True
     export_format: str = "pdf"
+    top_k: Optional[int] = None  # Yalnızca en benzer k çifti döndür
+    cluster_threshold: Optional[float] = None  # Benzerlik kümeleri için eşik
+
+class CandidateSearchRequest(BaseModel):
+    filter_options: Optional[FilterOptions] = None
+    position_id: Optional[str] = None  # Verilirse filtreyi geçen adaylar bu pozisyona göre sıralanır
+    matching_options: Optional[MatchingOptions] = None
+    limit: int = 20
+    offset: int = 0
+
+class ClusteringRequest(BaseModel):
+    n_clusters: int = 8
+    vocabulary_size: int = 500  # Havuzda en sık geçen kaç beceri kullanılacak
+    epochs: int = 3
+    incremental: bool = False  # True ise yalnızca son hesaplamadan sonra eklenen adaylar uygulanır
+
+class CandidateComparisonRequest(BaseModel):
+    candidate_ids: Optional[List[str]] = None  # None ise tüm havuz (en fazla MAX_COMPARE_CANDIDATES)
+    comparison_fields: List[str] = ["skills"]
+    top_k: int = 20
+    cluster_threshold: Optional[float] = None
 
 class ReportOptions(BaseModel):
     report_type: str = "detailed"  # detailed, summary, custom
@@ -169,6 +243,10 @@ async def get_system_info():
 async def analyze_cv(
     file: UploadFile = File(...),
     use_llm: bool = Form(False),  # LLM kullanımını kontrol etmek için parametre ekle
+    degrade_to_regex: bool = Form(False),
+    progressive: bool = Form(False),
+    model_name: Optional[str] = Form(None),
+    duplicate_policy: str = Form(POLICY_ANALYZE),
     filter_options: Optional[FilterOptions] = None
 ):
     """
@@ -177,12 +255,19 @@ async def analyze_cv(
     Args:
         file (UploadFile): Yüklenen CV dosyası
         use_llm (bool): LLM modelini kullanarak gelişmiş analiz yapılıp yapılmayacağı
+        degrade_to_regex (bool): LLM kuyruğu doluysa hata yerine regex analizi döndür
+        progressive (bool): Regex sonucunu hemen döndür, LLM sonucunu /results/{result_id} ile ver
+        model_name (str, optional): LLM analizinde kullanılacak model (None ise varsayılan model)
+        duplicate_policy (str): Aynı kişinin yakın kopya CV'si kayıtlıysa: "analyze" (tam analiz),
+            "reuse" (önceki analizi döndür) veya "update" (önceki analizi regex analiziyle güncelle)
         filter_options (FilterOptions, optional): Filtreleme seçenekleri
         
     Returns:
         Dict[str, Any]: Analiz sonuçları
     """
     try:
+        if use_llm:
+            _require_known_model(model_name)
         # Dosyayı geçici konuma kaydet
         file_location = f"temp/{file.filename}"
         os.makedirs(os.path.dirname(file_location), exist_ok=True)
@@ -197,56 +282,225 @@ async def analyze_cv(
         if not text:
             raise HTTPException(status_code=400, detail="Dosyadan metin çıkarılamadı")
             
+        # Yakın kopya kontrolü; imza metin çıkarılırken bir kez hesaplanır
+        if duplicate_policy not in DUPLICATE_POLICIES:
+            raise HTTPException(status_code=400, detail=f"Geçersiz duplicate_policy: {duplicate_policy}")
+        signature = minhash_signature(text)
+        contacts = contact_keys(text)
+        duplicate = near_duplicates.closest(signature, contacts)
+        if duplicate and duplicate["ayni_kisi"] and duplicate_policy != POLICY_ANALYZE:
+            prior = candidate_store.get_candidate(duplicate["candidate_id"])
+            if prior is not None:
+                cv_data = await _run_indexing(_reuse_prior_analysis, prior, duplicate, duplicate_policy, text,
+                                              signature, contacts)
+                if filter_options:
+                    cv_data = _apply_filters(cv_data, filter_options)
+                os.remove(file_location)
+                return cv_data
+        duplicate_info = {**duplicate, "politika": POLICY_ANALYZE} if duplicate else None
+            
         # LLM kullanımını kontrol et
-        if use_llm:
+        if use_llm and progressive:
+            # Filtreler LLM görevi başlamadan uygulanır; reddedilen CV için kabul slotu tutulmaz
+            initial = analyze_with_regex(text)
+            if filter_options:
+                initial = _apply_filters(initial, filter_options)
+            entry = result_store.create(initial)
+            # LLM sonucu geldiğinde aynı aday kaydı güncellenir
+            candidate_id = await _run_indexing(_index_candidate, entry.initial, text, signature, contacts,
+                                               source=file.filename)
+            entry.initial["candidate_id"] = candidate_id
+            if duplicate_info:
+                entry.initial["_yakin_kopya"] = duplicate_info
+            # LLM analizi indeksleme başarılı olduktan sonra arka planda başlar; indeksleme hatası
+            # kabul slotu tutan sahipsiz bir görev bırakmaz. Regex sonucu hemen döndürülür
+            llm_task = asyncio.ensure_future(analyze_with_llm(text, model_name))
+            entry.task = asyncio.ensure_future(_complete_progressive(entry, llm_task, candidate_id, text, signature,
+                                                                     contacts))
+            os.remove(file_location)
+            return entry.to_dict()
+        elif use_llm:
             # LLM ile analiz yap
             logging.info("LLM ile analiz yapılıyor...")
-            cv_data = await analyze_with_llm(text)
+            try:
+                cv_data = await analyze_with_llm(text, model_name)
+            except AdmissionRejected as e:
+                if not degrade_to_regex:
+                    raise HTTPException(status_code=e.status_code, detail=str(e),
+                                        headers={"Retry-After": str(e.retry_after)})
+                logging.warning(f"{str(e)}, regex tabanlı analize geçiliyor")
+                cv_data = analyze_with_regex(text)
+                cv_data["_llm_atlandi"] = {"neden": str(e), "retry_after": e.retry_after}
         else:
-            # Regex tabanlı analiz yap
-            logging.info("Regex tabanlı analiz yapılıyor...")
-            if llm_manager:
-                # Aynı yüksek kaliteli regex fonksiyonunu kullan, ancak LLM çağrısı yapma
-                cv_data = llm_manager._create_default_cv_response(cv_text=text)
-            else:
-                # LLM manager yoksa standart analiz
-                cv_data = document_processor.analyze_cv(text)
+            cv_data = analyze_with_regex(text)
             
         # Filtre seçeneklerini uygula
         if filter_options:
             cv_data = _apply_filters(cv_data, filter_options)
             
+        # Aday deposuna kaydet
+        if "error" not in cv_data:
+            cv_data["candidate_id"] = await _run_indexing(_index_candidate, cv_data, text, signature, contacts,
+                                                          source=file.filename)
+            if duplicate_info:
+                cv_data["_yakin_kopya"] = duplicate_info
+            
         # Geçici dosyayı temizle
         os.remove(file_location)
             
         return cv_data
         
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"CV analiz hatası: {str(e)}")
         raise HTTPException(status_code=500, detail=f"CV analiz hatası: {str(e)}")
 
-async def analyze_with_llm(text: str) -> Dict[str, Any]:
+async def _run_indexing(func, *args, **kwargs):
+    """Senkron indeks yazımını indeks iş parçacığında çalıştırır ve sonucunu bekler"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(index_executor, functools.partial(func, *args, **kwargs))
+
+def _index_candidate(cv_data: Dict[str, Any], text: str, signature, contacts: Dict[str, List[str]],
+                     source: Optional[str] = None, candidate_id: Optional[str] = None) -> str:
+    """Analizi aday deposuna, metni tam metin, vektör ve yakın kopya indekslerine kaydeder"""
+    candidate_id = candidate_store.add_candidate(cv_data, candidate_id=candidate_id, source=source)
+    text_index.add_document(candidate_id, text)
+    vector_index.add(candidate_id, text)
+    talent_clusters.add_candidate(candidate_id, cv_data)
+    near_duplicates.add(candidate_id, signature, contacts)
+    return candidate_id
+
+def _reuse_prior_analysis(prior: Dict[str, Any], duplicate: Dict[str, Any], policy: str, text: str,
+                          signature, contacts: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    Yakın kopya CV için önceki analizi yeniden kullanır
+    
+    "update" politikasında önceki (ör. LLM) analiz, yeni metnin hızlı regex
+    analiziyle birleştirilip aynı aday kaydına yazılır; "reuse" politikasında
+    önceki analiz olduğu gibi döndürülür.
+    """
+    candidate_id = duplicate["candidate_id"]
+    if policy == POLICY_UPDATE:
+        cv_data = merge_analysis(prior, analyze_with_regex(text))
+        _index_candidate(cv_data, text, signature, contacts, candidate_id=candidate_id)
+    else:
+        cv_data = dict(prior)
+    logging.info(f"Yakın kopya CV (benzerlik {duplicate['benzerlik']:.2f}), önceki analiz kullanıldı: {policy}")
+    cv_data["candidate_id"] = candidate_id
+    cv_data["_yakin_kopya"] = {**duplicate, "politika": policy}
+    return cv_data
+
+def analyze_with_regex(text: str) -> Dict[str, Any]:
+    """Regex tabanlı CV analizi yapar (LLM çağrısı yapılmaz)"""
+    logging.info("Regex tabanlı analiz yapılıyor...")
+    if llm_manager:
+        # Aynı yüksek kaliteli regex fonksiyonunu kullan, ancak LLM çağrısı yapma
+        return llm_manager._create_default_cv_response(cv_text=text)
+    # LLM manager yoksa standart analiz
+    return document_processor.analyze_cv(text)
+
+async def _complete_progressive(entry: ProgressiveResult, llm_task: "asyncio.Future",
+                                candidate_id: Optional[str], text: str, signature,
+                                contacts: Dict[str, List[str]]) -> None:
+    """
+    Arka plandaki LLM analizinin sonucunu aşamalı kayda işler
+
+    candidate_id verilirse regex sonucuyla indekslenen aday kaydı, küme ataması
+    ve metin indeksleri LLM sonucuyla yeniden indekslenir.
+    """
+    try:
+        result = await llm_task
+        if "error" in result:
+            entry.fail(result["error"])
+        else:
+            if candidate_id:
+                await _run_indexing(_index_candidate, result, text, signature, contacts, candidate_id=candidate_id)
+                result["candidate_id"] = candidate_id
+            entry.complete(result)
+    except AdmissionRejected as e:
+        entry.fail(f"{str(e)} (Retry-After: {e.retry_after} sn)")
+    except Exception as e:
+        logging.error(f"Aşamalı LLM analizi hatası: {str(e)}")
+        entry.fail(str(e))
+
+@app.get("/results/{result_id}")
+async def get_progressive_result(result_id: str):
+    """
+    Aşamalı analiz sonucunu döndürür (yoklama için)
+    
+    status "pending" iken result alanı regex sonucudur; "done" olduğunda LLM
+    sonucu ve regex sonucuna göre alan farkları (diff) eklenir.
+    """
+    entry = result_store.get(result_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Sonuç bulunamadı")
+    return entry.to_dict()
+
+@app.get("/results/{result_id}/events")
+async def stream_progressive_result(result_id: str):
+    """Aşamalı analiz sonucunu Server-Sent Events olarak akıtır"""
+    if not result_store.get(result_id):
+        raise HTTPException(status_code=404, detail="Sonuç bulunamadı")
+    return StreamingResponse(result_store.stream(result_id), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+def _require_known_model(model_name: Optional[str]) -> None:
+    """İstenen model model dizininde yoksa 404 döndürür (çıkarım sunucusunda model sunucudadır)"""
+    if not model_name or (llm_manager and llm_manager.client):
+        return
+    try:
+        get_registry().get_info(model_name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Model bulunamadı: {model_name}")
+
+async def _get_llm_manager(model_name: Optional[str] = None) -> LLMManager:
+    """
+    Kullanıma hazır LLM yöneticisini döndürür; model yüklü değilse yükler
+    
+    Raises:
+        RuntimeError: Model yüklenemezse
+        AdmissionRejected: model_name yüklenirken LLM kuyruğu doluysa
+    """
+    if not _llm_ready():
+        logging.warning("LLM modeli hazır değil, model yükleniyor...")
+        if not await ensure_model_loaded():
+            raise RuntimeError("LLM modeli yüklenemedi")
+    if model_name:
+        # Yüklü modeller kayıt defterinden paylaşılır; model değiştirmek yeniden yükleme gerektirmez
+        return await llm_admission.run(llm_manager.for_model, model_name)
+    return llm_manager
+
+async def analyze_with_llm(text: str, model_name: Optional[str] = None) -> Dict[str, Any]:
     """
     LLM ile CV analizi yapar
     
     Args:
         text (str): CV metni
+        model_name (str, optional): Kullanılacak model; yüklü değilse kayıt defteri üzerinden yüklenir
         
     Returns:
         Dict[str, Any]: LLM analiz sonuçları
+        
+    Yerel LLM kuyruğu doluysa ve HF_API_TOKEN/HF_API_URL tanımlıysa taşan istekler
+    Hugging Face API'ye yönlendirilir; eşzamanlı taşan istekler toplu API isteklerinde
+    birleştirilir.
+    
+    Raises:
+        AdmissionRejected: LLM kuyruğu doluysa (ve HF API tanımlı değilse) veya bekleme süresi aşıldıysa
     """
     try:
-        # LLM Manager'ın hazır olduğundan emin ol
-        if not llm_manager or not llm_manager.model:
-            logging.warning("LLM modeli hazır değil, model yükleniyor...")
-            await load_model_async()
-            
-            if not llm_manager or not llm_manager.model:
-                raise RuntimeError("LLM modeli yüklenemedi")
-        
-        # LLM ile CV analizi yap
-        logging.info("LLM ile CV analizi yapılıyor...")
-        result = llm_manager.analyze_cv(cv_text=text)
+        try:
+            # LLM ile CV analizi yap (sınırlı eşzamanlılıkla, olay döngüsünü bloke etmeden)
+            manager = await _get_llm_manager(model_name)
+            logging.info("LLM ile CV analizi yapılıyor...")
+            result = await llm_admission.run(manager.analyze_cv, cv_text=text)
+        except AdmissionRejected as e:
+            hf_manager = get_hf_manager()
+            if hf_manager is None:
+                raise
+            logging.warning(f"{str(e)}, CV analizi Hugging Face API'ye yönlendiriliyor")
+            result = await hf_manager.analyze_cv_async(text)
         
         # Analiz sonucunu logla (HATA AYIKLAMA İÇİN)
         logging.info(f"LLM analiz sonucu: {json.dumps(result, ensure_ascii=False)[:500]}...")
@@ -257,6 +511,8 @@ async def analyze_with_llm(text: str) -> Dict[str, Any]:
             raise RuntimeError(f"LLM analiz hatası: {result['error']}")
             
         return result
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logging.error(f"CV analizi sırasında beklenmeyen hata: {str(e)}")
         import traceback
@@ -269,36 +525,46 @@ async def analyze_with_llm(text: str) -> Dict[str, Any]:
 @app.post("/match-cv")
 async def match_cv(
     file: UploadFile = File(...),
-    position: str = Form(...),
+    position: Optional[str] = Form(None),
+    position_ids: Optional[str] = Form(None),
+    explain_top: int = Form(0),
+    model_name: Optional[str] = Form(None),
     filter_options: Optional[FilterOptions] = None,
     search_options: Optional[SearchOptions] = None,
     matching_options: Optional[MatchingOptions] = None
 ) -> Dict[str, Any]:
     """
-    CV'yi iş tanımıyla eşleştirir
+    CV'yi bir veya birden çok iş tanımıyla eşleştirir
+    
+    CV bir kez ayrıştırılır ve tüm pozisyonlar ağırlıklı eşleştirme skoruyla
+    tek seferde puanlanır. /positions ile kaydedilen pozisyonlar kimlikle
+    verilebilir; bunların derlenmiş profilleri önbellekten kullanılır.
+    explain_top verilirse en yüksek skorlu pozisyonlar için LLM açıklaması arka
+    planda hazırlanır; yanıt hemen döner ve açıklamalar /results/{result_id} ile
+    alınır.
     
     Args:
         file (UploadFile): Yüklenen CV dosyası
-        position (str): İş tanımı (JSON formatında)
+        position (str, optional): İş tanımı veya iş tanımları listesi (JSON formatında)
+        position_ids (str, optional): Kayıtlı pozisyon kimlikleri (virgülle ayrılmış)
+        explain_top (int): LLM ile açıklanacak en iyi pozisyon sayısı (0 ise LLM kullanılmaz)
+        model_name (str, optional): Açıklamalarda kullanılacak model (None ise varsayılan model)
         filter_options (FilterOptions, optional): Filtreleme seçenekleri
         search_options (SearchOptions, optional): Arama seçenekleri
         matching_options (MatchingOptions, optional): Eşleştirme seçenekleri
         
     Returns:
-        Dict[str, Any]: Eşleştirme sonuçları
+        Dict[str, Any]: Tek pozisyonda eşleştirme sonucu, listede skora göre sıralı
+            sonuçlar; explain_top > 0 ise aşamalı sonuç kaydı
     """
     file_path = None
     try:
-        # Pozisyon verisini JSON'dan dict'e çevir
-        try:
-            position_data = json.loads(position)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Geçersiz pozisyon verisi")
-            
-        # Gerekli alanları kontrol et
-        required_fields = ["title", "description", "requirements"]
-        if not all(field in position_data for field in required_fields):
-            raise HTTPException(status_code=400, detail="Geçersiz pozisyon verisi")
+        # Pozisyonları derle: kayıtlı olanlar önbellekten, JSON olarak gelenler burada
+        positions, position_refs, batch = _resolve_positions(position, position_ids)
+        if explain_top < 0:
+            raise HTTPException(status_code=400, detail="explain_top negatif olamaz")
+        if explain_top:
+            _require_known_model(model_name)
             
         # Dosyayı geçici dizine kaydet
         file_path = UPLOAD_DIR / file.filename
@@ -309,7 +575,7 @@ async def match_cv(
         # Metni çıkar
         text = document_processor.extract_text(str(file_path))
         
-        # CV'yi analiz et
+        # CV'yi analiz et (tüm pozisyonlar için bir kez)
         cv_data = document_processor.analyze_cv(text)
         
         # Filtreleme uygula
@@ -317,29 +583,34 @@ async def match_cv(
             cv_data = _apply_filters(cv_data, filter_options)
             
         # Eşleştirme yap
-        result = {
-            "match_score": 0.85,  # TODO: Gerçek eşleştirme yapılacak
-            "category_scores": {
-                "skills": 0.9,
-                "experience": 0.8,
-                "education": 0.85
-            },
-            "strengths": [
-                "Python ve FastAPI deneyimi",
-                "Docker ve Kubernetes bilgisi"
-            ],
-            "weaknesses": [
-                "AWS deneyimi eksik"
-            ],
-            "recommendations": [
-                "AWS sertifikasyonu alınabilir",
-                "Cloud teknolojileri üzerine çalışılabilir"
-            ]
-        }
+        weights = matching_options.dict() if matching_options else None
+        try:
+            matches = match_positions(cv_data, positions, weights)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        for match in matches:
+            if isinstance(position_refs[match["position_index"]], str):
+                match["position_id"] = position_refs[match["position_index"]]
         
         # Arama seçeneklerini uygula
-        if search_options:
-            result = _apply_search_options(result, search_options)
+        if batch:
+            if search_options:
+                _check_keywords(search_options, text)
+                if search_options.min_match_score:
+                    matches = [m for m in matches if m["match_score"] >= search_options.min_match_score]
+            result = {"position_count": len(positions), "results": matches}
+        else:
+            result = {key: value for key, value in matches[0].items()
+                      if key not in ("position_index", "title", "position_id")}
+            if search_options:
+                result = _apply_search_options(result, search_options, text)
+                
+        # LLM açıklamaları yalnızca en iyi pozisyonlar için, arka planda
+        if explain_top and matches:
+            entry = result_store.create(result)
+            entry.task = asyncio.ensure_future(
+                _explain_matches(entry, cv_data, position_refs, matches[:explain_top], batch, model_name))
+            result = entry.to_dict()
             
         # Geçici dosyayı sil
         if file_path and file_path.exists():
@@ -347,86 +618,381 @@ async def match_cv(
         
         return result
         
+    except HTTPException:
+        if file_path and file_path.exists():
+            file_path.unlink()
+        raise
     except Exception as e:
         if file_path and file_path.exists():
             file_path.unlink()
         raise HTTPException(status_code=400, detail=str(e))
 
+def _resolve_positions(position: Optional[str],
+                       position_ids: Optional[str]) -> Tuple[List[PositionProfile], List[Any], bool]:
+    """
+    /match-cv pozisyonlarını derlenmiş profillere çevirir
+    
+    Returns:
+        Tuple: profiller, her profilin kaynağı (pozisyon verisi veya kayıtlı kimlik)
+            ve yanıtın liste biçiminde olup olmayacağı
+    """
+    sources: List[Any] = []
+    batch = False
+    if position:
+        try:
+            position_data = json.loads(position)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Geçersiz pozisyon verisi")
+        batch = isinstance(position_data, list)
+        sources.extend(_validate_position(item) for item in (position_data if batch else [position_data]))
+    if position_ids:
+        sources.extend(item.strip() for item in position_ids.split(",") if item.strip())
+    if not sources:
+        raise HTTPException(status_code=400, detail="En az bir pozisyon gerekli")
+        
+    profiles = []
+    for source in sources:
+        if isinstance(source, str):
+            profile = candidate_store.position_profile(source)
+            if profile is None:
+                raise HTTPException(status_code=404, detail=f"Pozisyon bulunamadı: {source}")
+        else:
+            try:
+                profile = compile_position(source)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Geçersiz pozisyon verisi: {str(e)}")
+        profiles.append(profile)
+    return profiles, sources, batch or len(sources) > 1
+
+async def _explain_matches(entry: ProgressiveResult, cv_data: Dict[str, Any], position_refs: List[Any],
+                           matches: List[Dict[str, Any]], batch: bool, model_name: Optional[str] = None) -> None:
+    """En iyi pozisyonlar için LLM eşleştirme açıklamalarını aşamalı kayda işler"""
+    try:
+        manager = await _get_llm_manager(model_name)
+        explanations = {}
+        for match in matches:
+            position_data = position_refs[match["position_index"]]
+            if isinstance(position_data, str):
+                # Kayıtlı pozisyonun açıklama için tam metni gerekir
+                position_data = candidate_store.get_position(position_data) or {}
+            explanations[match["position_index"]] = await llm_admission.run(
+                manager.match_cv_with_position, cv_data, position_data)
+        if batch:
+            final = {**entry.initial, "results": [
+                {**item, "llm_aciklama": explanations[item["position_index"]]}
+                if item["position_index"] in explanations else item
+                for item in entry.initial["results"]
+            ]}
+        else:
+            final = {**entry.initial, "llm_aciklama": explanations[matches[0]["position_index"]]}
+        entry.complete(final)
+    except AdmissionRejected as e:
+        entry.fail(f"{str(e)} (Retry-After: {e.retry_after} sn)")
+    except Exception as e:
+        logging.error(f"LLM eşleştirme açıklaması hatası: {str(e)}")
+        entry.fail(str(e))
+
+def _validate_position(position_data: Any) -> Dict[str, Any]:
+    """Pozisyon verisinin gerekli alanlarını kontrol eder"""
+    required_fields = ["title", "description", "requirements"]
+    if not isinstance(position_data, dict) or not all(field in position_data for field in required_fields):
+        raise HTTPException(status_code=400, detail="Geçersiz pozisyon verisi")
+    return position_data
+
+@app.post("/positions")
+async def create_position(position: Dict[str, Any]):
+    """
+    İş pozisyonunu kaydeder
+    
+    Args:
+        position (Dict[str, Any]): title, description ve requirements alanlarını içeren pozisyon
+        
+    Returns:
+        Dict[str, Any]: Pozisyon kimliği ve verisi
+    """
+    position_data = _validate_position(position)
+    try:
+        # Pozisyon kayıt sırasında bir kez derlenir; eşleştirmelerde kimlikle kullanılır
+        position_id = candidate_store.add_position(position_data, position_id=position_data.get("id"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Geçersiz pozisyon verisi: {str(e)}")
+    return {"position_id": position_id, "position": position_data}
+
+@app.get("/positions/{position_id}")
+async def get_position(position_id: str):
+    """Kayıtlı pozisyonu döndürür"""
+    position_data = candidate_store.get_position(position_id)
+    if position_data is None:
+        raise HTTPException(status_code=404, detail="Pozisyon bulunamadı")
+    return {"position_id": position_id, "position": position_data}
+
+@app.post("/positions/{position_id}/rank")
+async def rank_candidates(position_id: str, request: Optional[PositionRankRequest] = None):
+    """
+    Aday havuzunu pozisyona göre sıralar
+    
+    Yalnızca pozisyonla en az bir gereksinimi paylaşan adaylar ters indeksten
+    bulunur ve ağırlıklı eşleştirme skoruyla puanlanır. semantic_candidates
+    verilirse önce vektör indeksinden pozisyon metnine en benzer N aday alınır
+    ve yalnızca bunlar puanlanır.
+    
+    Args:
+        position_id (str): Pozisyon kimliği
+        request (PositionRankRequest, optional): Döndürülecek aday sayısı (k), ağırlıklar ve anlamsal aday sayısı
+        
+    Returns:
+        Dict[str, Any]: Havuz büyüklüğü, puanlanan aday sayısı ve ilk k aday
+    """
+    profile = candidate_store.position_profile(position_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Pozisyon bulunamadı")
+    request = request or PositionRankRequest()
+    if request.k < 1:
+        raise HTTPException(status_code=400, detail="k en az 1 olmalı")
+    if request.semantic_candidates is not None and request.semantic_candidates < request.k:
+        raise HTTPException(status_code=400, detail="semantic_candidates en az k olmalı")
+    matching_options = request.matching_options.dict() if request.matching_options else None
+    loop = asyncio.get_running_loop()
+    candidate_ids = None
+    if request.semantic_candidates:
+        text = position_text(candidate_store.get_position(position_id))
+        similar = await loop.run_in_executor(None, vector_index.search, text, request.semantic_candidates)
+        candidate_ids = [candidate_id for candidate_id, _ in similar]
+    try:
+        result = await loop.run_in_executor(None, candidate_store.rank, profile, request.k, matching_options,
+                                            candidate_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"position_id": position_id, **result}
+
+@app.get("/positions/{position_id}/similar-candidates")
+async def similar_candidates(position_id: str, k: int = 20):
+    """
+    Pozisyon metnine (başlık, açıklama, gereksinimler) en benzer adayları vektör indeksinden döndürür
+    
+    Args:
+        position_id (str): Pozisyon kimliği
+        k (int): Döndürülecek aday sayısı
+        
+    Returns:
+        Dict[str, Any]: Kosinüs benzerliğine göre sıralı aday kimlikleri
+    """
+    position_data = candidate_store.get_position(position_id)
+    if position_data is None:
+        raise HTTPException(status_code=404, detail="Pozisyon bulunamadı")
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k en az 1 olmalı")
+    loop = asyncio.get_running_loop()
+    similar = await loop.run_in_executor(None, vector_index.search, position_text(position_data), k)
+    return {
+        "position_id": position_id,
+        "indexed": len(vector_index),
+        "candidates": [{"candidate_id": candidate_id, "similarity": round(score, 4)} for candidate_id, score in similar]
+    }
+
+@app.get("/models")
+async def list_models():
+    """Model dizinindeki modelleri ve yükleme/boşaltma metriklerini döndürür"""
+    registry = get_registry()
+    return {
+        "models": [info.to_dict() for info in registry.list_models()],
+        "metrics": registry.metrics()
+    }
+
 @app.get("/health")
 async def health_check():
     """API sağlık kontrolü"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "llm_queue": llm_admission.stats(),
+        "backends": get_backend_manager().metrics()
+    }
 
 def _apply_filters(cv_data: Dict[str, Any], filter_options: FilterOptions) -> Dict[str, Any]:
-    """Filtreleme seçeneklerini uygular"""
-    # Deneyim yılı kontrolü
-    if filter_options.min_experience_years:
-        total_experience = sum(
-            int(exp.get('end_date', '2024')) - int(exp.get('start_date', '2024'))
-            for exp in cv_data.get('experience', [])
-        )
-        if total_experience < filter_options.min_experience_years:
-            raise HTTPException(status_code=400, detail="Yetersiz deneyim")
-            
-    # Gerekli beceriler kontrolü
-    if filter_options.required_skills:
-        cv_skills = set(skill.lower() for skill in cv_data.get('skills', []))
-        required_skills = set(skill.lower() for skill in filter_options.required_skills)
-        if not required_skills.issubset(cv_skills):
-            raise HTTPException(status_code=400, detail="Eksik beceriler")
-            
-    # Eğitim seviyesi kontrolü
-    if filter_options.education_level:
-        education_levels = {
-            'lisans': ['lisans', 'bachelor'],
-            'yüksek lisans': ['yüksek lisans', 'master'],
-            'doktora': ['doktora', 'phd']
-        }
-        cv_education = [edu.get('degree', '').lower() for edu in cv_data.get('education', [])]
-        if not any(level in edu for edu in cv_education for level in education_levels.get(filter_options.education_level.lower(), [])):
-            raise HTTPException(status_code=400, detail="Yetersiz eğitim seviyesi")
-            
-    # Konum kontrolü
-    if filter_options.location:
-        cv_location = cv_data.get('personal_info', {}).get('location', '').lower()
-        if filter_options.location.lower() not in cv_location:
-            raise HTTPException(status_code=400, detail="Uygun olmayan konum")
-            
-    # Dil kontrolü
-    if filter_options.languages:
-        cv_languages = set(lang.lower() for lang in cv_data.get('languages', []))
-        required_languages = set(lang.lower() for lang in filter_options.languages)
-        if not required_languages.issubset(cv_languages):
-            raise HTTPException(status_code=400, detail="Eksik dil bilgisi")
-            
-    # Sertifika kontrolü
-    if filter_options.certifications:
-        cv_certifications = set(cert.lower() for cert in cv_data.get('certifications', []))
-        required_certifications = set(cert.lower() for cert in filter_options.certifications)
-        if not required_certifications.issubset(cv_certifications):
-            raise HTTPException(status_code=400, detail="Eksik sertifikalar")
-            
+    """Filtreleme seçeneklerini uygular; sağlanmayan ilk filtre için 400 döndürür"""
+    try:
+        reason = filter_mismatch(cv_data, filter_options.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if reason:
+        raise HTTPException(status_code=400, detail=reason)
     return cv_data
 
-def _apply_search_options(result: Dict[str, Any], search_options: SearchOptions) -> Dict[str, Any]:
-    """Arama seçeneklerini uygular"""
+def _apply_search_options(result: Dict[str, Any], search_options: SearchOptions,
+                          text: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Arama seçeneklerini uygular
+    
+    Anahtar kelimeler CV metninde (verilmezse sonuç alanlarında) tam terim olarak
+    aranır; çok kelimeli anahtar kelimeler ardışık ifade olarak eşleşir. Metin
+    bir kez terimlere ayrılır, her anahtar kelime için yeniden taranmaz.
+    """
     # Minimum eşleşme skoru kontrolü
     if search_options.min_match_score and result['match_score'] < search_options.min_match_score:
         raise HTTPException(status_code=400, detail="Yetersiz eşleşme skoru")
         
+    _check_keywords(search_options, text if text is not None else ' '.join(str(v) for v in result.values()))
+    return result
+
+def _check_keywords(search_options: SearchOptions, text: str) -> None:
+    """Gerekli ve hariç tutulan anahtar kelimeleri metinde kontrol eder"""
+    if not search_options.required_keywords and not search_options.exclude_keywords:
+        return
+    terms = DocumentTerms(text)
+        
     # Anahtar kelime kontrolü
     if search_options.required_keywords:
-        text = ' '.join(str(v) for v in result.values())
-        if not all(keyword.lower() in text.lower() for keyword in search_options.required_keywords):
+        if not all(terms.contains(keyword) for keyword in search_options.required_keywords):
             raise HTTPException(status_code=400, detail="Eksik anahtar kelimeler")
             
     # Hariç tutulan kelimeler kontrolü
     if search_options.exclude_keywords:
-        text = ' '.join(str(v) for v in result.values())
-        if any(keyword.lower() in text.lower() for keyword in search_options.exclude_keywords):
+        if any(terms.contains(keyword) for keyword in search_options.exclude_keywords):
             raise HTTPException(status_code=400, detail="Hariç tutulan kelimeler mevcut")
-            
-    return result 
+
+@app.get("/candidates/text-search")
+async def search_candidate_text(
+    q: str = Query(..., description='Sorgu, ör. kubernetes AND (golang OR rust) NOT intern'),
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Kayıtlı CV metinlerinde BM25 sıralamalı tam metin araması yapar
+    
+    Args:
+        q (str): AND/OR/NOT, parantez ve tırnaklı ifade içerebilen sorgu
+        limit (int): Sayfa büyüklüğü
+        offset (int): Atlanacak sonuç sayısı
+        
+    Returns:
+        Dict[str, Any]: Toplam eşleşme sayısı ve skorlu adaylar
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        found = await loop.run_in_executor(None, text_index.search, q, limit, offset)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    names = candidate_store.names([item["doc_id"] for item in found["results"]])
+    return {
+        "query": q,
+        "total": found["total"],
+        "results": [{"candidate_id": item["doc_id"], "name": names.get(item["doc_id"], ""), "score": item["score"]}
+                    for item in found["results"]]
+    }
+
+@app.post("/candidates/search")
+async def search_candidates(request: Optional[CandidateSearchRequest] = None):
+    """
+    Kayıtlı adayları filtreler ve sayfalı olarak döndürür
+    
+    Filtreler analiz sırasında indekslenen özniteliklere (deneyim ayı, eğitim
+    seviyesi, konum, beceri/dil/sertifika) puanlamadan önce uygulanır; filtreyi
+    geçemeyen adaylar hata yerine sonuçlardan çıkarılır.
+    
+    Args:
+        request (CandidateSearchRequest, optional): Filtreler, isteğe bağlı sıralama
+            pozisyonu ve sayfalama
+        
+    Returns:
+        Dict[str, Any]: Filtreyi geçen toplam aday sayısı ve sayfadaki adaylar
+    """
+    request = request or CandidateSearchRequest()
+    if request.limit < 1 or request.limit > 500 or request.offset < 0:
+        raise HTTPException(status_code=400, detail="limit 1-500 arasında, offset 0 veya büyük olmalı")
+    profile = None
+    if request.position_id:
+        profile = candidate_store.position_profile(request.position_id)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Pozisyon bulunamadı")
+    filters = request.filter_options.dict() if request.filter_options else {}
+    matching_options = request.matching_options.dict() if request.matching_options else None
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(None, candidate_store.search, filters, request.limit, request.offset,
+                                            profile, matching_options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"limit": request.limit, "offset": request.offset, **result}
+
+@app.post("/candidates/compare")
+async def compare_candidates(request: Optional[CandidateComparisonRequest] = None):
+    """
+    Kayıtlı adayları karşılaştırır; en benzer çiftleri ve istenirse kümeleri döndürür
+    
+    Kimlik verilmezse tüm havuz karşılaştırılır; karşılaştırılacak aday sayısı
+    MAX_COMPARE_CANDIDATES'ı aşıyorsa istek reddedilir.
+    
+    Args:
+        request (CandidateComparisonRequest, optional): Aday kimlikleri (yoksa tüm havuz),
+            döndürülecek çift sayısı (top_k) ve küme eşiği
+        
+    Returns:
+        Dict[str, Any]: Karşılaştırılan aday sayısı ve karşılaştırma sonuçları
+    """
+    request = request or CandidateComparisonRequest()
+    if request.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k en az 1 olmalı")
+    requested = len(request.candidate_ids) if request.candidate_ids is not None else candidate_store.count()
+    if requested > MAX_COMPARE_CANDIDATES:
+        raise HTTPException(status_code=400, detail=f"En fazla {MAX_COMPARE_CANDIDATES} aday karşılaştırılabilir "
+                                                    f"({requested} istendi); candidate_ids ile aday seçin")
+    candidates = list(candidate_store.iter_candidates(request.candidate_ids))
+    if len(candidates) < 2:
+        raise HTTPException(status_code=400, detail="Karşılaştırma için en az iki aday gerekli")
+    options = ComparisonOptions(comparison_fields=request.comparison_fields, generate_charts=False,
+                                top_k=request.top_k, cluster_threshold=request.cluster_threshold)
+    loop = asyncio.get_running_loop()
+    comparison = await loop.run_in_executor(
+        None, _compare_cv_data, [data for _, data in candidates], options, [candidate_id for candidate_id, _ in candidates])
+    # Havuz boyutunda büyüyebilecek alanlar döndürülmez
+    comparison.pop("unique_features", None)
+    return {"compared": len(candidates), **comparison}
+
+@app.post("/candidates/clusters")
+async def cluster_candidates(request: Optional[ClusteringRequest] = None):
+    """
+    Aday havuzunu beceri/deneyim vektörleri üzerinde mini-batch k-means ile kümeler
+    
+    Havuz depodan parça parça okunur, bu yüzden büyük havuzlarda da bellek
+    kullanımı sınırlıdır. incremental=True ise mevcut kümeler yalnızca son
+    hesaplamadan sonra eklenen adaylarla güncellenir.
+    
+    Args:
+        request (ClusteringRequest, optional): Küme sayısı, beceri sözlüğü büyüklüğü, geçiş sayısı
+        
+    Returns:
+        Dict[str, Any]: Küme merkezleri (en ağırlıklı beceriler), boyutları ve ortalama deneyim
+    """
+    request = request or ClusteringRequest()
+    loop = asyncio.get_running_loop()
+    try:
+        if request.incremental:
+            return await loop.run_in_executor(None, talent_clusters.update, candidate_store)
+        return await loop.run_in_executor(None, lambda: talent_clusters.fit(
+            candidate_store, n_clusters=request.n_clusters, vocabulary_size=request.vocabulary_size,
+            epochs=request.epochs))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/candidates/clusters")
+async def get_candidate_clusters(top_skills: int = 10):
+    """Son hesaplanan kümelerin özetini döndürür"""
+    return talent_clusters.summary(top_skills)
+
+@app.get("/candidates/clusters/{cluster}/members")
+async def get_cluster_members(cluster: int, limit: int = 100, offset: int = 0):
+    """Kümedeki adayları merkeze yakınlık sırasıyla, sayfalı olarak döndürür"""
+    if limit < 1 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit en az 1, offset en az 0 olmalı")
+    return {"cluster": cluster, "candidates": talent_clusters.members(cluster, limit, offset)}
+
+@app.get("/candidates/{candidate_id}/cluster")
+async def get_candidate_cluster(candidate_id: str):
+    """Adayın küme kimliğini döndürür"""
+    cluster = talent_clusters.cluster_of(candidate_id)
+    if cluster is None:
+        raise HTTPException(status_code=404, detail="Aday herhangi bir kümeye atanmamış")
+    return {"candidate_id": candidate_id, "cluster": cluster}
 
 @app.post("/analyze-batch")
 async def analyze_batch_cvs(
@@ -460,14 +1026,22 @@ async def analyze_batch_cvs(
         # Paralel analiz yap
         async def analyze_single_cv(file_path: PathLib) -> Dict[str, Any]:
             text = document_processor.extract_text(str(file_path))
-            result = document_processor.analyze_cv(text)
-            if options and options.filter_options:
-                result = _apply_filters(result, options.filter_options)
-            return result
+            return document_processor.analyze_cv(text)
             
         tasks = [analyze_single_cv(path) for path in file_paths]
         results = await asyncio.gather(*tasks)
         
+        # Filtreyi geçemeyen CV'ler tüm isteği 400 ile bitirmek yerine sonuçlardan çıkarılır
+        filtered_out = 0
+        if options and options.filter_options:
+            filters = options.filter_options.dict()
+            try:
+                kept = [result for result in results if not filter_mismatch(result, filters)]
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            filtered_out = len(results) - len(kept)
+            results = kept
+        
         # İstatistiksel analiz yap
         stats = _calculate_statistics(results)
         
@@ -482,6 +1056,7 @@ async def analyze_batch_cvs(
         
         return {
             "total_cvs": len(results),
+            "filtered_out": filtered_out,
             "analysis_results": results,
             "statistics": stats
         }
@@ -509,6 +1084,9 @@ async def compare_cvs(
     Returns:
         Dict[str, Any]: Karşılaştırma sonuçları
     """
+    options = options or ComparisonOptions()
+    if options.top_k is not None and options.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k en az 1 olmalı")
     results = []
     file_paths = []
     
@@ -528,10 +1106,11 @@ async def compare_cvs(
             results.append(result)
             
         # Karşılaştırma yap
-        comparison = _compare_cv_data(results, options)
+        loop = asyncio.get_running_loop()
+        comparison = await loop.run_in_executor(None, _compare_cv_data, results, options)
         
         # Görselleştirme oluştur
-        if options and options.generate_charts:
+        if options.generate_charts:
             background_tasks.add_task(
                 _generate_comparison_charts,
                 comparison,
@@ -581,102 +1160,14 @@ async def generate_report(
         raise HTTPException(status_code=400, detail=str(e))
 
 def _calculate_statistics(results: List[Dict[str, Any]]) -> StatisticalAnalysis:
-    """CV sonuçları için istatistiksel analiz yapar"""
-    stats = {
-        "skill_distribution": {},
-        "experience_distribution": {},
-        "education_distribution": {},
-        "language_distribution": {},
-        "average_match_scores": {}
-    }
-    
-    # Beceri dağılımı
-    all_skills = []
-    for result in results:
-        all_skills.extend(result.get('skills', []))
-    skill_counts = pd.Series(all_skills).value_counts()
-    stats["skill_distribution"] = skill_counts.to_dict()
-    
-    # Deneyim dağılımı
-    experience_years = []
-    for result in results:
-        total_exp = sum(
-            int(exp.get('end_date', '2024')) - int(exp.get('start_date', '2024'))
-            for exp in result.get('experience', [])
-        )
-        experience_years.append(total_exp)
-    stats["experience_distribution"] = {
-        "min": min(experience_years),
-        "max": max(experience_years),
-        "average": sum(experience_years) / len(experience_years)
-    }
-    
-    # Eğitim dağılımı
-    education_levels = []
-    for result in results:
-        for edu in result.get('education', []):
-            education_levels.append(edu.get('degree', ''))
-    stats["education_distribution"] = pd.Series(education_levels).value_counts().to_dict()
-    
-    # Dil dağılımı
-    all_languages = []
-    for result in results:
-        all_languages.extend(result.get('languages', []))
-    stats["language_distribution"] = pd.Series(all_languages).value_counts().to_dict()
-    
-    return StatisticalAnalysis(**stats)
-
-def _compare_cv_data(results: List[Dict[str, Any]], options: ComparisonOptions) -> Dict[str, Any]:
-    """CV'leri karşılaştırır"""
-    comparison = {
-        "field_comparisons": {},
-        "similarity_scores": {},
-        "unique_features": {}
-    }
-    
-    # Alan karşılaştırmaları
-    for field in options.comparison_fields:
-        field_data = [result.get(field, []) for result in results]
-        comparison["field_comparisons"][field] = {
-            "common": list(set.intersection(*map(set, field_data))),
-            "unique": list(set.union(*map(set, field_data)) - set.intersection(*map(set, field_data)))
-        }
-    
-    # Benzerlik skorları
-    for i, result1 in enumerate(results):
-        for j, result2 in enumerate(results[i+1:], i+1):
-            similarity = _calculate_similarity(result1, result2)
-            comparison["similarity_scores"][f"cv_{i}_cv_{j}"] = similarity
-    
-    # Benzersiz özellikler
-    for i, result in enumerate(results):
-        comparison["unique_features"][f"cv_{i}"] = {
-            field: result.get(field, [])
-            for field in options.comparison_fields
-            if result.get(field, [])
-        }
-    
-    return comparison
+    """CV sonuçları için istatistiksel analiz yapar (bkz. batch_statistics)"""
+    return StatisticalAnalysis(**calculate_statistics(results))
 
-def _calculate_similarity(cv1: Dict[str, Any], cv2: Dict[str, Any]) -> float:
-    """İki CV arasındaki benzerlik skorunu hesaplar"""
-    # Beceri benzerliği
-    skills1 = set(cv1.get('skills', []))
-    skills2 = set(cv2.get('skills', []))
-    skill_similarity = len(skills1.intersection(skills2)) / len(skills1.union(skills2))
-    
-    # Deneyim benzerliği
-    exp1 = set(exp.get('company', '') for exp in cv1.get('experience', []))
-    exp2 = set(exp.get('company', '') for exp in cv2.get('experience', []))
-    exp_similarity = len(exp1.intersection(exp2)) / len(exp1.union(exp2))
-    
-    # Eğitim benzerliği
-    edu1 = set(edu.get('school', '') for edu in cv1.get('education', []))
-    edu2 = set(edu.get('school', '') for edu in cv2.get('education', []))
-    edu_similarity = len(edu1.intersection(edu2)) / len(edu1.union(edu2))
-    
-    # Ağırlıklı ortalama
-    return (skill_similarity * 0.4 + exp_similarity * 0.4 + edu_similarity * 0.2)
+def _compare_cv_data(results: List[Dict[str, Any]], options: ComparisonOptions,
+                     labels: Optional[List[str]] = None) -> Dict[str, Any]:
+    """CV'leri seyrek özellik matrisiyle karşılaştırır (bkz. cv_comparison)"""
+    return compare_cv_data(results, options.comparison_fields, top_k_pairs=options.top_k,
+                           cluster_threshold=options.cluster_threshold, labels=labels)
 
 def _generate_batch_report(results: List[Dict[str, Any]], stats: StatisticalAnalysis, include_charts: bool):
     """Toplu analiz raporu oluşturur"""
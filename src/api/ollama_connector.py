@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import json
-import requests
 import logging
 import time
 from typing import Dict, Any, List, Optional
 
+from src.api.ollama_pool import OllamaPool, get_shared_pool
+from src.core.llm_backend import ollama_backend
+from src.utils.json_repair import repair_json
+
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('ollama_connector')
@@ -16,15 +18,19 @@ class OllamaConnector:
     Bu sınıf, mevcut CV Analyzer koduna entegre olabilir ve LLMManager sınıfının yerine kullanılabilir.
     """
     
-    def __init__(self, base_url: str = "http://localhost:11434", default_model: Optional[str] = None):
+    def __init__(self, base_url: str = "http://localhost:11434", default_model: Optional[str] = None,
+                 pool: Optional[OllamaPool] = None):
         """
         Ollama API bağlantısını başlatır.
         
         Args:
-            base_url (str): Ollama API URL'si
+            base_url (str): Ollama API URL'si (OLLAMA_HOSTS tanımlı değilse kullanılır)
             default_model (str, optional): Varsayılan olarak kullanılacak model adı
+            pool (OllamaPool, optional): İsteklerin dağıtılacağı sunucu havuzu
         """
         self.base_url = base_url
+        # İstekler havuzdaki en az yüklü sağlıklı sunucuya yönlendirilir
+        self.pool = pool or get_shared_pool(base_url)
         self.default_model = default_model
         self.available_models = []
         self._refresh_models()
@@ -48,9 +54,8 @@ class OllamaConnector:
     def _refresh_models(self) -> List[str]:
         """Mevcut modelleri yeniler ve döndürür"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            models_data = response.json().get('models', [])
-            self.available_models = [model.get('name') for model in models_data]
+            self.pool.check_health()
+            self.available_models = self.pool.models()
             logger.info(f"Mevcut modeller: {', '.join(self.available_models)}")
             return self.available_models
         except Exception as e:
@@ -66,8 +71,8 @@ class OllamaConnector:
             List[Dict[str, Any]]: Model listesi
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            return response.json().get('models', [])
+            self.pool.check_health()
+            return self.pool.model_details()
         except Exception as e:
             logger.error(f"Modeller alınırken hata: {str(e)}")
             return []
@@ -79,11 +84,8 @@ class OllamaConnector:
         Returns:
             bool: API çalışıyorsa True, aksi halde False
         """
-        try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            return response.status_code == 200
-        except:
-            return False
+        self.pool.check_health()
+        return self.pool.is_available()
     
     def load_model(self, model_name: Optional[str] = None) -> bool:
         """
@@ -103,22 +105,9 @@ class OllamaConnector:
         
         try:
             # Modeli ön belleğe almak için kısa bir mesaj gönder
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    'model': model,
-                    'prompt': 'Merhaba',
-                    'stream': False
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                logger.info(f"Model başarıyla yüklendi: {model}")
-                return True
-            else:
-                logger.error(f"Model yüklenemedi: {response.status_code} - {response.text}")
-                return False
+            self.pool.generate({'model': model, 'prompt': 'Merhaba'}, timeout=30)
+            logger.info(f"Model başarıyla yüklendi: {model}")
+            return True
         except Exception as e:
             logger.error(f"Model yükleme hatası: {str(e)}")
             return False
@@ -148,24 +137,10 @@ class OllamaConnector:
             logger.info(f"'{model}' modeli ile metin üretiliyor...")
             start_time = time.time()
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    'model': model,
-                    'prompt': prompt,
-                    'stream': False,
-                    'temperature': temperature,
-                    'num_predict': max_tokens,
-                },
-                timeout=120  # 2 dakika timeout
-            )
-            
-            if response.status_code != 200:
-                error_msg = f"API hatası: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                return f"Metin üretme hatası: {error_msg}"
-            
-            result = response.json().get('response', '')
+            # İstek ortak backend katmanından (eşzamanlılık sınırı ve metrikler) havuza gider;
+            # model bellekte kalır, sabit prompt öneki önbellekten yeniden kullanılır
+            result = ollama_backend(self.pool, model).generate(
+                prompt, max_tokens=max_tokens, temperature=temperature)
             
             elapsed_time = time.time() - start_time
             logger.info(f"Metin üretildi! ({len(result)} karakter, {elapsed_time:.2f} saniye)")
@@ -242,25 +217,12 @@ class OllamaConnector:
             logger.info(f"'{model}' modeli ile CV analizi yapılıyor...")
             start_time = time.time()
             
-            response = requests.post(
-                f"{self.base_url}/api/generate", 
-                json={
-                    'model': model,
-                    'prompt': prompt,
-                    'stream': False,
-                    'temperature': 0.2,  # Daha tutarlı sonuçlar için düşük sıcaklık
-                    'num_predict': 4000  # Yeterince uzun yanıt için
-                },
-                timeout=180  # 3 dakika timeout
+            response_text = ollama_backend(self.pool, model).generate(
+                prompt,
+                max_tokens=4000,  # Yeterince uzun yanıt için
+                temperature=0.2  # Daha tutarlı sonuçlar için düşük sıcaklık
             )
             
-            if response.status_code != 200:
-                error_msg = f"API hatası: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                return {"error": error_msg}
-            
-            response_text = response.json().get('response', '')
-            
             # İşlem süresini hesapla
             elapsed_time = time.time() - start_time
             logger.info(f"CV analizi tamamlandı! ({elapsed_time:.2f} saniye)")
@@ -283,41 +245,14 @@ class OllamaConnector:
         Returns:
             Dict[str, Any]: Ayrıştırılmış JSON verisi
         """
-        # Markdown JSON bloğunu temizle
-        text = text.replace('```json', '').replace('```', '')
-        
-        # JSON başlangıç ve bitiş konumlarını bul
-        json_start = text.find('{')
-        json_end = text.rfind('}') + 1
-        
-        if json_start == -1 or json_end <= json_start:
+        result, repairs = repair_json(text)
+        if not result:
             logger.error(f"JSON yapısı bulunamadı: {text[:100]}...")
             return {"error": "JSON yapısı bulunamadı", "raw_text": text[:300]}
         
-        # JSON içeriğini çıkar
-        json_content = text[json_start:json_end]
-        
-        try:
-            # JSON ayrıştırma dene
-            return json.loads(json_content)
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON ayrıştırma hatası, düzeltme deneniyor: {str(e)}")
-            # Hata durumunda JSON düzeltme girişimi
-            try:
-                # Tek tırnak yerine çift tırnak
-                fixed_json = json_content.replace("'", '"')
-                
-                # Gereksiz virgülleri temizle
-                fixed_json = fixed_json.replace(",}", "}")
-                fixed_json = fixed_json.replace(",]", "]")
-                
-                return json.loads(fixed_json)
-            except:
-                logger.error(f"JSON düzeltme başarısız oldu")
-                return {
-                    "error": f"JSON ayrıştırılamadı",
-                    "raw_json": json_content[:300]
-                }
+        if repairs:
+            logger.warning(f"JSON yanıtı düzeltildi: {', '.join(repairs)}")
+        return result
 
 
 # Test için
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Birden fazla Ollama sunucusu için yük dengeleyen arka uç havuzu.
+
+Havuz, verilen uç noktaları arka planda düzenli olarak kontrol eder, her
+sunucu için devam eden istek sayısını ve gözlenen token/saniye hızını tutar.
+Her üretim isteği, istenen modele sahip sağlıklı sunucular arasında tahmini
+bekleme süresi en düşük olana yönlendirilir; sunucu hata verirse istek
+şeffaf biçimde bir sonraki sunucuya aktarılır.
+
+Uç noktalar OLLAMA_HOSTS ortam değişkeniyle virgülle ayrılmış olarak verilebilir:
+    OLLAMA_HOSTS=http://10.0.0.5:11434,http://10.0.0.6:11434
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+HOSTS_ENV = "OLLAMA_HOSTS"
+
+# Henüz ölçüm yapılmamış sunucular için varsayılan hız (token/saniye)
+DEFAULT_TOKENS_PER_SEC = 10.0
+# Yeni hız ölçümlerinin hareketli ortalamadaki ağırlığı
+TPS_SMOOTHING = 0.3
+
+
+class OllamaHost:
+    """Havuzdaki tek bir Ollama sunucusunun durumu"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.healthy = False
+        self.models: List[str] = []
+        self.model_details: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.tokens_per_sec = 0.0
+        self.total_requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_check = 0.0
+
+    def has_model(self, model: Optional[str]) -> bool:
+        """Sunucuda modelin olup olmadığını kontrol eder ("llama3" -> "llama3:latest" eşleşir)"""
+        if not model:
+            return True
+        if model in self.models:
+            return True
+        if ":" not in model:
+            return f"{model}:latest" in self.models
+        return False
+
+    def expected_wait(self) -> float:
+        """Yeni bir istek için göreli bekleme tahmini (kuyruktaki iş / hız)"""
+        return (self.in_flight + 1) / (self.tokens_per_sec or DEFAULT_TOKENS_PER_SEC)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "models": list(self.models),
+            "in_flight": self.in_flight,
+            "tokens_per_sec": round(self.tokens_per_sec, 2),
+            "total_requests": self.total_requests,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class OllamaPool:
+    """Birden fazla Ollama sunucusuna en az yüklü sunucu seçimiyle istek dağıtan havuz"""
+
+    def __init__(self, endpoints: List[str], health_interval: float = 15.0,
+                 health_timeout: float = 3.0, start_monitor: bool = True):
+        """
+        Args:
+            endpoints (List[str]): Ollama sunucu adresleri
+            health_interval (float): Arka plan sağlık kontrolü aralığı (saniye, 0 ise kapalı)
+            health_timeout (float): Sağlık kontrolü zaman aşımı (saniye)
+            start_monitor (bool): Arka plan sağlık kontrolünü hemen başlat
+        """
+        if not endpoints:
+            raise ValueError("En az bir Ollama uç noktası gerekli")
+        self.hosts = [OllamaHost(url) for url in endpoints]
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+        self.check_health()
+        if start_monitor and health_interval > 0:
+            self.start()
+
+    @classmethod
+    def from_env(cls, default_url: str = DEFAULT_OLLAMA_URL, **kwargs) -> "OllamaPool":
+        """OLLAMA_HOSTS ortam değişkeninden (yoksa default_url'den) havuz oluşturur"""
+        endpoints = [url.strip() for url in os.environ.get(HOSTS_ENV, "").split(",") if url.strip()]
+        return cls(endpoints or [default_url], **kwargs)
+
+    def check_health(self) -> None:
+        """Tüm sunucuları kontrol eder ve model listelerini günceller"""
+        for host in self.hosts:
+            try:
+                response = self.session.get(f"{host.url}/api/tags", timeout=self.health_timeout)
+                response.raise_for_status()
+                details = response.json().get("models", [])
+                with self._lock:
+                    if not host.healthy:
+                        logger.info(f"Ollama sunucusu kullanılabilir: {host.url}")
+                    host.healthy = True
+                    host.models = [model.get("name") for model in details]
+                    host.model_details = details
+                    host.last_error = None
+            except Exception as e:
+                with self._lock:
+                    if host.healthy:
+                        logger.warning(f"Ollama sunucusu erişilemez: {host.url} ({str(e)})")
+                    host.healthy = False
+                    host.last_error = str(e)
+            host.last_check = time.time()
+
+    def start(self) -> None:
+        """Arka plan sağlık kontrolü iş parçacığını başlatır"""
+        if self._monitor and self._monitor.is_alive():
+            return
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="ollama-pool-health", daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        """Arka plan sağlık kontrolünü durdurur"""
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=self.health_timeout + 1)
+            self._monitor = None
+
+    def _monitor_loop(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            self.check_health()
+
+    def models(self) -> List[str]:
+        """Sağlıklı sunuculardaki tüm modelleri döndürür"""
+        with self._lock:
+            seen = []
+            for host in self.hosts:
+                if host.healthy:
+                    seen.extend(model for model in host.models if model not in seen)
+            return seen
+
+    def model_details(self) -> List[Dict[str, Any]]:
+        """Sağlıklı sunuculardaki modelleri /api/tags ayrıntılarıyla döndürür (ada göre tekil)"""
+        with self._lock:
+            details: Dict[str, Dict[str, Any]] = {}
+            for host in self.hosts:
+                if host.healthy:
+                    for model in host.model_details:
+                        details.setdefault(model.get("name"), model)
+            return list(details.values())
+
+    def is_available(self) -> bool:
+        """En az bir sağlıklı sunucu olup olmadığını döndürür"""
+        with self._lock:
+            return any(host.healthy for host in self.hosts)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Sunucu bazında durum ve performans bilgilerini döndürür"""
+        with self._lock:
+            return [host.to_dict() for host in self.hosts]
+
+    def _acquire(self, model: Optional[str], tried: List[OllamaHost]) -> Optional[OllamaHost]:
+        """İstenen modele sahip, beklemesi en düşük sağlıklı sunucuyu seçip rezerve eder"""
+        with self._lock:
+            candidates = [h for h in self.hosts if h.healthy and h not in tried and h.has_model(model)]
+            if not candidates:
+                return None
+            host = min(candidates, key=lambda h: (h.expected_wait(), h.in_flight))
+            host.in_flight += 1
+            host.total_requests += 1
+            return host
+
+    def _release(self, host: OllamaHost, result: Optional[Dict[str, Any]] = None,
+                 error: Optional[str] = None, missing_model: Optional[str] = None) -> None:
+        """
+        _acquire ile rezerve edilen sunucuyu bırakır; in_flight yalnızca burada azaltılır
+
+        Args:
+            host (OllamaHost): Bırakılan sunucu
+            result (Dict[str, Any], optional): Başarılı yanıt (hız ölçümü için)
+            error (str, optional): Sunucuyu sağlıksız işaretleyen hata
+            missing_model (str, optional): Sunucuda bulunamayan model (listeden çıkarılır)
+        """
+        with self._lock:
+            host.in_flight -= 1
+            if missing_model is not None:
+                host.models = [m for m in host.models if m != missing_model]
+                return
+            if error:
+                host.failures += 1
+                host.healthy = False
+                host.last_error = error
+                return
+            # Ollama yanıtındaki eval_count/eval_duration (ns) üzerinden hız ölçümü
+            if result and result.get("eval_count") and result.get("eval_duration"):
+                tps = result["eval_count"] / (result["eval_duration"] / 1e9)
+                host.tokens_per_sec = tps if not host.tokens_per_sec else \
+                    (1 - TPS_SMOOTHING) * host.tokens_per_sec + TPS_SMOOTHING * tps
+
+    def _accept(self, host: OllamaHost, response: requests.Response, model: Optional[str],
+                errors: List[str]) -> bool:
+        """
+        Yanıt durumunu değerlendirir
+
+        Returns:
+            bool: Yanıt kullanılabilirse True, sonraki sunucu denenmeliyse False
+
+        Raises:
+            RuntimeError: Yeniden denenemeyen istemci hatasında
+        """
+        if response.status_code == 200:
+            return True
+        response.close()
+        if response.status_code == 404:
+            # Model bu sunucuda yok (liste eskimiş olabilir)
+            self._release(host, missing_model=model)
+            errors.append(f"{host.url}: model bulunamadı")
+            return False
+        if response.status_code >= 500:
+            self._release(host, error=f"HTTP {response.status_code}")
+            errors.append(f"{host.url}: HTTP {response.status_code}")
+            logger.warning(f"Ollama sunucusu hata döndü, sonraki deneniyor: {host.url} ({response.status_code})")
+            return False
+        self._release(host)
+        raise RuntimeError(f"API hatası: {response.status_code} - {response.text}")
+
+    def post(self, path: str, payload: Dict[str, Any], timeout: float = 180) -> Dict[str, Any]:
+        """
+        İsteği uygun sunucuya gönderir, hata durumunda diğer sunucuları dener
+
+        Args:
+            path (str): API yolu (ör. /api/generate)
+            payload (Dict[str, Any]): İstek gövdesi ("model" alanı yönlendirmede kullanılır)
+            timeout (float): İstek zaman aşımı (saniye)
+
+        Returns:
+            Dict[str, Any]: Sunucunun JSON yanıtı
+
+        Raises:
+            RuntimeError: Hiçbir sunucu isteği tamamlayamazsa
+        """
+        model = payload.get("model")
+        tried: List[OllamaHost] = []
+        errors = []
+
+        while True:
+            host = self._acquire(model, tried)
+            if host is None:
+                break
+            tried.append(host)
+            try:
+                response = self.session.post(f"{host.url}{path}", json=payload, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                self._release(host, error=str(e))
+                errors.append(f"{host.url}: {str(e)}")
+                logger.warning(f"Ollama sunucusu başarısız, sonraki deneniyor: {host.url} ({str(e)})")
+                continue
+
+            if not self._accept(host, response, model, errors):
+                continue
+
+            result = None
+            try:
+                result = response.json()
+            except ValueError:
+                errors.append(f"{host.url}: geçersiz JSON yanıtı")
+                logger.warning(f"Ollama sunucusu geçersiz JSON döndü, sonraki deneniyor: {host.url}")
+            finally:
+                # Yanıt okunamazsa da (ör. JSON olmayan 200 yanıtı) sunucu rezervasyonu bırakılır
+                self._release(host, result=result, error=None if result is not None else "geçersiz JSON yanıtı")
+            if result is not None:
+                return result
+
+        if not errors:
+            errors.append(f"'{model}' modeline sahip sağlıklı sunucu yok")
+        raise RuntimeError("Ollama isteği tamamlanamadı: " + "; ".join(errors))
+
+    def generate(self, payload: Dict[str, Any], timeout: float = 180) -> Dict[str, Any]:
+        """/api/generate isteğini havuz üzerinden gönderir"""
+        return self.post("/api/generate", dict(payload, stream=False), timeout=timeout)
+
+    def generate_stream(self, payload: Dict[str, Any], timeout: float = 180) -> Iterator[Dict[str, Any]]:
+        """
+        /api/generate isteğini akışlı gönderir ve parçaları geldikçe döndürür
+
+        Sunucu ilk parçadan önce başarısız olursa sonraki sunucu denenir; akış
+        başladıktan sonraki kopmalar hata olarak iletilir.
+
+        Args:
+            payload (Dict[str, Any]): İstek gövdesi
+            timeout (float): Bağlantı ve parçalar arası zaman aşımı (saniye)
+
+        Yields:
+            Dict[str, Any]: Ollama akış parçaları (son parçada done=True)
+
+        Raises:
+            RuntimeError: Hiçbir sunucu isteği başlatamazsa veya akış koparsa
+        """
+        model = payload.get("model")
+        tried: List[OllamaHost] = []
+        errors: List[str] = []
+
+        while True:
+            host = self._acquire(model, tried)
+            if host is None:
+                break
+            tried.append(host)
+            try:
+                response = self.session.post(f"{host.url}/api/generate", json=dict(payload, stream=True),
+                                             stream=True, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                self._release(host, error=str(e))
+                errors.append(f"{host.url}: {str(e)}")
+                continue
+            if not self._accept(host, response, model, errors):
+                continue
+
+            final = None
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        chunk = json.loads(line)
+                        if chunk.get("done"):
+                            final = chunk
+                        yield chunk
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self._release(host, error=str(e))
+                raise RuntimeError(f"Ollama akışı kesildi: {host.url} ({str(e)})") from e
+            except BaseException:
+                # Tüketici akışı erken bıraktı
+                self._release(host)
+                raise
+            finally:
+                response.close()
+            self._release(host, result=final)
+            return
+
+        if not errors:
+            errors.append(f"'{model}' modeline sahip sağlıklı sunucu yok")
+        raise RuntimeError("Ollama isteği tamamlanamadı: " + "; ".join(errors))
+
+
+_shared_pools: Dict[str, OllamaPool] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(default_url: str = DEFAULT_OLLAMA_URL) -> OllamaPool:
+    """
+    Süreç genelinde paylaşılan havuzu döndürür
+
+    Aynı uç nokta listesi için tek bir havuz (ve tek bir sağlık kontrolü iş parçacığı) oluşturulur.
+    """
+    endpoints = os.environ.get(HOSTS_ENV) or default_url
+    with _shared_lock:
+        pool = _shared_pools.get(endpoints)
+        if pool is None:
+            pool = OllamaPool.from_env(default_url)
+            _shared_pools[endpoints] = pool
+        return pool
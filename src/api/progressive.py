@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aşamalı (progressive) CV analizi için sonuç deposu ve alan farkı hesaplama.
+
+Regex analizi hemen döndürülür; LLM analizi arka planda sürer. İstemci
+sonucu result_id ile sorgular veya SSE ile bekler. LLM sonucu geldiğinde
+regex sonucuna göre hangi alanların değiştiği alan yolu bazında listelenir.
+"""
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Sonuçların bellekte tutulma süresi (saniye); tamamlananlar bitişten, bekleyenler oluşturulmadan itibaren
+RESULT_TTL = 3600
+# Bellekte tutulan en fazla sonuç sayısı; aşılırsa en eski kayıtlar silinir
+MAX_RESULTS = 1000
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def diff_fields(before: Any, after: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    İki analiz sonucunu alan bazında karşılaştırır
+
+    Sözlükler anahtar anahtar gezilir; listeler ve diğer değerler bütün olarak
+    karşılaştırılır. "_" ile başlayan iç alanlar atlanır.
+
+    Args:
+        before: İlk sonuç (ör. regex analizi)
+        after: Yeni sonuç (ör. LLM analizi)
+        path (str): Alan yolu öneki
+
+    Returns:
+        List[Dict[str, Any]]: {"alan", "islem" (eklendi/degisti/silindi), "onceki", "yeni"} kayıtları
+    """
+    if isinstance(before, dict) and isinstance(after, dict):
+        changes = []
+        for key in list(before) + [k for k in after if k not in before]:
+            if str(key).startswith("_"):
+                continue
+            field = f"{path}.{key}" if path else str(key)
+            if key not in after:
+                changes.append({"alan": field, "islem": "silindi", "onceki": before[key], "yeni": None})
+            elif key not in before:
+                changes.append({"alan": field, "islem": "eklendi", "onceki": None, "yeni": after[key]})
+            else:
+                changes.extend(diff_fields(before[key], after[key], field))
+        return changes
+
+    if before == after:
+        return []
+    return [{"alan": path, "islem": "degisti", "onceki": before, "yeni": after}]
+
+
+class ProgressiveResult:
+    """Tek bir aşamalı analizin durumu"""
+
+    def __init__(self, initial: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.status = STATUS_PENDING
+        self.initial = initial
+        self.final: Optional[Dict[str, Any]] = None
+        self.diff: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        # Arka plan görevine referans tutulur (çöp toplayıcı tarafından silinmemesi için)
+        self.task: Optional[asyncio.Future] = None
+        self._event = asyncio.Event()
+
+    def complete(self, final: Dict[str, Any]) -> None:
+        """LLM sonucunu kaydeder ve bekleyenleri uyandırır"""
+        self.final = final
+        self.diff = diff_fields(self.initial, final)
+        self.status = STATUS_DONE
+        self.finished = time.time()
+        self._event.set()
+
+    def fail(self, error: str) -> None:
+        """LLM analizinin başarısız olduğunu kaydeder (regex sonucu geçerli kalır)"""
+        self.error = error
+        self.status = STATUS_FAILED
+        self.finished = time.time()
+        self._event.set()
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sonuç tamamlanana kadar bekler; zaman aşımında False döndürür"""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "result_id": self.id,
+            "status": self.status,
+            "result": self.final if self.final is not None else self.initial,
+            "regex_result": self.initial,
+            "llm_result": self.final,
+            "diff": self.diff,
+            "error": self.error,
+        }
+
+
+class ResultStore:
+    """Aşamalı analiz sonuçlarını süre ve sayı sınırıyla bellekte tutan depo"""
+
+    def __init__(self, ttl: float = RESULT_TTL, max_results: int = MAX_RESULTS):
+        self.ttl = ttl
+        self.max_results = max_results
+        # Ekleme sırası oluşturulma sırasıdır; en eski kayıt başta
+        self._results: "OrderedDict[str, ProgressiveResult]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def create(self, initial: Dict[str, Any]) -> ProgressiveResult:
+        """Regex sonucuyla yeni bir kayıt oluşturur"""
+        self._expire()
+        while len(self._results) >= self.max_results:
+            self._evict_oldest()
+        entry = ProgressiveResult(initial)
+        self._results[entry.id] = entry
+        return entry
+
+    def get(self, result_id: str) -> Optional[ProgressiveResult]:
+        self._expire()
+        return self._results.get(result_id)
+
+    def _drop(self, key: str) -> None:
+        entry = self._results.pop(key)
+        if entry.task is not None and not entry.task.done():
+            # Süresi dolan bekleyen analizin LLM görevi de durdurulur
+            entry.task.cancel()
+
+    def _evict_oldest(self) -> None:
+        """Önce en eski tamamlanmış kaydı, yoksa en eski kaydı siler"""
+        finished = next((key for key, entry in self._results.items() if entry.finished), None)
+        self._drop(finished or next(iter(self._results)))
+
+    def _expire(self) -> None:
+        now = time.time()
+        expired = [key for key, entry in self._results.items()
+                   if now - (entry.finished or entry.created) > self.ttl]
+        for key in expired:
+            self._drop(key)
+
+    async def stream(self, result_id: str, heartbeat: float = 15.0) -> AsyncIterator[str]:
+        """
+        Sonucu Server-Sent Events biçiminde akıtır
+
+        Önce mevcut (regex) sonuç "initial" olayı olarak gönderilir; LLM sonucu
+        geldiğinde "final" olayı gönderilip akış kapanır.
+        """
+        entry = self._results[result_id]
+        yield _sse("initial", entry.to_dict())
+        while not await entry.wait(timeout=heartbeat):
+            # Bağlantının açık kalması için yorum satırı
+            yield ": bekleniyor\n\n"
+        yield _sse("final", entry.to_dict())
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
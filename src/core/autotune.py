@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Makineye ve model dosyasına göre çıkarım ayarlarını ölçerek belirleyen otomatik ayarlayıcı.
+
+Sabit bir CV analiz promptu; iş parçacığı sayısı, toplu işleme (batch) boyutu
+ve bağlam uzunluğu kombinasyonlarıyla çalıştırılır. Saniyede en çok token
+üreten yapılandırma, model dosyası ve makine için models/autotune.json dosyasına
+kaydedilir; erken duran (daha az token üreten) bir çalıştırma kısa sürdüğü için
+kazanmaz. LLMManager.load_model ve initialize_model kayıtlı ayarları
+otomatik olarak kullanır.
+
+Kullanım:
+    python -m src.core.autotune --model models/model.gguf
+    python -m src.core.autotune --model models/model.gguf --backend llama_cpp --threads 4,6,8
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+TUNING_FILE = Path(__file__).resolve().parents[2] / "models" / "autotune.json"
+
+DEFAULT_BATCH_SIZES = (64, 256, 512)
+DEFAULT_CONTEXT_LENGTHS = (2048, 4096, 8192)
+
+# Ölçüm promptu: tüm çalıştırmalarda aynı CV ve talimat kullanılır
+CALIBRATION_PROMPT = """Lütfen aşağıda verilen CV metnini analiz et ve yanıtını JSON formatında ver:
+{"kisisel_bilgiler": {"isim": "", "email": "", "telefon": ""}, "beceriler": [], "is_deneyimi": []}
+
+CV METNİ:
+Ayşe Yılmaz
+ayse.yilmaz@ornek.com | +90 532 000 00 00 | İstanbul
+
+DENEYİM
+Kıdemli Yazılım Geliştirici - Örnek Teknoloji A.Ş. (2020 - Günümüz)
+- Python ve FastAPI ile mikroservis mimarisi geliştirdi
+- PostgreSQL sorgu optimizasyonu ile yanıt sürelerini %40 azalttı
+Yazılım Geliştirici - Deneme Yazılım Ltd. (2017 - 2020)
+- Django tabanlı e-ticaret altyapısının bakımını yaptı
+
+EĞİTİM
+Orta Doğu Teknik Üniversitesi - Bilgisayar Mühendisliği (2013 - 2017)
+
+BECERİLER
+Python, FastAPI, Django, PostgreSQL, Docker, Kubernetes, Git
+
+JSON:
+"""
+
+# Runner: (prompt, max_tokens) -> üretilen token sayısı
+Runner = Callable[[str, int], int]
+RunnerFactory = Callable[[Dict[str, int]], Runner]
+
+_lock = threading.Lock()
+
+
+def candidate_threads() -> List[int]:
+    """
+    Denenecek iş parçacığı sayılarını döndürür
+
+    Fiziksel çekirdek sayısı ve çevresi denenir; mantıksal çekirdek sayısı
+    (hyperthreading ile aşırı abonelik) karşılaştırma için listeye eklenir.
+    """
+    physical = psutil.cpu_count(logical=False) or os.cpu_count() or 4
+    logical = psutil.cpu_count(logical=True) or physical
+    candidates = {max(1, physical // 2), max(1, physical - 1), physical, logical}
+    return sorted(candidates)
+
+
+def _machine_key(model_path: str) -> str:
+    """Ayarın geçerli olduğu makine ve model dosyası için anahtar"""
+    path = Path(model_path)
+    size = path.stat().st_size if path.exists() else 0
+    return f"{platform.node()}|{psutil.cpu_count(logical=True)}|{path.name}|{size}"
+
+
+def load_tuned_config(model_path: str, tuning_file: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """
+    Model dosyası ve bu makine için kayıtlı en iyi ayarları döndürür
+
+    Args:
+        model_path (str): Model dosyası
+        tuning_file (Path, optional): Ayar dosyası
+
+    Returns:
+        Optional[Dict[str, Any]]: {"threads", "batch_size", "context_length", ...} veya None
+    """
+    tuning_file = Path(tuning_file or TUNING_FILE)
+    if not tuning_file.exists():
+        return None
+    try:
+        with open(tuning_file, "r", encoding="utf-8") as f:
+            return json.load(f).get(_machine_key(model_path))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Otomatik ayar dosyası okunamadı: {str(e)}")
+        return None
+
+
+def save_tuned_config(model_path: str, config: Dict[str, Any], tuning_file: Optional[Path] = None) -> None:
+    """En iyi ayarları model dosyası ve makine anahtarıyla kaydeder"""
+    tuning_file = Path(tuning_file or TUNING_FILE)
+    with _lock:
+        data: Dict[str, Any] = {}
+        if tuning_file.exists():
+            try:
+                with open(tuning_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        data[_machine_key(model_path)] = config
+        tuning_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tuning_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+class Autotuner:
+    """İş parçacığı / batch / bağlam uzunluğu ızgarasında ölçüm yapan ayarlayıcı"""
+
+    def __init__(self, model_path: str, runner_factory: RunnerFactory,
+                 threads: Optional[Sequence[int]] = None,
+                 batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+                 context_lengths: Sequence[int] = DEFAULT_CONTEXT_LENGTHS,
+                 max_new_tokens: int = 64, repeats: int = 1,
+                 prompt: str = CALIBRATION_PROMPT):
+        """
+        Args:
+            model_path (str): Ayarlanacak model dosyası
+            runner_factory (RunnerFactory): Verilen ayarlarla modeli yükleyip çalıştırıcı döndüren fonksiyon
+            threads (Sequence[int], optional): Denenecek iş parçacığı sayıları (None ise otomatik)
+            batch_sizes (Sequence[int]): Denenecek batch boyutları
+            context_lengths (Sequence[int]): Denenecek bağlam uzunlukları
+            max_new_tokens (int): Ölçümde üretilecek token sayısı
+            repeats (int): Her yapılandırma için tekrar sayısı (en iyi süre alınır)
+            prompt (str): Ölçüm promptu
+        """
+        self.model_path = model_path
+        self.runner_factory = runner_factory
+        self.threads = list(threads) if threads else candidate_threads()
+        self.batch_sizes = list(batch_sizes)
+        self.context_lengths = list(context_lengths)
+        self.max_new_tokens = max_new_tokens
+        self.repeats = max(1, repeats)
+        self.prompt = prompt
+        self.results: List[Dict[str, Any]] = []
+
+    def grid(self) -> List[Dict[str, int]]:
+        """Denenecek tüm yapılandırmaları döndürür"""
+        return [
+            {"threads": threads, "batch_size": batch_size, "context_length": context_length}
+            for threads, batch_size, context_length
+            in itertools.product(self.threads, self.batch_sizes, self.context_lengths)
+        ]
+
+    def measure(self, config: Dict[str, int]) -> Dict[str, Any]:
+        """Tek bir yapılandırmayı ölçer"""
+        runner = self.runner_factory(config)
+        # İlk çalıştırma ısınma amaçlıdır (sayfa önbelleği, bellek ayırma)
+        runner(self.prompt, 1)
+
+        # Her tekrarın hızı kendi token sayısıyla hesaplanır; en yüksek hız esas alınır
+        best = None
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            tokens = runner(self.prompt, self.max_new_tokens)
+            elapsed = time.perf_counter() - start
+            rate = tokens / elapsed if elapsed > 0 else 0.0
+            if best is None or rate > best[0]:
+                best = (rate, elapsed, tokens)
+
+        rate, elapsed, tokens = best
+        return dict(config, seconds=round(elapsed, 4), tokens=tokens, tokens_per_sec=round(rate, 2))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Izgaradaki tüm yapılandırmaları ölçer ve en hızlısını döndürür
+
+        Returns:
+            Dict[str, Any]: Saniyede en çok token üreten yapılandırma ve ölçümleri
+        """
+        self.results = []
+        for config in self.grid():
+            try:
+                result = self.measure(config)
+            except Exception as e:
+                logger.warning(f"Yapılandırma ölçülemedi {config}: {str(e)}")
+                continue
+            logger.info(f"{config} -> {result['seconds']:.2f} sn ({result['tokens_per_sec']:.1f} token/sn)")
+            self.results.append(result)
+
+        if not self.results:
+            raise RuntimeError("Hiçbir yapılandırma ölçülemedi")
+        best = max(self.results, key=lambda r: r["tokens_per_sec"])
+        return dict(best, tuned_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def tune(self, tuning_file: Optional[Path] = None) -> Dict[str, Any]:
+        """Ölçüm yapar ve en iyi yapılandırmayı kaydeder"""
+        best = self.run()
+        save_tuned_config(self.model_path, best, tuning_file)
+        logger.info(f"En iyi yapılandırma kaydedildi: {best}")
+        return best
+
+
+def ctransformers_runner_factory(model_path: str, model_type: str) -> RunnerFactory:
+    """ctransformers ile çalışan ölçüm fonksiyonu üretir"""
+    from ctransformers import AutoModelForCausalLM
+
+    def factory(config: Dict[str, int]) -> Runner:
+        model = AutoModelForCausalLM.from_pretrained(
+            model_path, model_type=model_type, context_length=config["context_length"],
+            batch_size=config["batch_size"], threads=config["threads"]
+        )
+
+        def run(prompt: str, max_tokens: int) -> int:
+            return len(model.tokenize(model(prompt, max_new_tokens=max_tokens, temperature=0.1)))
+        return run
+    return factory
+
+
+def llama_cpp_runner_factory(model_path: str) -> RunnerFactory:
+    """llama_cpp ile çalışan ölçüm fonksiyonu üretir"""
+    from llama_cpp import Llama
+
+    def factory(config: Dict[str, int]) -> Runner:
+        model = Llama(model_path=model_path, n_ctx=config["context_length"], n_batch=config["batch_size"],
+                      n_threads=config["threads"], verbose=False)
+
+        def run(prompt: str, max_tokens: int) -> int:
+            # Önceki çalıştırmanın KV-cache'i ölçümü etkilemesin
+            model.reset()
+            output = model.create_completion(prompt, max_tokens=max_tokens, temperature=0.1)
+            return output["usage"]["completion_tokens"]
+        return run
+    return factory
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    """Komut satırından otomatik ayarlamayı çalıştırır"""
+    parser = argparse.ArgumentParser(description="Çıkarım ayarlarını bu makinede ölçerek belirler")
+    parser.add_argument("--model", required=True, help="GGUF model dosyası")
+    parser.add_argument("--backend", choices=["ctransformers", "llama_cpp"], default="ctransformers")
+    parser.add_argument("--model-type", default=None, help="ctransformers model tipi (varsayılan: GGUF başlığından)")
+    parser.add_argument("--threads", type=_int_list, default=None, help="Ör. 4,6,8")
+    parser.add_argument("--batch-sizes", type=_int_list, default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument("--contexts", type=_int_list, default=list(DEFAULT_CONTEXT_LENGTHS))
+    parser.add_argument("--tokens", type=int, default=64, help="Ölçümde üretilecek token sayısı")
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.backend == "llama_cpp":
+        factory = llama_cpp_runner_factory(args.model)
+    else:
+        from src.core.model_registry import inspect_model
+        model_type = args.model_type or inspect_model(Path(args.model)).model_type
+        factory = ctransformers_runner_factory(args.model, model_type)
+
+    tuner = Autotuner(args.model, factory, threads=args.threads, batch_sizes=args.batch_sizes,
+                      context_lengths=args.contexts, max_new_tokens=args.tokens, repeats=args.repeats)
+    best = tuner.tune()
+
+    print(f"{'Thread':>7}{'Batch':>7}{'Bağlam':>8}{'Süre (sn)':>11}{'Token/sn':>10}")
+    for result in sorted(tuner.results, key=lambda r: r["tokens_per_sec"], reverse=True):
+        print(f"{result['threads']:>7}{result['batch_size']:>7}{result['context_length']:>8}"
+              f"{result['seconds']:>11.2f}{result['tokens_per_sec']:>10.1f}")
+    print(f"\nKaydedilen yapılandırma: threads={best['threads']}, batch_size={best['batch_size']}, "
+          f"context_length={best['context_length']}")
+
+
+if __name__ == "__main__":
+    main()
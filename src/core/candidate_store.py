@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analiz edilmiş CV'ler için kalıcı aday deposu ve ters beceri indeksi.
+
+Adaylar SQLite veritabanında saklanır. Her adayın beceri, dil ve sertifika
+terimleri (küçük harfe çevrilmiş haliyle) ters indekse, en yüksek eğitim
+seviyesi indeksli bir sütuna yazılır. Bir pozisyon sıralanırken yalnızca en
+az bir gereksinimi paylaşan adaylar indeksten bulunur ve mevcut ağırlıklı
+skorla (bulk_matching.score_matrix) toplu olarak puanlanır; tüm havuz taranmaz.
+
+Toplam deneyim (ay) ve konum da analiz sırasında indeksli sütunlara yazılır;
+aday araması (search) filtreleri puanlamadan önce indeks aramaları ve aralık
+taramalarıyla uygular.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.processors.bulk_matching import CandidateMatrix, PositionLike, compile_positions, score_matrix, top_k
+from src.core.text_index import normalize_text
+from src.processors.position_matching import (EDUCATION_LEVELS, PositionProfile, build_match_result, compile_position,
+                                               current_month_index, cv_location, education_level, experience_months,
+                                               experience_span, normalize_cv)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "output/candidates.db"
+DB_PATH_ENV = "CANDIDATE_DB"
+# Bellekte tutulan derlenmiş pozisyon profili sayısı
+DEFAULT_PROFILE_CACHE_SIZE = 256
+
+# Ters indekste tutulan terim türleri ve pozisyon gereksinimlerindeki karşılıkları
+TERM_KINDS = {
+    'skill': 'skills',
+    'language': 'languages',
+    'certification': 'certifications',
+}
+
+# SQLite'ın IN (...) parametre sınırının altında kalan parça boyutu
+_FETCH_CHUNK = 500
+# Pozisyonlu aramada aynı anda puanlanan aday sayısı
+_SCORE_CHUNK = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    source TEXT,
+    education_level INTEGER NOT NULL DEFAULT 0,
+    experience_base INTEGER NOT NULL DEFAULT 0,
+    ongoing_jobs INTEGER NOT NULL DEFAULT 0,
+    location TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_education ON candidates(education_level);
+CREATE TABLE IF NOT EXISTS candidate_terms (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    PRIMARY KEY (kind, term, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_candidate_terms_candidate ON candidate_terms(candidate_id);
+CREATE TABLE IF NOT EXISTS term_suffixes (
+    kind TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    term TEXT NOT NULL,
+    PRIMARY KEY (kind, suffix, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS positions (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+# Sonradan eklenen sütunlar; eski veritabanlarına ALTER TABLE ile eklenip kayıtlı verilerden doldurulur.
+# Deneyim, süren işler bayatlamasın diye (experience_base, ongoing_jobs) olarak saklanır (bkz. experience_span)
+_ATTRIBUTE_COLUMNS = {
+    'experience_base': "INTEGER NOT NULL DEFAULT 0",
+    'ongoing_jobs': "INTEGER NOT NULL DEFAULT 0",
+    'location': "TEXT NOT NULL DEFAULT ''",
+}
+_ATTRIBUTE_INDEXES = """
+DROP INDEX IF EXISTS idx_candidates_experience;
+CREATE INDEX IF NOT EXISTS idx_candidates_ongoing_experience ON candidates(ongoing_jobs, experience_base);
+CREATE INDEX IF NOT EXISTS idx_candidates_location ON candidates(location);
+DROP TABLE IF EXISTS term_words;
+"""
+# Sorgu anındaki toplam deneyim ayı (ilk parametre current_month_index())
+_EXPERIENCE_SQL = "experience_base + ongoing_jobs * ?"
+
+
+def canonical_term(text: Any) -> str:
+    """Terimi eşleştirmenin karşılaştırdığı biçime (küçük harf) getirir"""
+    return str(text).lower()
+
+
+# Önek aralığının üst sınırı için eklenen en büyük kod noktası
+_PREFIX_END = "\U0010ffff"
+
+
+def term_suffixes(term: str) -> Set[str]:
+    """
+    Terimin tüm son eklerini döndürür
+
+    Bir gereksinim, ancak ve ancak terimin bir son ekinin öneki ise terimin alt
+    dizesidir; böylece indeks, puanlamanın alt dize kuralıyla aynı terimleri
+    bulur: "python" -> "advanced python", "sql" -> "postgresql", "script" ->
+    "javascript".
+    """
+    return {term[start:] for start in range(len(term))}
+
+
+def _candidate_name(cv_data: Dict[str, Any]) -> str:
+    """Analiz çıktısındaki aday adını bulur"""
+    for section, key in (('personal_info', 'name'), ('kisisel_bilgiler', 'isim')):
+        info = cv_data.get(section)
+        if isinstance(info, dict) and info.get(key):
+            return str(info[key])
+    return ""
+
+
+def candidate_attributes(cv_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Filtrelemede kullanılan aday özniteliklerini hesaplar
+
+    Returns:
+        Dict[str, Any]: experience_months (bugüne göre), experience_base ve ongoing_jobs
+            (bkz. experience_span), education_level, location (normalize edilmiş) ve terim
+            türü başına canonical_term kümeleri
+    """
+    profile = normalize_cv(cv_data)
+    experience_base, ongoing_jobs = experience_span(profile['experience'])
+    attributes = {
+        'experience_months': experience_months(profile['experience']),
+        'experience_base': experience_base,
+        'ongoing_jobs': ongoing_jobs,
+        'education_level': education_level(profile['education']),
+        'location': normalize_text(cv_location(cv_data)),
+    }
+    for kind, field in TERM_KINDS.items():
+        attributes[kind] = {canonical_term(item) for item in profile[field]}
+    return attributes
+
+
+def _filter_level(name: str) -> int:
+    level = EDUCATION_LEVELS.get(str(name).lower())
+    if level is None:
+        raise ValueError(f"Bilinmeyen eğitim seviyesi: {name}")
+    return level
+
+
+# FilterOptions alanı -> ters indeksteki terim türü
+_FILTER_TERM_KINDS = {
+    'required_skills': 'skill',
+    'languages': 'language',
+    'certifications': 'certification',
+}
+
+# Filtre başına ret nedeni (tek CV filtrelenirken döndürülür)
+_FILTER_REASONS = {
+    'min_experience_years': "Yetersiz deneyim",
+    'required_skills': "Eksik beceriler",
+    'education_level': "Yetersiz eğitim seviyesi",
+    'location': "Uygun olmayan konum",
+    'languages': "Eksik dil bilgisi",
+    'certifications': "Eksik sertifikalar",
+}
+
+
+def filter_mismatch(cv_data: Dict[str, Any], filters: Dict[str, Any]) -> Optional[str]:
+    """
+    Tek bir analiz sonucunu filtrelerle karşılaştırır (search ile aynı kurallar)
+
+    Args:
+        cv_data (Dict[str, Any]): CV analiz sonucu
+        filters (Dict[str, Any]): FilterOptions alanları
+
+    Returns:
+        Optional[str]: İlk sağlanmayan filtrenin nedeni; tüm filtreler sağlanıyorsa None
+
+    Raises:
+        ValueError: Eğitim seviyesi tanınmıyorsa
+    """
+    attributes = candidate_attributes(cv_data)
+
+    def missing_terms(key: str) -> bool:
+        required = {canonical_term(item) for item in filters.get(key) or []}
+        return not required <= attributes[_FILTER_TERM_KINDS[key]]
+
+    # Kontrol sırası eski _apply_filters ile aynı (ilk sağlanmayan filtrenin nedeni döner)
+    if filters.get('min_experience_years') and \
+            attributes['experience_months'] < round(filters['min_experience_years'] * 12):
+        return _FILTER_REASONS['min_experience_years']
+    if missing_terms('required_skills'):
+        return _FILTER_REASONS['required_skills']
+    if filters.get('education_level') and attributes['education_level'] < _filter_level(filters['education_level']):
+        return _FILTER_REASONS['education_level']
+    if filters.get('location') and normalize_text(filters['location']) not in attributes['location']:
+        return _FILTER_REASONS['location']
+    for key in ('languages', 'certifications'):
+        if missing_terms(key):
+            return _FILTER_REASONS[key]
+    return None
+
+
+def _chunks(items: List[str], size: int = _FETCH_CHUNK) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CandidateStore:
+    """Analiz edilmiş CV'leri ve pozisyonları saklayan, ters indeksli SQLite deposu"""
+
+    def __init__(self, path: str = ":memory:", profile_cache_size: int = DEFAULT_PROFILE_CACHE_SIZE):
+        """
+        Args:
+            path (str): Veritabanı dosyası (":memory:" ise bellekte tutulur)
+            profile_cache_size (int): Bellekte tutulan derlenmiş pozisyon profili sayısı (LRU)
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self.profile_cache_size = profile_cache_size
+        self._profiles: "OrderedDict[str, PositionProfile]" = OrderedDict()
+
+    def _migrate(self) -> None:
+        """Eski veritabanlarına öznitelik sütunlarını ekler ve kayıtlı analizlerden doldurur"""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(candidates)")}
+        missing = [name for name in _ATTRIBUTE_COLUMNS if name not in columns]
+        with self._conn:
+            for name in missing:
+                self._conn.execute(f"ALTER TABLE candidates ADD COLUMN {name} {_ATTRIBUTE_COLUMNS[name]}")
+            if missing:
+                rows = self._conn.execute("SELECT id, data FROM candidates").fetchall()
+                for row in rows:
+                    attributes = candidate_attributes(json.loads(row["data"]))
+                    self._conn.execute(
+                        f"UPDATE candidates SET {', '.join(f'{name} = ?' for name in _ATTRIBUTE_COLUMNS)} WHERE id = ?",
+                        [*(attributes[name] for name in _ATTRIBUTE_COLUMNS), row["id"]])
+                logger.info(f"Aday deposu güncellendi: {', '.join(missing)} sütunları eklendi ({len(rows)} aday)")
+            self._conn.executescript(_ATTRIBUTE_INDEXES)
+            if self._conn.execute("SELECT 1 FROM term_suffixes LIMIT 1").fetchone() is None:
+                # Son ek sözlüğü kayıtlı terimlerden bir kez oluşturulur
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO term_suffixes (kind, suffix, term) VALUES (?, ?, ?)",
+                    [(row["kind"], suffix, row["term"])
+                     for row in self._conn.execute("SELECT DISTINCT kind, term FROM candidate_terms").fetchall()
+                     for suffix in term_suffixes(row["term"])])
+
+    @classmethod
+    def from_env(cls) -> "CandidateStore":
+        """CANDIDATE_DB ortam değişkenindeki (yoksa varsayılan) dosyayla depo oluşturur"""
+        return cls(os.environ.get(DB_PATH_ENV, DEFAULT_DB_PATH))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Adaylar
+
+    def add_candidate(self, cv_data: Dict[str, Any], candidate_id: Optional[str] = None,
+                      source: Optional[str] = None) -> str:
+        """
+        Analiz sonucunu kaydeder ve indeksler (aynı kimlik varsa günceller)
+
+        Args:
+            cv_data (Dict[str, Any]): CV analiz sonucu
+            candidate_id (str, optional): Aday kimliği (None ise yeni kimlik üretilir)
+            source (str, optional): Kaynak dosya adı
+
+        Returns:
+            str: Aday kimliği
+        """
+        candidate_id = candidate_id or uuid.uuid4().hex
+        profile = normalize_cv(cv_data)
+        attributes = candidate_attributes(cv_data)
+        terms = {(kind, term) for kind in TERM_KINDS for term in attributes[kind]}
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO candidates (id, name, source, education_level, experience_base, ongoing_jobs, location, "
+                "data, profile, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET name=excluded.name, source=COALESCE(excluded.source, source), "
+                "education_level=excluded.education_level, experience_base=excluded.experience_base, "
+                "ongoing_jobs=excluded.ongoing_jobs, location=excluded.location, data=excluded.data, "
+                "profile=excluded.profile, updated_at=excluded.updated_at",
+                (candidate_id, _candidate_name(cv_data), source, attributes['education_level'],
+                 attributes['experience_base'], attributes['ongoing_jobs'], attributes['location'],
+                 json.dumps(cv_data, ensure_ascii=False), json.dumps(profile, ensure_ascii=False), now, now))
+            self._conn.execute("DELETE FROM candidate_terms WHERE candidate_id = ?", (candidate_id,))
+            self._conn.executemany("INSERT OR IGNORE INTO candidate_terms (kind, term, candidate_id) VALUES (?, ?, ?)",
+                                   [(kind, term, candidate_id) for kind, term in terms])
+            self._conn.executemany("INSERT OR IGNORE INTO term_suffixes (kind, suffix, term) VALUES (?, ?, ?)",
+                                   [(kind, suffix, term) for kind, term in terms for suffix in term_suffixes(term)])
+        return candidate_id
+
+    def add_candidates(self, cv_list: Iterable[Dict[str, Any]]) -> List[str]:
+        """Birden çok analiz sonucunu kaydeder"""
+        return [self.add_candidate(cv_data) for cv_data in cv_list]
+
+    def get_candidate(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        """Adayın kayıtlı analiz sonucunu döndürür"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def names(self, candidate_ids: List[str]) -> Dict[str, str]:
+        """Verilen adayların adlarını döndürür (kayıtlı olmayanlar atlanır)"""
+        names = {}
+        with self._lock:
+            for chunk in _chunks(list(candidate_ids)):
+                placeholders = ",".join("?" * len(chunk))
+                names.update(self._conn.execute(
+                    f"SELECT id, name FROM candidates WHERE id IN ({placeholders})", chunk).fetchall())
+        return names
+
+    def iter_candidates(self, candidate_ids: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Verilen (None ise tüm) adayların (kimlik, analiz sonucu) çiftlerini kimlik sırasıyla döndürür"""
+        with self._lock:
+            if candidate_ids is None:
+                rows = self._conn.execute("SELECT id, data FROM candidates ORDER BY id").fetchall()
+            else:
+                rows = []
+                for chunk in _chunks(sorted(set(candidate_ids))):
+                    placeholders = ",".join("?" * len(chunk))
+                    rows.extend(self._conn.execute(
+                        f"SELECT id, data FROM candidates WHERE id IN ({placeholders}) ORDER BY id", chunk))
+        for row in rows:
+            yield row["id"], json.loads(row["data"])
+
+    def iter_term_rows(self, kind: str = 'skill', chunk_size: int = _FETCH_CHUNK,
+                       updated_after: Optional[float] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Adayların terimlerini ve sayısal özniteliklerini kimlik sırasıyla parça parça döndürür
+
+        Havuz belleğe alınmaz; her parça kimliğe göre sayfalanarak (id > son kimlik)
+        okunur ve terimler ters indeksten parça için toplu çekilir.
+
+        Args:
+            kind (str): Terim türü (TERM_KINDS anahtarı)
+            chunk_size (int): Parça başına aday sayısı
+            updated_after (float, optional): Yalnızca bu zamandan sonra eklenen/güncellenen adaylar
+
+        Yields:
+            List[Dict[str, Any]]: candidate_id, experience_months, education_level,
+                updated_at ve terms (terim kümesi) alanlı kayıtlar
+        """
+        sql = (f"SELECT id, {_EXPERIENCE_SQL} AS experience_months, education_level, updated_at FROM candidates "
+               f"WHERE id > ?")
+        if updated_after is not None:
+            sql += " AND updated_at > ?"
+        sql += " ORDER BY id LIMIT ?"
+        last_id = ""
+        while True:
+            params = ((current_month_index(), last_id) + ((updated_after,) if updated_after is not None else ())
+                      + (chunk_size,))
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+                if not rows:
+                    return
+                records = {row["id"]: {'candidate_id': row["id"], 'experience_months': row["experience_months"],
+                                       'education_level': row["education_level"], 'updated_at': row["updated_at"],
+                                       'terms': set()} for row in rows}
+                for chunk in _chunks(list(records)):
+                    placeholders = ",".join("?" * len(chunk))
+                    for term_row in self._conn.execute(
+                            f"SELECT candidate_id, term FROM candidate_terms "
+                            f"WHERE kind = ? AND candidate_id IN ({placeholders})", [kind, *chunk]):
+                        records[term_row["candidate_id"]]['terms'].add(term_row["term"])
+            last_id = rows[-1]["id"]
+            yield list(records.values())
+
+    def term_frequencies(self, kind: str = 'skill', limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Terimleri kaç adayda geçtiklerine göre azalan sırada döndürür"""
+        sql = "SELECT term, COUNT(*) AS n FROM candidate_terms WHERE kind = ? GROUP BY term ORDER BY n DESC, term"
+        params: List[Any] = [kind]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [(row["term"], row["n"]) for row in self._conn.execute(sql, params)]
+
+    def remove_candidate(self, candidate_id: str) -> bool:
+        """Adayı ve indeks kayıtlarını siler"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM candidate_terms WHERE candidate_id = ?", (candidate_id,))
+            cursor = self._conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    # Pozisyonlar
+
+    def add_position(self, position_data: Dict[str, Any], position_id: Optional[str] = None) -> str:
+        """
+        Pozisyonu doğrulayıp kaydeder (aynı kimlik varsa üzerine yazar) ve kimliğini döndürür
+
+        Pozisyon kayıt sırasında bir kez derlenir ve profil önbelleğine alınır.
+
+        Raises:
+            ValueError: Gereksinimler geçersizse
+        """
+        profile = compile_position(position_data)
+        position_id = position_id or uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO positions (id, title, data, created_at) VALUES (?, ?, ?, ?)",
+                (position_id, position_data.get('title', ''), json.dumps(position_data, ensure_ascii=False),
+                 time.time()))
+            self._cache_profile(position_id, profile)
+        return position_id
+
+    def get_position(self, position_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM positions WHERE id = ?", (position_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def position_profile(self, position_id: str) -> Optional[PositionProfile]:
+        """
+        Pozisyonun derlenmiş profilini döndürür
+
+        Profiller LRU önbellekte tutulur; önbellekte yoksa pozisyon depodan
+        okunup derlenir.
+
+        Returns:
+            Optional[PositionProfile]: Profil (pozisyon kayıtlı değilse None)
+        """
+        with self._lock:
+            profile = self._profiles.get(position_id)
+            if profile is not None:
+                self._profiles.move_to_end(position_id)
+                return profile
+            position_data = self.get_position(position_id)
+            if position_data is None:
+                return None
+            profile = compile_position(position_data)
+            self._cache_profile(position_id, profile)
+        return profile
+
+    def _cache_profile(self, position_id: str, profile: PositionProfile) -> None:
+        self._profiles[position_id] = profile
+        self._profiles.move_to_end(position_id)
+        while len(self._profiles) > self.profile_cache_size:
+            self._profiles.popitem(last=False)
+
+    # Sıralama
+
+    def candidate_ids_for(self, position: PositionLike) -> Optional[Set[str]]:
+        """
+        Pozisyonla en az bir gereksinimi paylaşan adayları indeksten bulur
+
+        Eşleştirme gereksinim terimini CV terimi içinde aradığı için (alt dize),
+        önce son ek sözlüğünden gereksinimle başlayan bir son eke sahip
+        terimler (birincil anahtarda önek aralığı, bkz. term_suffixes), sonra
+        bunların adayları (kind, term) anahtarıyla bulunur. Eğitimde gereken
+        seviye ve üstü aranır.
+
+        Args:
+            position (PositionLike): İş pozisyonu verisi veya derlenmiş profil
+
+        Returns:
+            Optional[Set[str]]: Aday kimlikleri; indekslenen bir gereksinim yoksa None
+        """
+        queries = self._requirement_queries(compile_positions([position])[0])
+        if not queries:
+            return None
+
+        ids: Set[str] = set()
+        with self._lock:
+            for sql, params in queries:
+                ids.update(row[0] for row in self._conn.execute(sql, params))
+        return ids
+
+    @staticmethod
+    def _requirement_queries(profile: PositionProfile) -> List[Tuple[str, Tuple]]:
+        """Profilin gereksinim başına aday kimliği sorgularını (SQL, parametreler) döndürür"""
+        queries: List[Tuple[str, Tuple]] = []
+        for kind, field in TERM_KINDS.items():
+            # Profil terimleri zaten canonical_term biçiminde (küçük harf)
+            for term in getattr(profile, field):
+                queries.append(("SELECT candidate_id FROM candidate_terms WHERE kind = ? AND term IN "
+                                "(SELECT term FROM term_suffixes WHERE kind = ? AND suffix >= ? AND suffix < ?)",
+                                (kind, kind, term, term + _PREFIX_END)))
+        if profile.education_level:
+            queries.append(("SELECT id FROM candidates WHERE education_level >= ?", (profile.education_level,)))
+        return queries
+
+    def _iter_profiles(self, ids: Optional[Set[str]]) -> Iterator[sqlite3.Row]:
+        """Verilen (None ise tüm) adayların eşleştirme profillerini parça parça okur"""
+        with self._lock:
+            if ids is None:
+                yield from self._conn.execute("SELECT id, name, profile FROM candidates ORDER BY id").fetchall()
+                return
+            for chunk in _chunks(sorted(ids)):
+                placeholders = ",".join("?" * len(chunk))
+                yield from self._conn.execute(
+                    f"SELECT id, name, profile FROM candidates WHERE id IN ({placeholders})", chunk).fetchall()
+
+    def rank(self, position: PositionLike, k: int = 10, matching_options: Dict[str, float] = None,
+             candidate_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Pozisyon için havuzdaki en uygun k adayı ağırlıklı skorla sıralar
+
+        Yalnızca en az bir gereksinimi paylaşan adaylar puanlanır. Pozisyonda
+        indekslenebilir gereksinim yoksa (ör. yalnızca deneyim) tüm havuz puanlanır.
+        candidate_ids verilirse (ör. vektör indeksinden gelen anlamsal adaylar)
+        yalnızca bu adaylar arasından puanlama yapılır.
+
+        Args:
+            position (PositionLike): İş pozisyonu verisi veya derlenmiş profil
+            k (int): Döndürülecek aday sayısı
+            matching_options (Dict[str, float], optional): Kategori ağırlıkları
+            candidate_ids (Iterable[str], optional): Puanlanacak adayların üst kümesi
+
+        Returns:
+            Dict[str, Any]: havuz büyüklüğü, puanlanan aday sayısı ve sıralı adaylar
+        """
+        profile = compile_positions([position], matching_options)[0]
+        ids = self.candidate_ids_for(profile)
+        if candidate_ids is not None:
+            ids = set(candidate_ids) if ids is None else ids & set(candidate_ids)
+        rows = list(self._iter_profiles(ids))
+        matrix = CandidateMatrix(json.loads(row["profile"]) for row in rows)
+        total, category_scores = score_matrix(matrix, [profile])
+
+        # Tam sıralama yerine yalnızca ilk k aday seçilir; satırlar kimliğe göre sıralı
+        # olduğundan eşit skorlarda kimlik sırası korunur
+        candidates = []
+        for index in top_k(total[:, 0], k):
+            scores = {category: float(values[index, 0]) for category, values in category_scores.items()}
+            candidates.append({'candidate_id': rows[index]["id"], 'name': rows[index]["name"],
+                               **build_match_result(float(total[index, 0]), scores)})
+        logger.info(f"{len(rows)} aday puanlandı, ilk {len(candidates)} aday döndürülüyor")
+        return {'pool_size': self.count(), 'scored': len(rows), 'candidates': candidates}
+
+    # Filtreli arama
+
+    def _filter_clauses(self, filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """FilterOptions alanlarını indeksli sütunlar üzerinde SQL koşullarına çevirir"""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if filters.get('min_experience_years'):
+            # Süren işi olmayan ve tek süren işi olan adaylar (ongoing_jobs, experience_base)
+            # indeksinde aralık taramasıyla, diğerleri bu aya göre hesaplanarak bulunur
+            needed, current = round(filters['min_experience_years'] * 12), current_month_index()
+            clauses.append("(ongoing_jobs = 0 AND experience_base >= ? OR ongoing_jobs = 1 AND experience_base >= ? "
+                           f"OR ongoing_jobs > 1 AND {_EXPERIENCE_SQL} >= ?)")
+            params.extend([needed, needed - current, current, needed])
+        if filters.get('education_level'):
+            clauses.append("education_level >= ?")
+            params.append(_filter_level(filters['education_level']))
+        if filters.get('location'):
+            clauses.append("instr(location, ?) > 0")
+            params.append(normalize_text(filters['location']))
+        for key, kind in _FILTER_TERM_KINDS.items():
+            terms = sorted({canonical_term(item) for item in filters.get(key) or []})
+            if not terms:
+                continue
+            # Her terim (kind, term) birincil anahtarından bulunur; tüm terimlere sahip adaylar kalır
+            placeholders = ",".join("?" * len(terms))
+            clauses.append(f"id IN (SELECT candidate_id FROM candidate_terms WHERE kind = ? AND term IN ({placeholders}) "
+                           f"GROUP BY candidate_id HAVING COUNT(*) = ?)")
+            params.extend([kind, *terms, len(terms)])
+        return clauses, params
+
+    def search(self, filters: Optional[Dict[str, Any]] = None, limit: int = 20, offset: int = 0,
+               position: Optional[PositionLike] = None,
+               matching_options: Dict[str, float] = None) -> Dict[str, Any]:
+        """
+        Adayları filtreler ve sayfalı olarak döndürür
+
+        Filtreler puanlamadan önce SQL'de uygulanır: deneyim ve eğitim seviyesi
+        indeksli aralık taramasıyla, beceri/dil/sertifika ters indeksle bulunur.
+        Pozisyon verilirse filtreyi geçen adaylardan, rank gibi yalnızca en az
+        bir gereksinimi paylaşanlar parça parça puanlanıp skora göre, verilmezse
+        en son güncellenenler önce sıralanır.
+
+        Args:
+            filters (Dict[str, Any], optional): FilterOptions alanları (salary_range ve
+                work_type CV'de bulunmadığı için dikkate alınmaz)
+            limit (int): Sayfa büyüklüğü
+            offset (int): Atlanacak aday sayısı
+            position (PositionLike, optional): Sıralama için pozisyon verisi veya profil
+            matching_options (Dict[str, float], optional): Kategori ağırlıkları
+
+        Returns:
+            Dict[str, Any]: filtreyi geçen toplam aday sayısı ve sayfadaki adaylar
+                (pozisyon verildiyse puanlanan aday sayısı da)
+
+        Raises:
+            ValueError: Eğitim seviyesi tanınmıyorsa
+        """
+        clauses, params = self._filter_clauses(filters or {})
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = f"id, name, {_EXPERIENCE_SQL} AS experience_months, education_level, location"
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM candidates {where}", params).fetchone()[0]
+            if position is None:
+                rows = self._conn.execute(
+                    f"SELECT {columns} FROM candidates {where} ORDER BY updated_at DESC, id LIMIT ? OFFSET ?",
+                    [current_month_index(), *params, limit, offset]).fetchall()
+                return {'total': total, 'candidates': [self._search_item(row) for row in rows]}
+
+        profile = compile_positions([position], matching_options)[0]
+        queries = self._requirement_queries(profile)
+        if queries:
+            clauses.append(f"id IN ({' UNION '.join(sql for sql, _ in queries)})")
+            params.extend(param for _, query_params in queries for param in query_params)
+        sql = f"SELECT {columns}, profile FROM candidates WHERE {' AND '.join([*clauses, 'id > ?'])} ORDER BY id LIMIT ?"
+
+        # Havuz belleğe alınmaz; her parçanın en iyi offset + limit adayı birikimli listeyle birleştirilir
+        best: List[Tuple[float, str, Dict[str, Any]]] = []
+        scored, last_id = 0, ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, [current_month_index(), *params, last_id, _SCORE_CHUNK]).fetchall()
+            if not rows:
+                break
+            matrix = CandidateMatrix(json.loads(row["profile"]) for row in rows)
+            scores, category_scores = score_matrix(matrix, [profile])
+            for index in top_k(scores[:, 0], offset + limit):
+                categories = {category: float(values[index, 0]) for category, values in category_scores.items()}
+                best.append((-float(scores[index, 0]), rows[index]["id"],
+                             {**self._search_item(rows[index]), **build_match_result(float(scores[index, 0]),
+                                                                                     categories)}))
+            best = sorted(best, key=lambda item: item[:2])[:offset + limit]
+            scored += len(rows)
+            last_id = rows[-1]["id"]
+        return {'total': total, 'scored': scored, 'candidates': [item for _, _, item in best[offset:]]}
+
+    @staticmethod
+    def _search_item(row: sqlite3.Row) -> Dict[str, Any]:
+        return {'candidate_id': row["id"], 'name': row["name"], 'experience_months': row["experience_months"],
+                'education_level': row["education_level"], 'location': row["location"]}
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Uzun CV'ler için bölüm bazlı (map-reduce) LLM analizi.
+
+CV metni bölüm başlıklarına göre parçalara ayrılır, her parça için yalnızca o
+bölümle ilgili alanları isteyen küçük bir prompt hazırlanır, promptlar sınırlı
+eşzamanlılıkla çalıştırılır ve kısmi JSON çıktıları deterministik olarak
+birleştirilir. Böylece metin kesilmeden işlenir ve her çağrının prefill maliyeti
+küçük kalır.
+"""
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.json_repair import extract_json
+
+logger = logging.getLogger(__name__)
+
+# Değeri boş sayılan yer tutucular (birleştirme sırasında ezilebilir)
+EMPTY_VALUES = {"", "belirtilmemiş", "n/a", "null", "none", "-"}
+
+# Bölüm anahtarı -> başlık kalıpları (satırın tamamı başlık olmalı)
+SECTION_PATTERNS = {
+    "kisisel": [r"kişisel bilgiler", r"iletişim", r"personal information", r"contact( information)?"],
+    "ozet": [r"özet", r"hakkımda", r"profil", r"summary", r"profile", r"about me", r"objective"],
+    "egitim": [r"eğitim( bilgileri)?", r"öğrenim", r"education", r"academic background", r"educational background"],
+    "deneyim": [r"iş deneyimi", r"deneyim", r"tecrübe", r"(work |professional )?experience", r"employment history"],
+    "beceriler": [r"beceriler", r"yetenekler", r"teknik beceriler", r"(technical )?skills", r"skills & interests", r"competencies"],
+    "diller": [r"diller", r"yabancı diller", r"languages"],
+    "projeler": [r"projeler", r"projects"],
+    "sertifikalar": [r"sertifikalar", r"certifications", r"certificates"],
+}
+
+_HEADER_REGEXES = {
+    section: re.compile(r"^\s*(?:" + "|".join(patterns) + r")\s*:?\s*$", re.IGNORECASE)
+    for section, patterns in SECTION_PATTERNS.items()
+}
+
+
+@dataclass
+class CVChunk:
+    """CV'nin tek bir prompt ile işlenecek parçası"""
+    section: str
+    title: str
+    text: str
+    index: int = 0
+
+
+@dataclass
+class ChunkSchema:
+    """
+    Parça promptlarında kullanılacak şema
+
+    Args:
+        fields: Çıktı alanı -> JSON örnek parçası
+        sections: Bölüm anahtarı -> o bölümden istenecek alanlar
+        reduce_fields: Birleştirilmiş sonuçtan üretilecek türetilmiş alanlar (isteğe bağlı)
+    """
+    fields: Dict[str, str]
+    sections: Dict[str, List[str]]
+    reduce_fields: Dict[str, str] = field(default_factory=dict)
+
+    def fields_for(self, section: str) -> List[str]:
+        """Bölüm için istenecek alanları döndürür (bilinmeyen bölümler için tüm alanlar)"""
+        return self.sections.get(section, list(self.fields.keys()))
+
+
+# LLMManager / OllamaConnector tarafından kullanılan basit şema
+BASIC_SCHEMA = ChunkSchema(
+    fields={
+        "kisisel_bilgiler": '{"isim": "İsim", "email": "Email", "telefon": "Telefon"}',
+        "egitim": '[{"okul": "Okul", "bolum": "Bölüm", "tarih": "Tarih"}]',
+        "beceriler": '["Beceri1", "Beceri2"]',
+        "is_deneyimi": '[{"sirket": "Şirket", "pozisyon": "Pozisyon", "tarih": "Tarih"}]',
+    },
+    sections={
+        "kisisel": ["kisisel_bilgiler"],
+        "ozet": ["kisisel_bilgiler", "beceriler"],
+        "egitim": ["egitim"],
+        "deneyim": ["is_deneyimi", "beceriler"],
+        "beceriler": ["beceriler"],
+        "diller": ["beceriler"],
+        "projeler": ["beceriler"],
+        "sertifikalar": ["beceriler"],
+    },
+)
+
+# HFLLMManager şeması (görevler ve profil değerlendirmesi dahil)
+HF_SCHEMA = ChunkSchema(
+    fields={
+        "kisisel_bilgiler": '{"isim": "Ad Soyad", "email": "ornek@email.com", "telefon": "555-123-4567"}',
+        "egitim": '[{"okul": "Üniversite Adı", "bolum": "Bölüm", "tarih": "2020-2024"}]',
+        "is_deneyimi": '[{"sirket": "Şirket Adı", "pozisyon": "Pozisyon", "tarih": "2020-2022", "gorevler": ["Görev 1"]}]',
+        "beceriler": '["Beceri 1", "Beceri 2"]',
+    },
+    sections=BASIC_SCHEMA.sections,
+    reduce_fields={
+        "profil_degerlendirmesi": '{"guclu_yonler": ["Güçlü yön 1"], "gelistirilmesi_gereken_alanlar": ["Alan 1"]}',
+    },
+)
+
+# GelismisCVAnaliz tarafından kullanılan ayrıntılı şema
+DETAILED_SCHEMA = ChunkSchema(
+    fields={
+        "kisisel_bilgiler": '{"isim": "Kişinin tam adı", "email": "E-posta", "telefon": "Telefon", "lokasyon": "Şehir, Ülke", "linkedin": "LinkedIn"}',
+        "egitim_bilgileri": '[{"okul": "Okul", "bolum": "Bölüm", "derece": "Lisans/Yüksek Lisans/Doktora", "tarih": "2018-2022"}]',
+        "is_deneyimi": '[{"sirket": "Şirket", "pozisyon": "Pozisyon", "tarih": "2018-2022", "sorumluluklar": ["Sorumluluk 1"]}]',
+        "projeler": '[{"proje_adi": "Proje adı", "aciklama": "Kısa açıklama", "kullanilan_teknolojiler": ["Teknoloji 1"]}]',
+        "beceriler": '{"teknik_beceriler": ["Beceri 1"], "yazilim_dilleri": ["Dil 1"], "diller": ["Dil 1 (Seviye)"], "soft_beceriler": ["Beceri 1"]}',
+    },
+    sections={
+        "kisisel": ["kisisel_bilgiler"],
+        "ozet": ["kisisel_bilgiler", "beceriler"],
+        "egitim": ["egitim_bilgileri"],
+        "deneyim": ["is_deneyimi", "beceriler"],
+        "beceriler": ["beceriler"],
+        "diller": ["beceriler"],
+        "projeler": ["projeler", "beceriler"],
+        "sertifikalar": ["beceriler"],
+    },
+    reduce_fields={
+        "cv_puanlama": '{"toplam_puan": 0, "egitim_puani": 0, "deneyim_puani": 0, "beceri_puani": 0, "proje_puani": 0}',
+        "guclu_yonler": '["Güçlü yön 1"]',
+        "gelistirilmesi_gereken_yonler": '["Geliştirilmesi gereken yön 1"]',
+        "uygun_pozisyonlar": '["Pozisyon 1"]',
+        "yetenek_ozeti": '"3-5 cümlelik özet"',
+    },
+)
+
+# CVParser.analyze_cv_with_ai şeması (türetilmiş alanlar regex ile doldurulur)
+PARSER_SCHEMA = ChunkSchema(
+    fields={
+        "kisisel_bilgiler": '{"isim": "", "email": "", "telefon": "", "lokasyon": "", "linkedin": "", "website": ""}',
+        "egitim": '[{"okul": "", "bolum": "", "mezuniyet": "", "detaylar": ""}]',
+        "deneyim": '[{"sirket": "", "pozisyon": "", "tarih": "", "sorumluluklar": [""]}]',
+        "projeler": '[{"proje_adi": "", "aciklama": "", "kullanilan_teknolojiler": [""]}]',
+        "beceriler": '{"teknik_beceriler": [""], "yazilim_dilleri": [""], "diller": [""], "soft_beceriler": [""]}',
+    },
+    sections={
+        "kisisel": ["kisisel_bilgiler"],
+        "ozet": ["kisisel_bilgiler", "beceriler"],
+        "egitim": ["egitim"],
+        "deneyim": ["deneyim", "beceriler"],
+        "beceriler": ["beceriler"],
+        "diller": ["beceriler"],
+        "projeler": ["projeler", "beceriler"],
+        "sertifikalar": ["beceriler"],
+    },
+)
+
+
+def detect_section(line: str) -> Optional[str]:
+    """Satır bir bölüm başlığıysa bölüm anahtarını döndürür"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    for section, regex in _HEADER_REGEXES.items():
+        if regex.match(stripped):
+            return section
+    return None
+
+
+def segment_cv(text: str, max_chunk_chars: int = 3000) -> List[CVChunk]:
+    """
+    CV metnini bölümlere ve gerekirse daha küçük parçalara ayırır
+
+    Metnin hiçbir kısmı atılmaz; çok uzun bölümler paragraf ve satır
+    sınırlarından bölünür.
+
+    Args:
+        text (str): CV metni
+        max_chunk_chars (int): Bir parçanın maksimum karakter sayısı
+
+    Returns:
+        List[CVChunk]: Sıralı parça listesi
+    """
+    sections = []
+    current_section, current_title, current_lines = "kisisel", "Giriş", []
+
+    for line in text.split("\n"):
+        section = detect_section(line)
+        if section:
+            if any(l.strip() for l in current_lines):
+                sections.append((current_section, current_title, "\n".join(current_lines).strip()))
+            current_section, current_title, current_lines = section, line.strip(), []
+        else:
+            current_lines.append(line)
+
+    if any(l.strip() for l in current_lines):
+        sections.append((current_section, current_title, "\n".join(current_lines).strip()))
+
+    chunks = []
+    for section, title, body in sections:
+        for piece in _split_long_text(body, max_chunk_chars):
+            chunks.append(CVChunk(section=section, title=title, text=piece, index=len(chunks)))
+
+    return chunks
+
+
+def _split_long_text(text: str, max_chars: int) -> List[str]:
+    """Metni paragraf/satır sınırlarından max_chars'ı aşmayacak şekilde böler"""
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces, current = [], ""
+    for unit in re.split(r"(\n\s*\n|\n)", text):
+        if len(unit) > max_chars:
+            # Tek satır bile sığmıyorsa kelime sınırından böl
+            for word in unit.split(" "):
+                if len(current) + len(word) + 1 > max_chars and current.strip():
+                    pieces.append(current.strip())
+                    current = ""
+                current += word + " "
+            continue
+        if len(current) + len(unit) > max_chars and current.strip():
+            pieces.append(current.strip())
+            current = ""
+        current += unit
+
+    if current.strip():
+        pieces.append(current.strip())
+    return pieces
+
+
+def is_empty_value(value: Any) -> bool:
+    """Değerin boş veya yer tutucu olup olmadığını kontrol eder"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in EMPTY_VALUES
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+def _identity(value: Any) -> str:
+    """Liste elemanlarının tekilleştirilmesi için normalize edilmiş anahtar"""
+    if isinstance(value, str):
+        return value.strip().lower()
+    return json.dumps(value, sort_keys=True, ensure_ascii=False).lower()
+
+
+def merge_values(base: Any, incoming: Any) -> Any:
+    """
+    İki kısmi değeri deterministik olarak birleştirir
+
+    - Sözlükler anahtar bazında birleştirilir
+    - Listeler sırası korunarak tekilleştirilip birleştirilir
+    - Skalerlerde ilk dolu değer korunur
+    """
+    if is_empty_value(base):
+        return incoming if not is_empty_value(incoming) else base
+    if is_empty_value(incoming):
+        return base
+
+    if isinstance(base, dict) and isinstance(incoming, dict):
+        merged = dict(base)
+        for key, value in incoming.items():
+            merged[key] = merge_values(merged.get(key), value)
+        return merged
+
+    if isinstance(base, list) and isinstance(incoming, list):
+        merged = list(base)
+        seen = {_identity(item) for item in merged}
+        for item in incoming:
+            if is_empty_value(item):
+                continue
+            key = _identity(item)
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+        return merged
+
+    return base
+
+
+def merge_partials(partials: List[Dict[str, Any]], schema: ChunkSchema) -> Dict[str, Any]:
+    """Parça sonuçlarını parça sırasına göre birleştirir"""
+    result: Dict[str, Any] = {}
+    for partial in partials:
+        if not isinstance(partial, dict):
+            continue
+        for key, value in partial.items():
+            if key not in schema.fields:
+                continue
+            result[key] = merge_values(result.get(key), value)
+
+    # Eksik alanları şemadaki tipe uygun boş değerle doldur
+    for key, fragment in schema.fields.items():
+        if key not in result:
+            result[key] = [] if fragment.lstrip().startswith("[") else {}
+    return result
+
+
+class ChunkedCVAnalyzer:
+    """Uzun CV'leri bölüm bazlı küçük promptlarla analiz eden yardımcı sınıf"""
+
+    def __init__(self, generate_fn: Callable[[str], str], schema: ChunkSchema = BASIC_SCHEMA,
+                 max_workers: int = 2, max_chunk_chars: int = 3000,
+                 parse_fn: Optional[Callable[[str], Dict[str, Any]]] = None):
+        """
+        Args:
+            generate_fn (Callable[[str], str]): Prompt alıp model çıktısı döndüren fonksiyon
+            schema (ChunkSchema): Kullanılacak çıktı şeması
+            max_workers (int): Aynı anda çalıştırılacak en fazla prompt sayısı
+            max_chunk_chars (int): Bir parçanın maksimum karakter sayısı
+            parse_fn (Callable, optional): Model çıktısından sözlük üreten fonksiyon
+        """
+        self.generate_fn = generate_fn
+        self.schema = schema
+        self.max_workers = max(1, max_workers)
+        self.max_chunk_chars = max_chunk_chars
+        self.parse_fn = parse_fn or extract_json
+
+    def build_prompt(self, chunk: CVChunk, keys: Optional[List[str]] = None) -> str:
+        """Tek bir parça için yalnızca ilgili alanları isteyen prompt oluşturur"""
+        keys = keys or self.schema.fields_for(chunk.section)
+        fragment = ",\n".join(f'  "{key}": {self.schema.fields[key]}' for key in keys)
+        # Talimat ve format önce, bölüm metni sonda: aynı alan kümesini isteyen
+        # parçalar ortak öneki paylaşır ve backend önbelleğinden yararlanır
+        return (
+            "En sonda bir CV'nin yalnızca bir bölümü var. Bu bölümden bilgileri çıkar ve "
+            "SADECE aşağıdaki JSON formatında yanıt ver. Bölümde olmayan bilgiler için boş değer kullan.\n\n"
+            f"## ÇIKTI FORMATI:\n{{\n{fragment}\n}}\n\n"
+            f"## BÖLÜM: {chunk.title}\n{chunk.text}\n"
+        )
+
+    def build_reduce_prompt(self, merged: Dict[str, Any]) -> str:
+        """Birleştirilmiş sonuçtan türetilmiş alanları isteyen prompt oluşturur"""
+        fragment = ",\n".join(f'  "{key}": {value}' for key, value in self.schema.reduce_fields.items())
+        compact = json.dumps(merged, ensure_ascii=False, separators=(",", ":"))
+        return (
+            "Aşağıda bir CV'den çıkarılmış yapılandırılmış bilgiler var. Bu bilgilere göre adayı "
+            "değerlendir ve SADECE aşağıdaki JSON formatında yanıt ver.\n\n"
+            f"## CV VERİSİ:\n{compact}\n\n"
+            f"## ÇIKTI FORMATI:\n{{\n{fragment}\n}}\n"
+        )
+
+    def _run_chunk(self, chunk: CVChunk, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Tek bir parçayı modele gönderir ve sonucu ayrıştırır"""
+        try:
+            response = self.generate_fn(self.build_prompt(chunk, keys))
+            return self.parse_fn(response or "")
+        except Exception as e:
+            logger.error(f"Parça analizi hatası ({chunk.title} #{chunk.index}): {str(e)}")
+            return {}
+
+    def analyze(self, cv_text: str) -> Dict[str, Any]:
+        """
+        CV metnini parçalara ayırıp analiz eder ve sonuçları birleştirir
+
+        Args:
+            cv_text (str): CV metni
+
+        Returns:
+            Dict[str, Any]: Birleştirilmiş analiz sonucu
+        """
+        chunks = segment_cv(cv_text, self.max_chunk_chars)
+        logger.info(f"Parçalı analiz: {len(cv_text)} karakter, {len(chunks)} parça, "
+                    f"en fazla {self.max_workers} eşzamanlı istek")
+
+        # executor.map sonuçları parça sırasında döndürür, birleştirme deterministiktir
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            partials = list(executor.map(self._run_chunk, chunks))
+
+        merged = merge_partials(partials, self.schema)
+
+        if self.schema.reduce_fields:
+            try:
+                reduced = self.parse_fn(self.generate_fn(self.build_reduce_prompt(merged)) or "")
+                for key in self.schema.reduce_fields:
+                    if key in reduced:
+                        merged[key] = reduced[key]
+            except Exception as e:
+                logger.error(f"Özet (reduce) adımı hatası: {str(e)}")
+
+        merged["_parca_sayisi"] = len(chunks)
+        return merged
+
+    def extract_fields(self, cv_text: str, keys: List[str]) -> Dict[str, Any]:
+        """
+        Yalnızca istenen alanları, yalnızca bu alanlarla ilgili bölümlerden çıkarır
+
+        Bölüm başlığı bulunamayan alanlar için tüm parçalar kullanılır.
+
+        Args:
+            cv_text (str): CV metni
+            keys (List[str]): Çıkarılacak şema alanları
+
+        Returns:
+            Dict[str, Any]: Yalnızca istenen alanları içeren birleştirilmiş sonuç
+        """
+        keys = [key for key in keys if key in self.schema.fields]
+        chunks = segment_cv(cv_text, self.max_chunk_chars)
+
+        covered = {key for chunk in chunks for key in self.schema.fields_for(chunk.section) if key in keys}
+        orphan_keys = [key for key in keys if key not in covered]
+
+        jobs = []
+        for chunk in chunks:
+            chunk_keys = [key for key in self.schema.fields_for(chunk.section) if key in keys]
+            chunk_keys += [key for key in orphan_keys if key not in chunk_keys]
+            if chunk_keys:
+                jobs.append((chunk, chunk_keys))
+
+        logger.info(f"Hedefli analiz: {', '.join(keys)} alanları için {len(jobs)} istek")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            partials = list(executor.map(lambda job: self._run_chunk(*job), jobs))
+
+        merged = merge_partials(partials, self.schema)
+        return {key: merged[key] for key in keys}
@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 import json
 import logging
-import requests
 import time
 import re
 import sys
@@ -15,21 +14,113 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 # Yardımcı modülleri ekle
 from src.utils.pdf_to_text import pdf_to_text
+from src.api.ollama_pool import OllamaPool, get_shared_pool
+from src.core.prompt_cache import PromptTemplate
+from src.core.llm_backend import ollama_backend
+from src.utils.json_repair import repair_json
+from src.core.chunked_analysis import ChunkedCVAnalyzer, DETAILED_SCHEMA, merge_values, is_empty_value
 
 # Loglama ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('gelismis_cv_analiz')
 
+# Bu uzunluğu aşan CV'ler kısaltılmak yerine bölüm bazlı parçalı analizle işlenir
+CHUNKED_ANALYSIS_THRESHOLD = 12000
+
+# Bu güven skorunun altındaki parser alanları LLM ile yeniden çıkarılır
+CONFIDENCE_THRESHOLD = 0.6
+
+# Detaylı analiz promptu: sabit talimat ve şema önce, CV metni en sonda yer alır.
+# Önek tüm isteklerde aynı olduğundan Ollama önbellekteki tokenları yeniden kullanır.
+DETAILED_ANALYSIS_TEMPLATE = PromptTemplate(
+    prefix="""
+# CV ANALİZ GÖREVİ
+
+Sen bir CV Analiz uzmanısın. En sonda verilen CV metnini detaylı şekilde analiz edip sonuçları YALNIZCA aşağıda tanımlanan geçerli JSON formatında döndürmelisin.
+
+## KURALLAR:
+1. JSON formatta MUTLAKA DİKKATLİ ve HATASIZ çıktı üretmelisin
+2. JSON formatına SIKICI bir şekilde bağlı kal - hiçbir açıklama ekleme, sadece JSON çıktı ver
+3. JSON formatını ASLA BOZMA - tüm süslü parantezleri ve çift tırnakları doğru kullan
+4. Tüm alanları MUTLAKA doldur, gerekirse "Belirtilmemiş" kullan
+5. JSON formatında sayısal değerler tırnak içinde OLMAMALI
+6. Kapatılmayan süslü parantez ({}) veya köşeli parantez ([]) OLMAMALI
+
+## İSTENEN ÇIKTI FORMATI (TAM OLARAK BU ŞABLONA UYGUN OLMALI):
+```json
+{
+  "kisisel_bilgiler": {
+    "isim": "Kişinin tam adı",
+    "email": "E-posta adresi veya Belirtilmemiş",
+    "telefon": "Telefon numarası veya Belirtilmemiş",
+    "lokasyon": "Şehir, Ülke veya Belirtilmemiş",
+    "linkedin": "LinkedIn profil linki veya Belirtilmemiş"
+  },
+  "cv_puanlama": {
+    "toplam_puan": 0-100 arası sayı,
+    "egitim_puani": 0-100 arası sayı,
+    "deneyim_puani": 0-100 arası sayı,
+    "beceri_puani": 0-100 arası sayı,
+    "proje_puani": 0-100 arası sayı
+  },
+  "beceriler": {
+    "teknik_beceriler": ["Beceri 1", "Beceri 2"],
+    "yazilim_dilleri": ["Dil 1", "Dil 2"],
+    "diller": ["Dil 1 (Seviye)", "Dil 2 (Seviye)"],
+    "soft_beceriler": ["Beceri 1", "Beceri 2"]
+  },
+  "egitim_bilgileri": [
+    {
+      "okul": "Üniversite/Okul adı",
+      "bolum": "Bölüm",
+      "derece": "Lisans/Yüksek Lisans/Doktora",
+      "tarih": "2018-2022 veya benzeri tarih aralığı"
+    }
+  ],
+  "is_deneyimi": [
+    {
+      "sirket": "Şirket adı",
+      "pozisyon": "Pozisyon",
+      "tarih": "2018-2022 veya benzeri tarih aralığı",
+      "sorumluluklar": ["Sorumluluk 1", "Sorumluluk 2"]
+    }
+  ],
+  "projeler": [
+    {
+      "proje_adi": "Proje adı",
+      "aciklama": "Kısa açıklama",
+      "kullanilan_teknolojiler": ["Teknoloji 1", "Teknoloji 2"]
+    }
+  ],
+  "guclu_yonler": ["Güçlü yön 1", "Güçlü yön 2"],
+  "gelistirilmesi_gereken_yonler": ["Geliştirilmesi gereken yön 1", "Geliştirilmesi gereken yön 2"],
+  "uygun_pozisyonlar": ["Pozisyon 1", "Pozisyon 2"],
+  "yetenek_ozeti": "Kişinin yeteneklerini, deneyimlerini ve eğitimini özetleyen 3-5 cümle"
+}
+```
+
+## ÖNEMLİ UYARILAR:
+- SADECE JSON formatında çıktı ver
+- JSON formatı bozuk olursa CV analizi BAŞARISIZ olacak
+- Her alan için veri bulunamazsa "Belirtilmemiş" veya boş dizi [] kullan
+
+JSON çıktını kontrol et ve eksik parantez olmadığından emin ol!
+""",
+    suffix="\n## CV METNİ:\n{text}\n\n{position_context}\n## JSON ÇIKTISI:\n```json\n"
+)
+
 class GelismisCVAnaliz:
-    def __init__(self, model_name=None):
+    def __init__(self, model_name=None, pool: Optional[OllamaPool] = None):
         """CV analizci sınıfının yapıcı metodu"""
         self._init_logger()
+        # Ollama istekleri OLLAMA_HOSTS ile tanımlı sunucular arasında dağıtılır
+        self.pool = pool or get_shared_pool()
         
         # Kullanılabilir modelleri kontrol et
         try:
-            response = requests.get("http://localhost:11434/api/tags")
-            if response.status_code == 200:
-                available_models = [model["name"] for model in response.json()["models"]]
+            self.pool.check_health()
+            if self.pool.is_available():
+                available_models = self.pool.models()
                 self.logger.info(f"Ollama API bağlantısı başarılı! Mevcut modeller: {', '.join(available_models)}")
                 
                 # Eğer model belirtilmemişse veya belirtilen model mevcut değilse
@@ -56,11 +147,16 @@ class GelismisCVAnaliz:
         self.max_retries = 2
         
     def analyze_cv(self, pdf_path, pos_data=None):
-        """CV'yi analiz eder ve sonuçları döndürür"""
+        """
+        CV'yi analiz eder ve sonuçları döndürür (PDF yolu, metin dosyası yolu veya CV metni)
+        
+        Raises:
+            FileNotFoundError: Girdi bir dosya yoluna benziyor ama dosya yoksa
+        """
+        # CV metnini çıkar; eksik dosya yolu CV metni olarak analiz edilmez
+        pdf_text = self._read_cv_text(pdf_path)
         try:
-            # PDF metnini çıkar
-            pdf_text = pdf_to_text(pdf_path)
-            self.logger.info(f"PDF metin çıkarma başarılı: {len(pdf_text)} karakter")
+            self.logger.info(f"CV metin çıkarma başarılı: {len(pdf_text)} karakter")
             
             # Doğrudan CV parser'ı çalıştır
             try:
@@ -69,17 +165,30 @@ class GelismisCVAnaliz:
                 
                 parser = CVParser(pdf_text)
                 parser_result = parser.generate_cv_analysis()
+                confidences = parser.field_confidence(parser_result)
+                low_fields = [f for f, score in confidences.items() if score < CONFIDENCE_THRESHOLD]
+                self.logger.info(f"CV Parser alan güvenleri: {confidences}")
                 
-                # Parser sonucu geçerli mi kontrol et
-                if parser_result and isinstance(parser_result, dict) and len(parser_result) >= 5:
+                if not low_fields:
                     self.logger.info("CV Parser analizi başarılı! LLM kullanılmadan analiz tamamlandı.")
                     return parser_result
+                elif len(low_fields) < len(confidences):
+                    # Yalnızca düşük güvenli alanlar için hedefli LLM istekleri gönder
+                    return self._refine_low_confidence_fields(pdf_text, parser_result, low_fields, confidences)
                 else:
                     self.logger.warning("CV Parser analizi yetersiz, LLM analizi deneniyor...")
             except Exception as parser_err:
                 self.logger.error(f"CV Parser hatası: {str(parser_err)}, LLM analizi deneniyor...")
             
-            # Metni ön işle - uzunluk kontrolü yap
+            # Uzun CV'ler kesilmeden bölüm bazlı parçalar halinde analiz edilir
+            if len(pdf_text) > CHUNKED_ANALYSIS_THRESHOLD:
+                cv_data = self._analyze_cv_chunked(pdf_text)
+                if self._is_valid_cv_data(cv_data):
+                    return cv_data
+                self.logger.warning("Parçalı analiz sonucu geçersiz")
+                return self._create_default_json_response("Parçalı CV analizi başarısız oldu")
+            
+            # Metni ön işle
             processed_text = self._preprocess_cv_text(pdf_text)
             
             # LLM'e gönder
@@ -109,79 +218,79 @@ class GelismisCVAnaliz:
             self.logger.error(f"CV analiz hatası: {str(e)}")
             return self._create_default_json_response(f"Hata: {str(e)}")
             
+    def _read_cv_text(self, source):
+        """
+        PDF/metin dosyasını okur; dosya değilse girdiyi CV metni olarak kabul eder
+        
+        Raises:
+            FileNotFoundError: Girdi tek satırlık bir .pdf/.txt yolu ama dosya yoksa
+        """
+        if len(source) < 4096 and os.path.isfile(source):
+            if source.lower().endswith('.pdf'):
+                return pdf_to_text(source)
+            with open(source, 'r', encoding='utf-8') as f:
+                return f.read()
+        if '\n' not in source and source.strip().lower().endswith(('.pdf', '.txt')):
+            raise FileNotFoundError(f"CV dosyası bulunamadı: {source}")
+        return source
+
     def _preprocess_cv_text(self, text):
-        """CV metnini ön işleme (uzun CV'leri işlemek için)"""
-        # Metni temizle
+        """CV metnini ön işleme (fazla boşlukları temizler)"""
         text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        
-        # CV çok uzunsa, önemli kısımları çıkar
-        if len(text) > 12000:
-            self.logger.warning(f"CV metni çok uzun ({len(text)} karakter), kısaltılıyor")
-            
-            # CV'yi bölümlere ayır
-            sections = self._split_cv_into_sections(text)
-            
-            # Özet oluştur
-            summary = ""
-            
-            # Kişisel bilgiler ve iletişim detayları (genellikle CV'nin başında)
-            summary += text[:1500] + "\n\n"
-            
-            # Önemli bölümleri ekle
-            important_sections = ["deneyim", "tecrübe", "experience", "eğitim", "education", 
-                                 "beceri", "skills", "yetenek", "proje", "project"]
-            
-            for keyword in important_sections:
-                for section_title, section_content in sections.items():
-                    if keyword.lower() in section_title.lower() and section_content and len(section_content) > 50:
-                        # Her önemli bölümden en fazla 1500 karakter al
-                        summary += f"--- {section_title} ---\n{section_content[:1500]}\n\n"
-            
-            # Toplam metin maksimum 7500 karakter olsun
-            if len(summary) > 7500:
-                summary = summary[:7500]
-                
-            self.logger.info(f"CV metni {len(text)} karakterden {len(summary)} karaktere kısaltıldı")
-            return summary
-        
-        return text
-        
-    def _split_cv_into_sections(self, text):
-        """CV metnini bölümlere ayırır"""
-        sections = {}
-        
-        # Muhtemel bölüm başlıkları için regex kalıpları
-        section_patterns = [
-            r'^(EĞİTİM|EDUCATION)[:\s]*$',
-            r'^(DENEYİM|İŞ DENEYİMİ|TECRÜBE|EXPERIENCE)[:\s]*$',
-            r'^(BECERİLER|YETENEKLER|SKILLS)[:\s]*$',
-            r'^(PROJELER|PROJECTS)[:\s]*$',
-            r'^(SERTİFİKALAR|CERTIFICATIONS)[:\s]*$',
-            r'^(DİLLER|LANGUAGES)[:\s]*$',
-            r'^(KİŞİSEL BİLGİLER|PERSONAL INFORMATION)[:\s]*$',
-            r'^(REFERANSLAR|REFERENCES)[:\s]*$'
-        ]
-        
-        # Metni satırlara böl
-        lines = text.split('\n')
-        current_section = "Giriş"
-        sections[current_section] = ""
-        
-        for line in lines:
-            # Bu satır bir bölüm başlığı mı kontrol et
-            is_section_title = False
-            for pattern in section_patterns:
-                if re.match(pattern, line.strip(), re.IGNORECASE):
-                    current_section = line.strip()
-                    sections[current_section] = ""
-                    is_section_title = True
-                    break
-            
-            if not is_section_title:
-                sections[current_section] += line + "\n"
+        return text.strip()
+    
+    def _analyze_cv_chunked(self, text):
+        """Uzun CV metnini bölümlere ayırıp her bölümü ayrı promptla analiz eder"""
+        self.logger.info(f"CV metni uzun ({len(text)} karakter), parçalı analiz kullanılıyor")
+        # Bölüm başlıkları satır yapısına bağlı olduğundan ham metin kullanılır
+        analyzer = ChunkedCVAnalyzer(
+            generate_fn=lambda prompt: self._generate_text(prompt, num_predict=1536),
+            schema=DETAILED_SCHEMA,
+            max_workers=2
+        )
+        return analyzer.analyze(text)
+    
+    def _refine_low_confidence_fields(self, text, parser_result, low_fields, confidences):
+        """Parser sonucundaki düşük güvenli alanları hedefli LLM istekleriyle tamamlar"""
+        self.logger.info(f"Düşük güvenli alanlar LLM ile tamamlanıyor: {', '.join(low_fields)}")
+        analyzer = ChunkedCVAnalyzer(
+            generate_fn=lambda prompt: self._generate_text(prompt, num_predict=1024),
+            schema=DETAILED_SCHEMA,
+            max_workers=2
+        )
+        result = dict(parser_result)
+        refined = []
+        try:
+            extracted = analyzer.extract_fields(text, low_fields)
+        except Exception as e:
+            self.logger.error(f"Hedefli LLM analizi hatası: {str(e)}")
+            extracted = {}
+        
+        for field_name, value in extracted.items():
+            if is_empty_value(value):
+                continue
+            if isinstance(value, dict) and isinstance(result.get(field_name), dict):
+                # Parser'ın bulduğu değerler korunur, eksikler LLM ile doldurulur
+                result[field_name] = merge_values(result[field_name], value)
+            else:
+                result[field_name] = value
+            refined.append(field_name)
         
-        return sections
+        result["_alan_guvenleri"] = confidences
+        result["_llm_ile_tamamlanan_alanlar"] = refined
+        return result
+    
+    def _backend(self):
+        """İsteklerin ortak backend katmanından (eşzamanlılık sınırı ve metrikler) geçtiği Ollama backend'i"""
+        return ollama_backend(self.pool, self.model_name)
+
+    def _generate_text(self, prompt, num_predict=4096, temperature=0.2):
+        """Ollama API'ye tek bir prompt gönderir ve ham yanıt metnini döndürür"""
+        try:
+            return self._backend().generate(prompt, max_tokens=num_predict, temperature=temperature)
+        except Exception as e:
+            self.logger.error(f"LLM istek hatası: {str(e)}")
+            return ""
     
     def _send_to_llm(self, text, pos_data=None):
         """Metni LLM modeline gönderir ve JSON formatında yanıt alır"""
@@ -192,113 +301,22 @@ class GelismisCVAnaliz:
             Pozisyon: {pos_data}
             """
         
-        # Prompt şablonu - daha güçlü JSON formatı vurgusu
-        prompt = f"""
-        # CV ANALİZ GÖREVİ
-        
-        Sen bir CV Analiz uzmanısın. Aşağıdaki CV metnini detaylı şekilde analiz edip sonuçları YALNIZCA aşağıda tanımlanan geçerli JSON formatında döndürmelisin.
-        
-        ## KURALLAR:
-        1. JSON formatta MUTLAKA DİKKATLİ ve HATASIZ çıktı üretmelisin
-        2. JSON formatına SIKICI bir şekilde bağlı kal - hiçbir açıklama ekleme, sadece JSON çıktı ver
-        3. JSON formatını ASLA BOZMA - tüm süslü parantezleri ve çift tırnakları doğru kullan
-        4. Tüm alanları MUTLAKA doldur, gerekirse "Belirtilmemiş" kullan
-        5. JSON formatında sayısal değerler tırnak içinde OLMAMALI
-        6. Kapatılmayan süslü parantez ({{}}) veya köşeli parantez ([]) OLMAMALI
-        
-        ## CV METNİ:
-        {text}
-        
-        {position_context}
-        
-        ## İSTENEN ÇIKTI FORMATI (TAM OLARAK BU ŞABLONA UYGUN OLMALI):
-        ```json
-        {{
-          "kisisel_bilgiler": {{
-            "isim": "Kişinin tam adı",
-            "email": "E-posta adresi veya Belirtilmemiş",
-            "telefon": "Telefon numarası veya Belirtilmemiş",
-            "lokasyon": "Şehir, Ülke veya Belirtilmemiş",
-            "linkedin": "LinkedIn profil linki veya Belirtilmemiş"
-          }},
-          "cv_puanlama": {{
-            "toplam_puan": 0-100 arası sayı,
-            "egitim_puani": 0-100 arası sayı,
-            "deneyim_puani": 0-100 arası sayı,
-            "beceri_puani": 0-100 arası sayı,
-            "proje_puani": 0-100 arası sayı
-          }},
-          "beceriler": {{
-            "teknik_beceriler": ["Beceri 1", "Beceri 2"],
-            "yazilim_dilleri": ["Dil 1", "Dil 2"],
-            "diller": ["Dil 1 (Seviye)", "Dil 2 (Seviye)"],
-            "soft_beceriler": ["Beceri 1", "Beceri 2"]
-          }},
-          "egitim_bilgileri": [
-            {{
-              "okul": "Üniversite/Okul adı",
-              "bolum": "Bölüm",
-              "derece": "Lisans/Yüksek Lisans/Doktora",
-              "tarih": "2018-2022 veya benzeri tarih aralığı"
-            }}
-          ],
-          "is_deneyimi": [
-            {{
-              "sirket": "Şirket adı",
-              "pozisyon": "Pozisyon",
-              "tarih": "2018-2022 veya benzeri tarih aralığı",
-              "sorumluluklar": ["Sorumluluk 1", "Sorumluluk 2"]
-            }}
-          ],
-          "projeler": [
-            {{
-              "proje_adi": "Proje adı",
-              "aciklama": "Kısa açıklama",
-              "kullanilan_teknolojiler": ["Teknoloji 1", "Teknoloji 2"]
-            }}
-          ],
-          "guclu_yonler": ["Güçlü yön 1", "Güçlü yön 2"],
-          "gelistirilmesi_gereken_yonler": ["Geliştirilmesi gereken yön 1", "Geliştirilmesi gereken yön 2"],
-          "uygun_pozisyonlar": ["Pozisyon 1", "Pozisyon 2"],
-          "yetenek_ozeti": "Kişinin yeteneklerini, deneyimlerini ve eğitimini özetleyen 3-5 cümle"
-        }}
-        ```
-        
-        ## ÖNEMLİ UYARILAR:
-        - SADECE JSON formatında çıktı ver
-        - JSON formatı bozuk olursa CV analizi BAŞARISIZ olacak
-        - Her alan için veri bulunamazsa "Belirtilmemiş" veya boş dizi [] kullan
-        
-        JSON çıktını kontrol et ve eksik parantez olmadığından emin ol!
-        """
+        # Sabit önek + CV'ye özgü sonek
+        prompt = DETAILED_ANALYSIS_TEMPLATE.build(text=text, position_context=position_context)
         
         try:
             start_time = time.time()
             
             # LLM modeline istek gönder (Ollama API)
-            payload = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.2,  # Daha düşük sıcaklık = daha deterministik
-                    "num_predict": 4096, # Daha uzun yanıt
-                    "stop": ["```"]      # JSON bloğu bitiminde dur
-                }
-            }
-            
-            response = requests.post("http://localhost:11434/api/generate", json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                # Sadece metni al
-                output = result.get("response", "")
-                elapsed_time = time.time() - start_time
-                self.logger.info(f"CV analizi tamamlandı - {elapsed_time:.2f} saniye")
-                return output
-            else:
-                self.logger.error(f"LLM istek hatası: {response.status_code}")
-                return f"LLM istek hatası: {response.status_code}"
+            output = self._backend().generate(
+                prompt,
+                max_tokens=4096,  # Daha uzun yanıt
+                temperature=0.2,  # Daha düşük sıcaklık = daha deterministik
+                stop=["```"]      # JSON bloğu bitiminde dur
+            )
+            elapsed_time = time.time() - start_time
+            self.logger.info(f"CV analizi tamamlandı - {elapsed_time:.2f} saniye")
+            return output
         except Exception as e:
             self.logger.error(f"LLM istek hatası: {str(e)}")
             return f"LLM istek hatası: {str(e)}"
@@ -362,32 +380,26 @@ class GelismisCVAnaliz:
             start_time = time.time()
             
             # LLM modeline istek gönder (Ollama API) 
-            payload = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,  # Çok düşük sıcaklık
-                    "num_predict": 4096,
-                    "stop": ["```"]
-                }
-            }
-            
-            response = requests.post("http://localhost:11434/api/generate", json=payload)
-            
-            if response.status_code == 200:
-                result = response.json()
-                output = result.get("response", "")
-                elapsed_time = time.time() - start_time
-                self.logger.info(f"Basit format CV analizi tamamlandı - {elapsed_time:.2f} saniye")
-                return output
-            else:
-                self.logger.error(f"LLM istek hatası (basit format): {response.status_code}")
-                return f"LLM istek hatası: {response.status_code}"
+            output = self._backend().generate(
+                prompt,
+                max_tokens=4096,
+                temperature=0.1,  # Çok düşük sıcaklık
+                stop=["```"]
+            )
+            elapsed_time = time.time() - start_time
+            self.logger.info(f"Basit format CV analizi tamamlandı - {elapsed_time:.2f} saniye")
+            return output
         except Exception as e:
             self.logger.error(f"LLM istek hatası (basit format): {str(e)}")
             return f"LLM istek hatası: {str(e)}"
             
+    def _extract_json(self, text):
+        """LLM yanıtından JSON verisini tek geçişte çıkarır ve düzeltir"""
+        cv_data, repairs = repair_json(text or "")
+        if repairs:
+            self.logger.info(f"LLM yanıtındaki JSON düzeltildi: {', '.join(repairs)}")
+        return cv_data
+    
     def _is_valid_cv_data(self, data):
         """Analiz sonucunun geçerli olup olmadığını kontrol eder"""
         if not isinstance(data, dict):
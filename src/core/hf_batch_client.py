@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hugging Face Inference API için toplu (batched) ve yeniden denemeli istemci.
+
+Aynı anda gelen üretim istekleri kısa bir pencere içinde biriktirilip tek bir
+istekte `inputs` listesi olarak gönderilir. Model yüklenirken dönen 503
+yanıtlarında `estimated_time` kadar (üstel geri çekilmeyle) beklenip yeniden
+denenir. Bağlantılar havuzlu bir oturumda yeniden kullanılır; adres
+HF_API_URL ile yerel bir yedek sunucuya yönlendirilebilir.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HF_API_URL = "https://api-inference.huggingface.co/models"
+HF_URL_ENV = "HF_API_URL"
+HF_TOKEN_ENV = "HF_API_TOKEN"
+HF_MODEL_ENV = "HF_MODEL"
+
+DEFAULT_BATCH_WINDOW = 0.05
+DEFAULT_MAX_BATCH_SIZE = 8
+# Geri çekilme süresi her denemede ikiye katlanır, bu değeri aşmaz
+MAX_BACKOFF = 60.0
+
+
+class HFAPIError(RuntimeError):
+    """Inference API'nin yeniden denenemeyen hata yanıtı"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"API hatası: {status_code} - {message[:200]}")
+        self.status_code = status_code
+
+
+class HFBatchClient:
+    """Eşzamanlı üretim isteklerini toplu isteklerde birleştiren Inference API istemcisi"""
+
+    def __init__(self, model: str, api_token: Optional[str] = None, base_url: Optional[str] = None,
+                 batch_window: float = DEFAULT_BATCH_WINDOW, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 timeout: float = 120.0, max_retries: int = 5, max_wait: float = 300.0, pool_size: int = 4):
+        """
+        Args:
+            model (str): Model adı (ör. meta-llama/Meta-Llama-3-8B-Instruct)
+            api_token (str, optional): Hugging Face API anahtarı
+            base_url (str, optional): Model adresinin öneki (None ise HF_API_URL veya resmi API)
+            batch_window (float): İsteklerin biriktirileceği süre (saniye)
+            max_batch_size (int): Tek istekte gönderilecek en fazla girdi
+            timeout (float): Tek HTTP isteğinin zaman aşımı (saniye)
+            max_retries (int): 503/429 yanıtlarında en fazla yeniden deneme sayısı
+            max_wait (float): Yeniden denemeler için toplam bekleme üst sınırı (saniye)
+            pool_size (int): Havuzda tutulacak bağlantı sayısı
+        """
+        base_url = base_url or os.environ.get(HF_URL_ENV, DEFAULT_HF_API_URL)
+        self.model = model
+        self.url = f"{base_url.rstrip('/')}/{model}"
+        self.batch_window = batch_window
+        self.max_batch_size = max(1, max_batch_size)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_token:
+            self.session.headers["Authorization"] = f"Bearer {api_token}"
+
+        # Aynı parametrelerle gelen istekler aynı gruba biriktirilir
+        self._pending: Dict[Tuple, List[Tuple[str, asyncio.Future]]] = {}
+        self._flush_tasks: Dict[Tuple, asyncio.Task] = {}
+        self._stats_lock = threading.Lock()
+        self.stats = {"istek": 0, "toplu_istek": 0, "yeniden_deneme": 0, "hata": 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def post_batch(self, prompts: List[str], parameters: Dict[str, Any]) -> List[str]:
+        """
+        Girdileri tek istekte gönderir (engelleyici)
+
+        503 "model yükleniyor" ve 429 yanıtlarında `estimated_time` (yoksa üstel
+        geri çekilme) kadar beklenip yeniden denenir.
+
+        Args:
+            prompts (List[str]): Girdiler
+            parameters (Dict[str, Any]): Üretim parametreleri
+
+        Returns:
+            List[str]: Girdi sırasıyla üretilen metinler
+
+        Raises:
+            HFAPIError: Yeniden denenemeyen hata veya deneme hakkı tükendiğinde
+        """
+        payload = {
+            "inputs": prompts if len(prompts) > 1 else prompts[0],
+            "parameters": {**parameters, "return_full_text": False},
+        }
+        backoff = 1.0
+        waited = 0.0
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                self._count("hata")
+                raise HFAPIError(0, str(e)) from e
+
+            if response.status_code == 200:
+                self._count("toplu_istek")
+                self._count("istek", len(prompts))
+                return self._parse_outputs(response.json(), len(prompts))
+
+            if response.status_code not in (429, 503) or attempt == self.max_retries:
+                self._count("hata")
+                raise HFAPIError(response.status_code, response.text)
+
+            try:
+                estimated = float(response.json().get("estimated_time", 0))
+            except (ValueError, AttributeError):
+                estimated = 0.0
+            # Sunucunun tahmini varsa ona uyulur, yoksa üstel geri çekilme uygulanır
+            delay = min(estimated if estimated > 0 else backoff, MAX_BACKOFF, self.max_wait - waited)
+            if delay <= 0:
+                self._count("hata")
+                raise HFAPIError(response.status_code, response.text)
+            logger.info(f"Model hazır değil ({response.status_code}), {delay:.1f} sn sonra yeniden denenecek")
+            self._count("yeniden_deneme")
+            time.sleep(delay)
+            waited += delay
+            backoff = min(backoff * 2, MAX_BACKOFF)
+        raise HFAPIError(503, "Deneme hakkı tükendi")
+
+    @staticmethod
+    def _parse_outputs(result: Any, expected: int) -> List[str]:
+        """Tekli ([{...}]) ve toplu ([[{...}], ...]) yanıtları metin listesine çevirir"""
+        if expected == 1 and isinstance(result, list) and result and isinstance(result[0], dict):
+            result = [result]
+        if not isinstance(result, list) or len(result) != expected:
+            raise HFAPIError(200, f"Beklenmeyen yanıt biçimi: {str(result)[:200]}")
+        outputs = []
+        for item in result:
+            if isinstance(item, list):
+                item = item[0] if item else {}
+            outputs.append(item.get("generated_text", "") if isinstance(item, dict) else "")
+        return outputs
+
+    def generate_sync(self, prompt: str, max_new_tokens: int = 1024, **parameters: Any) -> str:
+        """Tek bir promptu biriktirmeden (engelleyici) gönderir"""
+        return self.post_batch([prompt], {"max_new_tokens": max_new_tokens, **parameters})[0]
+
+    async def generate(self, prompt: str, max_new_tokens: int = 1024, **parameters: Any) -> str:
+        """
+        Promptu biriktirme kuyruğuna ekler ve üretilen metni bekler
+
+        Args:
+            prompt (str): Giriş metni
+            max_new_tokens (int): Üretilecek en fazla token
+            **parameters: Diğer üretim parametreleri (temperature vb.)
+
+        Returns:
+            str: Üretilen metin
+        """
+        parameters = {"max_new_tokens": max_new_tokens, **parameters}
+        key = tuple(sorted((name, tuple(value) if isinstance(value, list) else value)
+                           for name, value in parameters.items()))
+        future = asyncio.get_running_loop().create_future()
+        group = self._pending.setdefault(key, [])
+        group.append((prompt, future))
+
+        if len(group) >= self.max_batch_size:
+            self._dispatch(key, parameters)
+        elif key not in self._flush_tasks:
+            self._flush_tasks[key] = asyncio.create_task(self._flush_later(key, parameters))
+        return await future
+
+    async def _flush_later(self, key: Tuple, parameters: Dict[str, Any]) -> None:
+        await asyncio.sleep(self.batch_window)
+        self._flush_tasks.pop(key, None)
+        self._dispatch(key, parameters)
+
+    def _dispatch(self, key: Tuple, parameters: Dict[str, Any]) -> None:
+        """Bekleyen grubu kuyruktan alıp arka planda gönderir"""
+        group = self._pending.pop(key, [])
+        task = self._flush_tasks.pop(key, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        if group:
+            asyncio.create_task(self._send(group, parameters))
+
+    async def _send(self, group: List[Tuple[str, asyncio.Future]], parameters: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        prompts = [prompt for prompt, _ in group]
+        try:
+            outputs = await loop.run_in_executor(None, self.post_batch, prompts, parameters)
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), output in zip(group, outputs):
+            if not future.done():
+                future.set_result(output)
+
+    def close(self) -> None:
+        self.session.close()
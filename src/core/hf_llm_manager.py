@@ -1,28 +1,21 @@
-import requests
-import json
+import asyncio
 import logging
+import os
+import threading
+from typing import Optional
+
+from src.core.chunked_analysis import ChunkedCVAnalyzer, HF_SCHEMA
+from src.core.hf_batch_client import HF_MODEL_ENV, HF_TOKEN_ENV, HF_URL_ENV, HFAPIError, HFBatchClient
+from src.core.llm_backend import REMOTE_CONCURRENCY, HFBackend, ManagedBackend, get_backend_manager
+from src.utils.json_repair import repair_json
 
 logger = logging.getLogger(__name__)
 
-class HFLLMManager:
-    def __init__(self, api_token, model="meta-llama/Meta-Llama-3-8B-Instruct"):
-        """
-        Hugging Face API ile LLM yönetici sınıfı
-        """
-        self.api_token = api_token
-        self.model = model
-        self.api_url = f"https://api-inference.huggingface.co/models/{model}"
-        self.headers = {"Authorization": f"Bearer {api_token}"}
-        
-    def load_model(self):
-        """API ile çalışırken model yüklemeye gerek yok"""
-        logger.info(f"Hugging Face API hazır: {self.model}")
-        return True
-        
-    def analyze_cv(self, cv_text):
-        """CV metnini Hugging Face API ile analiz eder"""
-        # JSON şablonu
-        json_template = '''
+# Bu uzunluğu aşan CV'ler kesilmek yerine bölüm bazlı parçalı analizle işlenir
+CHUNKED_ANALYSIS_THRESHOLD = 8000
+
+# JSON şablonu
+JSON_TEMPLATE = '''
 {
   "kisisel_bilgiler": {
     "isim": "Ad Soyad",
@@ -51,119 +44,168 @@ class HFLLMManager:
   }
 }
 '''
+
+class HFLLMManager:
+    def __init__(self, api_token, model="meta-llama/Meta-Llama-3-8B-Instruct", base_url=None,
+                 client: Optional[HFBatchClient] = None):
+        """
+        Hugging Face API ile LLM yönetici sınıfı
+
+        Args:
+            api_token (str): Hugging Face API anahtarı
+            model (str): Model adı
+            base_url (str, optional): API adresi öneki (yerel yedek sunucu için; None ise HF_API_URL)
+            client (HFBatchClient, optional): Paylaşılacak toplu istemci
+        """
+        self.api_token = api_token
+        self.model = model
+        # Eşzamanlı analizler tek istekte toplanır, 503 yanıtlarında yeniden denenir
+        self.client = client or HFBatchClient(model, api_token=api_token, base_url=base_url)
+        self.api_url = self.client.url
         
-        # Prompt oluştur (Llama formatında)
-        prompt = f"""Bir CV uzmanı olarak, aşağıdaki özgeçmişi analiz et ve sonuçları JSON formatında döndür.
+    @property
+    def backend(self) -> ManagedBackend:
+        """
+        Üretim isteklerinin geçtiği yönetilen backend (metrikler ve eşzamanlılık sınırı)
+
+        Paylaşılan yönetici "hf" adıyla, diğerleri API adresiyle kaydedilir.
+        """
+        name = HFBackend.name if self is _shared_manager else f"{HFBackend.name}:{self.api_url}"
+        return get_backend_manager().ensure(name, lambda: HFBackend(self), max_concurrency=REMOTE_CONCURRENCY)
+
+    def load_model(self):
+        """API ile çalışırken model yüklemeye gerek yok"""
+        logger.info(f"Hugging Face API hazır: {self.model}")
+        return True
+        
+    def _query(self, prompt, max_new_tokens=1024):
+        """Tek bir prompt gönderir ve yalnızca üretilen metni döndürür (hata durumunda boş metin)"""
+        try:
+            return self.backend.generate(prompt, max_tokens=max_new_tokens)
+        except HFAPIError as e:
+            logger.error(str(e))
+            return ""
+        
+    def _analyze_cv_chunked(self, cv_text):
+        """Uzun CV metnini bölüm bazlı promptlarla analiz eder"""
+        logger.info(f"CV metni uzun ({len(cv_text)} karakter), parçalı analiz kullanılıyor")
+        analyzer = ChunkedCVAnalyzer(generate_fn=self._query, schema=HF_SCHEMA, max_workers=4)
+        try:
+            result = analyzer.analyze(cv_text)
+        except Exception as e:
+            logger.error(f"Parçalı analiz hatası: {str(e)}")
+            return {"error": f"Parçalı analiz hatası: {str(e)}", "raw_response": ""}
+        if not result.get("kisisel_bilgiler") and not result.get("is_deneyimi"):
+            return {"error": "Parçalı analiz sonuç üretmedi", "raw_response": ""}
+        return result
+
+    def _build_prompt(self, cv_text):
+        """CV analiz promptunu oluşturur (Llama formatında)"""
+        return f"""Bir CV uzmanı olarak, aşağıdaki özgeçmişi analiz et ve sonuçları JSON formatında döndür.
 
 CV metni:
 {cv_text[:8000]}
 
 Analiz sonucunu aşağıdaki JSON formatında döndür:
 ```json
-{json_template}
+{JSON_TEMPLATE}
 ```
 """
+
+    def _parse_response(self, response_text, prompt):
+        """Üretilen metinden analiz JSON'unu çıkarır"""
+        logger.info(f"API yanıtı alındı, yanıt uzunluğu: {len(response_text)}")
+        
+        # Bazı sunucular promptu da döndürür; şablondaki örnek JSON ayrıştırılmasın
+        if response_text.startswith(prompt):
+            response_text = response_text[len(prompt):]
+        
+        result_dict, repairs = repair_json(response_text)
+        if not result_dict:
+            logger.warning(f"JSON formatı bulunamadı! Yanıt: {response_text[:500]}")
+            return {"error": "JSON formatı bulunamadı", "raw_response": response_text[:500]}
+        
+        if repairs:
+            logger.info(f"JSON yanıtı düzeltildi: {', '.join(repairs)}")
+        logger.info(f"JSON başarıyla ayrıştırıldı, alanlar: {', '.join(result_dict.keys())}")
+        return result_dict
+
+    @staticmethod
+    def _api_error(error):
+        """API hatasını analiz hata yanıtına çevirir"""
+        logger.error(str(error))
+        if error.status_code == 503:
+            return {
+                "error": "Model yükleniyor. Lütfen biraz bekleyin ve tekrar deneyin.",
+                "raw_response": str(error)
+            }
+        return {"error": str(error), "raw_response": str(error)}
+
+    @staticmethod
+    def _request_error(error):
+        """Bağlantı ve beklenmeyen hataları analiz hata yanıtına çevirir"""
+        logger.error(f"API isteği hatası: {str(error)}")
+        return {"error": f"API isteği hatası: {str(error)}", "raw_response": ""}
+        
+    def analyze_cv(self, cv_text):
+        """CV metnini Hugging Face API ile analiz eder"""
+        if len(cv_text) > CHUNKED_ANALYSIS_THRESHOLD:
+            return self._analyze_cv_chunked(cv_text)
         
+        prompt = self._build_prompt(cv_text)
+        logger.info(f"API isteği: {self.api_url}, prompt uzunluğu: {len(prompt)}")
         try:
-            logger.info(f"CV metni uzunluğu: {len(cv_text)}, API analizi başlıyor...")
-            
-            # API isteği parametrelerini logla
-            logger.info(f"API isteği: {self.api_url}, kullanılan model: {self.model}")
-            
-            # API isteği gönder
-            payload = {"inputs": prompt, "parameters": {"max_new_tokens": 2000}}
-            logger.info(f"API gönderiliyor, prompt uzunluğu: {len(prompt)}")
-            
-            try:
-                response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=60)
-                logger.info(f"API yanıt durum kodu: {response.status_code}")
-            except requests.exceptions.Timeout:
-                logger.error("API isteği zaman aşımına uğradı (60 saniye)")
-                return {"error": "API isteği zaman aşımına uğradı", "raw_response": "Zaman aşımı hatası"}
-            except requests.exceptions.ConnectionError:
-                logger.error("API bağlantı hatası")
-                return {"error": "API bağlantı hatası", "raw_response": "Bağlantı hatası"}
-            
-            if response.status_code != 200:
-                error_msg = f"API hatası: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                
-                # Model hala yükleniyor mu?
-                if "loading" in response.text.lower():
-                    logger.info("Model hala yükleniyor, lütfen bekleyin...")
-                    return {
-                        "error": "Model yükleniyor. Lütfen biraz bekleyin ve tekrar deneyin.",
-                        "raw_response": response.text
-                    }
-                
-                return {"error": error_msg, "raw_response": response.text}
-                
-            # API yanıtını al
-            try:
-                result = response.json()
-                logger.info(f"API yanıtı başarıyla alındı ve JSON'a dönüştürüldü")
-            except json.JSONDecodeError:
-                logger.error(f"API yanıtı JSON formatında değil: {response.text[:500]}")
-                return {"error": "API yanıtı JSON formatında değil", "raw_response": response.text[:500]}
-            
-            if isinstance(result, list) and len(result) > 0:
-                response_text = result[0].get("generated_text", "")
-                logger.info(f"Liste formatında yanıt alındı, uzunluk: {len(response_text)}")
-            else:
-                response_text = str(result)
-                logger.info(f"Tek değer formatında yanıt alındı, uzunluk: {len(response_text)}")
-                
-            logger.info(f"API yanıtı alındı, yanıt uzunluğu: {len(response_text)}")
-            
-            # JSON yanıtını ayıkla
-            try:
-                # Önce ```json ve ``` arasındaki içeriği bulmaya çalış
-                if "```json" in response_text and "```" in response_text.split("```json")[1]:
-                    json_str = response_text.split("```json")[1].split("```")[0].strip()
-                    logger.info(f"JSON kod bloğu bulundu, uzunluk: {len(json_str)}")
-                else:
-                    # Eğer bulunamazsa, { ve } arasındaki içeriği al
-                    json_start = response_text.find('{')
-                    json_end = response_text.rfind('}') + 1
-                    
-                    if json_start != -1 and json_end > json_start:
-                        json_str = response_text[json_start:json_end]
-                        logger.info(f"JSON sınırları bulundu, uzunluk: {len(json_str)}")
-                    else:
-                        logger.warning(f"JSON formatı bulunamadı! Yanıt: {response_text[:500]}")
-                        return {"error": "JSON formatı bulunamadı", "raw_response": response_text[:500]}
-            except Exception as e:
-                logger.error(f"JSON ayıklama hatası: {str(e)}")
-                return {"error": f"JSON ayıklama hatası: {str(e)}", "raw_response": response_text[:500]}
-                    
-            try:
-                result_dict = json.loads(json_str)
-                logger.info(f"JSON başarıyla ayrıştırıldı, alanlar: {', '.join(result_dict.keys())}")
-                return result_dict
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON ayrıştırma hatası: {e}")
-                
-                # JSON düzeltme denemeleri
-                logger.info("JSON düzeltme denemeleri yapılıyor...")
-                try:
-                    # Tek tırnaklı değerleri çift tırnaklı yap
-                    corrected_json = json_str.replace("'", '"')
-                    # Virgül düzeltmeleri
-                    corrected_json = corrected_json.replace(",\n}", "\n}")
-                    corrected_json = corrected_json.replace(",\n]", "\n]")
-                    
-                    result_dict = json.loads(corrected_json)
-                    logger.info("JSON düzeltme başarılı, veri ayrıştırıldı")
-                    return result_dict
-                except json.JSONDecodeError as e2:
-                    logger.error(f"Düzeltilen JSON ayrıştırılamadı: {e2}")
-                    return {
-                        "error": f"JSON ayrıştırma hatası: {str(e2)}", 
-                        "raw_response": response_text[:500]
-                    }
-                
+            response_text = self.backend.generate(prompt, max_tokens=2000)
+            return self._parse_response(response_text, prompt)
+        except HFAPIError as e:
+            return self._api_error(e)
         except Exception as e:
-            logger.error(f"API isteği sırasında beklenmeyen hata: {str(e)}")
-            import traceback
-            logger.error(f"Hata ayrıntıları: {traceback.format_exc()}")
-            return {"error": f"API hatası: {str(e)}", "raw_response": "API isteği sırasında hata oluştu"} 
\ No newline at end of file
+            return self._request_error(e)
+
+    async def analyze_cv_async(self, cv_text):
+        """
+        CV metnini analiz eder; eşzamanlı çağrılar toplu API isteklerinde birleştirilir
+
+        Args:
+            cv_text (str): CV metni
+
+        Returns:
+            Dict[str, Any]: Analiz sonucu veya {"error", "raw_response"}
+        """
+        if len(cv_text) > CHUNKED_ANALYSIS_THRESHOLD:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._analyze_cv_chunked, cv_text)
+        
+        prompt = self._build_prompt(cv_text)
+        try:
+            # Eşzamanlı çağrılar backend'in toplu istemcisinde tek istekte birleştirilir
+            response_text = await self.backend.agenerate(prompt, max_tokens=2000)
+            return self._parse_response(response_text, prompt)
+        except HFAPIError as e:
+            return self._api_error(e)
+        except Exception as e:
+            return self._request_error(e)
+
+
+_shared_manager: Optional[HFLLMManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_manager() -> Optional[HFLLMManager]:
+    """
+    Süreç genelinde paylaşılan HF yöneticisini döndürür
+
+    Tek bir toplu istemci kullanıldığından farklı çağıranların eşzamanlı
+    istekleri aynı API isteğinde birleştirilir.
+
+    Returns:
+        Optional[HFLLMManager]: HF_API_TOKEN veya HF_API_URL tanımlı değilse None
+    """
+    global _shared_manager
+    if not (os.environ.get(HF_TOKEN_ENV) or os.environ.get(HF_URL_ENV)):
+        return None
+    with _shared_lock:
+        if _shared_manager is None:
+            model = os.environ.get(HF_MODEL_ENV)
+            _shared_manager = HFLLMManager(os.environ.get(HF_TOKEN_ENV), **({"model": model} if model else {}))
+        return _shared_manager
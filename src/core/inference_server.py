@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yerel, sürekli toplu işleme (continuous batching) yapan çıkarım sunucusu.
+
+GGUF modeli tek bir süreçte (mmap ile) yüklenir ve llama.cpp'nin `llama-server`
+uygulaması ile yerel bir portta sunulur. Sunucu, eşzamanlı istekleri paylaşılan
+KV-cache slotlarında birlikte işler (`--parallel`, `--cont-batching`). Böylece
+birden fazla API işçisi modelin tek kopyasını paylaşır.
+
+Kullanım:
+    python -m src.core.inference_server --model models/model.gguf --parallel 4
+"""
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# LLMManager bu ortam değişkeni tanımlıysa modeli kendisi yüklemek yerine sunucuyu kullanır
+SERVER_URL_ENV = "LLM_SERVER_URL"
+
+
+class InferenceServer:
+    """llama-server sürecini başlatan, izleyen ve durduran yönetici sınıf"""
+
+    def __init__(self, model_path: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 parallel: int = 4, context_per_slot: int = 4096, threads: Optional[int] = None,
+                 batch_size: int = 512, use_mmap: bool = True, binary: Optional[str] = None):
+        """
+        Args:
+            model_path (str): GGUF model dosyasının yolu
+            host (str): Dinlenecek adres (varsayılan yalnızca yerel)
+            port (int): Dinlenecek port
+            parallel (int): Aynı anda işlenecek dizi (KV-cache slotu) sayısı
+            context_per_slot (int): Her slot için bağlam uzunluğu (token)
+            threads (int, optional): CPU iş parçacığı sayısı (None ise çekirdek sayısı)
+            batch_size (int): Prompt işleme toplu boyutu
+            use_mmap (bool): Model dosyasını bellek eşlemeli (mmap) yükle
+            binary (str, optional): llama-server çalıştırılabilir dosyası
+        """
+        self.model_path = Path(model_path)
+        self.host = host
+        self.port = port
+        self.parallel = max(1, parallel)
+        self.context_per_slot = context_per_slot
+        self.threads = threads or os.cpu_count() or 4
+        self.batch_size = batch_size
+        self.use_mmap = use_mmap
+        self.binary = binary or os.environ.get("LLAMA_SERVER_BIN") or shutil.which("llama-server")
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        """Sunucunun temel adresi"""
+        return f"http://{self.host}:{self.port}"
+
+    def build_command(self) -> List[str]:
+        """llama-server komut satırını oluşturur"""
+        if not self.binary:
+            raise FileNotFoundError(
+                "llama-server bulunamadı. llama.cpp'yi derleyip PATH'e ekleyin "
+                "veya LLAMA_SERVER_BIN ortam değişkenini ayarlayın."
+            )
+        command = [
+            self.binary,
+            "-m", str(self.model_path),
+            "--host", self.host,
+            "--port", str(self.port),
+            # Toplam bağlam tüm slotlar arasında paylaştırılır
+            "-c", str(self.context_per_slot * self.parallel),
+            "--parallel", str(self.parallel),
+            "--cont-batching",
+            "-t", str(self.threads),
+            "-b", str(self.batch_size),
+        ]
+        if not self.use_mmap:
+            command.append("--no-mmap")
+        return command
+
+    def start(self, timeout: float = 300.0) -> None:
+        """Sunucuyu başlatır ve model yüklenene kadar bekler"""
+        if not self.model_path.exists():
+            raise ValueError(f"Model dosyası bulunamadı: {self.model_path}")
+        if self.is_running():
+            return
+
+        command = self.build_command()
+        logger.info(f"Çıkarım sunucusu başlatılıyor: {' '.join(command)}")
+        self.process = subprocess.Popen(command)
+
+        client = InferenceClient(self.url)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Çıkarım sunucusu beklenmedik şekilde kapandı (kod: {self.process.returncode})")
+            if client.is_ready():
+                logger.info(f"Çıkarım sunucusu hazır: {self.url} ({self.parallel} paralel slot)")
+                return
+            time.sleep(1)
+
+        self.stop()
+        raise TimeoutError(f"Çıkarım sunucusu {timeout:.0f} saniye içinde hazır olmadı")
+
+    def is_running(self) -> bool:
+        """Sürecin çalışıp çalışmadığını kontrol eder"""
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self) -> None:
+        """Sunucu sürecini durdurur"""
+        if self.is_running():
+            logger.info("Çıkarım sunucusu durduruluyor...")
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+class InferenceClient:
+    """Yerel çıkarım sunucusu için ince istemci"""
+
+    def __init__(self, base_url: str, timeout: float = 300.0):
+        """
+        Args:
+            base_url (str): Sunucu adresi (ör. http://127.0.0.1:8765)
+            timeout (float): İstek zaman aşımı (saniye)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # Bağlantılar eşzamanlı isteklerde yeniden kullanılır
+        self.session = requests.Session()
+
+    def is_ready(self) -> bool:
+        """Sunucunun model yükleyip istek kabul etmeye hazır olup olmadığını kontrol eder"""
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=2)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def get_slot_count(self) -> int:
+        """Sunucudaki paralel slot sayısını döndürür (bilinmiyorsa 1)"""
+        try:
+            response = self.session.get(f"{self.base_url}/props", timeout=2)
+            if response.status_code == 200:
+                return int(response.json().get("total_slots", 1))
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        return 1
+
+    def generate(self, prompt: str, temperature: float = 0.1, top_p: float = 0.95, top_k: int = 40,
+                 repetition_penalty: float = 1.1, max_new_tokens: int = 4096,
+                 stop: Optional[List[str]] = None) -> str:
+        """
+        Sunucuda metin üretir
+
+        Args:
+            prompt (str): Giriş metni
+            temperature (float): Sıcaklık
+            top_p (float): Top-p örnekleme
+            top_k (int): Top-k örnekleme
+            repetition_penalty (float): Tekrar cezası
+            max_new_tokens (int): Üretilecek maksimum token sayısı
+            stop (List[str], optional): Durdurma dizileri
+
+        Returns:
+            str: Üretilen metin
+        """
+        payload: Dict[str, Any] = {
+            "prompt": prompt,
+            "temperature": temperature,
+            "top_p": top_p,
+            "top_k": top_k,
+            "repeat_penalty": repetition_penalty,
+            "n_predict": max_new_tokens,
+            "stream": False,
+            # Slotta önceki istekle ortak olan önek (sabit talimat/şema) yeniden değerlendirilmez
+            "cache_prompt": True,
+        }
+        if stop:
+            payload["stop"] = stop
+
+        response = self.session.post(f"{self.base_url}/completion", json=payload, timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"Çıkarım sunucusu hatası: {response.status_code} - {response.text[:200]}")
+        return response.json().get("content", "")
+
+
+def main():
+    """Komut satırından çıkarım sunucusunu başlatır"""
+    parser = argparse.ArgumentParser(description="Yerel sürekli toplu işleme çıkarım sunucusu")
+    parser.add_argument("--model", required=True, help="GGUF model dosyası")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--parallel", type=int, default=4, help="Paralel dizi (slot) sayısı")
+    parser.add_argument("--ctx", type=int, default=4096, help="Slot başına bağlam uzunluğu")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--no-mmap", action="store_true", help="mmap kullanma")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = InferenceServer(args.model, host=args.host, port=args.port, parallel=args.parallel,
+                             context_per_slot=args.ctx, threads=args.threads, use_mmap=not args.no_mmap)
+    server.start()
+    print(f"Sunucu hazır. LLMManager için: export {SERVER_URL_ENV}={server.url}")
+    try:
+        server.process.wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tüm LLM giriş noktaları için ortak backend arayüzü.
+
+Projede dört ayrı LLM yolu vardır: ctransformers (src/core/llm_manager),
+llama_cpp (src/models/llm_manager), Ollama (src/api/ollama_connector) ve
+Hugging Face Inference API (src/core/hf_llm_manager). Bu modül her biri için
+aynı arayüzü (generate, generate_stream, batch_generate, tokenize) ve yetenek
+bayraklarını sunan bağdaştırıcılar tanımlar.
+
+BackendManager bu arayüzün üzerinde çalışır: backendleri ilk kullanımda
+oluşturur, eşzamanlılığı sınırlar, yanıt önbelleği ve metrikleri her backend
+için tek noktadan uygular. Giriş noktaları üretim isteklerini süreç genelindeki
+yöneticiden aldıkları backend üzerinden gönderir; paylaşılan örnekler (varsayılan
+model yöneticisi, Ollama havuzu, HF istemcisi) genel adla, diğerleri kaynağı
+belirten adla ("ollama:<model>@<sunucular>" gibi) kaydedilir.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.hf_batch_client import HF_TOKEN_ENV, HF_URL_ENV
+from src.core.prompt_cache import OLLAMA_KEEP_ALIVE
+from src.core.token_budget import TokenBudgetPlanner
+
+logger = logging.getLogger(__name__)
+
+# Uzak backendlerde aynı anda gönderilecek istek sayısı (yerel modeller tek istek işler)
+REMOTE_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class BackendCapabilities:
+    """Backend'in desteklediği özellikler"""
+    streaming: bool = False
+    batching: bool = False
+    grammar: bool = False
+    tokenize: bool = False
+    # Model başka bir süreçte/sunucuda çalışıyor
+    remote: bool = False
+
+
+class LLMBackend(ABC):
+    """
+    Ortak backend arayüzü
+
+    Alt sınıflar generate() ve tokenize() metodlarını uygular (tokenizer'ı olmayan
+    backendler NotImplementedError fırlatır). Desteklenmeyen yetenekler için
+    varsayılan davranışlar: akış tek parça, toplu üretim sıralı çağrılar, token
+    sayımı karakter tahmini.
+    """
+
+    name = "backend"
+    capabilities = BackendCapabilities()
+
+    @abstractmethod
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                 stop: Optional[List[str]] = None, grammar: Optional[str] = None, **options: Any) -> str:
+        """
+        Prompt için metin üretir
+
+        Args:
+            prompt (str): Giriş metni
+            max_tokens (int): Üretilecek en fazla token
+            temperature (float): Sıcaklık
+            stop (List[str], optional): Durdurma dizileri
+            grammar (str, optional): GBNF dilbilgisi (yalnızca capabilities.grammar ise kullanılır)
+            **options: Backend'e özgü örnekleme seçenekleri (top_p, top_k, repetition_penalty)
+
+        Returns:
+            str: Üretilen metin
+        """
+
+    def generate_stream(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> Iterator[str]:
+        """Üretilen metni parça parça döndürür"""
+        yield self.generate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+
+    def batch_generate(self, prompts: List[str], max_tokens: int = 1024, temperature: float = 0.1,
+                       stop: Optional[List[str]] = None) -> List[str]:
+        """Birden fazla prompt için metin üretir (girdi sırasıyla)"""
+        return [self.generate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+                for prompt in prompts]
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> str:
+        """generate() metodunun olay döngüsünü engellemeyen sürümü"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.generate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop))
+
+    @abstractmethod
+    def tokenize(self, text: str) -> List[int]:
+        """Metni modelin token kimliklerine çevirir"""
+
+    def count_tokens(self, text: str) -> int:
+        """Token sayısı (tokenizer yoksa tahmin)"""
+        if self.capabilities.tokenize:
+            return len(self.tokenize(text))
+        return TokenBudgetPlanner().count(text)
+
+    def close(self) -> None:
+        """Backend kaynaklarını serbest bırakır"""
+
+
+class CTransformersBackend(LLMBackend):
+    """src.core.llm_manager.LLMManager (ctransformers veya llama-server) bağdaştırıcısı"""
+
+    name = "ctransformers"
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+        local = manager.client is None
+        self.capabilities = BackendCapabilities(streaming=local, tokenize=local, remote=not local)
+
+    def _model(self) -> Any:
+        if not self.manager.has_model():
+            self.manager.load_model()
+        return self.manager.model
+
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                 stop: Optional[List[str]] = None, grammar: Optional[str] = None, **options: Any) -> str:
+        if self.manager.client is not None:
+            return self.manager.client.generate(prompt, temperature=temperature, max_new_tokens=max_tokens,
+                                                stop=stop, **options)
+        return self._model()(prompt, max_new_tokens=max_tokens, temperature=temperature, stop=stop or [],
+                             **options)
+
+    def generate_stream(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> Iterator[str]:
+        if self.manager.client is not None:
+            yield self.generate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+            return
+        yield from self._model()(prompt, max_new_tokens=max_tokens, temperature=temperature,
+                                 stop=stop or [], stream=True)
+
+    def tokenize(self, text: str) -> List[int]:
+        return self._model().tokenize(text)
+
+
+class LlamaCppBackend(LLMBackend):
+    """src.models.llm_manager.LLMManager (llama_cpp veya llama-server) bağdaştırıcısı"""
+
+    name = "llama_cpp"
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+        local = manager.client is None
+        self.capabilities = BackendCapabilities(streaming=local, grammar=local, tokenize=local, remote=not local)
+
+    def _ensure_model(self) -> None:
+        if self.manager.model is None and not self.manager.initialize_model():
+            raise RuntimeError("llama_cpp modeli yüklenemedi")
+
+    def _completion_args(self, max_tokens: int, temperature: float, stop: Optional[List[str]],
+                         grammar: Optional[str], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        args: Dict[str, Any] = {"max_tokens": max_tokens, "temperature": temperature, "top_p": 0.95,
+                                "stop": stop or [], "echo": False}
+        for name, value in (options or {}).items():
+            # llama_cpp tekrar cezasını repeat_penalty adıyla alır
+            args["repeat_penalty" if name == "repetition_penalty" else name] = value
+        if grammar:
+            from llama_cpp import LlamaGrammar
+            args["grammar"] = LlamaGrammar.from_string(grammar)
+        return args
+
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                 stop: Optional[List[str]] = None, grammar: Optional[str] = None, **options: Any) -> str:
+        if self.manager.client is not None:
+            return self.manager.client.generate(prompt, temperature=temperature, max_new_tokens=max_tokens,
+                                                stop=stop, **options)
+        self._ensure_model()
+        # Yöneticinin önek durumu önbelleği aynı modeli kullandığından üretim modelin kilidiyle yapılır
+        with self.manager.model_lock:
+            response = self.manager.model.create_completion(
+                prompt, **self._completion_args(max_tokens, temperature, stop, grammar, options))
+        return response["choices"][0]["text"]
+
+    def generate_stream(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> Iterator[str]:
+        if self.manager.client is not None:
+            yield self.generate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+            return
+        self._ensure_model()
+        with self.manager.model_lock:
+            for chunk in self.manager.model.create_completion(
+                    prompt, stream=True, **self._completion_args(max_tokens, temperature, stop, None)):
+                yield chunk["choices"][0]["text"]
+
+    def tokenize(self, text: str) -> List[int]:
+        self._ensure_model()
+        return self.manager.model.tokenize(text.encode("utf-8"))
+
+
+class OllamaBackend(LLMBackend):
+    """
+    Ollama bağdaştırıcısı (OllamaConnector ve GelismisCVAnaliz istekleri sunucu havuzundan geçer)
+    """
+
+    name = "ollama"
+    capabilities = BackendCapabilities(streaming=True, remote=True)
+
+    def __init__(self, pool: Any, model: str, keep_alive: str = OLLAMA_KEEP_ALIVE, timeout: float = 180):
+        self.pool = pool
+        self.model = model
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+    def _payload(self, prompt: str, max_tokens: int, temperature: float,
+                 stop: Optional[List[str]], extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"temperature": temperature, "num_predict": max_tokens}
+        if stop:
+            options["stop"] = stop
+        for name, value in (extra or {}).items():
+            # Ollama tekrar cezasını repeat_penalty adıyla alır
+            options["repeat_penalty" if name == "repetition_penalty" else name] = value
+        return {"model": self.model, "prompt": prompt, "keep_alive": self.keep_alive, "options": options}
+
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                 stop: Optional[List[str]] = None, grammar: Optional[str] = None, **options: Any) -> str:
+        payload = self._payload(prompt, max_tokens, temperature, stop, options)
+        return self.pool.generate(payload, timeout=self.timeout).get("response", "")
+
+    def generate_stream(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> Iterator[str]:
+        payload = self._payload(prompt, max_tokens, temperature, stop)
+        for chunk in self.pool.generate_stream(payload, timeout=self.timeout):
+            if chunk.get("response"):
+                yield chunk["response"]
+
+    def tokenize(self, text: str) -> List[int]:
+        raise NotImplementedError("Ollama backend'i tokenize desteklemiyor")
+
+
+class HFBackend(LLMBackend):
+    """src.core.hf_llm_manager.HFLLMManager bağdaştırıcısı (toplu istemci üzerinden)"""
+
+    name = "hf"
+    capabilities = BackendCapabilities(batching=True, remote=True)
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+        self.client = manager.client
+
+    @staticmethod
+    def _parameters(max_tokens: int, temperature: float, stop: Optional[List[str]],
+                    options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        parameters: Dict[str, Any] = {"max_new_tokens": max_tokens, "temperature": temperature, **(options or {})}
+        if stop:
+            parameters["stop"] = stop
+        return parameters
+
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                 stop: Optional[List[str]] = None, grammar: Optional[str] = None, **options: Any) -> str:
+        return self.client.post_batch([prompt], self._parameters(max_tokens, temperature, stop, options))[0]
+
+    def batch_generate(self, prompts: List[str], max_tokens: int = 1024, temperature: float = 0.1,
+                       stop: Optional[List[str]] = None) -> List[str]:
+        parameters = self._parameters(max_tokens, temperature, stop)
+        outputs: List[str] = []
+        for start in range(0, len(prompts), self.client.max_batch_size):
+            outputs.extend(self.client.post_batch(prompts[start:start + self.client.max_batch_size], parameters))
+        return outputs
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> str:
+        # Eşzamanlı çağrılar istemcide toplu isteklere birleştirilir
+        return await self.client.generate(prompt, **self._parameters(max_tokens, temperature, stop))
+
+    def tokenize(self, text: str) -> List[int]:
+        raise NotImplementedError("HF backend'i tokenize desteklemiyor")
+
+    def close(self) -> None:
+        self.client.close()
+
+
+@dataclass
+class BackendMetrics:
+    """Backend bazında istek metrikleri"""
+    requests: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    output_tokens: int = 0
+    total_seconds: float = 0.0
+    first_token_seconds: float = 0.0
+    streams: int = 0
+    in_flight: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        completed = self.requests - self.in_flight
+        data["avg_latency"] = round(self.total_seconds / completed, 3) if completed else 0.0
+        data["avg_ttft"] = round(self.first_token_seconds / self.streams, 3) if self.streams else 0.0
+        data["tokens_per_sec"] = round(self.output_tokens / self.total_seconds, 2) if self.total_seconds else 0.0
+        data["total_seconds"] = round(self.total_seconds, 3)
+        data["first_token_seconds"] = round(self.first_token_seconds, 3)
+        return data
+
+
+class ManagedBackend(LLMBackend):
+    """Bir backend'i eşzamanlılık sınırı, yanıt önbelleği ve metriklerle saran katman"""
+
+    def __init__(self, inner: LLMBackend, max_concurrency: int = 1, cache_size: int = 0):
+        """
+        Args:
+            inner (LLMBackend): Sarılan backend
+            max_concurrency (int): Aynı anda işlenecek en fazla istek
+            cache_size (int): Önbellekte tutulacak en fazla yanıt (0 ise önbellek kapalı)
+        """
+        self.inner = inner
+        self.name = inner.name
+        self.capabilities = inner.capabilities
+        self.cache_size = cache_size
+        self.metrics = BackendMetrics()
+        self._semaphore = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple, str]" = OrderedDict()
+
+    def _cache_get(self, key: Tuple) -> Optional[str]:
+        if not self.cache_size:
+            return None
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self.metrics.cache_hits += 1
+            return value
+
+    def _cache_put(self, key: Tuple, value: str) -> None:
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _start(self) -> float:
+        with self._lock:
+            self.metrics.requests += 1
+            self.metrics.in_flight += 1
+        return time.perf_counter()
+
+    def _finish(self, start: float, output: Optional[str], first_token: Optional[float] = None) -> None:
+        tokens = self.inner.count_tokens(output) if output else 0
+        with self._lock:
+            self.metrics.in_flight -= 1
+            self.metrics.total_seconds += time.perf_counter() - start
+            if output is None:
+                self.metrics.errors += 1
+            self.metrics.output_tokens += tokens
+            if first_token is not None:
+                self.metrics.streams += 1
+                self.metrics.first_token_seconds += first_token - start
+
+    def generate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                 stop: Optional[List[str]] = None, grammar: Optional[str] = None, **options: Any) -> str:
+        key = (prompt, max_tokens, temperature, tuple(stop or ()), grammar, tuple(sorted(options.items())))
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        with self._semaphore:
+            start = self._start()
+            output = None
+            try:
+                output = self.inner.generate(prompt, max_tokens=max_tokens, temperature=temperature,
+                                             stop=stop, grammar=grammar, **options)
+            finally:
+                self._finish(start, output)
+        self._cache_put(key, output)
+        return output
+
+    def generate_stream(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Üretilen metni parça parça döndürür
+
+        Eşzamanlılık slotu ilk parça istendiğinde alınır ve akış bittiğinde, hata
+        verdiğinde veya üreteç kapatıldığında bırakılır. Akışı yarıda bırakan
+        çağıranlar üreteci kapatmalıdır (bkz. stream()).
+        """
+        self._semaphore.acquire()
+        start = self._start()
+        first_token = None
+        parts: List[str] = []
+        output = None
+        try:
+            for chunk in self.inner.generate_stream(prompt, max_tokens=max_tokens, temperature=temperature,
+                                                    stop=stop):
+                if first_token is None and chunk:
+                    first_token = time.perf_counter()
+                parts.append(chunk)
+                yield chunk
+            output = "".join(parts)
+        finally:
+            try:
+                self._finish(start, output, first_token or time.perf_counter())
+            finally:
+                self._semaphore.release()
+
+    @contextmanager
+    def stream(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+               stop: Optional[List[str]] = None) -> Iterator[Iterator[str]]:
+        """
+        generate_stream() üretecini blok sonunda kapatan bağlam yöneticisi
+
+        Akış yarıda bırakılsa da eşzamanlılık slotu blok çıkışında bırakılır::
+
+            with backend.stream(prompt) as chunks:
+                first = next(chunks)
+        """
+        chunks = self.generate_stream(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+        try:
+            yield chunks
+        finally:
+            chunks.close()
+
+    def batch_generate(self, prompts: List[str], max_tokens: int = 1024, temperature: float = 0.1,
+                       stop: Optional[List[str]] = None) -> List[str]:
+        keys = [(prompt, max_tokens, temperature, tuple(stop or ()), None, ()) for prompt in prompts]
+        outputs: List[Optional[str]] = [self._cache_get(key) for key in keys]
+        missing = [i for i, output in enumerate(outputs) if output is None]
+        if missing:
+            # Yalnızca önbellekte olmayan promptlar backend'e gönderilir
+            with self._semaphore:
+                start = self._start()
+                generated = None
+                try:
+                    generated = self.inner.batch_generate([prompts[i] for i in missing], max_tokens=max_tokens,
+                                                          temperature=temperature, stop=stop)
+                finally:
+                    self._finish(start, "".join(generated) if generated is not None else None)
+            for i, output in zip(missing, generated):
+                outputs[i] = output
+                self._cache_put(keys[i], output)
+        return outputs
+
+    async def agenerate(self, prompt: str, max_tokens: int = 1024, temperature: float = 0.1,
+                        stop: Optional[List[str]] = None) -> str:
+        if not self.capabilities.batching:
+            return await super().agenerate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+        # Toplu backendlerde istekler birleştirilebilsin diye semafor uygulanmaz
+        key = (prompt, max_tokens, temperature, tuple(stop or ()), None, ())
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        start = self._start()
+        output = None
+        try:
+            output = await self.inner.agenerate(prompt, max_tokens=max_tokens, temperature=temperature, stop=stop)
+        finally:
+            self._finish(start, output)
+        self._cache_put(key, output)
+        return output
+
+    def tokenize(self, text: str) -> List[int]:
+        return self.inner.tokenize(text)
+
+    def count_tokens(self, text: str) -> int:
+        return self.inner.count_tokens(text)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class BackendManager:
+    """Backendleri adla kaydeden, ilk kullanımda oluşturan ve ortak katmanla saran yönetici"""
+
+    def __init__(self, cache_size: int = 0):
+        """
+        Args:
+            cache_size (int): Her backend için yanıt önbelleği boyutu (0 ise kapalı)
+        """
+        self.cache_size = cache_size
+        self._factories: Dict[str, Tuple[Callable[[], LLMBackend], int]] = {}
+        self._backends: Dict[str, ManagedBackend] = {}
+        self._lock = threading.Lock()
+
+    def ensure(self, name: str, factory: Callable[[], LLMBackend], max_concurrency: int = 1) -> ManagedBackend:
+        """
+        Backend'i döndürür; ad kayıtlı değilse önce fabrikayı kaydeder
+
+        Giriş noktaları kendi kaynakları (model, sunucu havuzu, API adresi) için
+        bu metodla backend alır; aynı adı kullanan çağıranlar aynı backend'i paylaşır.
+
+        Args:
+            name (str): Backend adı (kaynağı belirtir)
+            factory (Callable): Ad kayıtlı değilse kullanılacak fabrika
+            max_concurrency (int): Aynı anda işlenecek en fazla istek
+
+        Returns:
+            ManagedBackend: Eşzamanlılık, önbellek ve metrik katmanıyla sarılmış backend
+        """
+        with self._lock:
+            self._factories.setdefault(name, (factory, max_concurrency))
+        return self.get(name)
+
+    def register(self, name: str, factory: Callable[[], LLMBackend], max_concurrency: int = 1) -> None:
+        """
+        Backend fabrikasını kaydeder (backend ilk get() çağrısında oluşturulur)
+
+        Args:
+            name (str): Backend adı
+            factory (Callable): Backend'i oluşturan fonksiyon
+            max_concurrency (int): Aynı anda işlenecek en fazla istek
+        """
+        with self._lock:
+            self._factories[name] = (factory, max_concurrency)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._factories)
+
+    def get(self, name: str) -> ManagedBackend:
+        """
+        Adı verilen backend'i döndürür (gerekirse oluşturur)
+
+        Raises:
+            KeyError: Backend kayıtlı değilse
+        """
+        with self._lock:
+            backend = self._backends.get(name)
+            if backend is not None:
+                return backend
+            if name not in self._factories:
+                raise KeyError(f"Backend kayıtlı değil: {name}")
+            factory, max_concurrency = self._factories[name]
+            logger.info(f"Backend oluşturuluyor: {name}")
+            backend = ManagedBackend(factory(), max_concurrency=max_concurrency, cache_size=self.cache_size)
+            self._backends[name] = backend
+            return backend
+
+    def release(self, name: str) -> None:
+        """Oluşturulmuş backend'i kapatır (kayıt korunur, sonraki get() yeniden oluşturur)"""
+        with self._lock:
+            backend = self._backends.pop(name, None)
+        if backend is not None:
+            backend.close()
+
+    def close(self) -> None:
+        """Tüm backendleri kapatır"""
+        for name in list(self._backends):
+            self.release(name)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Oluşturulmuş backendlerin yetenek ve metriklerini döndürür"""
+        with self._lock:
+            backends = dict(self._backends)
+        return {
+            name: {"capabilities": asdict(backend.capabilities), **backend.metrics.to_dict()}
+            for name, backend in backends.items()
+        }
+
+
+_default_manager: Optional[BackendManager] = None
+_default_lock = threading.Lock()
+
+
+# Fabrikalar giriş noktalarının paylaşılan örneklerini sarar; model ikinci kez yüklenmez
+
+def _ctransformers_factory() -> LLMBackend:
+    from src.core.llm_manager import get_shared_manager
+    return CTransformersBackend(get_shared_manager())
+
+
+def _llama_cpp_factory() -> LLMBackend:
+    from src.models.llm_manager import get_shared_manager
+    return LlamaCppBackend(get_shared_manager())
+
+
+def _ollama_factory() -> LLMBackend:
+    from src.api.ollama_connector import OllamaConnector
+    connector = OllamaConnector()
+    return OllamaBackend(connector.pool, connector.default_model)
+
+
+def _hf_factory() -> LLMBackend:
+    from src.core.hf_llm_manager import get_shared_manager
+    # API yolu ile aynı toplu istemci kullanılır
+    return HFBackend(get_shared_manager())
+
+
+def get_backend_manager() -> BackendManager:
+    """
+    Süreç genelinde paylaşılan backend yöneticisini döndürür
+
+    ctransformers, llama_cpp ve ollama her zaman kayıtlıdır; hf yalnızca
+    HF_API_TOKEN veya HF_API_URL tanımlıysa kaydedilir. Backendler ilk
+    kullanımda oluşturulur.
+    """
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            manager = BackendManager()
+            manager.register("ctransformers", _ctransformers_factory)
+            manager.register("llama_cpp", _llama_cpp_factory)
+            manager.register("ollama", _ollama_factory, max_concurrency=REMOTE_CONCURRENCY)
+            if os.environ.get(HF_TOKEN_ENV) or os.environ.get(HF_URL_ENV):
+                manager.register("hf", _hf_factory, max_concurrency=REMOTE_CONCURRENCY)
+            _default_manager = manager
+        return _default_manager
+
+
+def ollama_backend(pool: Any, model: str) -> ManagedBackend:
+    """
+    Ollama havuzu ve model için paylaşılan yönetilen backend'i döndürür
+
+    Args:
+        pool (OllamaPool): İsteklerin gönderileceği sunucu havuzu
+        model (str): Ollama model adı
+
+    Returns:
+        ManagedBackend: "ollama:<model>@<sunucular>" adıyla kayıtlı backend
+    """
+    hosts = ",".join(host.url for host in pool.hosts)
+    return get_backend_manager().ensure(f"ollama:{model}@{hosts}", lambda: OllamaBackend(pool, model),
+                                        max_concurrency=REMOTE_CONCURRENCY)
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 import os
 from pathlib import Path
 import json
@@ -6,9 +6,59 @@ import logging
 from tqdm import tqdm
 import importlib.util
 import re
+import math
+import threading
+import time
+
+from src.core.chunked_analysis import ChunkedCVAnalyzer, BASIC_SCHEMA
+from src.core.inference_server import InferenceClient, SERVER_URL_ENV
+from src.core.llm_backend import REMOTE_CONCURRENCY, CTransformersBackend, ManagedBackend, get_backend_manager
+from src.core.autotune import load_tuned_config
+from src.core.model_registry import ModelRegistry, ModelInfo, get_registry
+from src.core.prompt_cache import PromptTemplate
+from src.core.token_budget import TokenBudgetPlanner, PromptTooLongError, CHARS_PER_TOKEN
+from src.utils.json_repair import repair_json
 
 logger = logging.getLogger(__name__)
 
+# Bu uzunluğu aşan CV'ler kesilmek yerine bölüm bazlı parçalı analizle işlenir
+CHUNKED_ANALYSIS_THRESHOLD = 7000
+
+# CV analiz promptu: tüm isteklerde aynı olan önek + CV'ye özgü sonek
+CV_ANALYSIS_TEMPLATE = PromptTemplate(
+    prefix="""
+Lütfen aşağıda verilen CV metnini analiz et ve yanıtını aşağıdaki JSON formatında ver:
+
+{
+  "kisisel_bilgiler": {
+    "isim": "İsim",
+    "email": "Email",
+    "telefon": "Telefon"
+  },
+  "egitim": [
+    {
+      "okul": "Okul",
+      "bolum": "Bölüm",
+      "tarih": "Tarih"
+    }
+  ],
+  "beceriler": ["Beceri1", "Beceri2"],
+  "is_deneyimi": [
+    {
+      "sirket": "Şirket",
+      "pozisyon": "Pozisyon",
+      "tarih": "Tarih"
+    }
+  ]
+}
+
+ÖNEMLİ: Sadece JSON formatında yanıt ver, başka hiçbir şey yazma.
+
+CV METNİ:
+""",
+    suffix="{cv_text}\n\nJSON:\n"
+)
+
 # CTransformers kütüphanesinin yüklü olup olmadığını kontrol et
 CTRANSFORMERS_AVAILABLE = importlib.util.find_spec("ctransformers") is not None
 
@@ -19,7 +69,8 @@ else:
     AutoModelForCausalLM = None
 
 class LLMManager:
-    def __init__(self, model_path: Optional[str] = None, model_type: str = None, force_phi: bool = False):
+    def __init__(self, model_path: Optional[str] = None, model_type: str = None, force_phi: bool = False,
+                 server_url: Optional[str] = None, registry: Optional[ModelRegistry] = None):
         """
         LLM yönetici sınıfı
         
@@ -27,12 +78,39 @@ class LLMManager:
             model_path (str): Model dosyasının yolu (None ise otomatik seçilir)
             model_type (str): Model tipi (varsayılan: None, otomatik belirlenecek)
             force_phi (bool): Phi-2 modelini zorla kullan (varsayılan: False)
+            server_url (str): Yerel çıkarım sunucusu adresi (None ise LLM_SERVER_URL ortam değişkeni,
+                o da yoksa model bu süreçte yüklenir)
+            registry (ModelRegistry): Yüklü modelleri paylaşan kayıt defteri (None ise süreç geneli)
         """
         self.force_phi = force_phi
+        # Sunucu adresi model yolundan ayrı tutulur; yol tabanlı kontroller yalnızca yerel dosyalar içindir
+        self.server_url = server_url or os.environ.get(SERVER_URL_ENV)
+        self.client = InferenceClient(self.server_url) if self.server_url else None
+        self.server_slots = 1
+        # Model yüklendiğinde ayrılan bağlam uzunluğu ve istek başına token bütçesi
+        self.context_length: Optional[int] = None
+        self.planner = TokenBudgetPlanner()
+        
+        if self.client and model_path is None:
+            # Model sunucu sürecinde yüklü, yerel model dosyası gerekmiyor
+            self.model_path = None
+            self.registry = registry
+            self.model_type = model_type or "llama"
+            self._model = None
+            self._registry_loader = None
+            logger.info(f"Çıkarım sunucusu kullanılacak: {self.server_url}")
+            return
+        
+        # Model dizini süreç başına bir kez taranır; yüklü modeller istekler arasında paylaşılır
+        self.registry = registry or get_registry()
         self.model_path = self._select_best_model() if model_path is None else Path(model_path)
+        info = self._registry_info()
         
         # Model tipini belirle - phi modelini öncelikle kullan
-        if model_type is None:
+        if model_type is None and info is not None and not self.force_phi:
+            # GGUF başlığındaki mimariden belirlenir
+            self.model_type = info.model_type
+        elif model_type is None:
             model_name = str(self.model_path).lower()
             
             # Phi modelini kullanırken doğrudan model_type belirle
@@ -50,7 +128,9 @@ class LLMManager:
         else:
             self.model_type = model_type
             
-        self.model = None
+        # Doğrudan yüklenen model burada tutulur; kayıt defterindeki modellere referans tutulmaz
+        self._model = None
+        self._registry_loader: Optional[Callable[[ModelInfo], Any]] = None
         self._ensure_model_directory()
         
         logger.info(f"Model yolu: {self.model_path}, Model tipi: {self.model_type}")
@@ -61,19 +141,20 @@ class LLMManager:
         if not os.path.exists(model_dir):
             os.makedirs(model_dir)
         
+    def _registry_info(self) -> Optional[ModelInfo]:
+        """Model dosyası kayıt defterinde indekslenmişse bilgisini döndürür"""
+        if self.model_path is None or self.registry is None:
+            return None
+        try:
+            info = self.registry.get_info(self.model_path.name)
+        except KeyError:
+            return None
+        return info if info.path.resolve() == Path(self.model_path).resolve() else None
+    
     def _select_best_model(self) -> Path:
         """Sistemdeki en iyi modeli seçer - TinyLlama modelini öncelikli olarak dene"""
-        models_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "models")
-        
-        # Model dosyalarını bul
-        model_files = []
-        for file in os.listdir(models_dir):
-            if file.endswith(".gguf"):
-                model_path = os.path.join(models_dir, file)
-                model_size = os.path.getsize(model_path) / (1024 * 1024)  # MB cinsinden
-                # 0 boyutlu dosyaları atla
-                if model_size > 1:  
-                    model_files.append((model_path, model_size, file))
+        # Model dosyaları kayıt defterinin indeksinden alınır (0 boyutlu dosyalar atlanmış olur)
+        model_files = [(str(info.path), info.size_mb, info.name) for info in self.registry.list_models()]
         
         if not model_files:
             raise ValueError("Hiçbir model dosyası bulunamadı. Lütfen models/ dizinine bir GGUF modeli ekleyin.")
@@ -107,8 +188,23 @@ class LLMManager:
         logger.info(f"Seçilen model: {selected_model[2]} ({selected_model[1]:.1f} MB)")
         return Path(selected_model[0])
         
-    def load_model(self, context_length: int = 16384, max_new_tokens: int = 4096) -> None:
-        """Modeli yükler"""
+    def load_model(self, context_length: Optional[int] = None, max_new_tokens: int = 4096) -> None:
+        """
+        Modeli yükler (çıkarım sunucusu kullanılıyorsa sunucunun hazır olmasını bekler)
+        
+        Bu makinede `python -m src.core.autotune` ile ölçülmüş ayarlar varsa iş parçacığı ve
+        batch boyutu bu ayarlardan alınır. context_length verilmediyse bağlam, tam promptla
+        analiz edilecek en uzun CV'ye yetecek kadar ayrılır (ölçülmüş değer yetiyorsa o kullanılır).
+        """
+        if self.client:
+            for _ in range(60):
+                if self.client.is_ready():
+                    self.server_slots = self.client.get_slot_count()
+                    logger.info(f"Çıkarım sunucusu hazır, paralel slot sayısı: {self.server_slots}")
+                    return
+                time.sleep(1)
+            raise RuntimeError(f"Çıkarım sunucusuna ulaşılamadı: {self.client.base_url}")
+        
         if not CTRANSFORMERS_AVAILABLE:
             logger.error("ctransformers kütüphanesi bulunamadı. Yüklenemedi.")
             raise ImportError("ctransformers kütüphanesi bulunamadı. 'pip install ctransformers' ile yükleyin.")
@@ -117,21 +213,109 @@ class LLMManager:
             raise ValueError(f"Model dosyası bulunamadı: {self.model_path}")
         
         try:
-            logger.info(f"Model '{self.model_type}' tipi olarak yükleniyor: {self.model_path}")
-            self.model = AutoModelForCausalLM.from_pretrained(
-                str(self.model_path),
-                model_type=self.model_type,
-                context_length=context_length,
-                max_new_tokens=max_new_tokens,
-                threads=os.cpu_count() or 4
-            )
-            logger.info(f"Model başarıyla yüklendi! Tip: {self.model_type}")
+            if self._registry_info() is not None:
+                # Model zaten bellekteyse yeniden yüklenmez; gerekirse LRU modeller boşaltılır
+                self._registry_loader = lambda info: self._load_from_file(context_length, max_new_tokens)
+                model = self.registry.acquire(self.model_path.name, self._registry_loader)
+            else:
+                model = self._model = self._load_from_file(context_length, max_new_tokens)
+            if self.context_length is None:
+                # Model kayıt defterinden paylaşıldıysa bağlam uzunluğu yükleyen örnekten alınamaz
+                self.context_length = getattr(model, "context_length", None) \
+                    or context_length or self._required_context()
+            # Token bütçesi modelin kendi tokenizer'ı ile hesaplanır (modele referans tutmadan)
+            self.planner.tokenizer = lambda text: self.model.tokenize(text)
             
         except Exception as e:
             error_msg = f"Model yüklenirken hata: {str(e)}"
             logger.error(error_msg)
             raise RuntimeError(error_msg)
         
+    @property
+    def model(self) -> Any:
+        """
+        Yüklü model nesnesi
+        
+        Kayıt defterinden paylaşılan model her erişimde kayıt defterinden alınır; yönetici
+        modele referans tutmadığından LRU ile boşaltılan model bellekte kalmaz ve gerekirse
+        bir sonraki kullanımda yeniden yüklenir.
+        """
+        if self._model is None and self._registry_loader is not None:
+            return self.registry.acquire(self.model_path.name, self._registry_loader)
+        return self._model
+    
+    def has_model(self) -> bool:
+        """Model yüklendi mi (kayıt defterinden boşaltılmış olsa da yeniden yüklenebilir)"""
+        return self._model is not None or self._registry_loader is not None
+    
+    def _required_context(self) -> int:
+        """Parçalı analize geçmeden işlenen en uzun CV için gereken bağlam uzunluğu"""
+        cv_tokens = math.ceil(CHUNKED_ANALYSIS_THRESHOLD / CHARS_PER_TOKEN)
+        prompt_tokens = self.planner.count(CV_ANALYSIS_TEMPLATE.prefix) + cv_tokens
+        output_tokens = self.planner.estimate_output(CV_ANALYSIS_TEMPLATE.prefix, input_tokens=cv_tokens)
+        info = self._registry_info()
+        return self.planner.context_for(prompt_tokens, output_tokens, limit=info.context_length if info else None)
+    
+    def _load_from_file(self, context_length: Optional[int], max_new_tokens: int) -> Any:
+        """Model dosyasını ctransformers ile (varsa ölçülmüş ayarlarla) yükler"""
+        config = {"threads": os.cpu_count() or 4, "context_length": self._required_context()}
+        tuned = load_tuned_config(str(self.model_path))
+        if tuned:
+            config.update({key: tuned[key] for key in ("threads", "batch_size") if key in tuned})
+            # Ölçülmüş bağlam uzunluğu yalnızca gereken uzunluğa yetiyorsa kullanılır
+            config["context_length"] = max(config["context_length"], tuned.get("context_length", 0))
+            logger.info(f"Ölçülmüş ayarlar kullanılıyor: {config}")
+        if context_length is not None:
+            config["context_length"] = context_length
+        self.context_length = config["context_length"]
+        
+        logger.info(f"Model '{self.model_type}' tipi olarak yükleniyor: {self.model_path}")
+        model = AutoModelForCausalLM.from_pretrained(
+            str(self.model_path),
+            model_type=self.model_type,
+            max_new_tokens=max_new_tokens,
+            **config
+        )
+        logger.info(f"Model başarıyla yüklendi! Tip: {self.model_type}")
+        return model
+    
+    def for_model(self, model_name: str) -> "LLMManager":
+        """
+        Adı verilen model için yüklü bir LLMManager döndürür
+        
+        Model kayıt defterinde yüklüyse yeniden yüklenmez; aynı modeli isteyen
+        eşzamanlı çağrılar tek bir yüklemeyi bekler.
+        
+        Args:
+            model_name (str): Model adı (dosya adı veya uzantısız ad)
+            
+        Returns:
+            LLMManager: İstenen modeli kullanan yönetici
+        """
+        if self.client:
+            return self
+        info = self.registry.get_info(model_name)
+        if info.path == Path(self.model_path) and self.has_model():
+            return self
+        manager = LLMManager(model_path=str(info.path), force_phi=self.force_phi, registry=self.registry)
+        manager.load_model()
+        return manager
+    
+    @property
+    def backend(self) -> ManagedBackend:
+        """
+        Üretim isteklerinin geçtiği yönetilen backend (eşzamanlılık sınırı ve metrikler)
+        
+        Paylaşılan yönetici "ctransformers" adıyla, diğerleri model veya sunucu adresiyle kaydedilir.
+        """
+        if self is _shared_manager:
+            name = CTransformersBackend.name
+        else:
+            name = f"{CTransformersBackend.name}:{self.server_url or self.model_path.name}"
+        # Sunucu slotları paralel çalışır; yerel model tek istek işler
+        concurrency = max(self.server_slots, REMOTE_CONCURRENCY) if self.client else 1
+        return get_backend_manager().ensure(name, lambda: CTransformersBackend(self), max_concurrency=concurrency)
+    
     def generate(self, prompt: str, temperature: float = 0.1, top_p: float = 0.95, 
                 top_k: int = 40, repetition_penalty: float = 1.1, 
                 max_new_tokens: int = 4096) -> str:
@@ -148,37 +332,51 @@ class LLMManager:
             
         Returns:
             str: Üretilen metin
+            
+        Raises:
+            PromptTooLongError: Prompt modelin bağlam uzunluğuna sığmıyorsa
         """
-        if self.model is None:
+        if self.client:
+            try:
+                return self.backend.generate(prompt, max_tokens=max_new_tokens, temperature=temperature,
+                                             top_p=top_p, top_k=top_k, repetition_penalty=repetition_penalty)
+            except Exception as e:
+                logger.error(f"Çıkarım sunucusu hatası: {str(e)}")
+                return f"Metin üretme hatası: {str(e)}"
+        
+        if not self.has_model():
             raise RuntimeError("Model yüklenmemiş. Önce load_model() çağrılmalı.")
+        
+        # Prompt kesilmez: bağlama sığmıyorsa reddedilir, çıktı kalan yerle sınırlanır
+        budget = self.planner.plan(prompt, max_new_tokens, self.context_length)
+        if not budget.fits:
+            raise PromptTooLongError(budget.prompt_tokens, budget.context_length)
+        max_new_tokens = budget.max_new_tokens
             
-        logger.info(f"Metin üretme başlatılıyor (temp={temperature}, tokens={max_new_tokens})")
+        logger.info(f"Metin üretme başlatılıyor (temp={temperature}, tokens={max_new_tokens}, "
+                    f"prompt={budget.prompt_tokens} token)")
         try:
-            # Önce prompt uzunluğunu kontrol et
-            if len(prompt) > 16000:
-                logger.warning(f"Prompt çok uzun ({len(prompt)} karakter), kısaltılıyor...")
-                prompt = prompt[:16000]  # Maksimum 16000 karakter ile sınırla
-            
-            response = self.model(
+            backend = self.backend
+            response = backend.generate(
                 prompt,
+                max_tokens=max_new_tokens,
                 temperature=temperature,
                 top_p=top_p,
                 top_k=top_k,
-                repetition_penalty=repetition_penalty,
-                max_new_tokens=max_new_tokens
+                repetition_penalty=repetition_penalty
             )
             
             # Boş yanıt kontrolü
             if not response or len(response) < 10:
                 logger.warning("Model boş veya çok kısa yanıt döndü, tekrar deneniyor...")
                 # Daha yüksek temperature ile tekrar dene
-                response = self.model(
+                response = backend.generate(
                     prompt,
+                    max_tokens=max_new_tokens,
                     temperature=0.8,  # Daha yüksek yaratıcılık
                     top_p=0.95,
                     top_k=60,
-                    repetition_penalty=1.0,  # Tekrar cezası yok
-                    max_new_tokens=max_new_tokens
+                    repetition_penalty=1.0  # Tekrar cezası yok
                 )
             
             logger.info(f"Metin üretildi, uzunluk: {len(response)}")
@@ -197,43 +395,23 @@ class LLMManager:
         Returns:
             Dict[str, Any]: Analiz sonuçları (Bilgiler, eğitim, deneyim, vb.)
         """
-        if self.model is None:
+        if not self.has_model() and self.client is None:
             logger.error("Model yüklenmemiş. Önce load_model() çağrılmalı.")
             return {"error": "Model yüklenemedi", "raw_response": "Lütfen tekrar deneyin."}
+        
+        # Uzun CV'ler kesilmeden bölüm bazlı küçük promptlarla işlenir
+        if len(cv_text) > CHUNKED_ANALYSIS_THRESHOLD:
+            return self._analyze_cv_chunked(cv_text)
             
-        # Daha basit ve daha kısa bir prompt, daha uzun CV metni
-        prompt = f"""
-Lütfen bu CV metnini analiz et:
-
-{cv_text[:7000]}
-
-Yanıtını aşağıdaki JSON formatında ver:
-
-{{
-  "kisisel_bilgiler": {{
-    "isim": "İsim",
-    "email": "Email",
-    "telefon": "Telefon"
-  }},
-  "egitim": [
-    {{
-      "okul": "Okul",
-      "bolum": "Bölüm",
-      "tarih": "Tarih"
-    }}
-  ],
-  "beceriler": ["Beceri1", "Beceri2"],
-  "is_deneyimi": [
-    {{
-      "sirket": "Şirket",
-      "pozisyon": "Pozisyon",
-      "tarih": "Tarih"
-    }}
-  ]
-}}
-
-ÖNEMLİ: Sadece JSON formatında yanıt ver, başka hiçbir şey yazma.
-"""
+        # Sabit talimat/şema öneki önce, CV metni sonra gelir (önek KV-cache'i yeniden kullanılır)
+        prompt = CV_ANALYSIS_TEMPLATE.build(cv_text=cv_text)
+        
+        # Çıktı bütçesi şemadan ve CV uzunluğundan tahmin edilir; bağlama sığmayan CV parçalanır
+        budget = self.planner.plan(prompt, self.planner.estimate_output(CV_ANALYSIS_TEMPLATE.prefix, cv_text),
+                                   self.context_length)
+        if not budget.fits:
+            logger.warning(f"CV promptu bağlama sığmıyor ({budget.prompt_tokens} token), parçalı analiz yapılıyor")
+            return self._analyze_cv_chunked(cv_text)
         
         try:
             logger.info(f"CV metni uzunluğu: {len(cv_text)}, analiz başlıyor...")
@@ -243,7 +421,7 @@ Yanıtını aşağıdaki JSON formatında ver:
                 response = self.generate(
                     prompt, 
                     temperature=0.4,     # Daha yüksek sıcaklık
-                    max_new_tokens=4096, # Çok daha fazla token
+                    max_new_tokens=budget.max_new_tokens,
                     top_p=0.9,          # Daha çeşitli çıktı
                     repetition_penalty=1.03  # Çok az ceza
                 )
@@ -261,97 +439,51 @@ Yanıtını aşağıdaki JSON formatında ver:
                 logger.error(f"Model yanıt üretemedi: {str(gen_err)}")
                 return self._create_default_cv_response(error_msg=f"Model yanıt üretemedi: {str(gen_err)}")
                 
-            # Tüm metinden sadece JSON kısmını çıkarma
-            json_content = None
-            
-            # XML/HTML benzeri etiketleri çıkar
-            clean_response = re.sub(r'<[^>]+>', '', response)
-            
-            # JSON bracket algılama
-            json_start = clean_response.find('{')
-            json_end = clean_response.rfind('}') + 1
-            
-            if json_start != -1 and json_end > json_start:
-                json_content = clean_response[json_start:json_end]
-                logger.info(f"JSON içeriği bulundu, uzunluk: {len(json_content)}")
-            else:
-                logger.warning(f"JSON formatı bulunamadı! Yanıt: {clean_response[:200]}")
-                # CV'den temel bilgileri çıkararak varsayılan yanıt oluştur
+            # Yanıt tek geçişte taranır; açıklama metni, markdown ve bozuk sözdizimi aynı anda düzeltilir
+            result, repairs = repair_json(response)
+            if not result:
+                logger.warning(f"JSON formatı bulunamadı! Yanıt: {response[:200]}")
                 return self._create_default_cv_response(cv_text=cv_text, error_msg="JSON formatı bulunamadı", raw_response=response[:500])
-                
-            try:
-                # JSON stringini düzeltmeye çalış
-                json_str = json_content.strip()
-                
-                # Model çıktısında en yaygın görülen sorunları temizle
-                # 1. Tırnak işaretleri
-                json_str = re.sub(r'(?<!\\)"', '"', json_str)  # Yanlış tırnak işaretlerini düzelt
-                json_str = json_str.replace("'", '"')  # Tek tırnak yerine çift tırnak kullan
-                
-                # 2. Fazladan yazı veya açıklamaları temizle
-                json_str = re.sub(r'```json\s*', '', json_str)  # Markdown json başlangıcını temizle
-                json_str = re.sub(r'\s*```', '', json_str)      # Markdown kapanışını temizle
-                
-                # 3. Virgül sorunlarını düzelt
-                json_str = json_str.replace(",\n}", "\n}")
-                json_str = json_str.replace(",\n]", "\n]")
-                json_str = json_str.replace(",}", "}")
-                json_str = json_str.replace(",]", "]")
-                
-                # 4. JSON yapısını doğru olduğundan emin ol
-                if not json_str.startswith('{'): json_str = '{' + json_str.split('{', 1)[1] if '{' in json_str else '{}'
-                if not json_str.endswith('}'): json_str = json_str.rsplit('}', 1)[0] + '}' if '}' in json_str else '{}'
-                
-                # 5. Boş, null ve undefined değerleri temizle
-                json_str = re.sub(r':\s*null', ': ""', json_str)  
-                json_str = re.sub(r':\s*undefined', ': ""', json_str)
-                json_str = re.sub(r':\s*"null"', ': ""', json_str)
-                json_str = re.sub(r':\s*"undefined"', ': ""', json_str)
-                
-                # Fazladan veriyi temizle - line 23 column 1 (char 483) hatasını çözmek için
-                # İlk açılan { ile son kapanan } arasındaki kısmı al
-                first_brace = json_str.find('{')
-                last_brace = json_str.rfind('}')
-                if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-                    json_str = json_str[first_brace:last_brace+1]
-                
-                # JSON ayrıştır
-                try:
-                    # Önce geçerli JSON mu diye kontrol et
-                    try:
-                        result = json.loads(json_str)
-                        logger.info(f"JSON başarıyla ayrıştırıldı, alanlar: {', '.join(result.keys())}")
-                        return result
-                    except json.JSONDecodeError as e:
-                        logger.error(f"İlk JSON ayrıştırma denemesi başarısız: {e}")
-                        
-                        # En son çare - eğer JSON düzeltme başarısız olursa basit şablon oluştur
-                        if "kisisel_bilgiler" not in json_str or len(json_str) < 50:
-                            logger.warning("JSON içeriği oluşturulamadı, varsayılan işlemeye geçiliyor")
-                            return self._create_default_cv_response(cv_text=cv_text, error_msg=f"JSON formatı oluşturulamadı: {str(e)}")
-                        
-                        # JSON düzeltmeyi tekrar dene - json_repair kütüphanesi yoksa basit düzeltme yap
-                        try:
-                            # Çift tırnak sorunu olmadığından emin ol 
-                            clean_json = json_str.replace('"', '"').replace('"', '"')
-                            result = json.loads(clean_json)
-                            logger.info("JSON temizleme sonrası başarıyla ayrıştırıldı")
-                            return result
-                        except:
-                            logger.error("JSON temizleme sonrası da ayrıştırılamadı")
-                            return self._create_default_cv_response(cv_text=cv_text, error_msg=f"JSON ayrıştırma hatası: {str(e)}", raw_response=response[:300])
-                except Exception as e:
-                    logger.error(f"JSON düzeltme hatası: {str(e)}")
-                    return self._create_default_cv_response(cv_text=cv_text, error_msg=f"JSON düzeltme hatası: {str(e)}", raw_response=response[:300])
-            except Exception as e:
-                logger.error(f"JSON düzeltme hatası: {str(e)}")
-                return self._create_default_cv_response(cv_text=cv_text, error_msg=f"JSON düzeltme hatası: {str(e)}", raw_response=response[:300])
+            
+            if repairs:
+                logger.info(f"JSON yanıtı düzeltildi: {', '.join(repairs)}")
+            logger.info(f"JSON başarıyla ayrıştırıldı, alanlar: {', '.join(result.keys())}")
+            return result
         except Exception as e:
             logger.error(f"CV analizi sırasında beklenmeyen hata: {str(e)}")
             import traceback
             logger.error(f"Hata detayları: {traceback.format_exc()}")
             return self._create_default_cv_response(cv_text=cv_text, error_msg=f"CV analizi hatası: {str(e)}")
     
+    def _analyze_cv_chunked(self, cv_text: str) -> Dict[str, Any]:
+        """
+        Uzun CV metnini bölüm bazlı parçalar halinde analiz eder
+        
+        Args:
+            cv_text (str): CV metni
+            
+        Returns:
+            Dict[str, Any]: Birleştirilmiş analiz sonuçları
+        """
+        # ctransformers modeli eşzamanlı çağrılar için güvenli değil, parçalar sırayla işlenir;
+        # çıkarım sunucusu kullanılıyorsa parçalar sunucunun paralel slotlarına dağıtılır
+        analyzer = ChunkedCVAnalyzer(
+            generate_fn=lambda prompt: self.generate(prompt, temperature=0.2, max_new_tokens=1024,
+                                                     top_p=0.9, repetition_penalty=1.03),
+            schema=BASIC_SCHEMA,
+            max_workers=self.server_slots if self.client else 1
+        )
+        try:
+            result = analyzer.analyze(cv_text)
+        except Exception as e:
+            logger.error(f"Parçalı CV analizi hatası: {str(e)}")
+            return self._create_default_cv_response(cv_text=cv_text, error_msg=f"Parçalı analiz hatası: {str(e)}")
+        
+        if not result.get("kisisel_bilgiler") and not result.get("beceriler"):
+            logger.warning("Parçalı analiz boş sonuç döndü, varsayılan işleme moduna geçiliyor")
+            return self._create_default_cv_response(cv_text=cv_text, error_msg="Parçalı analiz sonuç üretmedi")
+        return result
+    
     def _create_default_cv_response(self, cv_text="", error_msg="Bilinmeyen hata", raw_response=""):
         """CV için regex tabanlı gelişmiş bilgi çıkarma (hata durumunda veya doğrudan kullanım için)"""
         try:
@@ -792,7 +924,7 @@ Yanıtını aşağıdaki JSON formatında ver:
         Returns:
             Dict[str, Any]: Eşleştirme sonuçları
         """
-        if self.model is None:
+        if not self.has_model() and self.client is None:
             raise RuntimeError("Model yüklenmemiş. Önce load_model() çağrılmalı.")
             
         # Prompt oluştur
@@ -835,46 +967,50 @@ Yanıtını aşağıdaki JSON formatında ver:
         
         JSON formatında yanıt ver:
         ```json
-        {
+        {{
           "match_score": 0.85,
-          "category_scores": {
+          "category_scores": {{
             "skills": 0.9,
             "experience": 0.8,
             "education": 0.85,
             "languages": 0.7,
             "certifications": 0.75
-          },
+          }},
           "strengths": ["Beceri 1", "Beceri 2"],
           "weaknesses": ["Zayıf alan 1", "Zayıf alan 2"],
           "recommendations": ["Öneri 1", "Öneri 2"]
-        }
+        }}
         ```
         """
         
     def _parse_matching_response(self, response: str) -> Dict[str, Any]:
         """Eşleştirme yanıtını ayrıştırır"""
-        try:
-            # JSON yanıtını ayıkla
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            
-            if json_start != -1 and json_end != -1:
-                json_str = response[json_start:json_end]
-                try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    # Tek tırnaklı değerleri çift tırnaklı yap
-                    corrected_json = json_str.replace("'", '"')
-                    # Virgül düzeltmeleri
-                    corrected_json = corrected_json.replace(",\n}", "\n}")
-                    corrected_json = corrected_json.replace(",\n]", "\n]")
-                    return json.loads(corrected_json)
-                    
+        result, repairs = repair_json(response)
+        if not result:
             return {"error": "JSON yanıtı bulunamadı", "raw_response": response}
-        except Exception as e:
-            return {"error": str(e), "raw_response": response}
+        if repairs:
+            logger.info(f"Eşleştirme yanıtı düzeltildi: {', '.join(repairs)}")
+        return result
         
     def __del__(self):
         """Kaynakları temizler"""
-        if self.model is not None:
-            del self.model 
\ No newline at end of file
+        if getattr(self, "_model", None) is not None:
+            del self._model 
+
+
+_shared_manager: Optional[LLMManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_manager() -> LLMManager:
+    """
+    Süreç genelinde paylaşılan LLM yöneticisini döndürür (API ve backend yöneticisi bunu kullanır)
+    
+    Model ilk kullanımda yüklenir; yüklü modeller kayıt defterinde tutulduğundan aynı model
+    ikinci kez yüklenmez.
+    """
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = LLMManager()
+        return _shared_manager
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GGUF model kayıt defteri ve bellek sınırlı LRU model önbelleği.
+
+models/ dizini bir kez taranır; her dosya için boyut, nicemleme (quantization),
+mimari ve bağlam uzunluğu GGUF başlığından okunur. Modeller ilk istendiğinde
+yüklenir ve yüklü modellerin tahmini bellek kullanımı PlatformConfig'ten alınan
+kullanılabilir belleği aşmayacak şekilde en az kullanılan (LRU) model boşaltılır.
+Aynı model için eşzamanlı istekler tek bir yüklemeyi bekler.
+"""
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.platform_config import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+
+# Kullanılabilir belleğin modellere ayrılabilecek oranı
+MEMORY_FRACTION = 0.8
+# Model dosyası boyutuna eklenen KV-cache ve çalışma belleği payı
+MEMORY_OVERHEAD = 1.2
+
+GGUF_MAGIC = b"GGUF"
+
+# GGUF değer tipleri: tip -> struct biçimi
+_GGUF_SCALARS = {
+    0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i",
+    6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d",
+}
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+
+# general.file_type değerlerinin nicemleme adları (llama.cpp LLAMA_FTYPE)
+GGUF_FILE_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1",
+    10: "Q2_K", 11: "Q3_K_S", 12: "Q3_K_M", 13: "Q3_K_L", 14: "Q4_K_S", 15: "Q4_K_M",
+    16: "Q5_K_S", 17: "Q5_K_M", 18: "Q6_K", 32: "BF16",
+}
+
+# ctransformers'ın doğrudan desteklediği mimariler
+_CTRANSFORMERS_TYPES = {"llama", "mistral", "falcon", "mpt", "gptj", "gpt_neox", "gpt2", "starcoder"}
+
+_QUANT_PATTERN = re.compile(r"(?:^|[._-])(I?Q\d_K_[SML]|I?Q\d_K|Q\d_\d|F16|F32|BF16)(?:[._-]|$)", re.IGNORECASE)
+
+
+def _read_string(f) -> str:
+    (length,) = struct.unpack("<Q", f.read(8))
+    return f.read(length).decode("utf-8", errors="replace")
+
+
+def _read_value(f, value_type: int) -> Any:
+    if value_type in _GGUF_SCALARS:
+        fmt = _GGUF_SCALARS[value_type]
+        return struct.unpack(fmt, f.read(struct.calcsize(fmt)))[0]
+    if value_type == _GGUF_STRING:
+        return _read_string(f)
+    if value_type == _GGUF_ARRAY:
+        item_type, count = struct.unpack("<IQ", f.read(12))
+        if item_type in _GGUF_SCALARS:
+            # Sayısal diziler (ör. token skorları) okunmadan atlanır
+            f.seek(struct.calcsize(_GGUF_SCALARS[item_type]) * count, os.SEEK_CUR)
+        else:
+            for _ in range(count):
+                _read_value(f, item_type)
+        return None
+    raise ValueError(f"Bilinmeyen GGUF değer tipi: {value_type}")
+
+
+def read_gguf_metadata(path: str, wanted: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """
+    GGUF dosya başlığındaki anahtar/değer meta verilerini okur
+
+    Tensör verisi okunmaz; diziler atlanır. Tokenizer sözlüğü gibi büyük diziler
+    dosyanın sonlarında olduğundan, istenen anahtarların tümü bulunduğunda okuma durur.
+
+    Args:
+        path (str): GGUF dosyası
+        wanted (Callable[[str], bool], optional): Saklanacak anahtarları seçen fonksiyon
+
+    Returns:
+        Dict[str, Any]: Meta veri sözlüğü (GGUF değilse boş)
+    """
+    wanted = wanted or (lambda key: key.startswith("general.") or key.endswith(".context_length"))
+    metadata: Dict[str, Any] = {}
+    with open(path, "rb") as f:
+        if f.read(4) != GGUF_MAGIC:
+            return metadata
+        (version,) = struct.unpack("<I", f.read(4))
+        if version == 1:
+            _, kv_count = struct.unpack("<II", f.read(8))
+        else:
+            _, kv_count = struct.unpack("<QQ", f.read(16))
+        metadata["gguf.version"] = version
+
+        for _ in range(kv_count):
+            key = _read_string(f)
+            (value_type,) = struct.unpack("<I", f.read(4))
+            if value_type == _GGUF_ARRAY and key.startswith("tokenizer."):
+                # Tokenizer dizileri meta verinin sonundadır; gerekli alanlar bunlardan önce gelir
+                break
+            value = _read_value(f, value_type)
+            if wanted(key):
+                metadata[key] = value
+    return metadata
+
+
+@dataclass
+class ModelInfo:
+    """Dizindeki bir GGUF modelinin özellikleri"""
+    name: str
+    path: Path
+    size_bytes: int
+    architecture: Optional[str] = None
+    quantization: Optional[str] = None
+    context_length: Optional[int] = None
+    metadata: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def size_mb(self) -> float:
+        return self.size_bytes / (1024 * 1024)
+
+    @property
+    def estimated_memory(self) -> int:
+        """Yüklü modelin tahmini bellek kullanımı (byte)"""
+        return int(self.size_bytes * MEMORY_OVERHEAD)
+
+    @property
+    def model_type(self) -> str:
+        """ctransformers model tipi (mimari, yoksa dosya adı üzerinden)"""
+        if self.architecture in _CTRANSFORMERS_TYPES:
+            return self.architecture
+        name = self.name.lower()
+        if "phi" in name or (self.architecture or "").startswith("phi"):
+            return "gptj"
+        if "llama" in name or "tiny" in name:
+            return "llama"
+        if "mistral" in name:
+            return "mistral"
+        return "gpt_neox"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "path": str(self.path),
+            "size_mb": round(self.size_mb, 1),
+            "architecture": self.architecture,
+            "quantization": self.quantization,
+            "context_length": self.context_length,
+            "model_type": self.model_type,
+        }
+
+
+def inspect_model(path: Path) -> ModelInfo:
+    """Bir GGUF dosyasının başlığını okuyarak ModelInfo oluşturur"""
+    path = Path(path)
+    info = ModelInfo(name=path.name, path=path, size_bytes=path.stat().st_size)
+    try:
+        metadata = read_gguf_metadata(str(path))
+    except (OSError, struct.error, ValueError, UnicodeDecodeError) as e:
+        logger.warning(f"GGUF başlığı okunamadı ({path.name}): {str(e)}")
+        metadata = {}
+
+    info.metadata = metadata
+    info.architecture = metadata.get("general.architecture")
+    if info.architecture:
+        info.context_length = metadata.get(f"{info.architecture}.context_length")
+    file_type = metadata.get("general.file_type")
+    if file_type in GGUF_FILE_TYPES:
+        info.quantization = GGUF_FILE_TYPES[file_type]
+    else:
+        match = _QUANT_PATTERN.search(path.stem)
+        info.quantization = match.group(1).upper() if match else None
+    return info
+
+
+class ModelRegistry:
+    """Model dizinini indeksleyen ve yüklü modelleri bellek sınırlı LRU olarak tutan kayıt defteri"""
+
+    def __init__(self, models_dir: Optional[str] = None, memory_budget: Optional[int] = None,
+                 platform_config: Optional[PlatformConfig] = None, min_size_mb: float = 1.0):
+        """
+        Args:
+            models_dir (str, optional): GGUF dosyalarının bulunduğu dizin
+            memory_budget (int, optional): Yüklü modeller için sabit bellek sınırı (byte).
+                None ise PlatformConfig'teki kullanılabilir bellekten hesaplanır.
+            platform_config (PlatformConfig, optional): Bellek bilgisi kaynağı
+            min_size_mb (float): Bu boyuttan küçük (bozuk/boş) dosyalar atlanır
+        """
+        self.models_dir = Path(models_dir) if models_dir else DEFAULT_MODELS_DIR
+        self.memory_budget = memory_budget
+        self.platform_config = platform_config or PlatformConfig()
+        self.min_size_mb = min_size_mb
+        self.models: Dict[str, ModelInfo] = {}
+        self._loaded: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._metrics = {"hits": 0, "misses": 0, "loads": 0, "evictions": 0, "load_seconds": 0.0}
+        self.scan()
+
+    def scan(self) -> Dict[str, ModelInfo]:
+        """Model dizinini tarar ve GGUF başlıklarını indeksler"""
+        models = {}
+        if self.models_dir.is_dir():
+            for path in sorted(self.models_dir.glob("*.gguf")):
+                if path.stat().st_size / (1024 * 1024) <= self.min_size_mb:
+                    continue
+                info = inspect_model(path)
+                models[info.name] = info
+        with self._lock:
+            self.models = models
+        logger.info(f"Model dizini indekslendi: {len(models)} model ({self.models_dir})")
+        return models
+
+    def get_info(self, name: str) -> ModelInfo:
+        """
+        Model bilgisini ad, dosya adı veya uzantısız ad ile bulur
+
+        Raises:
+            KeyError: Model dizinde yoksa
+        """
+        name = Path(name).name
+        if name in self.models:
+            return self.models[name]
+        for info in self.models.values():
+            if info.path.stem == name or info.path.stem.lower() == name.lower():
+                return info
+        raise KeyError(f"Model bulunamadı: {name}")
+
+    def list_models(self) -> List[ModelInfo]:
+        return list(self.models.values())
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            return self.get_info(name).name in self._loaded
+
+    def _available_memory(self) -> int:
+        return self.platform_config._get_memory_info()["available"]
+
+    def _budget(self) -> int:
+        """Yüklü modellerin toplam tahmini bellek sınırı"""
+        if self.memory_budget is not None:
+            return self.memory_budget
+        # Yüklü modellerin kullandığı bellek de yeniden kullanılabilir sayılır
+        return int((self._available_memory() + self.loaded_memory()) * MEMORY_FRACTION)
+
+    def loaded_memory(self) -> int:
+        """Yüklü modellerin toplam tahmini bellek kullanımı (byte)"""
+        return sum(self.models[name].estimated_memory for name in list(self._loaded) if name in self.models)
+
+    def acquire(self, name: str, loader: Callable[[ModelInfo], Any]) -> Any:
+        """
+        Modeli döndürür; yüklü değilse gerekirse LRU modelleri boşaltıp yükler
+
+        Args:
+            name (str): Model adı
+            loader (Callable[[ModelInfo], Any]): Model yüklenmesi gerekirse çağrılacak fonksiyon
+
+        Returns:
+            Any: Yüklü model nesnesi
+        """
+        info = self.get_info(name)
+        with self._lock:
+            if info.name in self._loaded:
+                self._loaded.move_to_end(info.name)
+                self._metrics["hits"] += 1
+                return self._loaded[info.name]
+            load_lock = self._load_locks.setdefault(info.name, threading.Lock())
+
+        # Aynı model için eşzamanlı istekler tek bir yüklemeyi bekler
+        with load_lock:
+            with self._lock:
+                if info.name in self._loaded:
+                    self._loaded.move_to_end(info.name)
+                    self._metrics["hits"] += 1
+                    return self._loaded[info.name]
+                self._metrics["misses"] += 1
+                self._make_room(info)
+
+            start = time.time()
+            model = loader(info)
+            elapsed = time.time() - start
+
+            with self._lock:
+                self._loaded[info.name] = model
+                self._metrics["loads"] += 1
+                self._metrics["load_seconds"] += elapsed
+            logger.info(f"Model yüklendi: {info.name} ({elapsed:.1f} sn, {len(self._loaded)} model bellekte)")
+            return model
+
+    def _make_room(self, info: ModelInfo) -> None:
+        """Yeni model sığana kadar en az kullanılan modelleri boşaltır (kilit altında çağrılır)"""
+        budget = self._budget()
+        while self._loaded and self.loaded_memory() + info.estimated_memory > budget:
+            name, _ = self._loaded.popitem(last=False)
+            self._metrics["evictions"] += 1
+            logger.info(f"Bellek sınırı nedeniyle model boşaltıldı: {name}")
+        if info.estimated_memory > budget:
+            logger.warning(f"{info.name} tahmini bellek sınırını aşıyor "
+                           f"({info.estimated_memory / 1024**3:.1f} GB > {budget / 1024**3:.1f} GB)")
+
+    def evict(self, name: str) -> bool:
+        """Modeli bellekten boşaltır"""
+        with self._lock:
+            model_name = self.get_info(name).name
+            if self._loaded.pop(model_name, None) is None:
+                return False
+            self._metrics["evictions"] += 1
+            return True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Yükleme/boşaltma sayaçları ve yüklü modelleri döndürür"""
+        with self._lock:
+            return dict(self._metrics,
+                        load_seconds=round(self._metrics["load_seconds"], 2),
+                        loaded=list(self._loaded),
+                        loaded_memory_mb=round(self.loaded_memory() / (1024 * 1024), 1),
+                        indexed=len(self.models))
+
+
+_default_registry: Optional[ModelRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Süreç genelinde paylaşılan model kayıt defterini döndürür (dizin bir kez taranır)"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Yüklenen CV'ler için MinHash/LSH tabanlı yakın kopya tespiti.
+
+CV metni normalize edilip (bkz. text_index.tokenize) kelime üçlülerine
+(shingle) ayrılır ve 128 permütasyonluk MinHash imzası hesaplanır. İmzalar
+32 banda bölünüp LSH kovalarına yazılır; yeni bir CV geldiğinde yalnızca en
+az bir kovayı paylaşan CV'lerin imzaları karşılaştırılır ve tahmini Jaccard
+benzerliği en yüksek olan döndürülür.
+
+Aynı şablondan üretilmiş farklı kişilerin CV'leri de çok benzer olabildiği
+için (ör. uploads/ altındaki örnekler) e-posta ve telefon bilgileri de
+saklanır; önceki analizin yeniden kullanılması yalnızca aynı kişi için
+önerilir.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from src.core.text_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "output/near_duplicates.db"
+INDEX_PATH_ENV = "NEAR_DUPLICATE_DB"
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Bu benzerliğin üstündeki CV'ler yakın kopya sayılır
+DEFAULT_THRESHOLD = 0.7
+
+# Yakın kopya bulunduğunda uygulanabilecek politikalar
+POLICY_ANALYZE = "analyze"  # Her zamanki gibi tam analiz yap, yalnızca raporla
+POLICY_REUSE = "reuse"      # Önceki analizi olduğu gibi döndür
+POLICY_UPDATE = "update"    # Önceki analizi hızlı (regex) analizle güncelle
+POLICIES = (POLICY_ANALYZE, POLICY_REUSE, POLICY_UPDATE)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# Permütasyon katsayıları sabit tohumla üretilir; imzalar süreçler arasında karşılaştırılabilir
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERM, dtype=np.uint64)
+
+_EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Normalize edilmiş metnin kelime n-gramlarını döndürür"""
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """
+    Metnin MinHash imzasını hesaplar
+
+    Args:
+        text (str): CV metni
+
+    Returns:
+        Optional[np.ndarray]: NUM_PERM uzunluğunda uint64 imza (metin boşsa None)
+    """
+    items = shingles(text)
+    if not items:
+        return None
+    hashes = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64, count=len(items))
+    # (a * x + b) mod p permütasyonları; uint64 taşması bilinçli olarak sarmalanır
+    permuted = ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=1)
+
+
+def estimate_jaccard(first: np.ndarray, second: np.ndarray) -> float:
+    """İki imzadan tahmini Jaccard benzerliğini hesaplar"""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+def contact_keys(text: str) -> Dict[str, List[str]]:
+    """
+    Adayın kendi e-posta adresini ve telefonunun son 10 hanesini döndürür
+
+    CV'lerde referansların iletişim bilgileri de geçtiği için yalnızca metindeki
+    ilk e-posta ve ilk telefon (başlıktaki iletişim bilgisi) alınır.
+    """
+    email = _EMAIL_PATTERN.search(text)
+    phone = None
+    for match in _PHONE_PATTERN.findall(text):
+        digits = re.sub(r"\D", "", match)
+        if 10 <= len(digits) <= 13:
+            phone = digits[-10:]
+            break
+    return {"email": [email.group(0).lower()] if email else [], "telefon": [phone] if phone else []}
+
+
+def same_person(first: Dict[str, List[str]], second: Dict[str, List[str]]) -> bool:
+    """
+    İletişim bilgilerine göre iki CV'nin aynı kişiye ait olup olmadığını tahmin eder
+
+    İki tarafta da bulunan bilgi türlerinden biri (e-posta/telefon) hiç
+    örtüşmüyorsa farklı kişi sayılır. Karşılaştırılacak ortak bilgi türü
+    yoksa aynı kişi olduğu doğrulanamaz; önceki analizin başka bir adaya
+    yazılmaması için farklı kişi kabul edilir.
+    """
+    compared = False
+    for kind in ("email", "telefon"):
+        a, b = set(first.get(kind, [])), set(second.get(kind, []))
+        if a and b:
+            if not a & b:
+                return False
+            compared = True
+    return compared
+
+
+def merge_analysis(prior: Any, fresh: Any) -> Any:
+    """
+    Önceki analizi yeni (hızlı) analizle günceller
+
+    Sözlükler alan alan birleştirilir; listelere yalnızca önceki analizde
+    olmayan yeni öğeler eklenir; diğer değerlerde yeni değer boş değilse
+    önceki değerin yerine geçer. "_" ile başlayan iç alanlar önceki analizden
+    alınmaz.
+    """
+    if isinstance(prior, dict) and isinstance(fresh, dict):
+        merged = {key: value for key, value in prior.items() if not str(key).startswith("_")}
+        for key, value in fresh.items():
+            merged[key] = merge_analysis(prior[key], value) if key in prior else value
+        return merged
+    if isinstance(prior, list) and isinstance(fresh, list):
+        return prior + [item for item in fresh if item not in prior]
+    if fresh in (None, "", [], {}):
+        return prior
+    return fresh
+
+
+def _band_keys(signature: np.ndarray) -> List[bytes]:
+    return [hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest()
+            for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """MinHash imzalarını ve LSH kovalarını SQLite'ta tutan yakın kopya indeksi"""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS minhash_signatures (
+        doc_id TEXT PRIMARY KEY,
+        signature BLOB NOT NULL,
+        contacts TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS lsh_buckets (
+        band INTEGER NOT NULL,
+        bucket BLOB NOT NULL,
+        doc_id TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, doc_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_lsh_buckets_doc ON lsh_buckets(doc_id);
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path (str): Veritabanı dosyası (":memory:" ise bellekte tutulur)
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> "NearDuplicateIndex":
+        """NEAR_DUPLICATE_DB ortam değişkenindeki (yoksa varsayılan) dosyayla indeks oluşturur"""
+        return cls(os.environ.get(INDEX_PATH_ENV, DEFAULT_INDEX_PATH))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def add(self, doc_id: str, signature: Optional[np.ndarray], contacts: Optional[Dict[str, List[str]]] = None) -> None:
+        """
+        İmzayı indeksler; aynı kimlikli kayıt varsa yerine geçer
+
+        Args:
+            doc_id (str): Belge (aday) kimliği
+            signature (np.ndarray, optional): MinHash imzası (None ise yalnızca eski kayıt silinir)
+            contacts (Dict[str, List[str]], optional): contact_keys çıktısı
+        """
+        with self._lock, self._conn:
+            self._delete(doc_id)
+            if signature is None:
+                return
+            self._conn.execute("INSERT INTO minhash_signatures (doc_id, signature, contacts) VALUES (?, ?, ?)",
+                               (doc_id, signature.astype(np.uint64).tobytes(), json.dumps(contacts or {})))
+            self._conn.executemany("INSERT OR IGNORE INTO lsh_buckets (band, bucket, doc_id) VALUES (?, ?, ?)",
+                                   [(band, key, doc_id) for band, key in enumerate(_band_keys(signature))])
+
+    def _delete(self, doc_id: str) -> None:
+        self._conn.execute("DELETE FROM lsh_buckets WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM minhash_signatures WHERE doc_id = ?", (doc_id,))
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock, self._conn:
+            self._delete(doc_id)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM minhash_signatures").fetchone()[0]
+
+    def candidates(self, signature: np.ndarray) -> Set[str]:
+        """İmzayla en az bir LSH kovasını paylaşan belgeleri döndürür"""
+        ids: Set[str] = set()
+        with self._lock:
+            for band, key in enumerate(_band_keys(signature)):
+                ids.update(row[0] for row in self._conn.execute(
+                    "SELECT doc_id FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, key)))
+        return ids
+
+    def closest(self, signature: Optional[np.ndarray], contacts: Optional[Dict[str, List[str]]] = None,
+                threshold: float = DEFAULT_THRESHOLD, exclude: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        En benzer kayıtlı CV'yi bulur (aynı kişiye ait olanlar önceliklidir)
+
+        Args:
+            signature (np.ndarray, optional): Yeni CV'nin MinHash imzası
+            contacts (Dict[str, List[str]], optional): Yeni CV'nin iletişim bilgileri
+            threshold (float): Yakın kopya sayılacak en düşük tahmini Jaccard benzerliği
+            exclude (str, optional): Karşılaştırmaya alınmayacak kimlik
+
+        Returns:
+            Optional[Dict[str, Any]]: {"candidate_id", "benzerlik", "ayni_kisi"} veya eşik altındaysa None
+        """
+        if signature is None:
+            return None
+        ids = self.candidates(signature) - {exclude}
+        best = None
+        with self._lock:
+            for doc_id in sorted(ids):
+                row = self._conn.execute("SELECT signature, contacts FROM minhash_signatures WHERE doc_id = ?",
+                                         (doc_id,)).fetchone()
+                if row is None:
+                    continue
+                similarity = estimate_jaccard(signature, np.frombuffer(row[0], dtype=np.uint64))
+                if similarity < threshold:
+                    continue
+                match = {"candidate_id": doc_id, "benzerlik": similarity,
+                         "ayni_kisi": same_person(contacts or {}, json.loads(row[1]))}
+                # Aynı kişiye ait kayıtlar, daha benzer olsalar bile başka kişilerinkinden önce gelir
+                if best is None or (match["ayni_kisi"], similarity) > (best["ayni_kisi"], best["benzerlik"]):
+                    best = match
+        return best
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sabit prompt öneki (talimatlar + JSON şeması) için KV-cache yeniden kullanımı.
+
+CV analiz promptları sabit bir önek ve CV'ye özgü değişken bir sonek olarak
+kurulur. Önek bir kez değerlendirilir; sonraki isteklerde yalnızca CV'ye özgü
+tokenlar için prefill yapılır:
+
+- llama_cpp: önek değerlendirildikten sonra model durumu kaydedilir ve her
+  istekten önce geri yüklenir (Llama.save_state / load_state).
+- llama-server: `cache_prompt` ile slot içindeki ortak önek yeniden kullanılır.
+- Ollama: model `keep_alive` ile bellekte tutulur; çalıştırıcı aynı önekle
+  gelen isteklerde önbellekteki tokenları yeniden kullanır.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ollama modelinin istekler arasında bellekte kalma süresi
+OLLAMA_KEEP_ALIVE = "30m"
+
+
+class PromptTemplate:
+    """Sabit önek + değişken sonekten oluşan prompt şablonu"""
+
+    def __init__(self, prefix: str, suffix: str = "{cv_text}"):
+        """
+        Args:
+            prefix (str): Tüm isteklerde aynı kalan talimat ve şema metni
+            suffix (str): str.format ile doldurulacak değişken kısım
+        """
+        self.prefix = prefix
+        self.suffix = suffix
+        self.key = hashlib.sha1(prefix.encode("utf-8")).hexdigest()
+
+    def build(self, **kwargs: Any) -> str:
+        """Öneki ve doldurulmuş soneki birleştirerek tam promptu döndürür"""
+        return self.prefix + self.suffix.format(**kwargs)
+
+
+class LlamaStateCache:
+    """llama_cpp modelleri için değerlendirilmiş önek durumlarını saklayan LRU önbellek"""
+
+    def __init__(self, max_entries: int = 4):
+        """
+        Args:
+            max_entries (int): Bellekte tutulacak en fazla önek durumu
+        """
+        self.max_entries = max_entries
+        self._states: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def restore(self, model: Any, template: PromptTemplate) -> bool:
+        """
+        Şablon önekinin değerlendirilmiş durumunu modele yükler
+
+        Önek daha önce değerlendirilmemişse değerlendirilir ve kaydedilir.
+        Sonraki create_completion çağrısı ortak öneki atlayıp yalnızca soneki işler;
+        çağıran, iki çağrı arasında modeli başka isteklere kapatan kilidi tutmalıdır
+        (ör. LLMManager.model_lock).
+
+        Args:
+            model: llama_cpp.Llama örneği
+            template (PromptTemplate): Kullanılacak şablon
+
+        Returns:
+            bool: Durum yüklendiyse veya kaydedildiyse True
+        """
+        with self._lock:
+            try:
+                state = self._states.get(template.key)
+                if state is not None:
+                    self._states.move_to_end(template.key)
+                    model.load_state(state)
+                    return True
+
+                tokens = model.tokenize(template.prefix.encode("utf-8"))
+                model.reset()
+                model.eval(tokens)
+                self._states[template.key] = model.save_state()
+                logger.info(f"Prompt öneki önbelleğe alındı ({len(tokens)} token)")
+
+                while len(self._states) > self.max_entries:
+                    self._states.popitem(last=False)
+                return True
+            except Exception as e:
+                logger.warning(f"Önek durumu yüklenemedi, tam prefill yapılacak: {str(e)}")
+                return False
+
+    def clear(self) -> None:
+        """Tüm kayıtlı durumları siler"""
+        with self._lock:
+            self._states.clear()
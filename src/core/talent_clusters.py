@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aday havuzunun beceri/deneyim vektörleri üzerinde kümelenmesi (yetenek havuzu analitiği).
+
+Her aday, havuzda en sık geçen beceriler sözlüğü üzerinde L2 normalize
+edilmiş bir beceri vektörü ve (20 yılda doygunluğa ulaşan) deneyim
+bileşeninden oluşan yoğun bir float32 vektörle temsil edilir. Kümeler
+mini-batch k-means ile, aday deposundan kimlik sırasıyla parça parça okunan
+vektörlerle güncellenir; bellekte aynı anda yalnızca bir parça ve merkezler
+tutulur, bu yüzden 100 bin üstü havuzlarda da bellek kullanımı sınırlıdır.
+
+Merkezler, küme boyutları ve adayların küme kimlikleri SQLite'ta saklanır.
+Yeni gelen CV'ler (add_candidate) veya son hesaplamadan sonra depoya eklenen
+adaylar (update) merkezleri artımlı olarak günceller; zaten atanmış bir aday
+yeniden analiz edildiğinde merkezlere ikinci kez eklenmez, yalnızca yeniden
+atanır. Beceri sözlüğü fit sırasında sabitlenir; sözlükte olmayan yeni
+beceriler bir sonraki fit'e kadar yok sayılır.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.candidate_store import CandidateStore, candidate_attributes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "output/talent_clusters.db"
+DB_PATH_ENV = "TALENT_CLUSTER_DB"
+
+DEFAULT_CLUSTERS = 8
+DEFAULT_VOCABULARY_SIZE = 500
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_EPOCHS = 3
+# Deneyim bileşeni bu yılda doygunluğa ulaşır ve beceri vektörüne göre bu ağırlıkla eklenir
+MAX_EXPERIENCE_YEARS = 20
+EXPERIENCE_WEIGHT = 0.5
+# Başlangıç merkezleri ilk parçada bu kadar Lloyd adımıyla iyileştirilir
+_INIT_ITERATIONS = 10
+# SQLite'ın IN (...) parametre sınırının altında kalan parça boyutu
+_FETCH_CHUNK = 500
+
+
+class SkillVectorizer:
+    """Aday kayıtlarını (beceri terimleri ve deneyim ayı) yoğun float32 vektörlere çevirir"""
+
+    def __init__(self, vocabulary: List[str], experience_weight: float = EXPERIENCE_WEIGHT):
+        """
+        Args:
+            vocabulary (List[str]): Beceri sözlüğü (canonical_term biçiminde)
+            experience_weight (float): Deneyim bileşeninin ağırlığı
+        """
+        self.vocabulary = list(vocabulary)
+        self.experience_weight = experience_weight
+        self._columns = {term: column for column, term in enumerate(self.vocabulary)}
+
+    @property
+    def dim(self) -> int:
+        return len(self.vocabulary) + 1
+
+    def transform(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Args:
+            records (List[Dict[str, Any]]): terms (beceri kümesi) ve experience_months alanlı kayıtlar
+
+        Returns:
+            np.ndarray: (kayıt sayısı, dim) boyutlu matris; son sütun deneyim bileşeni
+        """
+        matrix = np.zeros((len(records), self.dim), dtype=np.float32)
+        rows, columns, values = [], [], []
+        for row, record in enumerate(records):
+            known = [self._columns[term] for term in record['terms'] if term in self._columns]
+            rows.extend([row] * len(known))
+            columns.extend(known)
+            values.extend([1.0 / np.sqrt(len(known))] * len(known))
+        matrix[rows, columns] = values
+        months = np.fromiter((record['experience_months'] for record in records), dtype=np.float32, count=len(records))
+        matrix[:, -1] = self.experience_weight * np.minimum(months / 12, MAX_EXPERIENCE_YEARS) / MAX_EXPERIENCE_YEARS
+        return matrix
+
+    def experience_years(self, centroids: np.ndarray) -> np.ndarray:
+        """Merkezlerin deneyim bileşenini yıla çevirir"""
+        if not self.experience_weight:
+            return np.zeros(len(centroids))
+        return centroids[:, -1] / self.experience_weight * MAX_EXPERIENCE_YEARS
+
+
+class MiniBatchKMeans:
+    """
+    Parça parça beslenen mini-batch k-means (Sculley, 2010)
+
+    Her merkez, kendisine atanan tüm noktaların ortalamasına 1/sayaç öğrenme
+    oranıyla yaklaşır; bir parçadaki noktalar toplu olarak uygulanır.
+    """
+
+    def __init__(self, n_clusters: int, seed: int = 0, n_init: int = 10):
+        if n_clusters < 1:
+            raise ValueError("n_clusters en az 1 olmalı")
+        self.n_clusters = n_clusters
+        self.n_init = n_init
+        self.centroids: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+        self._rng = np.random.RandomState(seed)
+
+    def _initialize(self, batch: np.ndarray) -> None:
+        """
+        Merkezleri ilk parçadan seçer
+
+        n_init kez k-means++ ile başlangıç seçilip parça üzerinde birkaç Lloyd
+        adımı çalıştırılır; ataleti en düşük olan merkezler kullanılır.
+        """
+        if len(batch) < self.n_clusters:
+            raise ValueError(f"İlk parça en az {self.n_clusters} aday içermeli")
+        best = None
+        for _ in range(self.n_init):
+            chosen = [self._rng.randint(len(batch))]
+            closest = ((batch - batch[chosen[0]]) ** 2).sum(axis=1)
+            for _ in range(1, self.n_clusters):
+                total = closest.sum()
+                index = self._rng.choice(len(batch), p=closest / total) if total > 0 else self._rng.randint(len(batch))
+                chosen.append(index)
+                closest = np.minimum(closest, ((batch - batch[index]) ** 2).sum(axis=1))
+            self.centroids = batch[chosen].astype(np.float64)
+            for _ in range(_INIT_ITERATIONS):
+                labels, _ = self.predict(batch)
+                for cluster in np.unique(labels):
+                    self.centroids[cluster] = batch[labels == cluster].mean(axis=0)
+            inertia = self.predict(batch)[1].sum()
+            if best is None or inertia < best[0]:
+                best = (inertia, self.centroids)
+        self.centroids = best[1]
+        self.counts = np.zeros(self.n_clusters, dtype=np.int64)
+
+    def predict(self, batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: En yakın merkez indeksleri ve bu merkezlere kare uzaklıklar
+        """
+        distances = ((batch ** 2).sum(axis=1)[:, None] - 2 * batch @ self.centroids.T
+                     + (self.centroids ** 2).sum(axis=1)[None, :])
+        labels = distances.argmin(axis=1)
+        return labels, np.maximum(distances[np.arange(len(batch)), labels], 0.0)
+
+    def partial_fit(self, batch: np.ndarray) -> np.ndarray:
+        """Parçayı merkezlere uygular ve parçadaki noktaların (güncelleme öncesi) etiketlerini döndürür"""
+        if self.centroids is None:
+            self._initialize(batch)
+        labels, _ = self.predict(batch)
+        counts = np.bincount(labels, minlength=self.n_clusters)
+        membership = np.zeros((self.n_clusters, len(batch)))
+        membership[labels, np.arange(len(batch))] = 1.0
+        sums = membership @ batch
+        updated = counts > 0
+        total = self.counts + counts
+        self.centroids[updated] = ((self.centroids[updated] * self.counts[updated, None] + sums[updated])
+                                   / total[updated, None])
+        self.counts = total
+        return labels
+
+
+class TalentClusters:
+    """Aday havuzu kümelerini, merkezlerini ve aday-küme atamalarını SQLite'ta tutar"""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cluster_model (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        vocabulary TEXT NOT NULL,
+        experience_weight REAL NOT NULL,
+        centroids BLOB NOT NULL,
+        counts BLOB NOT NULL,
+        fitted_at REAL NOT NULL,
+        updated_until REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS cluster_assignments (
+        candidate_id TEXT PRIMARY KEY,
+        cluster INTEGER NOT NULL,
+        distance REAL NOT NULL,
+        assigned_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_cluster_assignments_cluster ON cluster_assignments(cluster, candidate_id);
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path (str): Veritabanı dosyası (":memory:" ise bellekte tutulur)
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        self._vectorizer: Optional[SkillVectorizer] = None
+        self._model: Optional[MiniBatchKMeans] = None
+        self._updated_until = 0.0
+        self._load()
+
+    @classmethod
+    def from_env(cls) -> "TalentClusters":
+        """TALENT_CLUSTER_DB ortam değişkenindeki (yoksa varsayılan) dosyayla model oluşturur"""
+        return cls(os.environ.get(DB_PATH_ENV, DEFAULT_DB_PATH))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def fitted(self) -> bool:
+        return self._model is not None
+
+    def _load(self) -> None:
+        row = self._conn.execute("SELECT vocabulary, experience_weight, centroids, counts, updated_until "
+                                 "FROM cluster_model WHERE id = 0").fetchone()
+        if row is None:
+            return
+        vocabulary, experience_weight, centroids, counts, updated_until = row
+        self._vectorizer = SkillVectorizer(json.loads(vocabulary), experience_weight)
+        centroids = np.frombuffer(centroids, dtype=np.float64).reshape(-1, self._vectorizer.dim)
+        self._model = MiniBatchKMeans(len(centroids))
+        self._model.centroids = centroids.copy()
+        self._model.counts = np.frombuffer(counts, dtype=np.int64).copy()
+        self._updated_until = updated_until
+
+    def _save_model(self, fitted_at: Optional[float] = None) -> None:
+        """Merkezleri ve sayaçları kaydeder (çağıran işlem içinde)"""
+        self._conn.execute(
+            "INSERT INTO cluster_model (id, vocabulary, experience_weight, centroids, counts, fitted_at, "
+            "updated_until) VALUES (0, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "vocabulary=excluded.vocabulary, experience_weight=excluded.experience_weight, "
+            "centroids=excluded.centroids, counts=excluded.counts, "
+            "fitted_at=COALESCE(?, fitted_at), updated_until=excluded.updated_until",
+            (json.dumps(self._vectorizer.vocabulary, ensure_ascii=False), self._vectorizer.experience_weight,
+             self._model.centroids.tobytes(), self._model.counts.tobytes(), fitted_at or time.time(),
+             self._updated_until, fitted_at))
+
+    def _write_assignments(self, records: List[Dict[str, Any]], labels: np.ndarray, distances: np.ndarray,
+                           assigned_at: float) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO cluster_assignments (candidate_id, cluster, distance, assigned_at) "
+            "VALUES (?, ?, ?, ?)",
+            [(record['candidate_id'], int(label), float(distance), assigned_at)
+             for record, label, distance in zip(records, labels, distances)])
+
+    def fit(self, store: CandidateStore, n_clusters: int = DEFAULT_CLUSTERS,
+            vocabulary_size: int = DEFAULT_VOCABULARY_SIZE, chunk_size: int = DEFAULT_CHUNK_SIZE,
+            epochs: int = DEFAULT_EPOCHS, experience_weight: float = EXPERIENCE_WEIGHT,
+            seed: int = 0) -> Dict[str, Any]:
+        """
+        Aday havuzunu baştan kümeler
+
+        Beceri sözlüğü havuzda en sık geçen vocabulary_size beceriden oluşur.
+        Havuz epochs kez parça parça okunarak merkezler güncellenir, son bir
+        geçişte her aday en yakın merkeze atanır. Havuzdaki aday sayısı
+        n_clusters'tan azsa küme sayısı aday sayısına indirilir.
+
+        Args:
+            store (CandidateStore): Aday deposu
+            n_clusters (int): Küme sayısı
+            vocabulary_size (int): Beceri sözlüğü büyüklüğü
+            chunk_size (int): Bellekte aynı anda tutulan aday sayısı
+            epochs (int): Merkez güncelleme geçişi sayısı
+            experience_weight (float): Deneyim bileşeninin ağırlığı
+            seed (int): k-means++ başlangıcı için tohum
+
+        Returns:
+            Dict[str, Any]: Küme özeti (bkz. summary)
+
+        Raises:
+            ValueError: Havuz boşsa veya parametreler geçersizse
+        """
+        if n_clusters < 1 or vocabulary_size < 1 or epochs < 1:
+            raise ValueError("n_clusters, vocabulary_size ve epochs en az 1 olmalı")
+        if chunk_size < n_clusters:
+            raise ValueError("chunk_size en az n_clusters olmalı")
+        pool_size = store.count()
+        if not pool_size:
+            raise ValueError("Kümelenecek aday yok")
+
+        started = time.time()
+        vectorizer = SkillVectorizer([term for term, _ in store.term_frequencies('skill', vocabulary_size)],
+                                     experience_weight)
+        model = MiniBatchKMeans(min(n_clusters, pool_size), seed=seed)
+        for _ in range(epochs):
+            for records in store.iter_term_rows('skill', chunk_size):
+                model.partial_fit(vectorizer.transform(records))
+
+        with self._lock, self._conn:
+            self._vectorizer, self._model = vectorizer, model
+            self._conn.execute("DELETE FROM cluster_assignments")
+            for records in store.iter_term_rows('skill', chunk_size):
+                labels, distances = model.predict(vectorizer.transform(records))
+                self._write_assignments(records, labels, distances, started)
+            # Bu fit sırasında eklenen adaylar bir sonraki update ile alınır
+            self._updated_until = started
+            self._save_model(fitted_at=started)
+        logger.info(f"{pool_size} aday {model.n_clusters} kümeye ayrıldı ({time.time() - started:.2f} sn)")
+        return self.summary()
+
+    def _apply(self, records: List[Dict[str, Any]], assigned_at: float,
+               assigned: Optional[Dict[str, float]] = None) -> None:
+        """
+        Kayıtları kümelere atar ve atamalarını yazar (çağıran işlem içinde)
+
+        Yalnızca henüz atanmamış adaylar merkezleri günceller; atanmış adaylar
+        (ör. LLM sonucuyla güncellenen) yeniden atanır, sayaçlara tekrar eklenmez.
+
+        Args:
+            records (List[Dict[str, Any]]): Aday kayıtları
+            assigned_at (float): Atama zamanı
+            assigned (Dict[str, float], optional): Kayıtların mevcut atama zamanları
+                (verilmezse veritabanından okunur)
+        """
+        if assigned is None:
+            assigned = self._assigned_at([record['candidate_id'] for record in records])
+        batch = self._vectorizer.transform(records)
+        fresh = np.fromiter((record['candidate_id'] not in assigned for record in records), dtype=bool,
+                            count=len(records))
+        if fresh.any():
+            self._model.partial_fit(batch[fresh])
+        labels, distances = self._model.predict(batch)
+        self._write_assignments(records, labels, distances, assigned_at)
+
+    def add_candidate(self, candidate_id: str, cv_data: Dict[str, Any]) -> Optional[int]:
+        """
+        Yeni analiz edilen adayı merkezlere uygular ve kümeye atar
+
+        Aday zaten atanmışsa merkezler değişmez, yalnızca yeniden atanır.
+        Kilit fit/update tarafından tutuluyorsa beklenmez; adayın depodaki kaydı
+        son atamasından yeni kaldığı için bir sonraki update ile uygulanır.
+
+        Returns:
+            Optional[int]: Adayın küme kimliği (model henüz kurulmadıysa veya kümeleme sürüyorsa None)
+        """
+        attributes = candidate_attributes(cv_data)
+        record = {'candidate_id': candidate_id, 'terms': attributes['skill'],
+                  'experience_months': attributes['experience_months']}
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self._model is None:
+                return None
+            with self._conn:
+                self._apply([record], time.time())
+                self._save_model()
+            return self.cluster_of(candidate_id)
+        finally:
+            self._lock.release()
+
+    def _assigned_at(self, candidate_ids: List[str]) -> Dict[str, float]:
+        assigned: Dict[str, float] = {}
+        for start in range(0, len(candidate_ids), _FETCH_CHUNK):
+            chunk = candidate_ids[start:start + _FETCH_CHUNK]
+            assigned.update(self._conn.execute(
+                f"SELECT candidate_id, assigned_at FROM cluster_assignments WHERE candidate_id IN "
+                f"({','.join('?' * len(chunk))})", chunk))
+        return assigned
+
+    def update(self, store: CandidateStore, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Son fit/update'ten sonra depoya eklenen veya güncellenen adayları artımlı olarak uygular
+
+        add_candidate ile zaten uygulanmış adaylar atlanır. Son atamasından sonra
+        güncellenen adaylar merkezlere yeniden eklenmeden yeniden atanır; diğer
+        atanmış adayların kümeleri yeniden hesaplanmaz, merkezler belirgin
+        kaydıysa fit ile baştan kümeleme yapılmalıdır.
+
+        Returns:
+            Dict[str, Any]: Uygulanan aday sayısı ve küme özeti
+
+        Raises:
+            ValueError: Model henüz kurulmadıysa
+        """
+        with self._lock:
+            if self._model is None:
+                raise ValueError("Kümeler henüz hesaplanmadı")
+            started = time.time()
+            applied = 0
+            with self._conn:
+                for records in store.iter_term_rows('skill', chunk_size, updated_after=self._updated_until):
+                    assigned = self._assigned_at([record['candidate_id'] for record in records])
+                    pending = [record for record in records
+                               if assigned.get(record['candidate_id'], -1.0) < record['updated_at']]
+                    if pending:
+                        self._apply(pending, started, assigned)
+                        applied += len(pending)
+                self._updated_until = started
+                self._save_model()
+        logger.info(f"Kümeler {applied} yeni adayla güncellendi")
+        return {'applied': applied, **self.summary()}
+
+    def cluster_of(self, candidate_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT cluster FROM cluster_assignments WHERE candidate_id = ?",
+                                     (candidate_id,)).fetchone()
+        return row[0] if row else None
+
+    def members(self, cluster: int, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Kümedeki adayları merkeze yakınlık sırasıyla döndürür"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT candidate_id, distance FROM cluster_assignments WHERE cluster = ? "
+                "ORDER BY distance, candidate_id LIMIT ? OFFSET ?", (cluster, limit, offset)).fetchall()
+        return [{'candidate_id': candidate_id, 'distance': round(distance, 4)} for candidate_id, distance in rows]
+
+    def summary(self, top_skills: int = 10) -> Dict[str, Any]:
+        """
+        Küme merkezlerini ve boyutlarını özetler
+
+        Args:
+            top_skills (int): Küme başına listelenecek beceri sayısı
+
+        Returns:
+            Dict[str, Any]: Küme sayısı, atanmış aday sayısı ve her küme için boyut,
+                merkezde en ağırlıklı beceriler, ortalama deneyim yılı ve ortalama kare uzaklık
+        """
+        with self._lock:
+            if self._model is None:
+                return {'fitted': False, 'n_clusters': 0, 'candidates': 0, 'clusters': []}
+            stats = {cluster: (size, inertia) for cluster, size, inertia in self._conn.execute(
+                "SELECT cluster, COUNT(*), SUM(distance) FROM cluster_assignments GROUP BY cluster")}
+            centroids = self._model.centroids
+            vocabulary = self._vectorizer.vocabulary
+            years = self._vectorizer.experience_years(centroids)
+            updated_until = self._updated_until
+
+        clusters = []
+        for cluster, centroid in enumerate(centroids):
+            size, inertia = stats.get(cluster, (0, 0.0))
+            weights = centroid[:-1]
+            order = [column for column in np.argsort(-weights, kind="stable")[:top_skills] if weights[column] > 0]
+            clusters.append({
+                'cluster': cluster,
+                'size': size,
+                'top_skills': [{'skill': vocabulary[column], 'weight': round(float(weights[column]), 4)}
+                               for column in order],
+                'mean_experience_years': round(float(years[cluster]), 1),
+                'mean_distance': round(inertia / size, 4) if size else 0.0,
+            })
+        return {
+            'fitted': True,
+            'n_clusters': len(centroids),
+            'candidates': sum(size for size, _ in stats.values()),
+            'vocabulary_size': len(vocabulary),
+            'updated_until': updated_until,
+            'clusters': clusters,
+        }
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV metinleri için BM25 sıralamalı tam metin indeksi.
+
+Metinler Türkçe kurallarına göre küçük harfe çevrilir (I → ı, İ → i) ve
+Türkçe karakterler ASCII karşılıklarına indirgenir; böylece "GELİŞTİRİCİ",
+"geliştirici" ve "gelistirici" aynı terime düşer. İki arka uç vardır:
+
+- "native": Konumlu (positional) posting listeleri SQLite tablolarında
+  tutulur, BM25 skoru burada hesaplanır.
+- "fts5": SQLite FTS5 sanal tablosu ve yerleşik bm25() kullanılır.
+
+Sorgular AND / OR / NOT (VE / VEYA / DEĞİL), parantez, "-terim" ve
+tırnaklı ifade (phrase) destekler; yan yana terimler AND ile bağlanır:
+
+    kubernetes AND (golang OR rust) NOT intern
+    "makine öğrenmesi" python -stajyer
+
+Belgeler eklendikçe/güncellendikçe indeks artımlı olarak güncellenir.
+"""
+import heapq
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "output/cv_index.db"
+INDEX_PATH_ENV = "CV_INDEX_DB"
+INDEX_BACKEND_ENV = "CV_INDEX_BACKEND"
+
+# BM25 parametreleri
+DEFAULT_K1 = 1.2
+DEFAULT_B = 0.75
+
+_TURKISH_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+# Türkçe karakterleri ASCII'ye indirger; "i̇" gibi birleşik noktalar silinir
+_FOLD = str.maketrans({"ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u",
+                       "â": "a", "î": "i", "û": "u", "̇": None})
+# c++, c#, node.js gibi terimler tek parça kalır
+_TOKEN_PATTERN = re.compile(r"\w+(?:\.\w+)*[+#]*")
+_QUERY_PATTERN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+
+_OPERATORS = {"AND": "AND", "VE": "AND", "OR": "OR", "VEYA": "OR", "NOT": "NOT", "DEĞİL": "NOT", "DEGIL": "NOT"}
+
+
+class QueryError(ValueError):
+    """Sorgu ayrıştırılamadığında veya arka uç desteklemediğinde fırlatılır"""
+
+
+def normalize_text(text: str) -> str:
+    """Metni Türkçe kurallarına göre küçük harfe çevirip ASCII'ye indirger"""
+    return str(text).translate(_TURKISH_UPPER).lower().translate(_FOLD)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Metni normalize edilmiş terimlere ayırır
+
+    Args:
+        text (str): Ham metin
+
+    Returns:
+        List[str]: Metindeki sırasıyla terimler
+    """
+    return _TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class DocumentTerms:
+    """Tek bir metnin terim konumları; anahtar kelime ve ifade kontrolü için"""
+
+    def __init__(self, text: str):
+        self.positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(tokenize(text)):
+            self.positions.setdefault(token, []).append(position)
+
+    def contains(self, keyword: str) -> bool:
+        """Anahtar kelime (birden çok terimse ardışık ifade olarak) metinde geçiyor mu"""
+        tokens = tokenize(keyword)
+        if not tokens:
+            return False
+        if len(tokens) == 1:
+            return tokens[0] in self.positions
+        return _phrase_matches([set(self.positions.get(token, ())) for token in tokens])
+
+
+def _phrase_matches(position_sets: List[Set[int]]) -> bool:
+    """Terim konum kümelerinde terimlerin ardışık geçtiği bir konum var mı"""
+    if not all(position_sets):
+        return False
+    return any(all(start + offset in positions for offset, positions in enumerate(position_sets[1:], 1))
+               for start in position_sets[0])
+
+
+# Sorgu ayrıştırma
+#
+# Sorgu ağacı düğümleri: ("term", str), ("phrase", [str, ...]), ("and", [düğüm, ...]),
+# ("or", [düğüm, ...]), ("not", düğüm)
+
+def parse_query(query: str) -> Tuple:
+    """
+    Sorgu metnini sorgu ağacına çevirir
+
+    Args:
+        query (str): Sorgu (ör. 'kubernetes AND (golang OR rust) NOT intern')
+
+    Returns:
+        Tuple: Sorgu ağacı
+
+    Raises:
+        QueryError: Sorgu boşsa veya sözdizimi hatalıysa
+    """
+    tokens = _QUERY_PATTERN.findall(query or "")
+    if not tokens:
+        raise QueryError("Sorgu boş")
+    parser = _QueryParser(tokens)
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise QueryError(f"Beklenmeyen ifade: {parser.peek()}")
+    return node
+
+
+class _QueryParser:
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _operator(self) -> Optional[str]:
+        token = self.peek()
+        return _OPERATORS.get(token) if token is not None else None
+
+    def parse_or(self) -> Tuple:
+        children = [self.parse_and()]
+        while self._operator() == "OR":
+            self.index += 1
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else ("or", children)
+
+    def parse_and(self) -> Tuple:
+        children = [self.parse_unary()]
+        while self.peek() is not None and self.peek() != ")" and self._operator() != "OR":
+            if self._operator() == "AND":
+                self.index += 1
+            children.append(self.parse_unary())
+        return children[0] if len(children) == 1 else ("and", children)
+
+    def parse_unary(self) -> Tuple:
+        token = self.peek()
+        if token is None:
+            raise QueryError("Sorgu beklenmedik şekilde bitti")
+        if self._operator() == "NOT":
+            self.index += 1
+            return ("not", self.parse_unary())
+        if self._operator() is not None:
+            raise QueryError(f"Beklenmeyen operatör: {token}")
+        self.index += 1
+        if token == "(":
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QueryError("Kapanmayan parantez")
+            self.index += 1
+            return node
+        if token == ")":
+            raise QueryError("Beklenmeyen kapanış parantezi")
+        if token.startswith("-") and len(token) > 1:
+            return ("not", self._leaf(token[1:]))
+        return self._leaf(token.strip('"'))
+
+    @staticmethod
+    def _leaf(text: str) -> Tuple:
+        terms = tokenize(text)
+        if not terms:
+            raise QueryError(f"Aranabilir terim yok: {text!r}")
+        return ("term", terms[0]) if len(terms) == 1 else ("phrase", terms)
+
+
+def _positive_leaves(node: Tuple, negated: bool = False) -> List[Tuple]:
+    """NOT altında kalmayan terim/ifade düğümlerini (skora katkı verenler) toplar"""
+    kind = node[0]
+    if kind in ("term", "phrase"):
+        return [] if negated else [node]
+    if kind == "not":
+        return _positive_leaves(node[1], not negated)
+    leaves = []
+    for child in node[1]:
+        leaves.extend(_positive_leaves(child, negated))
+    return leaves
+
+
+class TextIndex(ABC):
+    """Tam metin indeksi arayüzü"""
+
+    backend = ""
+
+    @abstractmethod
+    def add_document(self, doc_id: str, text: str) -> None:
+        ...
+
+    @abstractmethod
+    def remove_document(self, doc_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        Sorguya uyan belgeleri BM25 skoruna göre sıralar
+
+        Args:
+            query (str): Sorgu metni
+            limit (int): Döndürülecek sonuç sayısı
+            offset (int): Atlanacak sonuç sayısı (sayfalama)
+
+        Returns:
+            Dict[str, Any]: {"total": eşleşen belge sayısı, "results": [{"doc_id", "score"}]}
+
+        Raises:
+            QueryError: Sorgu geçersizse
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class _SQLiteIndex(TextIndex):
+    def __init__(self, path: str):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BM25Index(_SQLiteIndex):
+    """Konumlu posting listelerini SQLite'ta tutan BM25 indeksi"""
+
+    backend = "native"
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS text_docs (
+        doc_id TEXT PRIMARY KEY,
+        length INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS text_postings (
+        term TEXT NOT NULL,
+        doc_id TEXT NOT NULL,
+        tf INTEGER NOT NULL,
+        positions BLOB NOT NULL,
+        PRIMARY KEY (term, doc_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_text_postings_doc ON text_postings(doc_id);
+    """
+
+    def __init__(self, path: str = ":memory:", k1: float = DEFAULT_K1, b: float = DEFAULT_B):
+        """
+        Args:
+            path (str): Veritabanı dosyası (":memory:" ise bellekte tutulur)
+            k1 (float): BM25 terim sıklığı doygunluk parametresi
+            b (float): BM25 belge uzunluğu normalizasyon parametresi
+        """
+        super().__init__(path)
+        self.k1 = k1
+        self.b = b
+        self._conn.executescript(self._SCHEMA)
+        # Belge uzunlukları her sorguda gerektiği için bellekte tutulur
+        self._lengths: Dict[str, int] = dict(self._conn.execute("SELECT doc_id, length FROM text_docs"))
+        self._total_length = sum(self._lengths.values())
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        """Belgeyi indeksler; aynı kimlikli belge varsa yerine geçer"""
+        postings: Dict[str, array] = {}
+        tokens = tokenize(text)
+        for position, token in enumerate(tokens):
+            postings.setdefault(token, array("I")).append(position)
+        with self._lock, self._conn:
+            self._delete(doc_id)
+            self._conn.execute("INSERT INTO text_docs (doc_id, length) VALUES (?, ?)", (doc_id, len(tokens)))
+            self._conn.executemany(
+                "INSERT INTO text_postings (term, doc_id, tf, positions) VALUES (?, ?, ?, ?)",
+                [(term, doc_id, len(positions), positions.tobytes()) for term, positions in postings.items()])
+            self._lengths[doc_id] = len(tokens)
+            self._total_length += len(tokens)
+
+    def _delete(self, doc_id: str) -> bool:
+        if doc_id not in self._lengths:
+            return False
+        self._conn.execute("DELETE FROM text_postings WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM text_docs WHERE doc_id = ?", (doc_id,))
+        self._total_length -= self._lengths.pop(doc_id)
+        return True
+
+    def remove_document(self, doc_id: str) -> bool:
+        with self._lock, self._conn:
+            return self._delete(doc_id)
+
+    def count(self) -> int:
+        return len(self._lengths)
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        tree = parse_query(query)
+        with self._lock:
+            postings: Dict[str, Dict[str, Tuple[int, bytes]]] = {}
+            matches = self._match(tree, postings)
+            scores = self._score(matches, _positive_leaves(tree), postings)
+        top = heapq.nsmallest(max(0, offset) + max(0, limit), scores.items(), key=lambda item: (-item[1], item[0]))
+        return {"total": len(matches),
+                "results": [{"doc_id": doc_id, "score": score} for doc_id, score in top[max(0, offset):]]}
+
+    def _postings(self, term: str, cache: Dict[str, Dict[str, Tuple[int, bytes]]]) -> Dict[str, Tuple[int, bytes]]:
+        if term not in cache:
+            cache[term] = {doc_id: (tf, positions) for doc_id, tf, positions in self._conn.execute(
+                "SELECT doc_id, tf, positions FROM text_postings WHERE term = ?", (term,))}
+        return cache[term]
+
+    def _phrase_docs(self, terms: List[str], cache: Dict[str, Dict[str, Tuple[int, bytes]]]) -> Set[str]:
+        lists = [self._postings(term, cache) for term in terms]
+        candidates = set.intersection(*(set(docs) for docs in lists))
+        matches = set()
+        for doc_id in candidates:
+            position_sets = []
+            for docs in lists:
+                positions = array("I")
+                positions.frombytes(docs[doc_id][1])
+                position_sets.append(set(positions))
+            if _phrase_matches(position_sets):
+                matches.add(doc_id)
+        return matches
+
+    def _match(self, node: Tuple, cache: Dict[str, Dict[str, Tuple[int, bytes]]]) -> Set[str]:
+        kind = node[0]
+        if kind == "term":
+            return set(self._postings(node[1], cache))
+        if kind == "phrase":
+            return self._phrase_docs(node[1], cache)
+        if kind == "not":
+            return set(self._lengths) - self._match(node[1], cache)
+        if kind == "or":
+            return set().union(*(self._match(child, cache) for child in node[1]))
+
+        # AND: önce olumlu kümeler kesişir, olumsuzlar sonradan çıkarılır
+        positives = [child for child in node[1] if child[0] != "not"]
+        negatives = [child[1] for child in node[1] if child[0] == "not"]
+        result = None
+        for child in positives:
+            docs = self._match(child, cache)
+            result = docs if result is None else result & docs
+            if not result:
+                return set()
+        if result is None:
+            result = set(self._lengths)
+        for child in negatives:
+            result -= self._match(child, cache)
+        return result
+
+    def _score(self, matches: Set[str], leaves: List[Tuple],
+               cache: Dict[str, Dict[str, Tuple[int, bytes]]]) -> Dict[str, float]:
+        """Eşleşen belgelerin BM25 skorunu olumlu terimler üzerinden hesaplar"""
+        scores = dict.fromkeys(matches, 0.0)
+        if not matches or not self._lengths:
+            return scores
+        n_docs = len(self._lengths)
+        avg_length = self._total_length / n_docs or 1.0
+        for leaf in leaves:
+            terms = [leaf[1]] if leaf[0] == "term" else leaf[1]
+            eligible = matches if leaf[0] == "term" else matches & self._phrase_docs(terms, cache)
+            for term in terms:
+                docs = self._postings(term, cache)
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id in eligible & docs.keys():
+                    tf = docs[doc_id][0]
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+class FTS5Index(_SQLiteIndex):
+    """SQLite FTS5 ve yerleşik bm25() ile çalışan indeks"""
+
+    backend = "fts5"
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS fts_docs (
+        rowid INTEGER PRIMARY KEY,
+        doc_id TEXT NOT NULL UNIQUE
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS cv_fts USING fts5(body, tokenize="unicode61 tokenchars '.+#_'");
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path (str): Veritabanı dosyası (":memory:" ise bellekte tutulur)
+
+        Raises:
+            sqlite3.OperationalError: SQLite FTS5 desteği olmadan derlenmişse
+        """
+        super().__init__(path)
+        self._conn.executescript(self._SCHEMA)
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        """Belgeyi indeksler; aynı kimlikli belge varsa yerine geçer"""
+        # Terimler FTS5'e normalize edilmiş halleriyle verilir; Türkçe harf kuralları burada uygulanır
+        body = " ".join(tokenize(text))
+        with self._lock, self._conn:
+            self._delete(doc_id)
+            cursor = self._conn.execute("INSERT INTO fts_docs (doc_id) VALUES (?)", (doc_id,))
+            self._conn.execute("INSERT INTO cv_fts (rowid, body) VALUES (?, ?)", (cursor.lastrowid, body))
+
+    def _delete(self, doc_id: str) -> bool:
+        row = self._conn.execute("SELECT rowid FROM fts_docs WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM cv_fts WHERE rowid = ?", row)
+        self._conn.execute("DELETE FROM fts_docs WHERE rowid = ?", row)
+        return True
+
+    def remove_document(self, doc_id: str) -> bool:
+        with self._lock, self._conn:
+            return self._delete(doc_id)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fts_docs").fetchone()[0]
+
+    @classmethod
+    def _to_fts(cls, node: Tuple) -> str:
+        """Sorgu ağacını FTS5 sorgu sözdizimine çevirir"""
+        kind = node[0]
+        if kind == "term":
+            return f'"{node[1]}"'
+        if kind == "phrase":
+            return '"' + " ".join(node[1]) + '"'
+        if kind == "or":
+            return "(" + " OR ".join(cls._to_fts(child) for child in node[1]) + ")"
+        if kind == "not":
+            raise QueryError("FTS5 arka ucu tek başına NOT ifadesini desteklemiyor (ör. 'a OR NOT b')")
+        positives = [cls._to_fts(child) for child in node[1] if child[0] != "not"]
+        negatives = [cls._to_fts(child[1]) for child in node[1] if child[0] == "not"]
+        if not positives:
+            raise QueryError("FTS5 arka ucu yalnızca NOT içeren AND ifadesini desteklemiyor")
+        expression = "(" + " AND ".join(positives) + ")"
+        for negative in negatives:
+            expression = f"({expression} NOT {negative})"
+        return expression
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        tree = parse_query(query)
+        with self._lock:
+            if tree[0] == "not":
+                # Yalnızca olumsuz sorgu: eşleşmeyen tüm belgeler skor 0 ile döner
+                inner = self._to_fts(tree[1])
+                where = "rowid NOT IN (SELECT rowid FROM cv_fts WHERE cv_fts MATCH ?)"
+                total = self._conn.execute(f"SELECT COUNT(*) FROM fts_docs WHERE {where}", (inner,)).fetchone()[0]
+                rows = self._conn.execute(
+                    f"SELECT doc_id, 0.0 FROM fts_docs WHERE {where} ORDER BY doc_id LIMIT ? OFFSET ?",
+                    (inner, max(0, limit), max(0, offset))).fetchall()
+            else:
+                expression = self._to_fts(tree)
+                total = self._conn.execute("SELECT COUNT(*) FROM cv_fts WHERE cv_fts MATCH ?",
+                                           (expression,)).fetchone()[0]
+                rows = self._conn.execute(
+                    "SELECT d.doc_id, -bm25(cv_fts) AS score FROM cv_fts JOIN fts_docs d ON d.rowid = cv_fts.rowid "
+                    "WHERE cv_fts MATCH ? ORDER BY score DESC, d.doc_id LIMIT ? OFFSET ?",
+                    (expression, max(0, limit), max(0, offset))).fetchall()
+        return {"total": total, "results": [{"doc_id": doc_id, "score": score} for doc_id, score in rows]}
+
+
+def create_text_index(path: str = ":memory:", backend: str = "native") -> TextIndex:
+    """
+    İstenen arka uçla tam metin indeksi oluşturur
+
+    Args:
+        path (str): Veritabanı dosyası
+        backend (str): "native" (konumlu postingler + BM25) veya "fts5"
+
+    Returns:
+        TextIndex: İndeks
+    """
+    if backend == "fts5":
+        try:
+            return FTS5Index(path)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 kullanılamıyor ({str(e)}), yerleşik BM25 indeksine geçiliyor")
+            return BM25Index(path)
+    if backend != "native":
+        raise ValueError(f"Bilinmeyen indeks arka ucu: {backend}")
+    return BM25Index(path)
+
+
+def text_index_from_env() -> TextIndex:
+    """CV_INDEX_DB ve CV_INDEX_BACKEND ortam değişkenlerine göre indeks oluşturur"""
+    return create_text_index(os.environ.get(INDEX_PATH_ENV, DEFAULT_INDEX_PATH),
+                             os.environ.get(INDEX_BACKEND_ENV, "native"))
+
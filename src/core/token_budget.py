@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Token sayılarına göre bağlam ve çıktı bütçesi planlayıcı.
+
+Prompt modelin kendi tokenizer'ı ile sayılır; beklenen çıktı uzunluğu
+prompttaki JSON şemasının ve CV metninin token sayısından tahmin edilir.
+Böylece model yüklenirken gereğinden büyük KV-cache ayrılmaz, her istek için
+max_new_tokens şemanın gerektirdiği kadar tutulur ve bağlama sığmayan
+promptlar körlemesine kesilmek yerine reddedilir veya parçalanır.
+"""
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tokenizer yoksa kullanılan tahmin (Türkçe metinlerde token başına ~3 karakter)
+CHARS_PER_TOKEN = 3.0
+# Doldurulmuş JSON, CV'deki bilginin bir kısmını tekrarlar
+OUTPUT_PER_INPUT_TOKEN = 0.6
+# Bağlam uzunluğu bu katlara yuvarlanır
+CONTEXT_STEP = 512
+
+MIN_OUTPUT_TOKENS = 256
+MAX_OUTPUT_TOKENS = 4096
+
+
+class PromptTooLongError(ValueError):
+    """Prompt ve asgari çıktı modelin bağlamına sığmıyor"""
+
+    def __init__(self, prompt_tokens: int, context_length: int):
+        super().__init__(f"Prompt bağlama sığmıyor ({prompt_tokens} token, bağlam {context_length} token)")
+        self.prompt_tokens = prompt_tokens
+        self.context_length = context_length
+
+
+@dataclass
+class TokenBudget:
+    """Tek bir istek için planlanan token bütçesi"""
+    prompt_tokens: int
+    max_new_tokens: int
+    context_length: int
+
+    @property
+    def fits(self) -> bool:
+        return self.prompt_tokens + self.max_new_tokens <= self.context_length
+
+
+def _schema_text(text: str) -> str:
+    """Metindeki JSON şema bloğunu (ilk { ile son } arası) döndürür"""
+    start, end = text.find("{"), text.rfind("}")
+    return text[start:end + 1] if start != -1 and end > start else ""
+
+
+class TokenBudgetPlanner:
+    """Model tokenizer'ı ile prompt/çıktı token bütçesi hesaplayan planlayıcı"""
+
+    def __init__(self, tokenizer: Optional[Callable[[str], List[Any]]] = None,
+                 min_output: int = MIN_OUTPUT_TOKENS, max_output: int = MAX_OUTPUT_TOKENS):
+        """
+        Args:
+            tokenizer (Callable, optional): Metni token listesine çeviren fonksiyon
+                (ör. ctransformers model.tokenize). None ise karakter sayısından tahmin edilir.
+            min_output (int): Bir yanıt için ayrılacak en az token
+            max_output (int): Bir yanıt için ayrılacak en fazla token
+        """
+        self.tokenizer = tokenizer
+        self.min_output = min_output
+        self.max_output = max_output
+
+    def count(self, text: str) -> int:
+        """Metnin token sayısını döndürür"""
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            try:
+                return len(self.tokenizer(text))
+            except Exception as e:
+                logger.warning(f"Tokenizer hatası, karakter tahmini kullanılıyor: {str(e)}")
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def estimate_output(self, schema: str, input_text: str = "", input_tokens: Optional[int] = None) -> int:
+        """
+        Şemaya göre doldurulmuş JSON çıktısının token sayısını tahmin eder
+
+        Args:
+            schema (str): JSON şemasını içeren sabit prompt metni
+            input_text (str): Analiz edilecek metin (ör. CV)
+            input_tokens (int, optional): Metin yerine doğrudan token sayısı
+
+        Returns:
+            int: Tahmini çıktı token sayısı (min_output ile max_output arasında)
+        """
+        if input_tokens is None:
+            input_tokens = self.count(input_text)
+        estimate = self.count(_schema_text(schema)) + OUTPUT_PER_INPUT_TOKEN * input_tokens
+        return int(min(self.max_output, max(self.min_output, estimate)))
+
+    def context_for(self, prompt_tokens: int, output_tokens: int, limit: Optional[int] = None) -> int:
+        """Prompt ve çıktıya yetecek, CONTEXT_STEP katına yuvarlanmış bağlam uzunluğu"""
+        context = math.ceil((prompt_tokens + output_tokens) / CONTEXT_STEP) * CONTEXT_STEP
+        return min(context, limit) if limit else context
+
+    def plan(self, prompt: str, expected_output: int, context_length: Optional[int]) -> TokenBudget:
+        """
+        Bir istek için max_new_tokens değerini belirler
+
+        Çıktı, beklenen uzunluk ile bağlamda kalan yerin küçüğüne ayarlanır. Kalan yer
+        min_output'tan azsa bütçe sığmaz (fits=False) olarak döndürülür.
+
+        Args:
+            prompt (str): Tam prompt
+            expected_output (int): Beklenen çıktı token sayısı
+            context_length (int, optional): Modelin bağlam uzunluğu (None ise sınırsız kabul edilir)
+
+        Returns:
+            TokenBudget: Planlanan bütçe
+        """
+        prompt_tokens = self.count(prompt)
+        if context_length is None:
+            return TokenBudget(prompt_tokens, expected_output, prompt_tokens + expected_output)
+
+        remaining = context_length - prompt_tokens
+        if remaining < self.min_output:
+            return TokenBudget(prompt_tokens, self.min_output, context_length)
+        return TokenBudget(prompt_tokens, min(expected_output, remaining), context_length)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV ve iş tanımları için hash'lenmiş n-gram vektörleri ve yaklaşık en yakın komşu indeksi.
+
+Metinler harici bir model olmadan, normalize edilmiş kelime (tekli ve ikili)
+ve karakter n-gramlarının sabit boyutlu bir vektöre hash'lenmesiyle (işaretli
+"hashing trick") gömülür; aynı metin her süreçte aynı vektörü verir. Kelime
+ve karakter bileşenleri ayrı ayrı L2 normalize edilip toplanır, böylece
+"python"/"python3" gibi yazım farkları da benzerliğe katkı verir.
+
+Vektörler float32 olarak bellek eşlemeli (memmap) bir dosyada, belge
+kimlikleri SQLite'ta tutulur. Her vektör için rastgele hiperdüzlem
+izdüşümüyle (SimHash/LSH) 256 bitlik bir imza tutulur; iki imza arasındaki
+Hamming uzaklığı vektörler arasındaki açıyı tahmin eder. Arama önce yalnızca
+bu küçük imzalar üzerinden (vektör başına 32 bayt) en yakın adayları seçer,
+ardından yalnızca bu adaylar için memmap'ten kesin kosinüs benzerliği
+hesaplar. Bu indeks tam eşleştirme skorunun yerine geçmez; ağırlıklı
+skorlamadan önce aday üretimi için kullanılır.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.text_index import tokenize
+from src.processors.bulk_matching import top_k
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = "output/vector_index"
+INDEX_DIR_ENV = "VECTOR_INDEX_DIR"
+
+DEFAULT_DIM = 512
+CHAR_NGRAMS = (3, 4, 5)
+# İmza uzunluğu (32'nin katı); uzun imza açıyı daha az hatayla tahmin eder
+SKETCH_BITS = 256
+# Kesin benzerliği hesaplanacak aday sayısı: max(k * CANDIDATE_FACTOR, MIN_CANDIDATES)
+CANDIDATE_FACTOR = 20
+MIN_CANDIDATES = 200
+_INITIAL_CAPACITY = 1024
+# Hiperdüzlemler sabit tohumla üretilir; kayıtlı imzalar süreçler arasında geçerli kalır
+_SEED = 7
+
+
+def _hash_features(features: Iterable[str], dim: int) -> np.ndarray:
+    """Özellikleri işaretli olarak dim boyutlu vektöre hash'ler ve L2 normalize eder"""
+    hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), dtype=np.int64)
+    vector = np.zeros(dim, dtype=np.float64)
+    if len(hashes):
+        signs = np.where(hashes & (1 << 31), -1.0, 1.0)
+        counts = np.bincount(hashes % dim, weights=signs, minlength=dim)
+        # Alt doğrusal terim ağırlığı: sık tekrarlanan özellikler vektöre hakim olmasın
+        vector = np.sign(counts) * np.log1p(np.abs(counts))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def embed_text(text: str, dim: int = DEFAULT_DIM) -> np.ndarray:
+    """
+    Metni hash'lenmiş n-gram vektörüne çevirir
+
+    Args:
+        text (str): CV veya iş tanımı metni
+        dim (int): Vektör boyutu
+
+    Returns:
+        np.ndarray: float32, birim uzunlukta vektör (metin boşsa sıfır vektör)
+    """
+    tokens = tokenize(text)
+    words = [f"w:{token}" for token in tokens]
+    words.extend(f"b:{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    chars = []
+    for token in tokens:
+        padded = f" {token} "
+        for n in CHAR_NGRAMS:
+            chars.extend(f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1))
+    vector = _hash_features(words, dim) + _hash_features(chars, dim)
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).astype(np.float32)
+
+
+class VectorIndex:
+    """Memmap üzerinde float32 vektörler ve rastgele izdüşüm LSH ile yaklaşık en yakın komşu araması"""
+
+    def __init__(self, directory: Optional[str] = None, dim: int = DEFAULT_DIM, sketch_bits: int = SKETCH_BITS):
+        """
+        Args:
+            directory (str, optional): vectors.f32 ve index.db dosyalarının dizini (None ise bellekte tutulur)
+            dim (int): Vektör boyutu (mevcut indeksle aynı olmalı)
+            sketch_bits (int): LSH imza uzunluğu (32'nin katı)
+        """
+        if sketch_bits <= 0 or sketch_bits % 32:
+            raise ValueError("sketch_bits 32'nin pozitif katı olmalı")
+        self.directory = Path(directory) if directory else None
+        self.dim = dim
+        self.words = sketch_bits // 32
+        self._lock = threading.RLock()
+        self._planes = np.random.RandomState(_SEED).standard_normal((sketch_bits, dim)).astype(np.float32)
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.directory / "index.db"), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        else:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS vector_rows (doc_id TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE);
+            CREATE TABLE IF NOT EXISTS vector_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+        self._check_dim()
+
+        self._rows: Dict[str, int] = dict(self._conn.execute("SELECT doc_id, row FROM vector_rows"))
+        self._doc_ids: Dict[int, str] = {row: doc_id for doc_id, row in self._rows.items()}
+        size = max(self._rows.values(), default=-1) + 1
+        self._vectors = self._open_vectors(max(_INITIAL_CAPACITY, size))
+        self._free = sorted(set(range(size)) - set(self._doc_ids), reverse=True)
+        self._size = size
+        self._live = np.zeros(len(self._vectors), dtype=bool)
+        self._live[list(self._doc_ids)] = True
+        # LSH imzaları vektörlerden yeniden hesaplanır; ayrıca saklanmaz
+        self._codes = np.zeros((len(self._vectors), self.words), dtype=np.uint32)
+        if size:
+            self._codes[:size] = self._signatures(np.asarray(self._vectors[:size]))
+
+    @classmethod
+    def from_env(cls) -> "VectorIndex":
+        """VECTOR_INDEX_DIR ortam değişkenindeki (yoksa varsayılan) dizinle indeks oluşturur"""
+        return cls(os.environ.get(INDEX_DIR_ENV, DEFAULT_INDEX_DIR))
+
+    def _check_dim(self) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO vector_meta (key, value) VALUES ('dim', ?)", (self.dim,))
+        stored = self._conn.execute("SELECT value FROM vector_meta WHERE key = 'dim'").fetchone()[0]
+        if stored != self.dim:
+            raise ValueError(f"İndeks {stored} boyutlu vektörlerle oluşturulmuş, {self.dim} istendi")
+
+    def _open_vectors(self, capacity: int) -> np.ndarray:
+        """Vektör dosyasını en az capacity satırlık memmap olarak açar (gerekirse büyütür)"""
+        if self.directory is None:
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            if hasattr(self, "_vectors"):
+                vectors[:len(self._vectors)] = self._vectors
+            return vectors
+        path = self.directory / "vectors.f32"
+        if hasattr(self, "_vectors"):
+            self._vectors.flush()
+            del self._vectors
+        row_bytes = self.dim * np.dtype(np.float32).itemsize
+        current = path.stat().st_size // row_bytes if path.exists() else 0
+        if current < capacity:
+            with open(path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        else:
+            capacity = current
+        return np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _grow(self, capacity: int) -> None:
+        self._vectors = self._open_vectors(capacity)
+        self._live = np.concatenate([self._live, np.zeros(capacity - len(self._live), dtype=bool)])
+        self._codes = np.concatenate([self._codes, np.zeros((capacity - len(self._codes), self.words),
+                                                            dtype=np.uint32)])
+
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        """Vektörlerin LSH imzalarını (hiperdüzlemin hangi tarafında olduklarını) 32 bitlik kelimeler olarak döndürür"""
+        projected = (np.atleast_2d(vectors) @ self._planes.T) > 0
+        return np.packbits(projected, axis=1, bitorder="little").view(np.uint32)
+
+    def close(self) -> None:
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Metni gömüp indeksler; aynı kimlik varsa vektörü güncellenir"""
+        self.add_vector(doc_id, embed_text(text, self.dim))
+
+    def add_vector(self, doc_id: str, vector: np.ndarray) -> None:
+        """Önceden hesaplanmış vektörü indeksler"""
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = self._size
+                    self._size += 1
+                    if row >= len(self._vectors):
+                        self._grow(len(self._vectors) * 2)
+                with self._conn:
+                    self._conn.execute("INSERT INTO vector_rows (doc_id, row) VALUES (?, ?)", (doc_id, row))
+                self._rows[doc_id] = row
+                self._doc_ids[row] = doc_id
+            self._vectors[row] = vector
+            self._codes[row] = self._signatures(vector)[0]
+            self._live[row] = True
+
+    def remove(self, doc_id: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return False
+            with self._conn:
+                self._conn.execute("DELETE FROM vector_rows WHERE doc_id = ?", (doc_id,))
+            del self._doc_ids[row]
+            self._vectors[row] = 0
+            self._live[row] = False
+            self._free.append(row)
+            return True
+
+    def flush(self) -> None:
+        """Memmap değişikliklerini diske yazar"""
+        with self._lock:
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+
+    def _candidate_rows(self, query: np.ndarray, count: int) -> np.ndarray:
+        """İmzası sorgununkine Hamming uzaklığı en küçük count canlı satırı döndürür"""
+        live = np.flatnonzero(self._live[:self._size])
+        if len(live) <= count:
+            return live
+        distances = np.bitwise_count(self._codes[live] ^ self._signatures(query)[0]).sum(axis=1)
+        return live[np.argpartition(distances, count - 1)[:count]]
+
+    def search_vector(self, query: np.ndarray, k: int = 10, exact: bool = False,
+                      candidates: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Vektöre en benzer k belgeyi döndürür
+
+        Args:
+            query (np.ndarray): Sorgu vektörü
+            k (int): Sonuç sayısı
+            exact (bool): True ise LSH atlanıp tüm indeks taranır
+            candidates (int, optional): Kesin benzerliği hesaplanacak aday sayısı
+                (varsayılan max(k * CANDIDATE_FACTOR, MIN_CANDIDATES))
+
+        Returns:
+            List[Tuple[str, float]]: Kosinüs benzerliğine göre azalan (belge kimliği, benzerlik) listesi
+        """
+        query = np.asarray(query, dtype=np.float32)
+        with self._lock:
+            if not self._rows or k < 1 or not np.any(query):
+                return []
+            if exact:
+                rows = np.flatnonzero(self._live[:self._size])
+            else:
+                rows = self._candidate_rows(query, candidates or max(k * CANDIDATE_FACTOR, MIN_CANDIDATES))
+            scores = np.asarray(self._vectors[rows]) @ query
+            return [(self._doc_ids[int(rows[i])], float(scores[i])) for i in top_k(scores, k)]
+
+    def search(self, text: str, k: int = 10, exact: bool = False) -> List[Tuple[str, float]]:
+        """Metne en benzer k belgeyi döndürür (bkz. search_vector)"""
+        return self.search_vector(embed_text(text, self.dim), k, exact=exact)
+
+
+def position_text(position_data: Dict) -> str:
+    """Pozisyonun başlık, açıklama ve gereksinimlerini tek metinde birleştirir"""
+    requirements = position_data.get("requirements") or {}
+    parts = [str(position_data.get("title", "")), str(position_data.get("description", ""))]
+    for field in ("skills", "languages", "certifications"):
+        items = requirements.get(field) or []
+        if isinstance(items, list):
+            parts.extend(str(item) for item in items)
+    return " ".join(parts)
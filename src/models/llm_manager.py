@@ -1,16 +1,100 @@
 from typing import Dict, Optional, List
 import os
+import threading
 from llama_cpp import Llama
 from ..utils.platform_utils import PlatformConfig
+from ..core.autotune import load_tuned_config
+from ..core.inference_server import InferenceClient, SERVER_URL_ENV
+from ..core.prompt_cache import PromptTemplate, LlamaStateCache
+from ..core.token_budget import TokenBudgetPlanner, PromptTooLongError
+from ..utils.json_repair import repair_json
+
+# Sabit talimat ve şema önce gelir; değerlendirilmiş önek durumu istekler arasında yeniden kullanılır
+CV_ANALYSIS_TEMPLATE = PromptTemplate(
+    prefix="""<CV_ANALYSIS>
+Lütfen CV'yi analiz ederek yapılandırılmış formatta bilgileri çıkar ve aşağıdaki formatta yanıt ver:
+{
+    "kisisel_bilgiler": {
+        "ad_soyad": "",
+        "email": "",
+        "telefon": "",
+        "lokasyon": ""
+    },
+    "egitim": [
+        {
+            "okul": "",
+            "bolum": "",
+            "derece": "",
+            "baslangic": "",
+            "bitis": ""
+        }
+    ],
+    "deneyimler": [
+        {
+            "sirket": "",
+            "pozisyon": "",
+            "baslangic": "",
+            "bitis": "",
+            "sorumluluklar": []
+        }
+    ],
+    "beceriler": {
+        "teknik": [],
+        "diller": [],
+        "soft_skills": []
+    }
+}
+
+CV:
+""",
+    suffix="{cv_text}\n</CV_ANALYSIS>"
+)
+
+MATCHING_TEMPLATE = PromptTemplate(
+    prefix="""<MATCH_ANALYSIS>
+Lütfen CV ve pozisyon verilerini karşılaştırarak eşleşme analizi yap ve aşağıdaki formatta yanıt ver:
+{
+    "genel_skor": 0-100,
+    "kategori_skorlari": {
+        "teknik_beceriler": 0-100,
+        "deneyim": 0-100,
+        "egitim": 0-100
+    },
+    "guclu_yonler": [],
+    "eksik_yonler": [],
+    "tavsiyeler": []
+}
+
+""",
+    suffix="CV Verileri:\n{cv_data}\n\nPozisyon Gereksinimleri:\n{position_data}\n</MATCH_ANALYSIS>"
+)
 
 class LLMManager:
-    def __init__(self):
+    def __init__(self, server_url: Optional[str] = None):
         self.platform_config = PlatformConfig()
         self.model_config = self.platform_config.get_recommended_model_config()
+        # Bu makinede ölçülmüş ayarlar statik önerilerin yerine geçer
+        tuned = load_tuned_config(self.model_config["model_path"])
+        if tuned:
+            self.model_config.update({
+                "n_threads": tuned["threads"],
+                "n_batch": tuned["batch_size"],
+                "n_ctx": tuned["context_length"],
+            })
         self.model: Optional[Llama] = None
+        # Çıkarım sunucusu tanımlıysa model bu süreçte yüklenmez
+        server_url = server_url or os.environ.get(SERVER_URL_ENV)
+        self.client: Optional[InferenceClient] = InferenceClient(server_url) if server_url else None
+        self.state_cache = LlamaStateCache()
+        # Önek durumu yükleme ile üretim arasında başka bir istek modelin durumunu değiştirmemeli
+        self.model_lock = threading.Lock()
+        self.planner = TokenBudgetPlanner()
         
     def initialize_model(self) -> bool:
         """Model'i yükler ve başlatır"""
+        if self.client:
+            return self.client.is_ready()
+        
         if not os.path.exists(self.model_config["model_path"]):
             raise FileNotFoundError(
                 f"Model dosyası bulunamadı: {self.model_config['model_path']}\n"
@@ -27,6 +111,7 @@ class LLMManager:
                 use_mmap=self.model_config["use_mmap"],
                 use_mlock=self.model_config["use_mlock"]
             )
+            self.planner.tokenizer = lambda text: self.model.tokenize(text.encode("utf-8"))
             return True
         except Exception as e:
             print(f"Model yüklenirken hata oluştu: {str(e)}")
@@ -34,110 +119,75 @@ class LLMManager:
     
     def analyze_cv(self, cv_text: str) -> Dict:
         """CV metnini analiz eder ve yapılandırılmış veri döndürür"""
-        if not self.model:
+        if not self.model and not self.client:
             raise RuntimeError("Model henüz yüklenmedi. Önce initialize_model() çağrılmalı.")
         
         prompt = self._create_cv_analysis_prompt(cv_text)
-        response = self.model.create_completion(
-            prompt,
-            max_tokens=2048,
-            temperature=0.1,
-            top_p=0.95,
-            stop=["</CV_ANALYSIS>"],
-            echo=False
-        )
-        
-        return self._parse_cv_analysis_response(response.choices[0].text)
+        return self._parse_cv_analysis_response(
+            self._complete(prompt, 2048, ["</CV_ANALYSIS>"], CV_ANALYSIS_TEMPLATE))
     
     def match_cv_with_position(self, cv_data: Dict, position_data: Dict) -> Dict:
         """CV ve pozisyon verilerini karşılaştırır ve eşleşme skoru döndürür"""
-        if not self.model:
+        if not self.model and not self.client:
             raise RuntimeError("Model henüz yüklenmedi. Önce initialize_model() çağrılmalı.")
         
         prompt = self._create_matching_prompt(cv_data, position_data)
-        response = self.model.create_completion(
-            prompt,
-            max_tokens=1024,
-            temperature=0.1,
-            top_p=0.95,
-            stop=["</MATCH_ANALYSIS>"],
-            echo=False
-        )
+        return self._parse_matching_response(
+            self._complete(prompt, 1024, ["</MATCH_ANALYSIS>"], MATCHING_TEMPLATE))
+    
+    def _complete(self, prompt: str, max_tokens: int, stop: List[str],
+                  template: Optional[PromptTemplate] = None) -> str:
+        """Promptu yerel modele veya çıkarım sunucusuna gönderir"""
+        if self.client:
+            return self.client.generate(prompt, temperature=0.1, top_p=0.95,
+                                        max_new_tokens=max_tokens, stop=stop)
         
-        return self._parse_matching_response(response.choices[0].text)
+        # Çıktı bağlamda kalan yerle sınırlanır; sığmayan prompt kesilmeden reddedilir
+        budget = self.planner.plan(prompt, max_tokens, self.model_config["n_ctx"])
+        if not budget.fits:
+            raise PromptTooLongError(budget.prompt_tokens, budget.context_length)
+        max_tokens = budget.max_new_tokens
+        
+        # Önek durumu yüklenirse create_completion yalnızca CV'ye özgü tokenları değerlendirir
+        with self.model_lock:
+            if template is not None:
+                self.state_cache.restore(self.model, template)
+            
+            response = self.model.create_completion(
+                prompt,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                top_p=0.95,
+                stop=stop,
+                echo=False
+            )
+        return response["choices"][0]["text"]
     
     def _create_cv_analysis_prompt(self, cv_text: str) -> str:
         """CV analizi için prompt oluşturur"""
-        return f"""<CV_ANALYSIS>
-Lütfen aşağıdaki CV'yi analiz ederek yapılandırılmış formatta bilgileri çıkar:
-
-{cv_text}
-
-Lütfen aşağıdaki formatta yanıt ver:
-{{
-    "kisisel_bilgiler": {{
-        "ad_soyad": "",
-        "email": "",
-        "telefon": "",
-        "lokasyon": ""
-    }},
-    "egitim": [
-        {{
-            "okul": "",
-            "bolum": "",
-            "derece": "",
-            "baslangic": "",
-            "bitis": ""
-        }}
-    ],
-    "deneyimler": [
-        {{
-            "sirket": "",
-            "pozisyon": "",
-            "baslangic": "",
-            "bitis": "",
-            "sorumluluklar": []
-        }}
-    ],
-    "beceriler": {{
-        "teknik": [],
-        "diller": [],
-        "soft_skills": []
-    }}
-}}
-</CV_ANALYSIS>"""
+        return CV_ANALYSIS_TEMPLATE.build(cv_text=cv_text)
 
     def _create_matching_prompt(self, cv_data: Dict, position_data: Dict) -> str:
         """Eşleştirme analizi için prompt oluşturur"""
-        return f"""<MATCH_ANALYSIS>
-Lütfen aşağıdaki CV ve pozisyon verilerini karşılaştırarak eşleşme analizi yap:
-
-CV Verileri:
-{cv_data}
-
-Pozisyon Gereksinimleri:
-{position_data}
-
-Lütfen aşağıdaki formatta yanıt ver:
-{{
-    "genel_skor": 0-100,
-    "kategori_skorlari": {{
-        "teknik_beceriler": 0-100,
-        "deneyim": 0-100,
-        "egitim": 0-100
-    }},
-    "guclu_yonler": [],
-    "eksik_yonler": [],
-    "tavsiyeler": []
-}}
-</MATCH_ANALYSIS>"""
+        return MATCHING_TEMPLATE.build(cv_data=cv_data, position_data=position_data)
 
     def _parse_cv_analysis_response(self, response: str) -> Dict:
         """Model yanıtını işler ve yapılandırılmış veri döndürür"""
-        # TODO: Yanıt parsing işlemi geliştirilecek
-        return eval(response.strip())
+        return repair_json(response)[0]
     
     def _parse_matching_response(self, response: str) -> Dict:
         """Eşleştirme yanıtını işler ve yapılandırılmış veri döndürür"""
-        # TODO: Yanıt parsing işlemi geliştirilecek
-        return eval(response.strip()) 
\ No newline at end of file
+        return repair_json(response)[0] 
+
+
+_shared_manager: Optional[LLMManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_manager() -> LLMManager:
+    """Süreç genelinde paylaşılan llama_cpp yöneticisini döndürür (model bir kez yüklenir)"""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = LLMManager()
+        return _shared_manager
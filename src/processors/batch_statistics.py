@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Toplu CV analizi sonuçları için dağılım istatistikleri.
+
+Filtreler tüm CV'leri elediğinde sonuç listesi boş olabilir; bu durumda
+dağılımlar boş, deneyim özeti sıfır döner.
+"""
+from typing import Any, Dict, List
+
+import pandas as pd
+
+
+def calculate_statistics(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    CV sonuçları için istatistiksel analiz yapar
+
+    Args:
+        results (List[Dict[str, Any]]): CV analiz sonuçları (boş olabilir)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: StatisticalAnalysis alanları
+    """
+    stats = {
+        "skill_distribution": {},
+        "experience_distribution": {},
+        "education_distribution": {},
+        "language_distribution": {},
+        "average_match_scores": {}
+    }
+
+    # Beceri dağılımı
+    all_skills = []
+    for result in results:
+        all_skills.extend(result.get('skills', []))
+    stats["skill_distribution"] = pd.Series(all_skills, dtype=object).value_counts().to_dict()
+
+    # Deneyim dağılımı
+    experience_years = []
+    for result in results:
+        total_exp = sum(
+            int(exp.get('end_date', '2024')) - int(exp.get('start_date', '2024'))
+            for exp in result.get('experience', [])
+        )
+        experience_years.append(total_exp)
+    if experience_years:
+        stats["experience_distribution"] = {
+            "min": min(experience_years),
+            "max": max(experience_years),
+            "average": sum(experience_years) / len(experience_years)
+        }
+    else:
+        stats["experience_distribution"] = {"min": 0, "max": 0, "average": 0}
+
+    # Eğitim dağılımı
+    education_levels = []
+    for result in results:
+        for edu in result.get('education', []):
+            education_levels.append(edu.get('degree', ''))
+    stats["education_distribution"] = pd.Series(education_levels, dtype=object).value_counts().to_dict()
+
+    # Dil dağılımı
+    all_languages = []
+    for result in results:
+        all_languages.extend(result.get('languages', []))
+    stats["language_distribution"] = pd.Series(all_languages, dtype=object).value_counts().to_dict()
+
+    return stats
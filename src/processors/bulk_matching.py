@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+N aday × M pozisyon için vektörel (NumPy) toplu eşleştirme skoru.
+
+Adaylar bir kez kodlanır: beceri, dil ve sertifika terimleri seyrek (CSR)
+aday × terim matrislerine, toplam deneyim yılı ve en yüksek eğitim seviyesi
+sayısal sütunlara yazılır. Pozisyon gereksinimleri terim sözlüğüne karşı
+çözülür; eşleştirmedeki gibi gereksinim CV teriminin içinde geçiyorsa
+eşleşmiş sayılır. Kategori skorları ve ağırlıklı toplam, tek tek
+position_matching.score_cv çağrısıyla aynı işlem sırasıyla hesaplanır, bu
+yüzden sonuçlar bit düzeyinde aynıdır.
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.processors.position_matching import (WEIGHT_NAMES, PositionProfile, build_match_result, compile_position,
+                                               education_level, experience_years, normalize_cv)
+
+logger = logging.getLogger(__name__)
+
+# Terim kategorileri; CV'de ve pozisyon gereksinimlerinde aynı alan adıyla tutulur
+TERM_FIELDS = {
+    'skills': 'skills',
+    'languages': 'languages',
+    'certifications': 'certifications',
+}
+
+# Ağırlıklı toplamdaki kategori sırası (position_matching.score_profile ile aynı)
+_WEIGHTED_CATEGORIES = list(zip(['skills', 'experience', 'education', 'languages', 'certifications'], WEIGHT_NAMES))
+
+# Pozisyonlar ham veri olarak veya önceden derlenmiş profil olarak verilebilir
+PositionLike = Union[Dict[str, Any], PositionProfile]
+
+
+class TermMatrix:
+    """Aday × terim ilişkisinin CSR biçiminde seyrek gösterimi"""
+
+    def __init__(self, rows: List[List[str]]):
+        """
+        Args:
+            rows (List[List[str]]): Her aday için terim listesi
+        """
+        self.vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        for terms in rows:
+            columns = {self.vocabulary.setdefault(term.lower(), len(self.vocabulary)) for term in terms}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        # Her kaydın ait olduğu satır; gereksinim eşleşmeleri satır bazında toplanırken kullanılır
+        self.row_of = np.repeat(np.arange(len(rows), dtype=np.int64), np.diff(self.indptr))
+        self.terms = list(self.vocabulary)
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def columns_containing(self, requirement: str) -> np.ndarray:
+        """Küçük harfe çevrilmiş gereksinimi (alt dize olarak) içeren terim sütunlarını döndürür"""
+        return np.asarray([column for column, term in enumerate(self.terms) if requirement in term],
+                          dtype=np.int64)
+
+    def rows_matching(self, requirement: str) -> np.ndarray:
+        """Küçük harfe çevrilmiş gereksinimi karşılayan adayların boolean maskesini döndürür"""
+        mask = np.zeros(len(self.terms), dtype=bool)
+        mask[self.columns_containing(requirement)] = True
+        hits = self.row_of[mask[self.indices]]
+        return np.bincount(hits, minlength=self.n_rows) > 0
+
+
+class CandidateMatrix:
+    """Toplu skorlama için kodlanmış aday havuzu"""
+
+    def __init__(self, cv_list: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            cv_list (Iterable[Dict[str, Any]]): skills, experience, education, languages,
+                certifications alanlarını içeren CV verileri (bkz. position_matching.normalize_cv)
+        """
+        cv_list = list(cv_list)
+        self.size = len(cv_list)
+        self.terms = {category: TermMatrix([cv_data.get(field, []) for cv_data in cv_list])
+                      for category, field in TERM_FIELDS.items()}
+        self.experience_years = np.asarray([experience_years(cv_data.get('experience', [])) for cv_data in cv_list],
+                                           dtype=np.int64)
+        self.education_level = np.asarray([education_level(cv_data.get('education', [])) for cv_data in cv_list],
+                                          dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def _term_scores(matrix: TermMatrix, profiles: List[PositionProfile], field: str) -> np.ndarray:
+    """Tüm pozisyonlar için terim kategorisinin (beceri/dil/sertifika) N × M skorlarını hesaplar"""
+    scores = np.ones((matrix.n_rows, len(profiles)), dtype=np.float64)
+    # Aynı gereksinim birden çok pozisyonda geçse de sözlük bir kez taranır
+    cache: Dict[str, np.ndarray] = {}
+    for column, profile in enumerate(profiles):
+        required = getattr(profile, field)
+        if not required:
+            continue  # Gerekli terim yoksa tam puan
+        matches = np.zeros(matrix.n_rows, dtype=np.int64)
+        for key in required:
+            if key not in cache:
+                cache[key] = matrix.rows_matching(key)
+            matches += cache[key]
+        scores[:, column] = matches / len(required)
+    return scores
+
+
+def _experience_scores(candidates: CandidateMatrix, profiles: List[PositionProfile]) -> np.ndarray:
+    scores = np.ones((len(candidates), len(profiles)), dtype=np.float64)
+    for column, profile in enumerate(profiles):
+        if profile.min_years is None:
+            continue  # Gerekli deneyim yoksa tam puan
+        scores[:, column] = np.minimum(1.0, candidates.experience_years / max(1, profile.min_years))
+    return scores
+
+
+def _education_scores(candidates: CandidateMatrix, profiles: List[PositionProfile]) -> np.ndarray:
+    scores = np.ones((len(candidates), len(profiles)), dtype=np.float64)
+    levels = candidates.education_level
+    for column, profile in enumerate(profiles):
+        required_level = profile.education_level
+        if required_level == 0:
+            continue  # Gerekli eğitim yoksa tam puan
+        scores[:, column] = np.where(levels >= required_level, 1.0, levels / required_level)
+    return scores
+
+
+def compile_positions(positions: Sequence[PositionLike],
+                      matching_options: Optional[Dict[str, float]] = None) -> List[PositionProfile]:
+    """Ham pozisyonları derler; derlenmiş profillere verilen ağırlıkları uygular"""
+    return [position.with_weights(matching_options) if isinstance(position, PositionProfile)
+            else compile_position(position, matching_options) for position in positions]
+
+
+def score_matrix(candidates: CandidateMatrix, positions: Sequence[PositionLike],
+                 matching_options: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Tüm aday × pozisyon çiftleri için kategori skorlarını ve ağırlıklı toplamı hesaplar
+
+    Args:
+        candidates (CandidateMatrix): Kodlanmış aday havuzu
+        positions (Sequence[PositionLike]): İş pozisyonu verileri veya derlenmiş profiller
+        matching_options (Dict[str, float], optional): Kategori ağırlıkları (verilirse tüm pozisyonlar için)
+
+    Returns:
+        Tuple[np.ndarray, Dict[str, np.ndarray]]: N × M toplam skor ve kategori başına N × M skorlar
+    """
+    profiles = compile_positions(positions, matching_options)
+
+    category_scores = {
+        'skills': _term_scores(candidates.terms['skills'], profiles, 'skills'),
+        'experience': _experience_scores(candidates, profiles),
+        'education': _education_scores(candidates, profiles),
+        'languages': _term_scores(candidates.terms['languages'], profiles, 'languages'),
+        'certifications': _term_scores(candidates.terms['certifications'], profiles, 'certifications'),
+    }
+
+    # Toplama sırası tekli skorlamayla aynı tutulur (kayan nokta sonuçları birebir aynı olsun diye);
+    # ağırlıklar pozisyon başına olabildiği için sütun vektörü olarak çarpılır
+    total = np.zeros((len(candidates), len(profiles)), dtype=np.float64)
+    for category, weight_name in _WEIGHTED_CATEGORIES:
+        weights = np.asarray([profile.weights[weight_name] for profile in profiles], dtype=np.float64)
+        total = total + category_scores[category] * weights
+    return total, category_scores
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Tek bir skor vektöründe en yüksek k elemanın indekslerini döndürür
+
+    Tam sıralama yapılmaz: argpartition ile k. skor eşiği bulunur, yalnızca
+    eşiği geçen elemanlar sıralanır. Eşit skorlarda küçük indeks önce gelir.
+
+    Args:
+        scores (np.ndarray): Skorlar (1 boyutlu)
+        k (int): Seçilecek eleman sayısı
+
+    Returns:
+        np.ndarray: Skora göre azalan sırada indeksler
+    """
+    n = len(scores)
+    k = min(max(0, k), n)
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        selected = np.flatnonzero(scores >= threshold)
+    else:
+        selected = np.arange(n)
+    order = np.lexsort((selected, -scores[selected]))
+    return selected[order][:k]
+
+
+def rank_positions(candidates: CandidateMatrix, positions: Sequence[PositionLike], k: int = 10,
+                   matching_options: Optional[Dict[str, float]] = None) -> List[List[Tuple[int, float]]]:
+    """
+    Her pozisyon için en uygun k adayı (indeks, skor) olarak döndürür
+
+    Args:
+        candidates (CandidateMatrix): Kodlanmış aday havuzu
+        positions (Sequence[PositionLike]): İş pozisyonu verileri veya derlenmiş profiller
+        k (int): Pozisyon başına aday sayısı
+        matching_options (Dict[str, float], optional): Kategori ağırlıkları
+
+    Returns:
+        List[List[Tuple[int, float]]]: Pozisyon sırasıyla (aday indeksi, skor) listeleri
+    """
+    total, _ = score_matrix(candidates, positions, matching_options)
+    return [[(int(index), float(total[index, column])) for index in top_k(total[:, column], k)]
+            for column in range(len(positions))]
+
+
+def match_positions(cv_data: Dict[str, Any], positions: Sequence[PositionLike],
+                    matching_options: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """
+    Tek bir CV'yi birden çok pozisyonla eşleştirir
+
+    CV bir kez normalize edilip kodlanır; tüm pozisyonlar tek score_matrix
+    çağrısıyla puanlanır. Derlenmiş profiller verilirse pozisyon tarafında iş
+    yapılmaz.
+
+    Args:
+        cv_data (Dict[str, Any]): CV analiz sonucu (DocumentProcessor veya LLM biçiminde)
+        positions (Sequence[PositionLike]): İş pozisyonu verileri veya derlenmiş profiller
+        matching_options (Dict[str, float], optional): Kategori ağırlıkları
+
+    Returns:
+        List[Dict[str, Any]]: Skora göre azalan sırada, pozisyon indeksi ve başlığıyla eşleştirme sonuçları
+    """
+    profiles = compile_positions(positions, matching_options)
+    total, category_scores = score_matrix(CandidateMatrix([normalize_cv(cv_data)]), profiles)
+    results = []
+    for column in top_k(total[0], len(profiles)):
+        scores = {category: float(values[0, column]) for category, values in category_scores.items()}
+        results.append({'position_index': int(column), 'title': profiles[column].title,
+                        **build_match_result(float(total[0, column]), scores)})
+    return results
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çok sayıda CV'nin seyrek özellik matrisiyle karşılaştırılması.
+
+Her CV'nin becerileri, çalıştığı şirketler ve okulları bir kez seyrek (CSR)
+CV × özellik matrislerine kodlanır. Kesişim sayıları blok blok hesaplanır:
+scipy yüklüyse seyrek X · Xᵀ çarpımıyla, değilse özellik başına CV
+listeleri (posting) üzerinden, genişletilen kayıt sayısı sınırlı parçalar
+halinde. Böylece her çift için Python kümeleri kurulmaz ve N × N matrisin
+tamamı bellekte tutulmak zorunda kalmaz. Benzerlik, alan başına Jaccard benzerliklerinin ağırlıklı
+ortalamasıdır (beceri 0.4, şirket 0.4, okul 0.2); iki tarafta da boş olan
+alanın benzerliği 0 kabul edilir.
+"""
+import importlib.util
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.processors.bulk_matching import top_k
+
+logger = logging.getLogger(__name__)
+
+# scipy yüklüyse kesişimler seyrek matris çarpımıyla hesaplanır
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+
+if SCIPY_AVAILABLE:
+    from scipy import sparse
+else:
+    sparse = None
+
+# Özellik grubu -> (ağırlık, CV alanları, kayıt içindeki ad alanları)
+SIMILARITY_FEATURES = {
+    'skills': (0.4, ('skills', 'beceriler'), ()),
+    'companies': (0.4, ('experience', 'is_deneyimi'), ('company', 'sirket')),
+    'schools': (0.2, ('education', 'egitim', 'egitim_bilgileri'), ('school', 'institution', 'okul')),
+}
+
+DEFAULT_BLOCK_SIZE = 256
+# scipy yokken posting listelerinden bir seferde genişletilen en fazla kayıt sayısı;
+# sık geçen özelliklerde ara dizilerin bellek kullanımını sınırlar
+MAX_EXPANDED = 1 << 22
+
+
+def _feature_values(cv: Dict[str, Any], fields: Tuple[str, ...], keys: Tuple[str, ...]) -> List[str]:
+    """CV'deki bir özellik grubunun boş olmayan değerlerini döndürür"""
+    items = next((cv[field] for field in fields if field in cv), []) or []
+    if isinstance(items, dict):
+        items = [item for values in items.values() if isinstance(values, list) for item in values]
+    values = []
+    for item in items:
+        if isinstance(item, dict):
+            item = next((item[key] for key in keys if item.get(key)), '')
+        if isinstance(item, str) and item.strip():
+            values.append(item)
+    return values
+
+
+class _Incidence:
+    """CV × özellik ilişkisi: satır (CSR) ve sütun/posting (CSC) gösterimleri"""
+
+    def __init__(self, rows: List[List[str]]):
+        vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices: List[int] = []
+        for values in rows:
+            columns = {vocabulary.setdefault(value, len(vocabulary)) for value in values}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+        self.n_rows = len(rows)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.sizes = np.diff(self.indptr)
+        self.row_of = np.repeat(np.arange(self.n_rows, dtype=np.int64), self.sizes)
+
+        # Her özelliğin geçtiği CV'ler (posting listeleri)
+        order = np.argsort(self.indices, kind="stable")
+        self.posting_rows = self.row_of[order]
+        self.df = np.bincount(self.indices, minlength=len(vocabulary)).astype(np.int64)
+        self.posting_indptr = np.concatenate(([0], np.cumsum(self.df))).astype(np.int64)
+
+        self.matrix = self.matrix_t = None
+        if sparse is not None:
+            self.matrix = sparse.csr_matrix((np.ones(len(self.indices), dtype=np.int32), self.indices, self.indptr),
+                                            shape=(self.n_rows, len(vocabulary)))
+            self.matrix_t = self.matrix.T.tocsr()
+
+    def intersections(self, start: int, stop: int) -> np.ndarray:
+        """[start, stop) satırlarının tüm satırlarla ortak özellik sayılarını döndürür"""
+        block = stop - start
+        if self.matrix is not None:
+            return (self.matrix[start:stop] @ self.matrix_t).toarray()
+
+        lo, hi = self.indptr[start], self.indptr[stop]
+        features = self.indices[lo:hi]
+        rows = self.row_of[lo:hi] - start
+        lengths = self.df[features]
+        ends = np.cumsum(lengths)
+        counts = np.zeros(block * self.n_rows, dtype=np.int64)
+        first = 0
+        while first < len(features):
+            # Kayıtlar satır sırasında olduğundan her parça ardışık satırları kapsar;
+            # sınırı tek başına aşan kayıt kendi parçasında işlenir
+            last = max(int(np.searchsorted(ends, ends[first] - lengths[first] + MAX_EXPANDED, side="right")),
+                       first + 1)
+            part = lengths[first:last]
+            # Her (satır, özellik) kaydı, özelliğin posting listesindeki tüm satırlara genişletilir
+            offsets = np.arange(part.sum()) - np.repeat(np.cumsum(part) - part, part)
+            columns = self.posting_rows[np.repeat(self.posting_indptr[features[first:last]], part) + offsets]
+            base = rows[first] * self.n_rows
+            partial = np.bincount(np.repeat(rows[first:last], part) * self.n_rows + columns - base)
+            counts[base:base + len(partial)] += partial
+            first = last
+        return counts.reshape(block, self.n_rows)
+
+
+class CVFeatures:
+    """Karşılaştırma için kodlanmış CV listesi"""
+
+    def __init__(self, results: List[Dict[str, Any]]):
+        self.size = len(results)
+        self.groups = {name: (weight, _Incidence([_feature_values(cv, fields, keys) for cv in results]))
+                       for name, (weight, fields, keys) in SIMILARITY_FEATURES.items()}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def similarity_block(self, start: int, stop: int) -> np.ndarray:
+        """[start, stop) satırlarının tüm CV'lerle ağırlıklı benzerliklerini döndürür"""
+        total = np.zeros((stop - start, self.size), dtype=np.float64)
+        for weight, incidence in self.groups.values():
+            common = incidence.intersections(start, stop)
+            union = incidence.sizes[start:stop, None] + incidence.sizes[None, :] - common
+            jaccard = np.divide(common, union, out=np.zeros(common.shape, dtype=np.float64), where=union > 0)
+            total += jaccard * weight
+        return total
+
+    def iter_blocks(self, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Tuple[int, np.ndarray]]:
+        """Benzerlik matrisini satır blokları halinde üretir"""
+        for start in range(0, self.size, block_size):
+            stop = min(start + block_size, self.size)
+            yield start, self.similarity_block(start, stop)
+
+    def similarity_matrix(self) -> np.ndarray:
+        """N × N benzerlik matrisinin tamamını döndürür (küçük havuzlar için)"""
+        if not self.size:
+            return np.zeros((0, 0))
+        return np.vstack([block for _, block in self.iter_blocks()])
+
+
+def _upper_pairs(start: int, block: np.ndarray) -> np.ndarray:
+    """Bloğun yalnızca i < j çiftlerini bırakan maskesi"""
+    rows = np.arange(start, start + block.shape[0])[:, None]
+    return np.arange(block.shape[1])[None, :] > rows
+
+
+def top_pairs(features: CVFeatures, k: int, block_size: int = DEFAULT_BLOCK_SIZE) -> List[Tuple[int, int, float]]:
+    """
+    En benzer k CV çiftini döndürür (matrisin tamamı bellekte tutulmaz)
+
+    Args:
+        features (CVFeatures): Kodlanmış CV'ler
+        k (int): Çift sayısı
+        block_size (int): Aynı anda hesaplanan satır sayısı
+
+    Returns:
+        List[Tuple[int, int, float]]: Benzerliğe göre azalan (i, j, benzerlik) listesi
+    """
+    best: List[Tuple[float, int, int]] = []
+    for start, block in features.iter_blocks(block_size):
+        block = np.where(_upper_pairs(start, block), block, -np.inf)
+        for flat in top_k(block.ravel(), k):
+            score = block.flat[flat]
+            if score == -np.inf:
+                break
+            row, column = divmod(int(flat), features.size)
+            best.append((float(score), start + row, column))
+        best = sorted(best, key=lambda item: (-item[0], item[1], item[2]))[:k]
+    return [(i, j, score) for score, i, j in best]
+
+
+def similarity_clusters(features: CVFeatures, threshold: float,
+                        block_size: int = DEFAULT_BLOCK_SIZE) -> List[List[int]]:
+    """
+    Benzerliği eşiği geçen çiftleri birleştirerek CV kümelerini bulur
+
+    Args:
+        features (CVFeatures): Kodlanmış CV'ler
+        threshold (float): Aynı kümeye konacak en düşük benzerlik
+        block_size (int): Aynı anda hesaplanan satır sayısı
+
+    Returns:
+        List[List[int]]: En az iki CV içeren kümeler (büyükten küçüğe)
+    """
+    parent = list(range(features.size))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for start, block in features.iter_blocks(block_size):
+        rows, columns = np.nonzero((block >= threshold) & _upper_pairs(start, block))
+        for row, column in zip((rows + start).tolist(), columns.tolist()):
+            a, b = find(row), find(column)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    clusters: Dict[int, List[int]] = {}
+    for node in range(features.size):
+        clusters.setdefault(find(node), []).append(node)
+    return sorted((members for members in clusters.values() if len(members) > 1), key=lambda m: (-len(m), m[0]))
+
+
+def _hashable(item: Any) -> Any:
+    """Liste/sözlük öğelerini küme işlemlerinde kullanılabilir hale getirir"""
+    if isinstance(item, (dict, list)):
+        return json.dumps(item, ensure_ascii=False, sort_keys=True)
+    return item
+
+
+def field_comparisons(results: List[Dict[str, Any]], fields: List[str]) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Alan başına tüm CV'lerde ortak olan ve olmayan öğeleri bulur
+
+    Her öğenin kaç CV'de geçtiği tek geçişte sayılır; tüm CV'lerde geçenler
+    ortak, diğerleri benzersiz sayılır.
+    """
+    comparisons = {}
+    for field in fields:
+        counts: Counter = Counter()
+        originals: Dict[Any, Any] = {}
+        for result in results:
+            items = result.get(field, []) or []
+            keys = {_hashable(item) for item in items}
+            originals.update({_hashable(item): item for item in items})
+            counts.update(keys)
+        comparisons[field] = {
+            "common": [originals[key] for key, count in counts.items() if count == len(results)],
+            "unique": [originals[key] for key, count in counts.items() if count < len(results)]
+        }
+    return comparisons
+
+
+def compare_cv_data(results: List[Dict[str, Any]], fields: List[str], top_k_pairs: Optional[int] = None,
+                    cluster_threshold: Optional[float] = None, labels: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    CV'leri karşılaştırır
+
+    Args:
+        results (List[Dict[str, Any]]): CV analiz sonuçları
+        fields (List[str]): Ortak/benzersiz öğeleri raporlanacak alanlar
+        top_k_pairs (int, optional): Verilirse yalnızca en benzer k çift döndürülür
+        cluster_threshold (float, optional): Verilirse bu eşikle benzerlik kümeleri döndürülür
+        labels (List[str], optional): CV etiketleri (varsayılan cv_0, cv_1, ...)
+
+    Returns:
+        Dict[str, Any]: field_comparisons, similarity_scores, unique_features (ve istenirse clusters)
+    """
+    labels = labels or [f"cv_{i}" for i in range(len(results))]
+    features = CVFeatures(results)
+    comparison = {
+        "field_comparisons": field_comparisons(results, fields),
+        "similarity_scores": {},
+        "unique_features": {}
+    }
+
+    # Benzerlik skorları
+    if top_k_pairs is not None:
+        pairs = top_pairs(features, top_k_pairs)
+    else:
+        pairs = []
+        for start, block in features.iter_blocks():
+            rows, columns = np.nonzero(_upper_pairs(start, block))
+            pairs.extend((start + int(row), int(column), float(block[row, column]))
+                         for row, column in zip(rows, columns))
+    for i, j, similarity in pairs:
+        comparison["similarity_scores"][f"{labels[i]}_{labels[j]}"] = similarity
+
+    if cluster_threshold is not None:
+        comparison["clusters"] = [[labels[i] for i in members]
+                                  for members in similarity_clusters(features, cluster_threshold)]
+
+    # Benzersiz özellikler
+    for label, result in zip(labels, results):
+        comparison["unique_features"][label] = {
+            field: result.get(field, [])
+            for field in fields
+            if result.get(field, [])
+        }
+
+    return comparison
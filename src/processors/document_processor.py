@@ -8,6 +8,7 @@ import re
 from datetime import date
 from functools import lru_cache
 from ..models.cv_models import CV, PersonalInfo, Education, Experience
+from . import position_matching
 import json
 import logging
 
@@ -1017,190 +1018,30 @@ class DocumentProcessor:
             Dict[str, Any]: Eşleştirme sonuçları
         """
         logger.info(f"CV ve pozisyon eşleştirmesi başlatılıyor")
-        
-        if matching_options is None:
-            matching_options = {
-                'skill_weight': 0.4,
-                'experience_weight': 0.3,
-                'education_weight': 0.2,
-                'language_weight': 0.05,
-                'certification_weight': 0.05
-            }
-            
-        # Beceri eşleşmesi
-        skill_score = self._calculate_skill_match(cv_data.get('skills', []), position_data.get('requirements', {}).get('skills', []))
-        
-        # Deneyim eşleşmesi
-        experience_score = self._calculate_experience_match(cv_data.get('experience', []), position_data.get('requirements', {}).get('experience', {}))
-        
-        # Eğitim eşleşmesi
-        education_score = self._calculate_education_match(cv_data.get('education', []), position_data.get('requirements', {}).get('education', {}))
-        
-        # Dil eşleşmesi
-        language_score = self._calculate_language_match(cv_data.get('languages', []), position_data.get('requirements', {}).get('languages', []))
-        
-        # Sertifika eşleşmesi
-        certification_score = self._calculate_certification_match(cv_data.get('certifications', []), position_data.get('requirements', {}).get('certifications', []))
-        
-        # Ağırlıklı toplam skor
-        total_score = (
-            skill_score * matching_options['skill_weight'] +
-            experience_score * matching_options['experience_weight'] +
-            education_score * matching_options['education_weight'] +
-            language_score * matching_options['language_weight'] +
-            certification_score * matching_options['certification_weight']
-        )
-        
-        # Güçlü ve zayıf yönleri belirle
-        strengths = []
-        weaknesses = []
-        
-        # Beceri güçlü/zayıf yönleri
-        if skill_score >= 0.8:
-            strengths.append("Beceri setinin pozisyonla çok iyi uyumu")
-        elif skill_score <= 0.4:
-            weaknesses.append("Gerekli beceriler eksik")
-            
-        # Deneyim güçlü/zayıf yönleri
-        if experience_score >= 0.8:
-            strengths.append("Pozisyon için yeterli deneyim")
-        elif experience_score <= 0.4:
-            weaknesses.append("Pozisyon için deneyim eksikliği")
-            
-        # Eğitim güçlü/zayıf yönleri
-        if education_score >= 0.8:
-            strengths.append("Eğitim geçmişi pozisyonla uyumlu")
-        elif education_score <= 0.4:
-            weaknesses.append("Pozisyon için gerekli eğitim eksik")
-            
-        # Sonuçları döndür
-        match_result = {
-            'match_score': total_score,
-            'category_scores': {
-                'skills': skill_score,
-                'experience': experience_score,
-                'education': education_score,
-                'languages': language_score,
-                'certifications': certification_score
-            },
-            'strengths': strengths,
-            'weaknesses': weaknesses,
-            'recommendations': self._generate_recommendations(total_score, strengths, weaknesses)
-        }
-        
-        logger.info(f"Eşleştirme tamamlandı, skor: {total_score:.2f}")
+        match_result = position_matching.match_cv_with_position(cv_data, position_data, matching_options)
+        logger.info(f"Eşleştirme tamamlandı, skor: {match_result['match_score']:.2f}")
         return match_result
     
     def _calculate_skill_match(self, cv_skills: List[str], required_skills: List[str]) -> float:
         """Beceri eşleşme skorunu hesaplar"""
-        if not required_skills:
-            return 1.0  # Gerekli beceri yoksa tam puan
-            
-        # CV becerilerini ve gerekli becerileri küçük harfe çevir
-        cv_skills_lower = [skill.lower() for skill in cv_skills]
-        required_skills_lower = [skill.lower() for skill in required_skills]
-        
-        # Eşleşen becerileri say
-        matches = sum(1 for skill in required_skills_lower if any(skill in cv_skill for cv_skill in cv_skills_lower))
-        
-        # Skor hesapla
-        return matches / len(required_skills)
+        return position_matching.calculate_skill_match(cv_skills, required_skills)
     
     def _calculate_experience_match(self, cv_experience: List[Dict[str, Any]], required_experience: Dict[str, Any]) -> float:
         """Deneyim eşleşme skorunu hesaplar"""
-        if not required_experience:
-            return 1.0  # Gerekli deneyim yoksa tam puan
-            
-        # Toplam deneyim yılını hesapla
-        total_years = 0
-        for exp in cv_experience:
-            start_year = int(exp.get('start_date', 0)) if exp.get('start_date') else 0
-            end_year = int(exp.get('end_date', date.today().year)) if exp.get('end_date') else date.today().year
-            total_years += max(0, end_year - start_year)
-            
-        # Gerekli minimum deneyim
-        min_years = required_experience.get('min_years', 0)
-        
-        # Deneyim skoru hesapla (maksimum 1.0)
-        return min(1.0, total_years / max(1, min_years))
+        return position_matching.calculate_experience_match(cv_experience, required_experience)
     
     def _calculate_education_match(self, cv_education: List[Dict[str, Any]], required_education: Dict[str, Any]) -> float:
         """Eğitim eşleşme skorunu hesaplar"""
-        if not required_education:
-            return 1.0  # Gerekli eğitim yoksa tam puan
-            
-        # Eğitim seviyelerini sayısal değerlere dönüştür
-        education_levels = {
-            'lise': 1,
-            'önlisans': 2,
-            'lisans': 3,
-            'yüksek lisans': 4,
-            'doktora': 5
-        }
-        
-        # Gerekli minimum eğitim seviyesi
-        required_level = education_levels.get(required_education.get('min_level', '').lower(), 0)
-        
-        # CV'deki en yüksek eğitim seviyesini bul
-        cv_max_level = 0
-        for edu in cv_education:
-            level = education_levels.get(edu.get('degree', '').lower(), 0)
-            cv_max_level = max(cv_max_level, level)
-            
-        # Eğitim skoru hesapla
-        if required_level == 0:
-            return 1.0
-        elif cv_max_level == 0:
-            return 0.0
-        elif cv_max_level >= required_level:
-            return 1.0
-        else:
-            return cv_max_level / required_level
+        return position_matching.calculate_education_match(cv_education, required_education)
     
     def _calculate_language_match(self, cv_languages: List[str], required_languages: List[str]) -> float:
         """Dil eşleşme skorunu hesaplar"""
-        if not required_languages:
-            return 1.0  # Gerekli dil yoksa tam puan
-            
-        # CV dillerini ve gerekli dilleri küçük harfe çevir
-        cv_languages_lower = [lang.lower() for lang in cv_languages]
-        required_languages_lower = [lang.lower() for lang in required_languages]
-        
-        # Eşleşen dilleri say
-        matches = sum(1 for lang in required_languages_lower if any(lang in cv_lang for cv_lang in cv_languages_lower))
-        
-        # Skor hesapla
-        return matches / len(required_languages)
+        return position_matching.calculate_language_match(cv_languages, required_languages)
     
     def _calculate_certification_match(self, cv_certifications: List[str], required_certifications: List[str]) -> float:
         """Sertifika eşleşme skorunu hesaplar"""
-        if not required_certifications:
-            return 1.0  # Gerekli sertifika yoksa tam puan
-            
-        # CV sertifikalarını ve gerekli sertifikaları küçük harfe çevir
-        cv_certifications_lower = [cert.lower() for cert in cv_certifications]
-        required_certifications_lower = [cert.lower() for cert in required_certifications]
-        
-        # Eşleşen sertifikaları say
-        matches = sum(1 for cert in required_certifications_lower if any(cert in cv_cert for cv_cert in cv_certifications_lower))
-        
-        # Skor hesapla
-        return matches / len(required_certifications)
+        return position_matching.calculate_certification_match(cv_certifications, required_certifications)
     
     def _generate_recommendations(self, total_score: float, strengths: List[str], weaknesses: List[str]) -> List[str]:
         """Adaya öneriler oluşturur"""
-        recommendations = []
-        
-        if total_score < 0.5:
-            recommendations.append("Başvurulan pozisyon için gerekli beceri ve deneyimleri geliştirmek önerilir")
-            
-        if "Gerekli beceriler eksik" in weaknesses:
-            recommendations.append("Pozisyon için gerekli teknik becerileri edinmek için eğitim veya kurslar alınabilir")
-            
-        if "Pozisyon için deneyim eksikliği" in weaknesses:
-            recommendations.append("Benzer alanlarda proje veya gönüllü çalışmalarla deneyim kazanılabilir")
-            
-        if "Pozisyon için gerekli eğitim eksik" in weaknesses:
-            recommendations.append("İlgili alanda eğitim veya sertifika programları değerlendirilebilir")
-            
-        return recommendations 
\ No newline at end of file
+        return position_matching.generate_recommendations(total_score, strengths, weaknesses)
\ No newline at end of file
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV ile iş pozisyonu arasındaki ağırlıklı eşleştirme skoru.
+
+DocumentProcessor.match_cv_with_position'ın skorlama mantığı, belge işleme
+bağımlılıkları (PDF/DOCX kütüphaneleri) olmadan kullanılabilsin diye burada
+tutulur. Aday deposu binlerce adayı sıralarken aynı fonksiyonları kullanır.
+"""
+import logging
+import re
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MATCHING_OPTIONS = {
+    'skill_weight': 0.4,
+    'experience_weight': 0.3,
+    'education_weight': 0.2,
+    'language_weight': 0.05,
+    'certification_weight': 0.05
+}
+
+# Ağırlıklı toplamdaki sıra (kayan nokta sonuçları tüm skorlama yollarında aynı olsun diye sabit)
+WEIGHT_NAMES = ('skill_weight', 'experience_weight', 'education_weight', 'language_weight', 'certification_weight')
+
+# Eğitim seviyelerinin sayısal karşılıkları
+EDUCATION_LEVELS = {
+    'lise': 1,
+    'önlisans': 2,
+    'lisans': 3,
+    'yüksek lisans': 4,
+    'doktora': 5
+}
+
+# Eğitim girdisinde derece alanı yoksa metinde aranan seviye adları (uzundan kısaya)
+_DEGREE_NAMES = ['yüksek lisans', 'önlisans', 'doktora', 'lisans', 'lise']
+
+_YEAR_PATTERN = re.compile(r"(?:19|20)\d{2}")
+# "2018", "2018-05", "2018/5", "05.2018" veya "5/2018" biçimindeki tarihler
+_DATE_PATTERN = re.compile(r"((?:19|20)\d{2})(?:[-./](\d{1,2}))?|(\d{1,2})[-./]((?:19|20)\d{2})")
+
+
+def _flatten_strings(value: Any) -> List[str]:
+    """İç içe liste/sözlük değerlerindeki metinleri düz bir listeye çevirir"""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, dict):
+        for key in ('name', 'dil', 'ad', 'isim'):
+            if isinstance(value.get(key), str):
+                return _flatten_strings(value[key])
+        items = []
+        for item in value.values():
+            items.extend(_flatten_strings(item))
+        return items
+    if isinstance(value, (list, tuple)):
+        items = []
+        for item in value:
+            items.extend(_flatten_strings(item))
+        return items
+    return []
+
+
+def _split_period(period: str) -> Tuple[Any, Any]:
+    """"2018 - Günümüz" biçimindeki tarih aralığını başlangıç/bitiş yıllarına ayırır"""
+    years = _YEAR_PATTERN.findall(period or '')
+    if not years:
+        return None, None
+    if len(years) == 1:
+        return years[0], None
+    return years[0], years[-1]
+
+
+def normalize_cv(cv_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Farklı analiz çıktılarını eşleştirmenin beklediği alanlara dönüştürür
+
+    DocumentProcessor çıktısı (skills, experience, ...) olduğu gibi kullanılır.
+    LLM/regex çıktılarındaki Türkçe alanlar (beceriler, diller, sertifikalar,
+    egitim/egitim_bilgileri, is_deneyimi) karşılıklarına çevrilir; "tarih"
+    aralıkları yıllara ayrılır, derece yoksa okul/bölüm metninden çıkarılır.
+
+    Args:
+        cv_data (Dict[str, Any]): CV analiz sonucu
+
+    Returns:
+        Dict[str, Any]: skills, experience, education, languages, certifications alanları
+    """
+    skills_source = cv_data.get('skills', cv_data.get('beceriler', []))
+    languages = cv_data.get('languages', cv_data.get('diller'))
+    if isinstance(skills_source, dict):
+        if languages is None:
+            languages = skills_source.get('diller')
+        skills_source = {key: value for key, value in skills_source.items() if key != 'diller'}
+
+    experience = []
+    for exp in cv_data.get('experience', cv_data.get('is_deneyimi', [])) or []:
+        if not isinstance(exp, dict):
+            continue
+        if 'start_date' in exp or 'end_date' in exp:
+            experience.append({'start_date': exp.get('start_date'), 'end_date': exp.get('end_date')})
+        else:
+            start, end = _split_period(str(exp.get('tarih', '')))
+            if start:
+                experience.append({'start_date': start, 'end_date': end})
+
+    education = []
+    edu_source = cv_data.get('education', cv_data.get('egitim', cv_data.get('egitim_bilgileri', [])))
+    for edu in edu_source or []:
+        if not isinstance(edu, dict):
+            continue
+        degree = edu.get('degree', edu.get('derece'))
+        if not degree:
+            text = ' '.join(str(edu.get(key, '')) for key in ('bolum', 'okul')).lower()
+            degree = next((name for name in _DEGREE_NAMES if name in text), '')
+        education.append({'degree': degree})
+
+    return {
+        'skills': _flatten_strings(skills_source),
+        'experience': experience,
+        'education': education,
+        'languages': _flatten_strings(languages or []),
+        'certifications': _flatten_strings(cv_data.get('certifications', cv_data.get('sertifikalar', [])))
+    }
+
+
+def normalize_weights(matching_options: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    Kategori ağırlıklarını tamamlar ve toplamlarını 1'e ölçekler
+
+    Eksik ağırlıklar varsayılan değerleriyle doldurulur. Toplamı zaten 1 olan
+    ağırlıklar (varsayılanlar dahil) değiştirilmeden döndürülür.
+
+    Raises:
+        ValueError: Ağırlıklardan biri negatifse veya toplam 0 ise
+    """
+    weights = {name: float((matching_options or {}).get(name, DEFAULT_MATCHING_OPTIONS[name]))
+               for name in WEIGHT_NAMES}
+    total = sum(weights.values())
+    if any(weight < 0 for weight in weights.values()) or total <= 0:
+        raise ValueError("Eşleştirme ağırlıkları negatif olamaz ve toplamı 0'dan büyük olmalı")
+    if abs(total - 1.0) > 1e-9:
+        weights = {name: weight / total for name, weight in weights.items()}
+    return weights
+
+
+@dataclass(frozen=True)
+class PositionProfile:
+    """
+    Eşleştirmeye hazır (derlenmiş) pozisyon
+
+    Gereksinimler bir kez doğrulanıp küçük harfe çevrilir, eğitim seviyesi
+    sayıya dönüştürülür; her eşleştirmede yalnızca aday tarafı işlenir.
+    """
+    title: str = ''
+    skills: Tuple[str, ...] = ()
+    languages: Tuple[str, ...] = ()
+    certifications: Tuple[str, ...] = ()
+    # None: deneyim gereksinimi yok
+    min_years: Optional[float] = None
+    # 0: eğitim gereksinimi yok veya seviye tanınmıyor
+    education_level: int = 0
+    weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MATCHING_OPTIONS))
+
+    def with_weights(self, matching_options: Optional[Dict[str, float]]) -> "PositionProfile":
+        """Ağırlıkları değiştirilmiş profil döndürür (None ise profilin kendisi)"""
+        if matching_options is None:
+            return self
+        return replace(self, weights=normalize_weights(matching_options))
+
+
+def _requirement_terms(requirements: Dict[str, Any], name: str) -> Tuple[str, ...]:
+    items = requirements.get(name) or []
+    if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+        raise ValueError(f"requirements.{name} metin listesi olmalı")
+    return tuple(item.lower() for item in items)
+
+
+def compile_position(position_data: Dict[str, Any],
+                     matching_options: Optional[Dict[str, float]] = None) -> PositionProfile:
+    """
+    Pozisyon verisini eşleştirme profiline derler
+
+    Args:
+        position_data (Dict[str, Any]): İş pozisyonu verisi (requirements alanıyla)
+        matching_options (Dict[str, float], optional): Kategori ağırlıkları; verilmezse
+            pozisyonun kendi matching_options alanı, o da yoksa varsayılanlar kullanılır
+
+    Returns:
+        PositionProfile: Derlenmiş pozisyon
+
+    Raises:
+        ValueError: Gereksinimler geçersizse
+    """
+    requirements = position_data.get('requirements') or {}
+    if not isinstance(requirements, dict):
+        raise ValueError("requirements bir nesne olmalı")
+
+    min_years = None
+    experience = requirements.get('experience') or {}
+    if experience:
+        min_years = experience.get('min_years', 0) if isinstance(experience, dict) else None
+        if isinstance(min_years, bool) or not isinstance(min_years, (int, float)):
+            raise ValueError("requirements.experience.min_years sayı olmalı")
+
+    required_level = 0
+    education = requirements.get('education') or {}
+    if education:
+        if not isinstance(education, dict):
+            raise ValueError("requirements.education bir nesne olmalı")
+        required_level = EDUCATION_LEVELS.get(str(education.get('min_level', '')).lower(), 0)
+
+    return PositionProfile(
+        title=str(position_data.get('title', '')),
+        skills=_requirement_terms(requirements, 'skills'),
+        languages=_requirement_terms(requirements, 'languages'),
+        certifications=_requirement_terms(requirements, 'certifications'),
+        min_years=min_years,
+        education_level=required_level,
+        weights=normalize_weights(matching_options or position_data.get('matching_options')),
+    )
+
+
+def score_profile(cv_data: Dict[str, Any], profile: PositionProfile) -> Tuple[float, Dict[str, float]]:
+    """
+    Derlenmiş pozisyon için ağırlıklı toplam skoru ve kategori skorlarını hesaplar
+
+    Args:
+        cv_data (Dict[str, Any]): CV verisi (skills, experience, ... alanlarıyla)
+        profile (PositionProfile): Derlenmiş pozisyon
+
+    Returns:
+        Tuple[float, Dict[str, float]]: Toplam skor ve kategori skorları
+    """
+    category_scores = {
+        'skills': _term_match(cv_data.get('skills', []), profile.skills),
+        'experience': _experience_score(experience_years(cv_data.get('experience', [])), profile.min_years),
+        'education': _education_score(education_level(cv_data.get('education', [])), profile.education_level),
+        'languages': _term_match(cv_data.get('languages', []), profile.languages),
+        'certifications': _term_match(cv_data.get('certifications', []), profile.certifications)
+    }
+
+    # Ağırlıklı toplam skor
+    weights = profile.weights
+    total_score = (
+        category_scores['skills'] * weights['skill_weight'] +
+        category_scores['experience'] * weights['experience_weight'] +
+        category_scores['education'] * weights['education_weight'] +
+        category_scores['languages'] * weights['language_weight'] +
+        category_scores['certifications'] * weights['certification_weight']
+    )
+    return total_score, category_scores
+
+
+def score_cv(cv_data: Dict[str, Any], position_data: Dict[str, Any],
+             matching_options: Dict[str, float] = None) -> Tuple[float, Dict[str, float]]:
+    """
+    Ağırlıklı toplam skoru ve kategori skorlarını hesaplar
+
+    Args:
+        cv_data (Dict[str, Any]): CV verisi (skills, experience, ... alanlarıyla)
+        position_data (Dict[str, Any]): İş pozisyonu verisi
+        matching_options (Dict[str, float], optional): Kategori ağırlıkları
+
+    Returns:
+        Tuple[float, Dict[str, float]]: Toplam skor ve kategori skorları
+    """
+    return score_profile(cv_data, compile_position(position_data, matching_options))
+
+
+def build_match_result(total_score: float, category_scores: Dict[str, float]) -> Dict[str, Any]:
+    """Skorlardan güçlü/zayıf yönleri ve önerileri içeren eşleştirme sonucunu oluşturur"""
+    strengths = []
+    weaknesses = []
+
+    # Beceri güçlü/zayıf yönleri
+    if category_scores['skills'] >= 0.8:
+        strengths.append("Beceri setinin pozisyonla çok iyi uyumu")
+    elif category_scores['skills'] <= 0.4:
+        weaknesses.append("Gerekli beceriler eksik")
+
+    # Deneyim güçlü/zayıf yönleri
+    if category_scores['experience'] >= 0.8:
+        strengths.append("Pozisyon için yeterli deneyim")
+    elif category_scores['experience'] <= 0.4:
+        weaknesses.append("Pozisyon için deneyim eksikliği")
+
+    # Eğitim güçlü/zayıf yönleri
+    if category_scores['education'] >= 0.8:
+        strengths.append("Eğitim geçmişi pozisyonla uyumlu")
+    elif category_scores['education'] <= 0.4:
+        weaknesses.append("Pozisyon için gerekli eğitim eksik")
+
+    return {
+        'match_score': total_score,
+        'category_scores': category_scores,
+        'strengths': strengths,
+        'weaknesses': weaknesses,
+        'recommendations': generate_recommendations(total_score, strengths, weaknesses)
+    }
+
+
+def match_cv_with_position(cv_data: Dict[str, Any], position_data: Dict[str, Any],
+                           matching_options: Dict[str, float] = None) -> Dict[str, Any]:
+    """
+    CV'yi iş pozisyonuyla eşleştirir
+
+    Args:
+        cv_data (Dict[str, Any]): CV verisi
+        position_data (Dict[str, Any]): İş pozisyonu verisi
+        matching_options (Dict[str, float], optional): Eşleştirme seçenekleri
+
+    Returns:
+        Dict[str, Any]: Eşleştirme sonuçları
+    """
+    total_score, category_scores = score_cv(cv_data, position_data, matching_options)
+    logger.debug(f"Eşleştirme tamamlandı, skor: {total_score:.2f}")
+    return build_match_result(total_score, category_scores)
+
+
+def _term_match(cv_terms: List[str], required_lower: Tuple[str, ...]) -> float:
+    """Küçük harfli gereksinimlerden CV terimlerinin içinde geçenlerin oranı"""
+    if not required_lower:
+        return 1.0  # Gerekli terim yoksa tam puan
+    cv_terms_lower = [term.lower() for term in cv_terms]
+    matches = sum(1 for term in required_lower if any(term in cv_term for cv_term in cv_terms_lower))
+    return matches / len(required_lower)
+
+
+def _experience_score(total_years: int, min_years: Optional[float]) -> float:
+    if min_years is None:
+        return 1.0  # Gerekli deneyim yoksa tam puan
+    # Deneyim skoru hesapla (maksimum 1.0)
+    return min(1.0, total_years / max(1, min_years))
+
+
+def _education_score(cv_max_level: int, required_level: int) -> float:
+    if required_level == 0:
+        return 1.0
+    elif cv_max_level == 0:
+        return 0.0
+    elif cv_max_level >= required_level:
+        return 1.0
+    else:
+        return cv_max_level / required_level
+
+
+def calculate_skill_match(cv_skills: List[str], required_skills: List[str]) -> float:
+    """Beceri eşleşme skorunu hesaplar"""
+    return _term_match(cv_skills, tuple(skill.lower() for skill in required_skills))
+
+
+def experience_years(cv_experience: List[Dict[str, Any]]) -> int:
+    """Deneyim kayıtlarındaki toplam yılı hesaplar (bitişi olmayan kayıtlar bu yıla kadar sayılır)"""
+    total_years = 0
+    for exp in cv_experience:
+        start_year = int(exp.get('start_date', 0)) if exp.get('start_date') else 0
+        end_year = int(exp.get('end_date', date.today().year)) if exp.get('end_date') else date.today().year
+        total_years += max(0, end_year - start_year)
+    return total_years
+
+
+def _month_index(value: Any) -> Optional[int]:
+    """Tarihi yıl * 12 + ay biçiminde ay sırasına çevirir (ay yoksa Ocak kabul edilir)"""
+    match = _DATE_PATTERN.search(str(value or ''))
+    if not match:
+        return None
+    if match.group(1):
+        year, month = int(match.group(1)), int(match.group(2) or 1)
+    else:
+        year, month = int(match.group(4)), int(match.group(3))
+    return year * 12 + min(max(month, 1), 12) - 1
+
+
+def current_month_index() -> int:
+    """Bugünün ay sırasını (yıl * 12 + ay) döndürür"""
+    today = date.today()
+    return today.year * 12 + today.month - 1
+
+
+def experience_span(cv_experience: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Deneyimi, süren işler için zamandan bağımsız iki sayıya ayırır
+
+    Toplam ay, herhangi bir ayda base + ongoing * current_month_index()
+    olarak hesaplanır; bu sayede süren işlerin deneyimi kayıtta bayatlamaz.
+    Başlangıcı gelecekte olan süren işler bu aydan başlamış sayılır.
+
+    Returns:
+        Tuple[int, int]: (base, ongoing) — biten işlerin toplam ayı eksi süren
+            işlerin başlangıç aylarının toplamı ve süren iş sayısı
+    """
+    current = current_month_index()
+    base = ongoing = 0
+    for exp in cv_experience:
+        start = _month_index(exp.get('start_date'))
+        if start is None:
+            continue
+        end = _month_index(exp.get('end_date'))
+        if end is None:
+            base -= min(start, current)
+            ongoing += 1
+        else:
+            base += max(0, end - start)
+    return base, ongoing
+
+
+def experience_months(cv_experience: List[Dict[str, Any]]) -> int:
+    """
+    Deneyim kayıtlarındaki toplam ayı hesaplar
+
+    Başlangıcı okunamayan kayıtlar atlanır; bitişi olmayan (veya okunamayan)
+    kayıtlar bu aya kadar sayılır.
+    """
+    base, ongoing = experience_span(cv_experience)
+    return base + ongoing * current_month_index()
+
+
+def cv_location(cv_data: Dict[str, Any]) -> str:
+    """Analiz çıktısındaki adayın konum/adres bilgisini bulur"""
+    for section, keys in (('personal_info', ('location', 'address')), ('kisisel_bilgiler', ('lokasyon', 'adres'))):
+        info = cv_data.get(section)
+        if isinstance(info, dict):
+            for key in keys:
+                if isinstance(info.get(key), str) and info[key].strip():
+                    return info[key].strip()
+    return ''
+
+
+def education_level(cv_education: List[Dict[str, Any]]) -> int:
+    """CV'deki en yüksek eğitim seviyesini bulur (tanınmayan dereceler 0)"""
+    cv_max_level = 0
+    for edu in cv_education:
+        level = EDUCATION_LEVELS.get(edu.get('degree', '').lower(), 0)
+        cv_max_level = max(cv_max_level, level)
+    return cv_max_level
+
+
+def calculate_experience_match(cv_experience: List[Dict[str, Any]], required_experience: Dict[str, Any]) -> float:
+    """Deneyim eşleşme skorunu hesaplar"""
+    if not required_experience:
+        return 1.0  # Gerekli deneyim yoksa tam puan
+    return _experience_score(experience_years(cv_experience), required_experience.get('min_years', 0))
+
+
+def calculate_education_match(cv_education: List[Dict[str, Any]], required_education: Dict[str, Any]) -> float:
+    """Eğitim eşleşme skorunu hesaplar"""
+    if not required_education:
+        return 1.0  # Gerekli eğitim yoksa tam puan
+    required_level = EDUCATION_LEVELS.get(required_education.get('min_level', '').lower(), 0)
+    return _education_score(education_level(cv_education), required_level)
+
+
+def calculate_language_match(cv_languages: List[str], required_languages: List[str]) -> float:
+    """Dil eşleşme skorunu hesaplar"""
+    return _term_match(cv_languages, tuple(lang.lower() for lang in required_languages))
+
+
+def calculate_certification_match(cv_certifications: List[str], required_certifications: List[str]) -> float:
+    """Sertifika eşleşme skorunu hesaplar"""
+    return _term_match(cv_certifications, tuple(cert.lower() for cert in required_certifications))
+
+
+def generate_recommendations(total_score: float, strengths: List[str], weaknesses: List[str]) -> List[str]:
+    """Adaya öneriler oluşturur"""
+    recommendations = []
+
+    if total_score < 0.5:
+        recommendations.append("Başvurulan pozisyon için gerekli beceri ve deneyimleri geliştirmek önerilir")
+
+    if "Gerekli beceriler eksik" in weaknesses:
+        recommendations.append("Pozisyon için gerekli teknik becerileri edinmek için eğitim veya kurslar alınabilir")
+
+    if "Pozisyon için deneyim eksikliği" in weaknesses:
+        recommendations.append("Benzer alanlarda proje veya gönüllü çalışmalarla deneyim kazanılabilir")
+
+    if "Pozisyon için gerekli eğitim eksik" in weaknesses:
+        recommendations.append("İlgili alanda eğitim veya sertifika programları değerlendirilebilir")
+
+    return recommendations
@@ -21,6 +21,19 @@ except ImportError:
     logger.warning("OllamaConnector import edilemedi, AI analizi devre dışı")
     OllamaConnector = None
 
+from src.core.chunked_analysis import ChunkedCVAnalyzer, PARSER_SCHEMA
+from src.utils.json_repair import repair_json
+
+# Bu uzunluğu aşan CV'ler kesilmek yerine bölüm bazlı parçalı analizle işlenir
+CHUNKED_ANALYSIS_THRESHOLD = 8000
+
+# Liste alanlarının CV'deki bölüm başlıkları (satırın tamamı başlık olmalı)
+SECTION_HEADINGS = {
+    "egitim_bilgileri": r"e[ğg][iİı]t[iİı]m(?:\s+bilgileri)?|education(?:al background)?|öğrenim",
+    "is_deneyimi": r"[iİı][şs]\s+deneyimi|deneyim|tecrübe|(?:work\s+|professional\s+)?experience|employment",
+    "projeler": r"projeler|proje|projects?",
+}
+
 class CVParser:
     """CV'den önemli bilgileri ayıklar ve ön analiz yapar"""
     
@@ -1361,6 +1374,104 @@ class CVParser:
         
         return analysis
 
+    def field_confidence(self, analysis: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+        """
+        Kural tabanlı çıkarılan alanlar için 0-1 arası güven skorları hesaplar
+        
+        Eğitim, deneyim ve proje listeleri boşsa yalnızca CV'de ilgili bölüm
+        başlığı varsa düşük güven verilir; başlığı olmayan bölüm için boş liste
+        doğru sonuç kabul edilir (1.0).
+        
+        Args:
+            analysis (Dict[str, Any], optional): generate_cv_analysis() çıktısı (None ise hesaplanır)
+            
+        Returns:
+            Dict[str, float]: Alan adı -> güven skoru
+        """
+        if analysis is None:
+            analysis = self.generate_cv_analysis()
+        
+        def filled(value: Any) -> bool:
+            return bool(value) and str(value).strip() not in ("", "Belirtilmemiş")
+        
+        year_pattern = re.compile(r'(19|20)\d{2}')
+        
+        # Kişisel bilgiler: isim, geçerli email ve telefon
+        personal = analysis.get("kisisel_bilgiler") or {}
+        name = personal.get("isim", "")
+        personal_score = 0.0
+        if filled(name) and 2 <= len(name.split()) <= 4:
+            personal_score += 0.4
+        if filled(personal.get("email")) and re.match(r'[^@\s]+@[^@\s]+\.\w+$', personal["email"]):
+            personal_score += 0.3
+        if filled(personal.get("telefon")) and len(re.sub(r'\D', '', personal["telefon"])) >= 10:
+            personal_score += 0.3
+        
+        # Beceriler: toplam beceri sayısına göre
+        skills = analysis.get("beceriler") or {}
+        skill_count = sum(len(v) for v in skills.values() if isinstance(v, list))
+        skill_score = min(1.0, skill_count / 5)
+        
+        # Eğitim: okul adı kurum içermeli, bölüm ve yıl bulunmalı
+        school_words = ("üniversite", "university", "lise", "college", "institute", "enstitü", "fakülte", "okul", "school")
+        education_scores = []
+        for edu in analysis.get("egitim_bilgileri") or []:
+            school = str(edu.get("okul", "")).lower()
+            score = 0.0
+            if filled(edu.get("okul")) and any(w in school for w in school_words) and len(school.split()) >= 2:
+                score += 0.5
+            if filled(edu.get("bolum")):
+                score += 0.2
+            if year_pattern.search(str(edu.get("mezuniyet", "")) + str(edu.get("tarih", ""))):
+                score += 0.3
+            education_scores.append(score)
+        
+        # Deneyim: kısa bir şirket adı, pozisyon ve tarih bulunmalı
+        experience_scores = []
+        for exp in analysis.get("is_deneyimi") or []:
+            company = str(exp.get("sirket", ""))
+            score = 0.0
+            if filled(company) and len(company) <= 60 and not company.isupper() and not company.endswith("."):
+                score += 0.3
+            if filled(exp.get("pozisyon")):
+                score += 0.3
+            if year_pattern.search(str(exp.get("tarih", ""))):
+                score += 0.4
+            experience_scores.append(score)
+        
+        # Projeler: proje adı ve açıklama bulunmalı
+        project_scores = []
+        for project in analysis.get("projeler") or []:
+            score = 0.0
+            if filled(project.get("proje_adi")):
+                score += 0.6
+            if filled(project.get("aciklama")):
+                score += 0.4
+            project_scores.append(score)
+        
+        def average(field: str, scores: List[float]) -> float:
+            # CV'de bölüm başlığı hiç yoksa boş liste doğru sonuçtur; düşük güven
+            # yalnızca var olan ama ayrıştırılamayan bölümler için verilir
+            if not scores:
+                return 0.0 if self.has_section(field) else 1.0
+            return round(sum(scores) / len(scores), 2)
+        
+        return {
+            "kisisel_bilgiler": round(personal_score, 2),
+            "beceriler": round(skill_score, 2),
+            "egitim_bilgileri": average("egitim_bilgileri", education_scores),
+            "is_deneyimi": average("is_deneyimi", experience_scores),
+            "projeler": average("projeler", project_scores)
+        }
+    
+    def has_section(self, field: str) -> bool:
+        """CV metninde alanın bölüm başlığının (tek başına bir satır olarak) bulunup bulunmadığını döndürür"""
+        heading = SECTION_HEADINGS.get(field)
+        if heading is None:
+            return False
+        pattern = r'^[\s#*•\-]*(?:' + heading + r')[\s:]*$'
+        return re.search(pattern, self.cv_text, re.IGNORECASE | re.MULTILINE) is not None
+    
     def extract_keywords(self, limit: int = 20) -> List[str]:
         """CV'den anahtar kelimeleri çıkarır"""
         # Sık kullanılan kelimeler - filtrelenecek
@@ -1541,6 +1652,9 @@ class CVParser:
             logger.warning("Ollama bağlantısı yok, AI analizi yapılamıyor. Geleneksel analize yönlendiriliyor.")
             return self.get_cv_summary()  # Yedek olarak geleneksel analizi kullan
         
+        if len(self.cv_text) > CHUNKED_ANALYSIS_THRESHOLD:
+            return self._analyze_cv_with_ai_chunked()
+        
         prompt = """
         <KONU>CV ANALİZİ</KONU>
         
@@ -1632,30 +1746,44 @@ class CVParser:
             # Hata durumunda geleneksel analizi kullan
             return self.get_cv_summary()
     
-    def _extract_json_from_response(self, text: str) -> Dict[str, Any]:
-        """AI yanıtından JSON verisi çıkarır"""
+    def _analyze_cv_with_ai_chunked(self) -> Dict[str, Any]:
+        """Uzun CV'yi bölüm bazlı promptlarla analiz eder, türetilmiş alanları kural tabanlı doldurur"""
         try:
-            # JSON bloklarını bul
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                return json.loads(json_str)
+            analyzer = ChunkedCVAnalyzer(
+                generate_fn=lambda prompt: self.ollama.generate(prompt=prompt, max_tokens=1024),
+                schema=PARSER_SCHEMA,
+                max_workers=2,
+                parse_fn=self._extract_json_from_response
+            )
+            json_data = analyzer.analyze(self.cv_text)
             
-            # Eğer kod bloğu formatında değilse, düz JSON arama
-            json_match = re.search(r'(\{.*\})', text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                return json.loads(json_str)
+            if not json_data.get("kisisel_bilgiler") and not json_data.get("deneyim"):
+                logger.error("Parçalı AI analizi sonuç üretmedi")
+                return self.get_cv_summary()
             
-            # JSON bulunamadı
-            return {}
+            # Tüm CV'ye bakması gereken alanlar regex tabanlı yöntemlerle doldurulur
+            json_data["anahtar_kelimeler"] = self.extract_keywords()
+            json_data["guclu_yonler"] = self.detect_strengths()
+            json_data["gelistirilmesi_gereken_yonler"] = self.detect_improvement_areas()
+            json_data["uygun_pozisyonlar"] = self.suggest_positions()
+            json_data["kalite_analizi"] = self.get_cv_summary()["kalite_skoru"]
+            json_data["analiz_tarihi"] = datetime.datetime.now().strftime("%d-%m-%Y %H:%M")
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON çözümleme hatası: {str(e)}")
-            return {}
+            if hasattr(self, "file_path"):
+                json_data["dosya_adi"] = self.file_path
+            
+            logger.info("Parçalı CV AI analizi başarıyla tamamlandı")
+            return json_data
         except Exception as e:
-            logger.error(f"JSON çıkarma hatası: {str(e)}")
-            return {}
+            logger.error(f"Parçalı AI analizi sırasında hata: {str(e)}")
+            return self.get_cv_summary()
+    
+    def _extract_json_from_response(self, text: str) -> Dict[str, Any]:
+        """AI yanıtından JSON verisi çıkarır"""
+        json_data, repairs = repair_json(text or "")
+        if repairs:
+            logger.info(f"AI yanıtındaki JSON düzeltildi: {', '.join(repairs)}")
+        return json_data
             
     def get_cv_summary_ai(self) -> Dict[str, Any]:
         """CV'nin özet bilgilerini AI ile analiz ederek döndürür"""
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM çıktıları için tek geçişli, hata toleranslı JSON ayrıştırıcı.
+
+Model yanıtı bir kez baştan sona taranır: JSON öncesi açıklama metni ve
+markdown blokları atlanır, sondaki virgüller, tek tırnaklar, tırnaksız
+anahtarlar, Python sabitleri (True/False/None) ve kapanmamış parantezler
+aynı geçişte düzeltilir. Sonuç, yapılan düzeltmelerin listesiyle birlikte
+döndürülür.
+
+Örnek:
+    >>> data, repairs = repair_json("Sonuç: {'isim': 'Ali', 'beceriler': ['Python',]")
+    >>> data
+    {'isim': 'Ali', 'beceriler': ['Python']}
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = ",:]}"
+_DECODER = json.JSONDecoder()
+# Bu derinliğin altındaki iç içe yapılar kesik çıktı gibi kapatılır (özyineleme sınırına ulaşılmaz)
+MAX_DEPTH = 200
+_LITERALS = {
+    "true": True, "false": False, "null": None,
+    "True": True, "False": False, "None": None,
+    "undefined": None,
+}
+
+
+class _Truncated(Exception):
+    """Metin yapı tamamlanmadan bitti"""
+
+
+class _Parser:
+    """Tek bir metin üzerinde konum ilerleterek çalışan özyinelemeli ayrıştırıcı"""
+
+    def __init__(self, text: str, start: int):
+        self.text = text
+        self.pos = start
+        self.length = len(text)
+        self.depth = 0
+        self.repairs: List[str] = []
+
+    def repair(self, message: str) -> None:
+        if message not in self.repairs:
+            self.repairs.append(message)
+
+    def skip_whitespace(self) -> None:
+        text, length = self.text, self.length
+        while self.pos < length:
+            char = text[self.pos]
+            if char in _WHITESPACE:
+                self.pos += 1
+            elif text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.pos = length if end == -1 else end + 1
+                self.repair("yorum satırı silindi")
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                self.pos = length if end == -1 else end + 2
+                self.repair("yorum bloğu silindi")
+            else:
+                break
+
+    def peek(self) -> str:
+        self.skip_whitespace()
+        if self.pos >= self.length:
+            raise _Truncated()
+        return self.text[self.pos]
+
+    def parse_value(self) -> Any:
+        char = self.peek()
+        if char in "{[":
+            if self.depth >= MAX_DEPTH:
+                # Kalan metin atılır; açık yapılar metin burada bitmiş gibi kapatılır
+                self.repair("çok derin iç içe yapı kesildi")
+                self.pos = self.length
+                raise _Truncated()
+            self.depth += 1
+            try:
+                return self.parse_object() if char == "{" else self.parse_array()
+            finally:
+                self.depth -= 1
+        if char in "\"'“”":
+            return self.parse_string()
+        if char in "-+0123456789.":
+            return self.parse_number()
+        return self.parse_bare_word()
+
+    def parse_object(self) -> Dict[str, Any]:
+        self.pos += 1
+        result: Dict[str, Any] = {}
+        while True:
+            try:
+                char = self.peek()
+            except _Truncated:
+                self.repair("kapanmamış nesne kapatıldı")
+                return result
+
+            if char == "}":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                self.repair("fazla virgül silindi")
+                continue
+            if char in "]":
+                # Yanlış kapanış parantezi: nesneyi burada kapat
+                self.repair("hatalı kapanış parantezi düzeltildi")
+                self.pos += 1
+                return result
+
+            try:
+                if char in "\"'“”":
+                    key = self.parse_string()
+                else:
+                    key = self.parse_bare_key()
+                    self.repair("tırnaksız anahtar tırnaklandı")
+
+                if self.peek() == ":":
+                    self.pos += 1
+                else:
+                    self.repair("eksik iki nokta eklendi")
+
+                value = self.parse_value()
+            except _Truncated:
+                # Yarım kalan anahtar/değer çifti atılır
+                self.repair("yarım kalan alan atıldı")
+                self.repair("kapanmamış nesne kapatıldı")
+                return result
+
+            result[str(key)] = value
+
+            try:
+                char = self.peek()
+            except _Truncated:
+                self.repair("kapanmamış nesne kapatıldı")
+                return result
+            if char == ",":
+                self.pos += 1
+                try:
+                    if self.peek() == "}":
+                        self.repair("sondaki virgül silindi")
+                except _Truncated:
+                    pass
+            elif char != "}":
+                self.repair("eksik virgül eklendi")
+
+    def parse_array(self) -> List[Any]:
+        self.pos += 1
+        result: List[Any] = []
+        while True:
+            try:
+                char = self.peek()
+            except _Truncated:
+                self.repair("kapanmamış dizi kapatıldı")
+                return result
+
+            if char == "]":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                self.repair("fazla virgül silindi")
+                continue
+            if char == "}":
+                self.repair("hatalı kapanış parantezi düzeltildi")
+                self.pos += 1
+                return result
+
+            try:
+                result.append(self.parse_value())
+            except _Truncated:
+                self.repair("yarım kalan eleman atıldı")
+                self.repair("kapanmamış dizi kapatıldı")
+                return result
+
+            try:
+                char = self.peek()
+            except _Truncated:
+                self.repair("kapanmamış dizi kapatıldı")
+                return result
+            if char == ",":
+                self.pos += 1
+                try:
+                    if self.peek() == "]":
+                        self.repair("sondaki virgül silindi")
+                except _Truncated:
+                    pass
+            elif char != "]":
+                self.repair("eksik virgül eklendi")
+
+    def parse_string(self) -> str:
+        text, length = self.text, self.length
+        quote = text[self.pos]
+        if quote == "'":
+            self.repair("tek tırnak çift tırnağa çevrildi")
+        elif quote in "“”":
+            self.repair("tipografik tırnak düzeltildi")
+            quote = "”"
+        self.pos += 1
+
+        chars: List[str] = []
+        while self.pos < length:
+            char = text[self.pos]
+            if char == "\\":
+                if self.pos + 1 >= length:
+                    break
+                escaped = text[self.pos + 1]
+                if escaped == "u" and self.pos + 6 <= length:
+                    try:
+                        chars.append(chr(int(text[self.pos + 2:self.pos + 6], 16)))
+                        self.pos += 6
+                        continue
+                    except ValueError:
+                        pass
+                chars.append({"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}.get(escaped, escaped))
+                self.pos += 2
+                continue
+
+            if char == quote or (quote == "”" and char == "“"):
+                # Kapanış tırnağından sonra bir ayraç gelmiyorsa tırnak metnin parçasıdır
+                lookahead = self.pos + 1
+                while lookahead < length and text[lookahead] in " \t":
+                    lookahead += 1
+                if lookahead >= length or text[lookahead] in _DELIMITERS + "\r\n":
+                    self.pos += 1
+                    return "".join(chars)
+                self.repair("kaçışsız tırnak korundu")
+
+            chars.append(char)
+            self.pos += 1
+
+        raise _Truncated()
+
+    def parse_number(self) -> Any:
+        text, length = self.text, self.length
+        start = self.pos
+        while self.pos < length and text[self.pos] not in _DELIMITERS + _WHITESPACE:
+            self.pos += 1
+        raw = text[start:self.pos]
+        try:
+            if raw.lstrip("+-").isdigit():
+                return int(raw)
+            return float(raw)
+        except ValueError:
+            # "0-100 arası sayı" gibi tırnaksız metinler
+            return self._finish_bare(start, "tırnaksız değer tırnaklandı")
+
+    def parse_bare_word(self) -> Any:
+        start = self.pos
+        text, length = self.text, self.length
+        while self.pos < length and (text[self.pos].isalnum() or text[self.pos] == "_"):
+            self.pos += 1
+        word = text[start:self.pos]
+        if word in _LITERALS:
+            if word not in ("true", "false", "null"):
+                self.repair("standart dışı sabit düzeltildi")
+            return _LITERALS[word]
+        return self._finish_bare(start, "tırnaksız değer tırnaklandı")
+
+    def _finish_bare(self, start: int, message: str) -> str:
+        """Tırnaksız bir değeri satır sonu veya ayraca kadar metin olarak okur"""
+        text, length = self.text, self.length
+        self.pos = start
+        while self.pos < length and text[self.pos] not in ",]}\r\n":
+            self.pos += 1
+        if self.pos >= length:
+            raise _Truncated()
+        self.repair(message)
+        return text[start:self.pos].strip()
+
+    def parse_bare_key(self) -> str:
+        text, length = self.text, self.length
+        start = self.pos
+        while self.pos < length and text[self.pos] not in ":,{}[]\r\n":
+            self.pos += 1
+        if self.pos >= length:
+            raise _Truncated()
+        return text[start:self.pos].strip()
+
+
+def repair_json(text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Model çıktısındaki ilk geçerli JSON nesnesini bulur, düzeltir ve ayrıştırır
+
+    Args:
+        text (str): Ham model çıktısı (açıklama metni, markdown vb. içerebilir)
+
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: Ayrıştırılan sözlük (bulunamazsa boş) ve
+        yapılan düzeltmelerin listesi
+    """
+    if not text:
+        return {}, ["JSON bulunamadı"]
+
+    fallback = None
+    start = text.find("{")
+
+    # Hızlı yol: çıktı geçerli JSON ise C ayrıştırıcısı ile tek seferde okunur
+    if start != -1:
+        try:
+            result, end = _DECODER.raw_decode(text, start)
+            if isinstance(result, dict) and result:
+                repairs = []
+                if text[:start].strip():
+                    repairs.append("JSON öncesi metin atlandı")
+                if text[end:].strip().strip("`").strip():
+                    repairs.append("JSON sonrası metin atlandı")
+                return result, repairs
+        except (ValueError, RecursionError):
+            pass
+
+    while start != -1:
+        parser = _Parser(text, start)
+        if start > 0 and text[:start].strip():
+            parser.repair("JSON öncesi metin atlandı")
+        try:
+            result = parser.parse_object()
+        except _Truncated:
+            result = {}
+
+        if result:
+            parser.skip_whitespace()
+            if parser.pos < len(text) and text[parser.pos:].strip().strip("`").strip():
+                parser.repair("JSON sonrası metin atlandı")
+            if "tırnaksız anahtar tırnaklandı" not in parser.repairs:
+                return result, parser.repairs
+            # Açıklama metnindeki {yer_tutucu} gibi yapılar: sonrasında düzgün bir nesne varsa onu tercih et
+            if fallback is None:
+                fallback = (result, parser.repairs)
+            start = text.find("{", parser.pos)
+        else:
+            start = text.find("{", start + 1)
+
+    if fallback is not None:
+        return fallback
+    return {}, ["JSON bulunamadı"]
+
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """Model çıktısından sözlük döndürür; JSON bulunamazsa boş sözlük döndürür"""
+    return repair_json(text)[0]
@@ -143,7 +143,7 @@ def pozisyon_analiz():
         try:
             analizci = GelismisCVAnaliz(model_name=model_name)
             if hasattr(analizci, 'pozisyon_eslesme_analizi'):
-        pozisyon_sonuc = analizci.pozisyon_eslesme_analizi(analiz_sonuc, pozisyon)
+                pozisyon_sonuc = analizci.pozisyon_eslesme_analizi(analiz_sonuc, pozisyon)
             else:
                 # Alternatif: PDF'i tekrar göndererek pozisyon bilgisi ile analiz et
                 # Burada kullanıcı yüklediği CV'yi ekleyebiliriz
@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.mock_ollama import MockOllama
+
+
+@pytest.fixture
+def mock_servers():
+    """Test sonunda durdurulan MockOllama sunucuları üretir"""
+    started = []
+
+    def factory(**kwargs):
+        server = MockOllama(**kwargs).start()
+        started.append(server)
+        return server
+
+    yield factory
+    for server in started:
+        server.stop()
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+from src.api.admission import AdmissionController, AdmissionRejected, SingleFlight
+
+def _blocking_job(duration):
+    time.sleep(duration)
+    return duration
+
+def test_limits_concurrency_and_runs_in_order():
+    """Aynı anda en fazla max_concurrency iş çalışmalı"""
+    controller = AdmissionController(max_concurrency=2, max_queue=10)
+    peak = 0
+
+    async def job():
+        nonlocal peak
+        peak = max(peak, controller.active)
+        await asyncio.sleep(0.02)
+        return controller.active
+
+    async def main():
+        return await asyncio.gather(*(controller.submit(job) for _ in range(6)))
+
+    results = asyncio.run(main())
+    assert len(results) == 6 and peak == 2
+    assert controller.stats()["completed"] == 6 and controller.active == 0
+
+def test_rejects_when_queue_full_with_retry_after():
+    """Kuyruk doluysa istek beklemeden 429 ile reddedilmeli"""
+    controller = AdmissionController(max_concurrency=1, max_queue=1)
+
+    async def main():
+        first = asyncio.ensure_future(controller.run(_blocking_job, 0.2))
+        second = asyncio.ensure_future(controller.run(_blocking_job, 0.01))
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.run(_blocking_job, 0.01)
+        assert time.monotonic() - start < 0.05
+        await asyncio.gather(first, second)
+        return exc.value
+
+    error = asyncio.run(main())
+    assert error.status_code == 429 and error.retry_after >= 1
+    assert controller.rejected == 1
+
+def test_queue_timeout_returns_503():
+    """Kuyrukta bekleme süresi aşılırsa 503 verilmeli"""
+    controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=0.05)
+
+    async def main():
+        running = asyncio.ensure_future(controller.run(_blocking_job, 0.3))
+        await asyncio.sleep(0.01)
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.run(_blocking_job, 0.01)
+        await running
+        return exc.value
+
+    assert asyncio.run(main()).status_code == 503
+
+def test_single_flight_shares_one_load():
+    """Eşzamanlı çağrılar tek bir yükleme işlemini paylaşmalı"""
+    loader = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "model"
+
+    async def main():
+        results = await asyncio.gather(*(loader.run(load) for _ in range(5)))
+        # Tamamlandıktan sonra yeni çağrı yeni işlem başlatır
+        results.append(await loader.run(load))
+        return results
+
+    assert asyncio.run(main()) == ["model"] * 6
+    assert calls == 2
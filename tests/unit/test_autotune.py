@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from src.core.autotune import Autotuner, load_tuned_config, candidate_threads
+
+@pytest.fixture
+def model_file(tmp_path):
+    """Boş içerikli örnek model dosyası"""
+    path = tmp_path / "model.Q4_K_M.gguf"
+    path.write_bytes(b"GGUF" + b"\0" * 64)
+    return path
+
+def fake_factory(loaded):
+    """Süreyi yapılandırmaya göre belirleyen sahte çalıştırıcı (4 thread ve batch 256 en hızlı)"""
+    def factory(config):
+        loaded.append(config)
+        delay = 0.001 * (abs(config["threads"] - 4) + abs(config["batch_size"] - 256) / 128)
+
+        def run(prompt, max_tokens):
+            time.sleep(delay)
+            return max_tokens
+        return run
+    return factory
+
+def test_grid_search_persists_fastest_config(model_file, tmp_path):
+    """En hızlı yapılandırma model dosyası için kaydedilmeli"""
+    tuning_file = tmp_path / "autotune.json"
+    loaded = []
+    tuner = Autotuner(str(model_file), fake_factory(loaded), threads=[2, 4, 8],
+                      batch_sizes=[128, 256], context_lengths=[2048], max_new_tokens=8)
+
+    best = tuner.tune(tuning_file)
+
+    assert len(loaded) == 6 and len(tuner.results) == 6
+    assert (best["threads"], best["batch_size"]) == (4, 256)
+    saved = load_tuned_config(str(model_file), tuning_file)
+    assert saved["threads"] == 4 and saved["context_length"] == 2048
+
+def test_early_stopping_config_does_not_win(model_file):
+    """Erken durup az token üreten yapılandırma, kısa sürse de seçilmemeli"""
+    def factory(config):
+        def run(prompt, max_tokens):
+            if config["threads"] == 1:
+                time.sleep(0.002)
+                return 1
+            time.sleep(0.005)
+            return max_tokens
+        return run
+
+    tuner = Autotuner(str(model_file), factory, threads=[1, 2], batch_sizes=[64], context_lengths=[2048],
+                      max_new_tokens=64)
+    best = tuner.run()
+
+    assert best["threads"] == 2 and best["tokens"] == 64
+
+def test_failed_configs_are_skipped(model_file, tmp_path):
+    """Yüklenemeyen yapılandırmalar atlanmalı"""
+    def factory(config):
+        if config["context_length"] > 2048:
+            raise MemoryError("yetersiz bellek")
+        return lambda prompt, max_tokens: max_tokens
+
+    tuner = Autotuner(str(model_file), factory, threads=[1], batch_sizes=[64], context_lengths=[2048, 8192])
+    assert tuner.run()["context_length"] == 2048
+
+def test_missing_config_returns_none(model_file, tmp_path):
+    """Ayar yoksa None dönmeli"""
+    assert load_tuned_config(str(model_file), tmp_path / "yok.json") is None
+    assert all(count >= 1 for count in candidate_threads())
@@ -0,0 +1,31 @@
+from src.core.candidate_store import filter_mismatch
+from src.processors.batch_statistics import calculate_statistics
+
+CVS = [
+    {"skills": ["Python", "Docker"], "languages": ["Türkçe"],
+     "experience": [{"start_date": "2016", "end_date": "2020"}], "education": [{"degree": "Lisans"}]},
+    {"skills": ["Python"], "languages": ["Türkçe", "İngilizce"],
+     "experience": [{"start_date": "2019", "end_date": "2021"}], "education": [{"degree": "Yüksek Lisans"}]},
+]
+
+
+def test_distributions_over_results():
+    """Beceri, deneyim, eğitim ve dil dağılımları hesaplanmalı"""
+    stats = calculate_statistics(CVS)
+
+    assert stats["skill_distribution"] == {"Python": 2, "Docker": 1}
+    assert stats["experience_distribution"] == {"min": 2, "max": 4, "average": 3}
+    assert stats["education_distribution"] == {"Lisans": 1, "Yüksek Lisans": 1}
+    assert stats["language_distribution"] == {"Türkçe": 2, "İngilizce": 1}
+
+
+def test_filter_rejecting_every_cv_yields_empty_statistics():
+    """Filtre tüm CV'leri elediğinde istatistikler hata vermeden boş dönmeli"""
+    filters = {"min_experience_years": 50}
+    kept = [cv for cv in CVS if not filter_mismatch(cv, filters)]
+
+    stats = calculate_statistics(kept)
+
+    assert kept == []
+    assert stats["skill_distribution"] == {} and stats["language_distribution"] == {}
+    assert stats["experience_distribution"] == {"min": 0, "max": 0, "average": 0}
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+
+from benchmarks.mock_ollama import VALID_ANALYSIS
+from src.processors.bulk_matching import CandidateMatrix, match_positions, rank_positions, score_matrix, top_k
+from src.processors.position_matching import match_cv_with_position, normalize_cv, score_cv
+
+SKILLS = ["Python", "Python 3", "Java", "JavaScript", "Docker", "Kubernetes", "React", "SQL", "PostgreSQL", "Go"]
+LANGUAGES = ["Türkçe", "İngilizce", "Almanca", "ingilizce (B2)"]
+CERTIFICATIONS = ["AWS Solutions Architect", "CKA", "PMP"]
+DEGREES = ["Lise", "Önlisans", "Lisans", "Yüksek Lisans", "Doktora", "Diğer", ""]
+
+
+def _corpus(seed=11, size=400):
+    rng = random.Random(seed)
+    cvs = [normalize_cv(VALID_ANALYSIS), {}]
+    for _ in range(size):
+        experience = []
+        for _ in range(rng.randint(0, 3)):
+            start = rng.randint(1995, 2024)
+            experience.append({"start_date": str(start),
+                               "end_date": rng.choice([None, str(start + rng.randint(0, 6))])})
+        cvs.append({
+            "skills": rng.sample(SKILLS, rng.randint(0, 5)),
+            "experience": experience,
+            "education": [{"degree": rng.choice(DEGREES)} for _ in range(rng.randint(0, 2))],
+            "languages": rng.sample(LANGUAGES, rng.randint(0, 3)),
+            "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 2)),
+        })
+    return cvs
+
+
+def _positions(seed=5, size=25):
+    rng = random.Random(seed)
+    positions = [{"requirements": {}}, {"title": "gereksinimsiz"}]
+    for _ in range(size):
+        requirements = {
+            "skills": [s.lower() for s in rng.sample(SKILLS, rng.randint(0, 4))] + rng.choice([[], ["python"]]),
+            "languages": rng.sample(["ingilizce", "Almanca", "Fransızca"], rng.randint(0, 2)),
+            "certifications": rng.sample(["aws", "CKA", "Scrum"], rng.randint(0, 2)),
+        }
+        if rng.random() < 0.8:
+            requirements["experience"] = {"min_years": rng.choice([0, 1, 3, 5, 7, 2.5])}
+        if rng.random() < 0.8:
+            requirements["education"] = {"min_level": rng.choice(DEGREES)}
+        positions.append({"title": "pozisyon", "requirements": requirements})
+    return positions
+
+
+def test_bulk_scores_identical_to_per_pair_path():
+    """Vektörel skorlar tekli score_cv sonuçlarıyla birebir aynı olmalı"""
+    cvs = _corpus()
+    positions = _positions()
+    options = {"skill_weight": 0.35, "experience_weight": 0.25, "education_weight": 0.2,
+               "language_weight": 0.1, "certification_weight": 0.1}
+
+    for matching_options in (None, options):
+        total, categories = score_matrix(CandidateMatrix(cvs), positions, matching_options)
+        for i, cv in enumerate(cvs):
+            for j, position in enumerate(positions):
+                expected_total, expected_categories = score_cv(cv, position, matching_options)
+                assert total[i, j] == expected_total
+                assert {name: values[i, j] for name, values in categories.items()} == expected_categories
+
+
+def test_top_k_without_full_sort():
+    """top_k en yüksek k skoru azalan sırada, eşitlikte küçük indeksle döndürmeli"""
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.1, 0.5])
+    assert top_k(scores, 3).tolist() == [1, 3, 2]
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 5, 0, 4]
+    assert top_k(scores, 0).tolist() == []
+
+
+def test_rank_positions_matches_sorted_scores():
+    """Pozisyon başına sıralama tam sıralamanın ilk k elemanıyla aynı olmalı"""
+    cvs = _corpus(seed=3, size=200)
+    positions = _positions(seed=9, size=5)
+    ranked = rank_positions(CandidateMatrix(cvs), positions, k=7)
+
+    for j, position in enumerate(positions):
+        expected = sorted(((score_cv(cv, position)[0], i) for i, cv in enumerate(cvs)),
+                          key=lambda item: (-item[0], item[1]))[:7]
+        assert ranked[j] == [(i, score) for score, i in expected]
+
+
+def test_match_positions_for_single_upload():
+    """Tek CV'nin tüm pozisyonlarla eşleşmesi, pozisyon pozisyon eşleştirmeyle aynı olmalı"""
+    positions = _positions(seed=2, size=8)
+    matches = match_positions(VALID_ANALYSIS, positions)
+
+    assert sorted(match["position_index"] for match in matches) == list(range(len(positions)))
+    assert [match["match_score"] for match in matches] == sorted((m["match_score"] for m in matches), reverse=True)
+    for match in matches:
+        expected = match_cv_with_position(normalize_cv(VALID_ANALYSIS), positions[match["position_index"]])
+        assert {key: value for key, value in match.items() if key not in ("position_index", "title")} == expected
@@ -0,0 +1,257 @@
+import json
+import random
+import sqlite3
+
+import pytest
+
+from benchmarks.mock_ollama import VALID_ANALYSIS
+from src.core import candidate_store
+from src.core.candidate_store import CandidateStore, filter_mismatch
+from src.processors import position_matching
+from src.processors.position_matching import (compile_position, experience_months, match_cv_with_position,
+                                               normalize_cv, normalize_weights, score_cv, score_profile)
+
+SKILLS = ["Python", "Java", "Docker", "Kubernetes", "React", "SQL", "Go", "Rust"]
+LANGUAGES = ["Türkçe", "İngilizce", "Almanca"]
+DEGREES = ["Lise", "Lisans", "Yüksek Lisans", "Doktora", ""]
+
+POSITION = {
+    "title": "Backend Geliştirici",
+    "description": "Mikroservis geliştirme",
+    "requirements": {
+        "skills": ["python", "docker"],
+        "experience": {"min_years": 3},
+        "education": {"min_level": "Yüksek Lisans"},
+        "languages": ["İngilizce"],
+    },
+}
+
+
+def _cv(rng, index):
+    start = rng.randint(2005, 2022)
+    return {
+        "personal_info": {"name": f"Aday {index}"},
+        "skills": rng.sample(SKILLS, rng.randint(0, 3)),
+        "experience": [{"start_date": str(start), "end_date": str(start + rng.randint(0, 5))}],
+        "education": [{"degree": rng.choice(DEGREES)}],
+        "languages": rng.sample(LANGUAGES, rng.randint(0, 2)),
+        "certifications": [],
+    }
+
+
+def test_normalize_cv_maps_llm_output():
+    """LLM çıktısındaki Türkçe alanlar eşleştirme alanlarına çevrilmeli"""
+    profile = normalize_cv(VALID_ANALYSIS)
+
+    assert profile["skills"] == ["Docker", "Kubernetes", "Python", "SQL", "Takım çalışması"]
+    assert profile["languages"] == ["Türkçe", "İngilizce"]
+    assert profile["education"] == [{"degree": "Lisans"}]
+    assert profile["experience"] == [{"start_date": "2020", "end_date": None}]
+
+    result = match_cv_with_position(profile, POSITION)
+    assert result["category_scores"]["skills"] == 1.0
+    assert result["category_scores"]["education"] == 0.75
+
+
+def test_rank_matches_brute_force_and_skips_unrelated():
+    """İndeksli sıralama tüm havuzu puanlamakla aynı sonucu vermeli, ilgisiz adaylara dokunmamalı"""
+    rng = random.Random(7)
+    store = CandidateStore()
+    cvs = [store.add_candidate(_cv(rng, i)) for i in range(300)]
+    unrelated = store.add_candidate({"skills": ["Photoshop"], "education": [{"degree": "Lisans"}],
+                                     "experience": [{"start_date": "2000", "end_date": "2020"}]})
+
+    result = store.rank(POSITION, k=15)
+
+    expected = sorted(((score_cv(normalize_cv(store.get_candidate(cid)), POSITION)[0], cid) for cid in cvs),
+                      key=lambda item: (-item[0], item[1]))[:15]
+    assert [(c["match_score"], c["candidate_id"]) for c in result["candidates"]] == expected
+    assert result["pool_size"] == 301
+    assert result["scored"] < 301
+    assert unrelated not in store.candidate_ids_for(POSITION)
+
+
+def test_substring_requirements_and_updates(tmp_path):
+    """Gereksinim CV terimi içinde geçiyorsa aday bulunmalı; güncelleme indeksi yenilemeli"""
+    store = CandidateStore(str(tmp_path / "adaylar.db"))
+    candidate_id = store.add_candidate({"skills": ["Python 3.11"]})
+    position = {"requirements": {"skills": ["python"]}}
+
+    assert store.candidate_ids_for(position) == {candidate_id}
+    store.add_candidate({"skills": ["Java"]}, candidate_id=candidate_id)
+    assert store.candidate_ids_for(position) == set()
+    assert store.candidate_ids_for({"requirements": {"experience": {"min_years": 2}}}) is None
+
+    position_id = store.add_position({"title": "Java", "requirements": {"skills": ["java"]}})
+    store.close()
+
+    reopened = CandidateStore(str(tmp_path / "adaylar.db"))
+    ranked = reopened.rank(reopened.get_position(position_id), k=5)
+    assert ranked["candidates"][0]["candidate_id"] == candidate_id
+    assert ranked["candidates"][0]["match_score"] == 1.0
+    assert reopened.remove_candidate(candidate_id)
+    assert reopened.count() == 0
+
+
+def test_compiled_profile_scores_like_raw_position():
+    """Derlenmiş profil ham pozisyonla aynı skoru vermeli; geçersiz gereksinimler reddedilmeli"""
+    profile = compile_position(POSITION)
+    assert profile.skills == ("python", "docker") and profile.languages == ("İngilizce".lower(),)
+    assert profile.min_years == 3 and profile.education_level == 4
+
+    cv = normalize_cv(VALID_ANALYSIS)
+    assert score_profile(cv, profile) == score_cv(cv, POSITION)
+    weights = {"skill_weight": 2, "experience_weight": 1, "education_weight": 1}
+    assert score_profile(cv, profile.with_weights(weights)) == score_cv(cv, POSITION, normalize_weights(weights))
+    assert sum(normalize_weights(weights).values()) == pytest.approx(1.0)
+
+    for requirements in ({"skills": "python"}, {"experience": {"min_years": "3"}}, {"education": "lisans"}):
+        with pytest.raises(ValueError):
+            compile_position({"requirements": requirements})
+
+
+def test_position_profiles_cached_by_id(tmp_path):
+    """Kayıtlı pozisyon profilleri LRU önbellekten gelmeli, önbellek dışındakiler depodan derlenmeli"""
+    store = CandidateStore(str(tmp_path / "adaylar.db"), profile_cache_size=2)
+    ids = [store.add_position({"title": f"P{i}", "requirements": {"skills": [f"beceri{i}"]}}) for i in range(3)]
+
+    assert list(store._profiles) == ids[1:]
+    assert store.position_profile(ids[1]) is store.position_profile(ids[1])
+    assert store.position_profile(ids[0]).skills == ("beceri0",)
+    assert list(store._profiles) == [ids[1], ids[0]]
+    assert store.position_profile("yok") is None
+
+    store.add_candidate({"skills": ["Beceri0"]})
+    assert store.rank(store.position_profile(ids[0]))["candidates"][0]["match_score"] == 1.0
+    with pytest.raises(ValueError):
+        store.add_position({"title": "Hatalı", "requirements": {"skills": "python"}})
+
+
+def test_search_filters_match_per_cv_check():
+    """İndeksli filtreler, CV'leri tek tek filtrelemekle aynı adayları bulmalı"""
+    rng = random.Random(13)
+    store = CandidateStore()
+    cvs = {}
+    for i in range(200):
+        cv = _cv(rng, i)
+        cv["personal_info"]["location"] = rng.choice(["İstanbul, Türkiye", "Ankara", ""])
+        cvs[store.add_candidate(cv)] = cv
+
+    for filters in ({"min_experience_years": 3}, {"required_skills": ["python", "Docker"]},
+                    {"education_level": "Yüksek Lisans", "location": "istanbul"},
+                    {"languages": ["İngilizce"], "min_experience_years": 1.5}, {}):
+        expected = {cid for cid, cv in cvs.items() if filter_mismatch(cv, filters) is None}
+        result = store.search(filters, limit=500)
+        assert result["total"] == len(expected)
+        assert {c["candidate_id"] for c in result["candidates"]} == expected
+
+    pages = [store.search({"min_experience_years": 2}, limit=7, offset=offset)["candidates"] for offset in (0, 7)]
+    assert len(pages[0]) == 7 and not {c["candidate_id"] for c in pages[0]} & {c["candidate_id"] for c in pages[1]}
+
+    ranked = store.search({"min_experience_years": 2}, limit=5, position=POSITION)["candidates"]
+    assert all(filter_mismatch(cvs[c["candidate_id"]], {"min_experience_years": 2}) is None for c in ranked)
+    assert [c["match_score"] for c in ranked] == sorted((c["match_score"] for c in ranked), reverse=True)
+    with pytest.raises(ValueError):
+        store.search({"education_level": "bilinmeyen"})
+
+
+def test_experience_months_and_schema_migration(tmp_path):
+    """Eski veritabanındaki adaylar yeni öznitelik sütunlarıyla doldurulmalı"""
+    assert experience_months([{"start_date": "2018", "end_date": "2020"},
+                              {"start_date": "05/2021", "end_date": "2021-11"}, {"start_date": None}]) == 30
+
+    path = tmp_path / "eski.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE candidates (id TEXT PRIMARY KEY, name TEXT, source TEXT,
+            education_level INTEGER NOT NULL DEFAULT 0, data TEXT NOT NULL, profile TEXT NOT NULL,
+            created_at REAL NOT NULL, updated_at REAL NOT NULL);
+    """)
+    cv = {"experience": [{"start_date": "2015", "end_date": "2020"}], "personal_info": {"location": "İzmir"}}
+    conn.execute("INSERT INTO candidates VALUES ('eski', '', NULL, 0, ?, '{}', 0, 0)", (json.dumps(cv),))
+    conn.commit()
+    conn.close()
+
+    store = CandidateStore(str(path))
+    assert store.search({"min_experience_years": 5, "location": "izmir"})["candidates"][0]["candidate_id"] == "eski"
+    assert store.search({"min_experience_years": 6})["total"] == 0
+
+
+def test_ongoing_experience_does_not_go_stale(tmp_path, monkeypatch):
+    """Süren işlerin deneyimi kayıt anına değil sorgu anına göre hesaplanmalı"""
+    path = tmp_path / "eski.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE candidates (id TEXT PRIMARY KEY, name TEXT, source TEXT,
+            education_level INTEGER NOT NULL DEFAULT 0, experience_months INTEGER NOT NULL DEFAULT 0,
+            location TEXT NOT NULL DEFAULT '', data TEXT NOT NULL, profile TEXT NOT NULL,
+            created_at REAL NOT NULL, updated_at REAL NOT NULL);
+    """)
+    cv = {"experience": [{"start_date": "2020", "end_date": "2021"}, {"start_date": "01/2022", "end_date": None}]}
+    conn.execute("INSERT INTO candidates (id, data, profile, created_at, updated_at) VALUES ('suren', ?, '{}', 0, 0)",
+                 (json.dumps(cv),))
+    conn.commit()
+    conn.close()
+
+    store = CandidateStore(str(path))
+    store.add_candidate({"experience": [{"start_date": "2021", "end_date": None},
+                                        {"start_date": "2022", "end_date": None}]}, candidate_id="iki")
+    for month, expected in ((2023 * 12, {"iki"}), (2024 * 12, {"suren", "iki"})):
+        monkeypatch.setattr(candidate_store, "current_month_index", lambda: month)
+        monkeypatch.setattr(position_matching, "current_month_index", lambda: month)
+        # 2023 başında iki süren iş 24 + 12 = 36 ay; 2024 başında 12 + 24 = 36 ve 36 + 24 = 60 ay
+        result = store.search({"min_experience_years": 3}, limit=10)
+        assert {c["candidate_id"] for c in result["candidates"]} == expected
+        assert all(filter_mismatch(store.get_candidate(cid), {"min_experience_years": 3}) is None for cid in expected)
+    assert {c["candidate_id"]: c["experience_months"] for c in store.search({}, limit=10)["candidates"]} == \
+        {"suren": 36, "iki": 60}
+
+
+def test_position_search_scores_requirement_matches_in_chunks(monkeypatch):
+    """Pozisyonlu arama yalnızca gereksinim paylaşan adayları parça parça puanlamalı"""
+    rng = random.Random(17)
+    store = CandidateStore()
+    cvs = {store.add_candidate(_cv(rng, i)): None for i in range(120)}
+    store.add_candidate({"skills": ["Photoshop"], "experience": [{"start_date": "2000", "end_date": "2020"}]})
+    filters = {"min_experience_years": 1}
+    position = {"requirements": {"skills": ["python", "docker"], "experience": {"min_years": 3}}}
+
+    matching = store.candidate_ids_for(position)
+    expected = sorted(((score_cv(normalize_cv(store.get_candidate(cid)), position)[0], cid) for cid in cvs
+                       if cid in matching and filter_mismatch(store.get_candidate(cid), filters) is None),
+                      key=lambda item: (-item[0], item[1]))
+    monkeypatch.setattr(candidate_store, "_SCORE_CHUNK", 7)
+    result = store.search(filters, limit=5, offset=3, position=position)
+    assert [(c["match_score"], c["candidate_id"]) for c in result["candidates"]] == expected[3:8]
+    assert result["scored"] == len(expected) < result["total"]
+
+
+def test_requirements_match_any_substring(tmp_path):
+    """Gereksinim CV teriminin herhangi bir yerinde geçiyorsa bulunmalı; eski depoda sözlük doldurulmalı"""
+    path = str(tmp_path / "adaylar.db")
+    store = CandidateStore(path)
+    ids = {skill: store.add_candidate({"skills": [skill]}) for skill in ("Advanced Python", "ASP.NET", "JavaScript")}
+    assert store.candidate_ids_for({"requirements": {"skills": ["python"]}}) == {ids["Advanced Python"]}
+    assert store.candidate_ids_for({"requirements": {"skills": [".net"]}}) == {ids["ASP.NET"]}
+    assert store.candidate_ids_for({"requirements": {"skills": ["script"]}}) == {ids["JavaScript"]}
+
+    # Son ek sözlüğü olmayan eski veritabanı açılırken kayıtlı terimlerden doldurulur
+    with store._conn:
+        store._conn.execute("DELETE FROM term_suffixes")
+    store.close()
+    reopened = CandidateStore(path)
+    assert reopened.candidate_ids_for({"requirements": {"skills": ["java"]}}) == {ids["JavaScript"]}
+
+
+def test_rank_scores_requirements_inside_words():
+    """Kelime ortasında geçen gereksinimler puanlama ile aynı şekilde aday bulmalı"""
+    store = CandidateStore()
+    cv = {"skills": ["PostgreSQL", "NodeJS"]}
+    candidate_id = store.add_candidate(cv)
+    position = {"requirements": {"skills": ["sql", "js"]}}
+
+    result = store.rank(position)
+
+    assert score_cv(normalize_cv(cv), position)[0] == 1.0
+    assert result["scored"] == 1
+    assert result["candidates"][0]["candidate_id"] == candidate_id
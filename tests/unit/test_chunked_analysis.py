@@ -0,0 +1,94 @@
+import json
+import threading
+import pytest
+from src.core.chunked_analysis import (
+    ChunkedCVAnalyzer, BASIC_SCHEMA, DETAILED_SCHEMA, segment_cv, merge_partials
+)
+
+@pytest.fixture
+def long_cv_text():
+    """Bölüm başlıkları içeren uzun CV metni"""
+    deneyim = "\n".join(f"Şirket {i}\nYazılım Geliştirici\n2010-2011\n" + "Görev açıklaması. " * 20
+                        for i in range(30))
+    return (
+        "Ahmet Yılmaz\nahmet@example.com\n+90 555 123 4567\n\n"
+        "EĞİTİM\nBoğaziçi Üniversitesi\nBilgisayar Mühendisliği\n2015-2019\n\n"
+        f"İŞ DENEYİMİ\n{deneyim}\n\n"
+        "BECERİLER\nPython, Docker, SQL\n"
+    )
+
+def test_segment_cv_covers_whole_text(long_cv_text):
+    """Parçalama metnin hiçbir kısmını atmamalı"""
+    chunks = segment_cv(long_cv_text, max_chunk_chars=2000)
+    assert all(len(chunk.text) <= 2000 for chunk in chunks)
+    assert [chunk.section for chunk in chunks][:2] == ["kisisel", "egitim"]
+    assert chunks[-1].section == "beceriler"
+    joined = "".join(chunk.text for chunk in chunks)
+    assert "Şirket 29" in joined
+    assert "Python, Docker, SQL" in joined
+
+def test_merge_partials_is_order_deterministic():
+    """Birleştirme ilk dolu skaler değeri korur, listeleri tekilleştirir"""
+    partials = [
+        {"kisisel_bilgiler": {"isim": "Ahmet", "email": "Belirtilmemiş"}, "beceriler": ["Python"]},
+        {"kisisel_bilgiler": {"isim": "Başka", "email": "a@b.com"}, "beceriler": ["python", "SQL"]},
+    ]
+    merged = merge_partials(partials, BASIC_SCHEMA)
+    assert merged["kisisel_bilgiler"] == {"isim": "Ahmet", "email": "a@b.com"}
+    assert merged["beceriler"] == ["Python", "SQL"]
+    assert merged["egitim"] == []
+
+def test_analyzer_bounds_concurrency_and_merges(long_cv_text):
+    """Eşzamanlı istek sayısı sınırlanmalı ve sonuçlar birleştirilmeli"""
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def fake_generate(prompt):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            if "BÖLÜM: EĞİTİM" in prompt:
+                return json.dumps({"egitim": [{"okul": "Boğaziçi Üniversitesi"}]})
+            if "BÖLÜM: İŞ DENEYİMİ" in prompt:
+                return 'Sonuç: {"is_deneyimi": [{"sirket": "Şirket 1"}]}'
+            return json.dumps({"kisisel_bilgiler": {"isim": "Ahmet Yılmaz"}, "beceriler": ["Python"]})
+        finally:
+            with lock:
+                active[0] -= 1
+
+    analyzer = ChunkedCVAnalyzer(fake_generate, BASIC_SCHEMA, max_workers=2, max_chunk_chars=1500)
+    result = analyzer.analyze(long_cv_text)
+
+    assert peak[0] <= 2
+    assert result["kisisel_bilgiler"]["isim"] == "Ahmet Yılmaz"
+    assert result["egitim"] == [{"okul": "Boğaziçi Üniversitesi"}]
+    assert result["is_deneyimi"] == [{"sirket": "Şirket 1"}]
+    assert result["_parca_sayisi"] > 3
+
+def test_analyzer_reduce_step():
+    """Türetilmiş alanlar birleştirilmiş veriden ayrı bir istekle üretilmeli"""
+    prompts = []
+
+    def fake_generate(prompt):
+        prompts.append(prompt)
+        if "CV VERİSİ" in prompt:
+            return json.dumps({"yetenek_ozeti": "Deneyimli geliştirici"})
+        return json.dumps({"beceriler": {"teknik_beceriler": ["Python"]}})
+
+    result = ChunkedCVAnalyzer(fake_generate, DETAILED_SCHEMA, max_workers=1).analyze("BECERİLER\nPython")
+    assert result["yetenek_ozeti"] == "Deneyimli geliştirici"
+    assert '"teknik_beceriler":["Python"]' in prompts[-1]
+
+def test_extract_fields_only_queries_relevant_sections(long_cv_text):
+    """Hedefli çıkarma yalnızca istenen alanların bölümlerine istek göndermeli"""
+    prompts = []
+
+    def fake_generate(prompt):
+        prompts.append(prompt)
+        return json.dumps({"egitim": [{"okul": "Boğaziçi Üniversitesi", "tarih": "2015-2019"}]})
+
+    result = ChunkedCVAnalyzer(fake_generate, BASIC_SCHEMA, max_workers=1).extract_fields(long_cv_text, ["egitim"])
+    assert result == {"egitim": [{"okul": "Boğaziçi Üniversitesi", "tarih": "2015-2019"}]}
+    assert len(prompts) == 1
+    assert "BÖLÜM: EĞİTİM" in prompts[0]
+    assert '"is_deneyimi"' not in prompts[0]
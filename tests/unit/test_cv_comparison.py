@@ -0,0 +1,108 @@
+import itertools
+import random
+
+import numpy as np
+
+from src.core.candidate_store import CandidateStore
+from src.processors import cv_comparison
+from src.processors.cv_comparison import (CVFeatures, compare_cv_data, field_comparisons, similarity_clusters,
+                                          top_pairs)
+
+SKILLS = ["Python", "Java", "SQL", "Docker", "React", "Go", "Excel", "Linux"]
+COMPANIES = ["Aselsan", "Turkcell", "Getir", "Trendyol", ""]
+SCHOOLS = ["ODTÜ", "İTÜ", "Boğaziçi"]
+
+
+def _random_cv(rng):
+    return {
+        "skills": rng.sample(SKILLS, rng.randint(0, 4)),
+        "experience": [{"company": rng.choice(COMPANIES)} for _ in range(rng.randint(0, 2))],
+        "education": [{"institution": rng.choice(SCHOOLS)} for _ in range(rng.randint(0, 1))],
+    }
+
+
+def _reference_similarity(cv1, cv2):
+    """Çift çift küme kuran eski hesaplama (boş kümeler 0 kabul edilerek)"""
+    def jaccard(a, b):
+        a, b = a - {""}, b - {""}
+        return len(a & b) / len(a | b) if a | b else 0.0
+
+    return (jaccard(set(cv1["skills"]), set(cv2["skills"])) * 0.4
+            + jaccard({e["company"] for e in cv1["experience"]}, {e["company"] for e in cv2["experience"]}) * 0.4
+            + jaccard({e["institution"] for e in cv1["education"]}, {e["institution"] for e in cv2["education"]}) * 0.2)
+
+
+def test_matrix_matches_pairwise_sets():
+    """Blok blok hesaplanan matris, çift çift küme hesabıyla aynı olmalı"""
+    rng = random.Random(3)
+    cvs = [_random_cv(rng) for _ in range(60)]
+    features = CVFeatures(cvs)
+
+    expected = np.array([[_reference_similarity(a, b) for b in cvs] for a in cvs])
+    assert np.allclose(features.similarity_matrix(), expected)
+    blocks = np.vstack([block for _, block in features.iter_blocks(block_size=7)])
+    assert np.allclose(blocks, expected)
+
+
+def test_posting_expansion_is_chunked(monkeypatch):
+    """scipy olmadan posting genişletmesi parça parça yapılsa da kesişimler aynı kalmalı"""
+    rng = random.Random(11)
+    cvs = [_random_cv(rng) for _ in range(50)]
+    expected = np.array([[_reference_similarity(a, b) for b in cvs] for a in cvs])
+
+    monkeypatch.setattr(cv_comparison, "MAX_EXPANDED", 7)
+    features = CVFeatures(cvs)
+    for _, incidence in features.groups.values():
+        incidence.matrix = None
+    blocks = np.vstack([block for _, block in features.iter_blocks(block_size=9)])
+    assert np.allclose(blocks, expected)
+
+
+def test_top_pairs_and_clusters():
+    """En benzer çiftler tam sıralamayla, kümeler eşik üstü bağlantılarla aynı olmalı"""
+    rng = random.Random(5)
+    cvs = [_random_cv(rng) for _ in range(40)]
+    features = CVFeatures(cvs)
+    matrix = features.similarity_matrix()
+
+    pairs = sorted(((matrix[i, j], i, j) for i, j in itertools.combinations(range(len(cvs)), 2)),
+                   key=lambda item: (-item[0], item[1], item[2]))
+    assert [(i, j) for i, j, _ in top_pairs(features, 15, block_size=6)] == [(i, j) for _, i, j in pairs[:15]]
+
+    clusters = similarity_clusters(features, 0.6, block_size=6)
+    members = {node for cluster in clusters for node in cluster}
+    for score, i, j in pairs:
+        if score >= 0.6:
+            assert any(i in cluster and j in cluster for cluster in clusters)
+    assert all(len(cluster) > 1 for cluster in clusters) and len(members) == sum(map(len, clusters))
+
+
+def test_empty_fields_do_not_divide_by_zero():
+    """Boş CV'ler hata vermemeli, benzerlikleri 0 olmalı"""
+    result = compare_cv_data([{}, {"skills": []}, {"skills": ["Python"]}], ["skills"])
+    assert result["similarity_scores"] == {"cv_0_cv_1": 0.0, "cv_0_cv_2": 0.0, "cv_1_cv_2": 0.0}
+
+
+def test_field_comparisons_with_dict_items():
+    """Sözlük öğeleri (ör. deneyimler) de ortak/benzersiz olarak ayrılabilmeli"""
+    shared = {"company": "Getir", "title": "Geliştirici"}
+    results = [{"experience": [shared, {"company": "Aselsan"}], "skills": ["Python"]},
+               {"experience": [dict(shared)], "skills": ["Python", "Go"]}]
+
+    comparison = field_comparisons(results, ["experience", "skills"])
+    assert comparison["experience"] == {"common": [shared], "unique": [{"company": "Aselsan"}]}
+    assert comparison["skills"] == {"common": ["Python"], "unique": ["Go"]}
+
+
+def test_store_candidates_compare_by_id():
+    store = CandidateStore()
+    ids = [store.add_candidate({"skills": skills}, candidate_id=name)
+           for name, skills in [("b", ["Python", "SQL"]), ("a", ["Python", "SQL"]), ("c", ["Excel"])]]
+    candidates = list(store.iter_candidates())
+    assert [candidate_id for candidate_id, _ in candidates] == sorted(ids)
+
+    result = compare_cv_data([data for _, data in candidates], ["skills"], top_k_pairs=1, cluster_threshold=0.4,
+                             labels=[candidate_id for candidate_id, _ in candidates])
+    assert result["similarity_scores"] == {"a_b": 0.4}
+    assert result["clusters"] == [["a", "b"]]
+    assert [candidate_id for candidate_id, _ in store.iter_candidates(["c", "yok"])] == ["c"]
@@ -0,0 +1,35 @@
+import pytest
+from src.utils.cv_parser import CVParser
+
+@pytest.fixture
+def parser():
+    """Örnek CV ile parser fixture'ı"""
+    return CVParser(CVParser.create_example_cv())
+
+def test_field_confidence_range(parser):
+    """Güven skorları tüm alanlar için 0-1 aralığında olmalı"""
+    confidences = parser.field_confidence()
+    assert set(confidences) == {"kisisel_bilgiler", "beceriler", "egitim_bilgileri", "is_deneyimi", "projeler"}
+    assert all(0.0 <= score <= 1.0 for score in confidences.values())
+    assert confidences["kisisel_bilgiler"] == 1.0
+
+def test_field_confidence_low_for_missing_fields(parser):
+    """Bulunamayan alanların güveni düşük olmalı"""
+    analysis = {
+        "kisisel_bilgiler": {"isim": "Belirtilmemiş", "email": "Belirtilmemiş", "telefon": "Belirtilmemiş"},
+        "beceriler": {"teknik_beceriler": []},
+        "egitim_bilgileri": [],
+        "is_deneyimi": [{"sirket": "İŞ DENEYİMİ", "pozisyon": "Belirtilmemiş", "tarih": "Belirtilmemiş"}],
+        "projeler": []
+    }
+    confidences = parser.field_confidence(analysis)
+    assert all(score == 0.0 for score in confidences.values())
+
+def test_field_confidence_high_for_absent_sections():
+    """CV'de hiç bulunmayan bölümler için boş liste düşük güven vermemeli"""
+    parser = CVParser("Ayşe Yılmaz\nayse@example.com\n\nEĞİTİM\nODTÜ Bilgisayar Mühendisliği 2018\n")
+    analysis = {"kisisel_bilgiler": {}, "beceriler": {}, "egitim_bilgileri": [], "is_deneyimi": [], "projeler": []}
+    confidences = parser.field_confidence(analysis)
+    assert confidences["projeler"] == 1.0
+    assert confidences["is_deneyimi"] == 1.0
+    assert confidences["egitim_bilgileri"] == 0.0
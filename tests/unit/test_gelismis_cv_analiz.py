@@ -0,0 +1,16 @@
+import pytest
+
+from src.core.gelismis_cv_analiz import GelismisCVAnaliz
+
+
+def test_read_cv_text_accepts_files_and_text(tmp_path):
+    """Var olan dosya okunmalı, çok satırlı girdi CV metni sayılmalı, eksik dosya yolu hata vermeli"""
+    cv_file = tmp_path / "cv.txt"
+    cv_file.write_text("Ahmet Yılmaz\nPython", encoding="utf-8")
+    assert GelismisCVAnaliz._read_cv_text(None, str(cv_file)) == "Ahmet Yılmaz\nPython"
+
+    text = "Ahmet Yılmaz\nÖzgeçmiş: ahmet_cv.pdf"
+    assert GelismisCVAnaliz._read_cv_text(None, text) == text
+    for missing in (str(tmp_path / "yok.pdf"), "cvler/aday.TXT"):
+        with pytest.raises(FileNotFoundError):
+            GelismisCVAnaliz._read_cv_text(None, missing)
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.mock_ollama import MockOllama, VALID_ANALYSIS
+from src.core.hf_batch_client import HFAPIError, HFBatchClient
+from src.core.hf_llm_manager import HFLLMManager
+
+
+@pytest.fixture
+def mock():
+    """HF Inference API'yi taklit eden sahte sunucu"""
+    server = MockOllama(tokens_per_sec=100000).start()
+    yield server
+    server.stop()
+
+
+def _client(server, **kwargs):
+    return HFBatchClient("test-model", base_url=f"{server.url}/models", **kwargs)
+
+
+def test_concurrent_requests_are_batched(mock):
+    """Pencere içindeki eşzamanlı istekler tek istekte gönderilmeli"""
+    client = _client(mock, batch_window=0.1)
+
+    async def run():
+        return await asyncio.gather(*(client.generate(f"cv {i}", max_new_tokens=64) for i in range(5)))
+
+    outputs = asyncio.run(run())
+
+    assert len(outputs) == 5
+    assert all(json.loads(output) == VALID_ANALYSIS for output in outputs)
+    assert mock.hf_requests == [[f"cv {i}" for i in range(5)]]
+    assert client.stats["toplu_istek"] == 1 and client.stats["istek"] == 5
+
+
+def test_batches_split_by_size_and_parameters(mock):
+    """Parametresi farklı istekler ve boyutu aşan gruplar ayrı gönderilmeli"""
+    client = _client(mock, batch_window=0.1, max_batch_size=2)
+
+    async def run():
+        return await asyncio.gather(
+            client.generate("a", max_new_tokens=64),
+            client.generate("b", max_new_tokens=64),
+            client.generate("c", max_new_tokens=64),
+            client.generate("d", max_new_tokens=128),
+        )
+
+    asyncio.run(run())
+
+    assert sorted(map(str, mock.hf_requests)) == sorted(map(str, [["a", "b"], "c", "d"]))
+
+
+def test_retries_while_model_is_loading():
+    """503 yanıtında estimated_time kadar beklenip yeniden denenmeli"""
+    with MockOllama(tokens_per_sec=100000, hf_loading=2, hf_estimated_time=0.05) as server:
+        client = _client(server)
+        output = client.generate_sync("cv")
+
+    assert json.loads(output) == VALID_ANALYSIS
+    assert client.stats["yeniden_deneme"] == 2
+    assert len(server.hf_requests) == 3
+
+
+def test_gives_up_after_max_wait():
+    """Bekleme sınırı aşılınca hata fırlatılmalı"""
+    with MockOllama(hf_loading=10, hf_estimated_time=0.05) as server:
+        client = _client(server, max_wait=0.1)
+        with pytest.raises(HFAPIError) as error:
+            client.generate_sync("cv")
+
+    assert error.value.status_code == 503
+
+
+def test_manager_async_analysis(mock):
+    """HFLLMManager eşzamanlı analizleri toplu istemci üzerinden yapmalı"""
+    manager = HFLLMManager("token", model="test-model", base_url=f"{mock.url}/models")
+
+    async def run():
+        return await asyncio.gather(*(manager.analyze_cv_async("Ayşe Yılmaz") for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert all(result["kisisel_bilgiler"]["isim"] == "Ayşe Yılmaz" for result in results)
+    assert len(mock.hf_requests) == 1
+    assert manager.analyze_cv("Ayşe Yılmaz")["kisisel_bilgiler"]["isim"] == "Ayşe Yılmaz"
+
+
+def test_manager_reports_connection_errors(monkeypatch):
+    """Bağlantı hataları istisna yerine hata yanıtı olarak dönmeli; paylaşılan yönetici ortamdan kurulmalı"""
+    manager = HFLLMManager("token", model="test-model", base_url="http://127.0.0.1:9/models")
+    manager.client.max_wait = 0
+    for result in (manager.analyze_cv("Ayşe Yılmaz"), asyncio.run(manager.analyze_cv_async("Ayşe Yılmaz"))):
+        assert set(result) == {"error", "raw_response"}
+
+    from src.core import hf_llm_manager
+    monkeypatch.setattr(hf_llm_manager, "_shared_manager", None)
+    monkeypatch.delenv("HF_API_TOKEN", raising=False)
+    monkeypatch.delenv("HF_API_URL", raising=False)
+    assert hf_llm_manager.get_shared_manager() is None
+    monkeypatch.setenv("HF_API_URL", "http://127.0.0.1:9/models")
+    shared = hf_llm_manager.get_shared_manager()
+    assert shared is hf_llm_manager.get_shared_manager() and shared.api_url.startswith("http://127.0.0.1:9")
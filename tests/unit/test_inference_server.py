@@ -0,0 +1,70 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.inference_server import InferenceClient, InferenceServer
+from src.core.llm_backend import get_backend_manager
+from src.core.llm_manager import LLMManager
+
+
+def _long_cv():
+    experience = "\n".join(f"Şirket {i}\nYazılım Geliştirici\n2010-2011\n" + "Görev açıklaması. " * 20
+                           for i in range(30))
+    return f"Ahmet Yılmaz\nahmet@example.com\n\nEĞİTİM\nBoğaziçi Üniversitesi\n\nİŞ DENEYİMİ\n{experience}\n"
+
+
+def test_server_mode_spreads_chunks_over_slots(mock_servers):
+    """Sunucu modunda parçalar sunucunun paralel slotlarına aynı anda gönderilmeli"""
+    server = mock_servers(slots=3, latency=0.05, tokens_per_sec=100000,
+                          responses=[json.dumps({"beceriler": ["Python"]})])
+    manager = LLMManager(server_url=server.url)
+    assert manager.model_path is None and manager.server_url == server.url
+
+    manager.load_model()
+    assert manager.server_slots == 3
+
+    result = manager._analyze_cv_chunked(_long_cv())
+    assert result["beceriler"] == ["Python"]
+    assert len(server.payloads) > 3
+    assert 1 < server.peak_active <= 3
+    assert all(payload["cache_prompt"] and not payload["stream"] for payload in server.payloads)
+    # Üretim istekleri ortak backend katmanından geçer
+    metrics = get_backend_manager().metrics()[f"ctransformers:{server.url}"]
+    assert metrics["requests"] == len(server.payloads) and metrics["errors"] == 0
+
+
+def test_server_errors_reach_every_waiting_caller(mock_servers):
+    """Sunucu hatası, aynı anda bekleyen tüm çağıranlara hata olarak iletilmeli"""
+    server = mock_servers(status=503, latency=0.05)
+    client = InferenceClient(server.url)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(client.generate, f"istem {i}") for i in range(4)]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="503"):
+                future.result()
+    assert len(server.payloads) == 4
+
+    # LLMManager sunucu hatasını istisna yerine hata metni olarak döndürür
+    assert LLMManager(server_url=server.url).generate("istem").startswith("Metin üretme hatası")
+    assert not InferenceClient("http://127.0.0.1:9").is_ready()
+
+
+def test_server_command_and_startup_failures(tmp_path):
+    model = tmp_path / "model.gguf"
+    model.write_bytes(b"GGUF")
+
+    server = InferenceServer(str(model), parallel=4, context_per_slot=2048, binary="llama-server")
+    command = server.build_command()
+    assert command[command.index("-c") + 1] == "8192"
+    assert command[command.index("--parallel") + 1] == "4" and "--cont-batching" in command
+
+    with pytest.raises(RuntimeError, match="kapandı"):
+        InferenceServer(str(model), binary="false").start(timeout=5)
+    with pytest.raises(ValueError):
+        InferenceServer(str(tmp_path / "yok.gguf"), binary="false").start()
+    missing = InferenceServer(str(model))
+    missing.binary = None
+    with pytest.raises(FileNotFoundError):
+        missing.build_command()
@@ -0,0 +1,64 @@
+import json
+import pytest
+from pathlib import Path
+from src.utils.json_repair import MAX_DEPTH, repair_json, extract_json
+
+@pytest.fixture
+def raw_responses():
+    """results/ altındaki gerçek bozuk model çıktıları"""
+    responses = []
+    for name in ["cv_analiz_20250324132019.json", "cv_analiz_20250324133120.json"]:
+        with open(Path(__file__).parents[2] / "results" / name, encoding="utf-8") as f:
+            responses.append(json.load(f)["raw_response"])
+    return responses
+
+def test_valid_json_needs_no_repair():
+    """Geçerli JSON değiştirilmeden ayrıştırılmalı"""
+    data, repairs = repair_json('{"isim": "Ali", "beceriler": ["Python"]}')
+    assert data == {"isim": "Ali", "beceriler": ["Python"]}
+    assert repairs == []
+
+def test_prose_fences_and_trailing_commas():
+    """Açıklama metni, markdown ve sondaki virgüller aynı geçişte temizlenmeli"""
+    text = "İşte sonuç:\n```json\n{'isim': 'Ali', 'beceriler': ['Python', 'SQL',],}\n```\nBaşka sorunuz var mı?"
+    data, repairs = repair_json(text)
+    assert data == {"isim": "Ali", "beceriler": ["Python", "SQL"]}
+    assert "tek tırnak çift tırnağa çevrildi" in repairs
+    assert "sondaki virgül silindi" in repairs
+
+def test_truncated_output_is_closed():
+    """Yarıda kesilen çıktının tamamlanmış alanları korunmalı"""
+    data, repairs = repair_json('{"kisisel_bilgiler": {"isim": "Ali", "email": "a@b.com"}, "beceriler": ["Python", "Doc')
+    assert data == {"kisisel_bilgiler": {"isim": "Ali", "email": "a@b.com"}, "beceriler": ["Python"]}
+    assert "kapanmamış dizi kapatıldı" in repairs
+
+def test_python_literals_and_unquoted_keys():
+    """Python sabitleri ve tırnaksız anahtarlar düzeltilmeli"""
+    data, _ = repair_json("{aktif: True, puan: None, 'oran': 0.5}")
+    assert data == {"aktif": True, "puan": None, "oran": 0.5}
+
+def test_placeholder_before_real_json():
+    """Açıklama metnindeki {yer_tutucu} yerine gerçek JSON seçilmeli"""
+    assert extract_json('Şablon {isim} kullanıldı: {"isim": "Ali"}') == {"isim": "Ali"}
+
+def test_deep_nesting_is_cut_instead_of_recursing():
+    """Aşırı iç içe çıktı RecursionError yerine kesik yapı olarak kapatılmalı"""
+    data, repairs = repair_json('{"a":' + '[' * 3000)
+    assert "çok derin iç içe yapı kesildi" in repairs
+    depth, value = 0, data["a"]
+    while value:
+        depth, value = depth + 1, value[0]
+    assert depth == MAX_DEPTH - 1
+    assert repair_json('{"b": 1, "a": ' + '[' * 3000 + ']' * 3000 + '}')[0]["b"] == 1
+
+
+def test_no_json_returns_empty():
+    """JSON içermeyen metin boş sözlük döndürmeli"""
+    assert repair_json("Model yanıt veremedi") == ({}, ["JSON bulunamadı"])
+
+def test_real_malformed_outputs(raw_responses):
+    """Kayıtlı bozuk model çıktıları ayrıştırılabilmeli"""
+    for raw in raw_responses:
+        data = extract_json(raw)
+        assert data["kisisel_bilgiler"]["isim"]
+        assert data["is_deneyimi"]
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.mock_ollama import MockOllama, VALID_ANALYSIS
+from src.api.ollama_connector import OllamaConnector
+from src.api.ollama_pool import OllamaPool
+from src.core.hf_llm_manager import HFLLMManager
+from src.core.llm_backend import (BackendCapabilities, BackendManager, CTransformersBackend, HFBackend,
+                                  LLMBackend, LlamaCppBackend, ManagedBackend, OllamaBackend,
+                                  get_backend_manager)
+
+
+class EchoBackend(LLMBackend):
+    """Promptu büyük harfle döndüren test backend'i"""
+
+    name = "echo"
+    capabilities = BackendCapabilities(streaming=True)
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, max_tokens=1024, temperature=0.1, stop=None, grammar=None, **options):
+        with self._lock:
+            self.calls.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return prompt.upper()
+
+    def generate_stream(self, prompt, max_tokens=1024, temperature=0.1, stop=None):
+        for word in prompt.split():
+            yield word.upper() + " "
+
+    def tokenize(self, text):
+        raise NotImplementedError("echo tokenize desteklemiyor")
+
+    def close(self):
+        self.closed = True
+
+
+def test_default_batch_and_stream_fall_back_to_generate():
+    """Yeteneği olmayan backend için varsayılan davranışlar generate() kullanmalı"""
+    backend = EchoBackend()
+    assert backend.batch_generate(["a", "b"]) == ["A", "B"]
+    assert list(LLMBackend.generate_stream(backend, "cv")) == ["CV"]
+    assert backend.count_tokens("abcdef") == 2
+    with pytest.raises(NotImplementedError):
+        backend.tokenize("cv")
+    # Arayüzün zorunlu metodları soyut; eksik backend oluşturulamaz
+    with pytest.raises(TypeError):
+        LLMBackend()
+
+
+def test_managed_backend_caches_and_counts():
+    """Önbellek aynı istekleri backend'e göndermemeli, metrikler kaydedilmeli"""
+    inner = EchoBackend()
+    managed = ManagedBackend(inner, cache_size=8)
+
+    assert managed.generate("cv") == "CV"
+    assert managed.generate("cv") == "CV"
+    assert managed.batch_generate(["cv", "yeni"]) == ["CV", "YENI"]
+
+    assert inner.calls == ["cv", "yeni"]
+    metrics = managed.metrics.to_dict()
+    assert metrics["requests"] == 2
+    assert metrics["cache_hits"] == 2
+    assert metrics["errors"] == 0
+
+
+def test_managed_backend_records_errors_and_streams():
+    """Hatalar ve akış süreleri metriklere yansımalı"""
+    class Failing(EchoBackend):
+        def generate(self, *args, **kwargs):
+            raise RuntimeError("model yok")
+
+    managed = ManagedBackend(Failing())
+    with pytest.raises(RuntimeError):
+        managed.generate("cv")
+    assert "".join(managed.generate_stream("iki kelime")) == "IKI KELIME "
+
+    metrics = managed.metrics.to_dict()
+    assert metrics["errors"] == 1
+    assert metrics["streams"] == 1
+    assert metrics["in_flight"] == 0
+
+
+def test_managed_backend_limits_concurrency():
+    """Eşzamanlılık sınırı backend'e aynı anda gelen istekleri kısıtlamalı"""
+    inner = EchoBackend(delay=0.05)
+    managed = ManagedBackend(inner, max_concurrency=2)
+
+    threads = [threading.Thread(target=managed.generate, args=(f"cv {i}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert inner.max_active == 2
+
+
+def test_abandoned_stream_releases_slot():
+    """Yarıda bırakılan akış eşzamanlılık slotunu bırakmalı"""
+    managed = ManagedBackend(EchoBackend(), max_concurrency=1)
+    with managed.stream("üç ayrı kelime") as chunks:
+        assert next(chunks) == "ÜÇ "
+    assert managed.generate("cv") == "CV"
+    assert managed.metrics.to_dict()["in_flight"] == 0
+
+    with pytest.raises(RuntimeError):
+        with managed.stream("iki kelime") as chunks:
+            next(chunks)
+            raise RuntimeError("istemci koptu")
+    assert managed._semaphore.acquire(blocking=False)
+
+
+def test_backend_manager_lifecycle():
+    """Backend ilk kullanımda oluşturulmalı, release ile kapatılmalı"""
+    created = []
+
+    def factory():
+        created.append(EchoBackend())
+        return created[-1]
+
+    manager = BackendManager()
+    manager.register("echo", factory)
+    assert manager.metrics() == {}
+
+    backend = manager.get("echo")
+    assert manager.get("echo") is backend and len(created) == 1
+    backend.generate("cv")
+    assert manager.metrics()["echo"]["requests"] == 1
+    assert manager.metrics()["echo"]["capabilities"]["streaming"] is True
+
+    manager.release("echo")
+    assert created[0].closed
+    manager.get("echo")
+    assert len(created) == 2
+    with pytest.raises(KeyError):
+        manager.get("yok")
+
+
+def test_ollama_backend_generate_and_stream():
+    """Ollama bağdaştırıcısı havuz üzerinden akışlı ve akışsız üretmeli"""
+    with MockOllama(tokens_per_sec=100000) as mock:
+        connector = OllamaConnector(default_model="llama3:8b", pool=OllamaPool([mock.url], start_monitor=False))
+        backend = OllamaBackend(connector.pool, connector.default_model)
+
+        assert json.loads(backend.generate("cv")) == VALID_ANALYSIS
+        chunks = list(backend.generate_stream("cv"))
+        # Bağlayıcının kendi istekleri de yöneticideki backend'den geçmeli
+        assert json.loads(connector.generate("cv")) == VALID_ANALYSIS
+
+    assert len(chunks) > 1
+    assert json.loads("".join(chunks)) == VALID_ANALYSIS
+    assert connector.pool.hosts[0].in_flight == 0
+    metrics = get_backend_manager().metrics()[f"ollama:llama3:8b@{mock.url}"]
+    assert metrics["requests"] == 1 and metrics["errors"] == 0
+
+
+def test_root_connector_uses_backend_layer():
+    """Kök dizindeki ollama_connector aynı backend katmanını kullanmalı"""
+    import ollama_connector
+
+    with MockOllama(tokens_per_sec=100000) as mock:
+        connector = ollama_connector.OllamaConnector(default_model="llama3:8b",
+                                                     pool=OllamaPool([mock.url], start_monitor=False))
+        assert connector.analyze_cv("cv")["kisisel_bilgiler"]["isim"] == "Ayşe Yılmaz"
+
+    assert ollama_connector.OllamaConnector is OllamaConnector
+    assert get_backend_manager().metrics()[f"ollama:llama3:8b@{mock.url}"]["requests"] == 1
+
+
+def test_hf_backend_batches_requests():
+    """HF bağdaştırıcısı toplu üretimi tek istekte göndermeli"""
+    with MockOllama(tokens_per_sec=100000) as mock:
+        manager = HFLLMManager("token", model="test-model", base_url=f"{mock.url}/models")
+        backend = HFBackend(manager)
+        outputs = backend.batch_generate(["a", "b", "c"], stop=["\n\n"])
+
+        async def run():
+            return await asyncio.gather(backend.agenerate("d", stop=["\n\n"]), backend.agenerate("e"))
+
+        asyncio.run(run())
+        assert manager.analyze_cv("Ayşe Yılmaz")["kisisel_bilgiler"]["isim"] == "Ayşe Yılmaz"
+
+    assert backend.capabilities.batching
+    assert get_backend_manager().metrics()[f"hf:{manager.api_url}"]["requests"] == 1
+    assert all(json.loads(output) == VALID_ANALYSIS for output in outputs)
+    assert mock.hf_requests[0] == ["a", "b", "c"]
+    assert len(mock.hf_requests) == 4
+
+
+def test_local_adapters_use_manager_models():
+    """ctransformers ve llama_cpp bağdaştırıcıları yöneticideki modeli kullanmalı"""
+    ct_model = lambda prompt, stream=False, **kwargs: iter(["{", "}"]) if stream else "{}"
+    ct_model.tokenize = lambda text: list(range(len(text)))
+    ct = CTransformersBackend(SimpleNamespace(client=None, model=ct_model, has_model=lambda: True))
+    assert ct.generate("cv") == "{}" and "".join(ct.generate_stream("cv")) == "{}"
+    assert ct.count_tokens("abc") == 3
+
+    class FakeLlama:
+        def create_completion(self, prompt, stream=False, **kwargs):
+            if stream:
+                return iter([{"choices": [{"text": "{"}]}, {"choices": [{"text": "}"}]}])
+            return {"choices": [{"text": "{}"}]}
+
+        def tokenize(self, data):
+            return list(data)
+
+    llama = LlamaCppBackend(SimpleNamespace(client=None, model=FakeLlama(), model_lock=threading.Lock()))
+    assert llama.capabilities.grammar
+    assert llama.generate("cv") == "{}"
+    assert list(llama.generate_stream("cv")) == ["{", "}"]
+    assert llama.count_tokens("ab") == 2
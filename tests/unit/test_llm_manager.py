@@ -1 +1,12 @@
- 
\ No newline at end of file
+import json
+import re
+
+from src.core.llm_manager import LLMManager
+
+
+def test_matching_prompt_contains_json_example():
+    """Eşleştirme promptu oluşturulabilmeli ve örnek JSON geçerli olmalı"""
+    prompt = LLMManager._create_matching_prompt(None, {"skills": ["Python"]}, {"title": "Backend"})
+    example = re.findall(r"```json\s*(.*?)```", prompt, re.S)[-1]
+    assert json.loads(example)["category_scores"]["skills"] == 0.9
+    assert '"title": "Backend"' in prompt
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+import requests
+
+from benchmarks.load_bench import percentile, run_load
+from benchmarks.mock_ollama import MockOllama, VALID_ANALYSIS, malformed_outputs
+from src.api.ollama_connector import OllamaConnector
+from src.api.ollama_pool import OllamaPool
+from src.core.inference_server import InferenceClient
+
+
+@pytest.fixture
+def mock():
+    """Hızlı yanıt veren sahte Ollama sunucusu"""
+    server = MockOllama(tokens_per_sec=100000, seed=1).start()
+    yield server
+    server.stop()
+
+
+def _pool(url):
+    return OllamaPool([url], start_monitor=False)
+
+
+def test_tags_and_non_streaming_generate(mock):
+    """Havuz sahte sunucunun modellerini görmeli ve akışsız yanıt almalı"""
+    pool = _pool(mock.url)
+    pool.check_health()
+    assert "llama3:8b" in pool.models()
+
+    result = pool.generate({"model": "llama3:8b", "prompt": "cv"})
+    assert json.loads(result["response"]) == VALID_ANALYSIS
+    assert result["eval_count"] > 0
+
+
+def test_streaming_generate(mock):
+    """Akışlı yanıt parçaları birleştirildiğinde tam çıktıyı vermeli"""
+    response = requests.post(f"{mock.url}/api/generate", json={"model": "llama3:8b", "prompt": "cv"}, stream=True)
+    chunks = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert chunks[-1]["done"] is True
+    assert json.loads("".join(chunk["response"] for chunk in chunks)) == VALID_ANALYSIS
+
+
+def test_unknown_model_returns_404(mock):
+    """Bilinmeyen model 404 döndürmeli"""
+    response = requests.post(f"{mock.url}/api/generate", json={"model": "yok", "prompt": "cv", "stream": False})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("output", malformed_outputs(VALID_ANALYSIS)[:3])
+def test_connector_repairs_malformed_output(output):
+    """Bağlayıcı bozuk model çıktısını onarıp alanları döndürmeli"""
+    with MockOllama(tokens_per_sec=100000, responses=[output]) as server:
+        connector = OllamaConnector(default_model="llama3:8b", pool=_pool(server.url))
+        result = connector.analyze_cv("Ayşe Yılmaz CV")
+
+    assert result["kisisel_bilgiler"]["isim"] == "Ayşe Yılmaz"
+
+
+def test_llama_server_endpoints(mock):
+    """LLM_SERVER_URL istemcisi sahte sunucuyla çalışmalı"""
+    client = InferenceClient(mock.url)
+    assert client.is_ready()
+    assert client.get_slot_count() == 4
+    assert json.loads(client.generate("cv")) == VALID_ANALYSIS
+
+
+def test_percentile_nearest_rank():
+    """Yüzdelikler en yakın sıra yöntemiyle hesaplanmalı"""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_load_counts_errors_and_failures():
+    """Yük testi hataları ve başarısız analizleri ayrı saymalı"""
+    calls = iter(range(10))
+
+    def call():
+        index = next(calls)
+        if index % 5 == 0:
+            raise RuntimeError("bağlantı hatası")
+        return {"_error": "analiz"} if index % 3 == 0 else {"ok": True}
+
+    report = run_load(call, requests_total=10, concurrency=1)
+
+    assert report["istek"] == 10
+    assert report["hata"] == 2
+    assert report["analiz_hatasi"] == 3
+    assert report["basarili"] == 8
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from benchmarks.mock_ollama import MockOllama, VALID_ANALYSIS
+from benchmarks.model_bench import (Backend, HFBackend, OllamaBackend, build_report, create_backend,
+                                    field_accuracy, run_backend)
+
+EXPECTED = {
+    "kisisel_bilgiler": {"isim": "Ayşe Yılmaz", "telefon": "0532 000 00 00"},
+    "egitim_bilgileri": [{"okul": "Orta Doğu Teknik Üniversitesi"}],
+    "beceriler": {"yazilim_dilleri": ["Python", "SQL", "Go"]},
+}
+
+CORPUS = [{"ad": "ayse", "metin": "Ayşe Yılmaz\nPython, SQL", "beklenen": EXPECTED}]
+
+
+class ListBackend(Backend):
+    """Hazır parçaları sırayla üreten test backend'i"""
+
+    kind = "liste"
+
+    def __init__(self, chunks):
+        super().__init__("test-model")
+        self.chunks = chunks
+
+    def stream(self, prompt, max_tokens):
+        yield from self.chunks
+
+
+def test_field_accuracy_scores_each_field():
+    """Alan doğruluğu tekil, telefon ve liste alanlarını ayrı puanlamalı"""
+    scores = field_accuracy(VALID_ANALYSIS, EXPECTED)
+
+    assert scores["kisisel_bilgiler.isim"] == 1.0
+    # Ülke kodu farklı olsa da son 10 hane aynıysa eşleşir
+    assert scores["kisisel_bilgiler.telefon"] == 1.0
+    assert scores["egitim_bilgileri"] == 1.0
+    # 2 doğru / 2 tahmin, 2 bulunan / 3 beklenen
+    assert scores["beceriler.yazilim_dilleri"] == pytest.approx(0.8)
+
+
+def test_field_accuracy_handles_missing_prediction():
+    """Tahmin boşsa tüm alanlar sıfır olmalı"""
+    scores = field_accuracy({}, EXPECTED)
+    assert set(scores.values()) == {0.0}
+
+
+def test_run_backend_measures_streamed_output():
+    """Akışlı çıktıda token sayısı, TTFT ve doğruluk raporlanmalı"""
+    text = json.dumps(VALID_ANALYSIS, ensure_ascii=False)
+    backend = ListBackend([text[i:i + 10] for i in range(0, len(text), 10)])
+
+    entry = run_backend(backend, CORPUS, warmup=False)
+
+    sample = entry["ornekler"][0]
+    assert sample["token"] == len(backend.chunks)
+    assert sample["ttft_ms"] <= sample["gecikme_ms"]
+    assert sample["json_ayristi"] is True
+    assert entry["ozet"]["dogruluk"] == sample["dogruluk"]
+    assert entry["tepe_rss_mb"] > 0
+
+
+def test_run_backend_records_errors():
+    """Backend hatası raporu bozmamalı"""
+    class Broken(ListBackend):
+        def load(self):
+            raise ImportError("kütüphane yok")
+
+    entry = run_backend(Broken([]), CORPUS)
+
+    assert entry["hata"] == "kütüphane yok"
+    assert entry["ozet"] == {}
+    assert build_report([entry], CORPUS)["siralama"] == []
+
+
+def test_remote_backends_against_mock():
+    """Ollama ve HF backendleri sunucunun bildirdiği token sayısını kullanmalı"""
+    with MockOllama(tokens_per_sec=100000) as mock:
+        ollama = create_backend("ollama:llama3:8b", mock.url, f"{mock.url}/models")
+        hf = create_backend("hf:mock-model", mock.url, f"{mock.url}/models")
+        assert isinstance(ollama, OllamaBackend) and isinstance(hf, HFBackend)
+
+        for backend in (ollama, hf):
+            text = "".join(backend.stream("cv", 64))
+            assert json.loads(text) == VALID_ANALYSIS
+            assert backend.last_token_count > 0
+
+
+def test_create_backend_rejects_invalid_spec():
+    """Geçersiz backend tanımı hata vermeli"""
+    with pytest.raises(ValueError):
+        create_backend("ollama", "", "")
+    with pytest.raises(ValueError):
+        create_backend("bilinmeyen:model", "", "")
@@ -0,0 +1,118 @@
+import struct
+import threading
+import time
+
+import pytest
+from src.core.model_registry import ModelRegistry, read_gguf_metadata, inspect_model
+
+def _gguf_string(text):
+    data = text.encode("utf-8")
+    return struct.pack("<Q", len(data)) + data
+
+def write_gguf(path, architecture="llama", file_type=15, context_length=4096, padding=2 * 1024 * 1024):
+    """Başlığı gerçek GGUF biçiminde olan küçük bir test dosyası yazar"""
+    kv = [
+        _gguf_string("general.architecture") + struct.pack("<I", 8) + _gguf_string(architecture),
+        _gguf_string("general.file_type") + struct.pack("<I", 4) + struct.pack("<I", file_type),
+        _gguf_string(f"{architecture}.context_length") + struct.pack("<I", 4) + struct.pack("<I", context_length),
+        _gguf_string(f"{architecture}.rope.scales") + struct.pack("<I", 9) + struct.pack("<IQ", 6, 3)
+        + struct.pack("<3f", 1.0, 2.0, 3.0),
+        _gguf_string("tokenizer.ggml.tokens") + struct.pack("<I", 9) + struct.pack("<IQ", 8, 2)
+        + _gguf_string("a") + _gguf_string("b"),
+    ]
+    header = b"GGUF" + struct.pack("<IQQ", 3, 0, len(kv)) + b"".join(kv)
+    path.write_bytes(header + b"\0" * padding)
+    return path
+
+@pytest.fixture
+def models_dir(tmp_path):
+    """Üç model ve bir boş dosya içeren model dizini"""
+    write_gguf(tmp_path / "tinyllama-1.1b.Q4_K_M.gguf")
+    write_gguf(tmp_path / "mistral-7b.gguf", architecture="mistral", file_type=7, context_length=32768)
+    write_gguf(tmp_path / "phi-2.Q5_K_S.gguf", architecture="phi2", file_type=99)
+    (tmp_path / "bos.gguf").write_bytes(b"")
+    return tmp_path
+
+def test_reads_gguf_header(models_dir):
+    """Mimari, nicemleme ve bağlam uzunluğu başlıktan okunmalı"""
+    metadata = read_gguf_metadata(str(models_dir / "mistral-7b.gguf"))
+    assert metadata["general.architecture"] == "mistral"
+    assert metadata["mistral.context_length"] == 32768
+
+    info = inspect_model(models_dir / "mistral-7b.gguf")
+    assert (info.architecture, info.quantization, info.context_length) == ("mistral", "Q8_0", 32768)
+    assert info.model_type == "mistral"
+
+    # Bilinmeyen file_type için dosya adına bakılır
+    phi = inspect_model(models_dir / "phi-2.Q5_K_S.gguf")
+    assert phi.quantization == "Q5_K_S" and phi.model_type == "gptj"
+
+def test_scan_indexes_once_and_skips_empty(models_dir):
+    """Boş dosyalar atlanmalı; modeller uzantılı veya uzantısız adla bulunmalı"""
+    registry = ModelRegistry(str(models_dir), memory_budget=10 ** 9)
+    assert sorted(registry.models) == ["mistral-7b.gguf", "phi-2.Q5_K_S.gguf", "tinyllama-1.1b.Q4_K_M.gguf"]
+    assert registry.get_info("mistral-7b").name == "mistral-7b.gguf"
+    with pytest.raises(KeyError):
+        registry.get_info("yok")
+
+def test_lru_eviction_within_memory_budget(models_dir):
+    """Bellek sınırı aşılınca en az kullanılan model boşaltılmalı"""
+    model_size = inspect_model(models_dir / "mistral-7b.gguf").estimated_memory
+    registry = ModelRegistry(str(models_dir), memory_budget=int(model_size * 2.5))
+    loader = lambda info: object()
+
+    tiny = registry.acquire("tinyllama-1.1b.Q4_K_M", loader)
+    registry.acquire("mistral-7b", loader)
+    assert registry.acquire("tinyllama-1.1b.Q4_K_M", loader) is tiny  # tiny en son kullanılan
+    registry.acquire("phi-2.Q5_K_S", loader)
+
+    metrics = registry.metrics()
+    assert metrics["loaded"] == ["tinyllama-1.1b.Q4_K_M.gguf", "phi-2.Q5_K_S.gguf"]
+    assert (metrics["loads"], metrics["hits"], metrics["evictions"]) == (3, 1, 1)
+    assert registry.evict("phi-2.Q5_K_S") and not registry.is_loaded("phi-2.Q5_K_S")
+
+def test_concurrent_requests_share_one_load(models_dir):
+    """Aynı modeli isteyen eşzamanlı çağrılar tek yükleme yapmalı"""
+    registry = ModelRegistry(str(models_dir), memory_budget=10 ** 9)
+    calls = []
+
+    def loader(info):
+        calls.append(info.name)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.acquire("mistral-7b", loader)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["mistral-7b.gguf"]
+    assert len({id(model) for model in results}) == 1
+
+def test_evicted_model_is_not_held_by_manager(models_dir, monkeypatch):
+    """Boşaltılan modele yöneticiler referans tutmamalı; sonraki kullanımda yeniden yüklenmeli"""
+    import gc
+    import weakref
+    from src.core import llm_manager as llm_module
+
+    class FakeModel:
+        def tokenize(self, text):
+            return text.split()
+
+    monkeypatch.setattr(llm_module, "CTRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setattr(llm_module.LLMManager, "_load_from_file", lambda self, *args: FakeModel())
+    registry = ModelRegistry(str(models_dir), memory_budget=10 ** 9)
+    manager = llm_module.LLMManager(model_path=str(models_dir / "mistral-7b.gguf"), registry=registry)
+    manager.load_model()
+    other = manager.for_model("tinyllama-1.1b.Q4_K_M")
+    assert other is not manager and other.has_model()
+
+    loaded = weakref.ref(manager.model)
+    assert registry.evict("mistral-7b")
+    gc.collect()
+    assert loaded() is None and manager.has_model()
+    assert manager.planner.count("iki kelime") == 2
+    assert registry.is_loaded("mistral-7b") and registry.metrics()["loads"] == 3
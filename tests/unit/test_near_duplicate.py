@@ -0,0 +1,85 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from src.core.near_duplicate import (NearDuplicateIndex, contact_keys, estimate_jaccard, merge_analysis,
+                                     minhash_signature, same_person, shingles)
+
+ROOT = Path(__file__).resolve().parents[2]
+CV_TEXT = (ROOT / "cv_ornek.txt").read_text(encoding="utf-8")
+
+
+def _edit(text, ratio, seed=0):
+    """Metindeki kelimelerin bir kısmını değiştirerek düzenlenmiş sürüm üretir"""
+    rng = random.Random(seed)
+    words = text.split()
+    for index in rng.sample(range(len(words)), int(len(words) * ratio)):
+        words[index] = f"degisti{index}"
+    return " ".join(words)
+
+
+def test_signature_estimates_jaccard():
+    """MinHash tahmini gerçek Jaccard benzerliğine yakın olmalı"""
+    edited = _edit(CV_TEXT, 0.05)
+    a, b = shingles(CV_TEXT), shingles(edited)
+    exact = len(a & b) / len(a | b)
+
+    estimate = estimate_jaccard(minhash_signature(CV_TEXT), minhash_signature(edited))
+    assert abs(estimate - exact) < 0.12
+    assert estimate_jaccard(minhash_signature(CV_TEXT), minhash_signature(CV_TEXT.upper())) == 1.0
+    assert minhash_signature("   ") is None
+
+
+def test_index_finds_edited_version_only(tmp_path):
+    """Düzenlenmiş CV bulunmalı, ilgisiz CV eşleşmemeli; kayıtlar kalıcı olmalı"""
+    index = NearDuplicateIndex(str(tmp_path / "kopya.db"))
+    index.add("orijinal", minhash_signature(CV_TEXT), contact_keys(CV_TEXT))
+    index.add("baska", minhash_signature(_edit(CV_TEXT, 0.9, seed=1)))
+    index.close()
+
+    index = NearDuplicateIndex(str(tmp_path / "kopya.db"))
+    edited = _edit(CV_TEXT, 0.03, seed=2)
+    match = index.closest(minhash_signature(edited), contact_keys(edited))
+    assert match["candidate_id"] == "orijinal"
+    assert match["benzerlik"] >= 0.7 and match["ayni_kisi"]
+    assert index.closest(minhash_signature(edited), exclude="orijinal") is None
+
+    index.remove("orijinal")
+    assert index.count() == 1
+    assert index.closest(minhash_signature(edited)) is None
+
+
+def test_same_person_uses_header_contacts():
+    """Referans bilgileri değil, başlıktaki iletişim bilgileri karşılaştırılmalı"""
+    first = contact_keys("Ali Veli | ali@ornek.com | 0532 111 22 33\nReferans: ref@firma.com 0555 000 00 00")
+    second = contact_keys("Ayşe Kaya | ayse@ornek.com | 0533 444 55 66\nReferans: ref@firma.com 0555 000 00 00")
+
+    assert first == {"email": ["ali@ornek.com"], "telefon": ["5321112233"]}
+    assert not same_person(first, second)
+    assert same_person(first, {"email": [], "telefon": ["5321112233"]})
+    assert not same_person(first, {"email": [], "telefon": []})
+
+
+def test_merge_analysis_keeps_prior_and_adds_new():
+    """Güncelleme önceki analizi korumalı, yeni öğeleri ve dolu alanları eklemeli"""
+    prior = {"kisisel_bilgiler": {"isim": "Ali", "telefon": "1"}, "beceriler": ["Python"], "_llm_atlandi": {}}
+    fresh = {"kisisel_bilgiler": {"isim": "", "telefon": "2"}, "beceriler": ["Python", "Go"]}
+
+    assert merge_analysis(prior, fresh) == {"kisisel_bilgiler": {"isim": "Ali", "telefon": "2"},
+                                            "beceriler": ["Python", "Go"]}
+
+
+def test_uploaded_versions_of_same_cv():
+    """uploads/ altındaki aynı kişinin iki sürümü eşleşmeli, aynı şablonlu başka kişi ayrılmalı"""
+    pytest.importorskip("pdfplumber")
+    from src.utils.pdf_to_text import pdf_to_text
+
+    texts = {name: pdf_to_text(str(ROOT / "uploads" / f"{name}.pdf"))
+             for name in ["Furkan_Sevinc-2", "Furkan_Sevinc-3", "Nisa_Duru-3"]}
+    index = NearDuplicateIndex()
+    for name in ["Furkan_Sevinc-2", "Nisa_Duru-3"]:
+        index.add(name, minhash_signature(texts[name]), contact_keys(texts[name]))
+
+    match = index.closest(minhash_signature(texts["Furkan_Sevinc-3"]), contact_keys(texts["Furkan_Sevinc-3"]))
+    assert match["candidate_id"] == "Furkan_Sevinc-2" and match["ayni_kisi"]
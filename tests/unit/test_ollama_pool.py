@@ -0,0 +1,92 @@
+import pytest
+from src.api.ollama_pool import OllamaPool, OllamaHost
+
+def test_host_model_matching():
+    """Etiketsiz model adı :latest ile eşleşmeli"""
+    host = OllamaHost("http://x/")
+    host.models = ["llama3:latest", "mistral:7b"]
+    assert host.url == "http://x"
+    assert host.has_model("llama3") and host.has_model("mistral:7b")
+    assert not host.has_model("mistral") and not host.has_model("qwen:7b")
+
+def test_routes_only_to_hosts_with_model(mock_servers):
+    """İstek yalnızca modeli barındıran sunucuya gitmeli"""
+    first = mock_servers(models=["llama3:8b"], responses=["birinci"])
+    second = mock_servers(models=["mistral:latest"], responses=["ikinci"])
+    pool = OllamaPool([first.url, second.url], start_monitor=False)
+
+    result = pool.generate({"model": "mistral", "prompt": "test"})
+
+    assert result["response"] == "ikinci"
+    assert first.request_count == 0
+    assert sorted(pool.models()) == ["llama3:8b", "mistral:latest"]
+
+def test_prefers_faster_host_after_measurement(mock_servers):
+    """Ölçülen token/saniye hızı yüksek olan sunucu tercih edilmeli"""
+    slow = mock_servers(models=["llama3:8b"], tokens_per_sec=5, responses=["yavaş"])
+    fast = mock_servers(models=["llama3:8b"], tokens_per_sec=80, responses=["hızlı"])
+    pool = OllamaPool([slow.url, fast.url], start_monitor=False)
+
+    for _ in range(6):
+        pool.generate({"model": "llama3:8b", "prompt": "test"})
+
+    assert fast.request_count > slow.request_count
+    stats = {entry["url"]: entry for entry in pool.stats()}
+    assert stats[fast.url]["tokens_per_sec"] > stats[slow.url]["tokens_per_sec"]
+    assert all(entry["in_flight"] == 0 for entry in stats.values())
+
+def test_in_flight_requests_spread_load(mock_servers):
+    """Meşgul sunucu yerine boştaki sunucu seçilmeli"""
+    first, second = mock_servers(models=["llama3:8b"]), mock_servers(models=["llama3:8b"])
+    pool = OllamaPool([first.url, second.url], start_monitor=False)
+
+    busy = pool._acquire("llama3:8b", [])
+    other = pool._acquire("llama3:8b", [])
+
+    assert busy is not other
+    pool._release(busy)
+    pool._release(other)
+
+def test_failover_on_server_error_and_dead_host(mock_servers):
+    """Hata veren veya kapanan sunucu atlanıp istek diğerine aktarılmalı"""
+    broken = mock_servers(models=["llama3:8b"], status=500)
+    healthy = mock_servers(models=["llama3:8b"], responses=["sağlam"])
+    dead = mock_servers(models=["llama3:8b"])
+    pool = OllamaPool([dead.url, broken.url, healthy.url], start_monitor=False)
+    dead.stop()
+
+    for _ in range(3):
+        assert pool.generate({"model": "llama3:8b", "prompt": "x"})["response"] == "sağlam"
+
+    stats = {entry["url"]: entry for entry in pool.stats()}
+    assert not stats[broken.url]["healthy"] and stats[broken.url]["failures"] == 1
+    assert not stats[dead.url]["healthy"]
+
+def test_invalid_json_and_missing_model_release_host(mock_servers):
+    """JSON olmayan 200 yanıtı ve 404 sonrasında sunucu rezervasyonu bırakılmalı"""
+    garbled = mock_servers(models=["llama3:8b"], raw_body="<html>proxy</html>")
+    healthy = mock_servers(models=["llama3:8b"], responses=["sağlam"])
+    missing = mock_servers(models=["llama3:8b"], status=404)
+    pool = OllamaPool([garbled.url, missing.url, healthy.url], start_monitor=False)
+
+    for _ in range(3):
+        assert pool.generate({"model": "llama3:8b", "prompt": "x"})["response"] == "sağlam"
+
+    stats = {entry["url"]: entry for entry in pool.stats()}
+    assert all(entry["in_flight"] == 0 for entry in stats.values())
+    assert not stats[garbled.url]["healthy"]
+    assert stats[missing.url]["healthy"] and not pool.hosts[1].has_model("llama3:8b")
+
+def test_raises_when_no_host_has_model(mock_servers):
+    """Modeli barındıran sağlıklı sunucu yoksa açık bir hata verilmeli"""
+    pool = OllamaPool([mock_servers(models=["llama3:8b"]).url], start_monitor=False)
+    with pytest.raises(RuntimeError):
+        pool.generate({"model": "qwen:7b", "prompt": "x"})
+
+def test_from_env_parses_host_list(monkeypatch, mock_servers):
+    """OLLAMA_HOSTS virgülle ayrılmış uç noktaları okumalı"""
+    first, second = mock_servers(models=["llama3:8b"]), mock_servers(models=["llama3:8b"])
+    monkeypatch.setenv("OLLAMA_HOSTS", f"{first.url}, {second.url},")
+    pool = OllamaPool.from_env(start_monitor=False)
+    assert [host.url for host in pool.hosts] == [first.url, second.url]
+    assert pool.is_available()
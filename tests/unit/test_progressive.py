@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+from src.api.progressive import ResultStore, diff_fields
+
+def test_diff_reports_field_paths():
+    """Değişen, eklenen ve silinen alanlar yol bazında raporlanmalı"""
+    regex = {
+        "kisisel_bilgiler": {"isim": "Belirtilmemiş", "email": "ali@ornek.com"},
+        "beceriler": ["Python"],
+        "eski_alan": 1,
+        "_meta": "yok sayılır",
+    }
+    llm = {
+        "kisisel_bilgiler": {"isim": "Ali Veli", "email": "ali@ornek.com"},
+        "beceriler": ["Python", "Docker"],
+        "yetenek_ozeti": "Backend geliştirici",
+        "_meta": "farklı",
+    }
+
+    changes = {change["alan"]: change for change in diff_fields(regex, llm)}
+
+    assert set(changes) == {"kisisel_bilgiler.isim", "beceriler", "eski_alan", "yetenek_ozeti"}
+    assert changes["kisisel_bilgiler.isim"]["islem"] == "degisti"
+    assert changes["kisisel_bilgiler.isim"]["yeni"] == "Ali Veli"
+    assert changes["eski_alan"]["islem"] == "silindi"
+    assert changes["yetenek_ozeti"]["islem"] == "eklendi"
+
+def test_result_completes_with_diff():
+    """Kayıt önce regex sonucunu, tamamlanınca LLM sonucunu ve farkı vermeli"""
+    store = ResultStore()
+    entry = store.create({"beceriler": ["Python"]})
+
+    assert store.get(entry.id).to_dict()["status"] == "pending"
+    assert entry.to_dict()["result"] == {"beceriler": ["Python"]}
+
+    entry.complete({"beceriler": ["Python", "SQL"]})
+    data = entry.to_dict()
+    assert data["status"] == "done" and data["result"] == {"beceriler": ["Python", "SQL"]}
+    assert [change["alan"] for change in data["diff"]] == ["beceriler"]
+
+def test_stream_sends_initial_then_final_event():
+    """SSE akışı önce regex, LLM bitince son sonucu göndermeli"""
+    store = ResultStore()
+
+    async def main():
+        entry = store.create({"isim": "Belirtilmemiş"})
+        events = []
+
+        async def consume():
+            async for chunk in store.stream(entry.id, heartbeat=0.01):
+                events.append(chunk)
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.03)
+        entry.fail("LLM kuyruğu dolu")
+        await asyncio.wait_for(consumer, timeout=1)
+        return events
+
+    events = asyncio.run(main())
+    assert events[0].startswith("event: initial")
+    assert any(chunk.startswith(":") for chunk in events[1:-1])
+    final = json.loads(events[-1].split("data: ", 1)[1])
+    assert events[-1].startswith("event: final")
+    assert final["status"] == "failed" and final["result"] == {"isim": "Belirtilmemiş"}
+
+def test_store_expires_and_bounds_entries(monkeypatch):
+    """Süresi dolan kayıtlar silinmeli, sayı sınırında önce tamamlanmış en eski kayıt çıkmalı"""
+    store = ResultStore(ttl=60, max_results=3)
+    first, second, third = (store.create({"n": i}) for i in range(3))
+    second.complete({"n": 1})
+
+    fourth = store.create({"n": 3})
+    assert store.get(second.id) is None and len(store) == 3
+    store.create({"n": 4})
+    assert store.get(first.id) is None and store.get(fourth.id) is fourth
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert store.get(third.id) is None and len(store) == 0
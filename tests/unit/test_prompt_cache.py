@@ -0,0 +1,55 @@
+import pytest
+from src.core.prompt_cache import PromptTemplate, LlamaStateCache
+
+class FakeLlama:
+    """Durum kaydetme/yükleme çağrılarını sayan sahte llama_cpp modeli"""
+
+    def __init__(self):
+        self.evaluated = []
+        self.loaded = []
+
+    def tokenize(self, data):
+        return list(data)
+
+    def reset(self):
+        self.evaluated = []
+
+    def eval(self, tokens):
+        self.evaluated.extend(tokens)
+
+    def save_state(self):
+        return ("state", len(self.evaluated))
+
+    def load_state(self, state):
+        self.loaded.append(state)
+
+@pytest.fixture
+def template():
+    """Örnek prompt şablonu"""
+    return PromptTemplate(prefix="TALİMAT {json}\n", suffix="CV: {cv_text}")
+
+def test_template_keeps_prefix_constant(template):
+    """Farklı CV'ler için önek aynı kalmalı"""
+    first = template.build(cv_text="A")
+    second = template.build(cv_text="B {x}")
+    assert first.startswith(template.prefix) and second.startswith(template.prefix)
+    assert second.endswith("CV: B {x}")
+
+def test_state_cache_evaluates_prefix_once(template):
+    """Önek yalnızca ilk istekte değerlendirilmeli, sonra durum geri yüklenmeli"""
+    model, cache = FakeLlama(), LlamaStateCache()
+    assert cache.restore(model, template)
+    assert model.evaluated and not model.loaded
+    model.evaluated = []
+    assert cache.restore(model, template)
+    assert model.evaluated == []
+    assert len(model.loaded) == 1
+
+def test_state_cache_evicts_oldest():
+    """Kapasite aşıldığında en eski önek durumu silinmeli"""
+    model, cache = FakeLlama(), LlamaStateCache(max_entries=1)
+    cache.restore(model, PromptTemplate("bir"))
+    cache.restore(model, PromptTemplate("iki"))
+    model.evaluated = []
+    cache.restore(model, PromptTemplate("bir"))
+    assert model.evaluated
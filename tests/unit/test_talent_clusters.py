@@ -0,0 +1,146 @@
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from src.core.candidate_store import CandidateStore
+from src.core.talent_clusters import MiniBatchKMeans, SkillVectorizer, TalentClusters
+
+GROUPS = {
+    "backend": ["Python", "Django", "PostgreSQL", "Docker", "Redis", "Kafka"],
+    "frontend": ["React", "TypeScript", "CSS", "Figma", "Redux", "Webpack"],
+    "veri": ["Pandas", "Spark", "Airflow", "Tableau", "Scikit-learn", "Hadoop"],
+}
+
+
+def _cv(rng, group, start=2015):
+    return {"skills": rng.sample(GROUPS[group], 3),
+            "experience": [{"start_date": str(start), "end_date": "2024"}]}
+
+
+def _store(count=300, seed=0):
+    rng = random.Random(seed)
+    store = CandidateStore()
+    groups = {}
+    for i in range(count):
+        group = list(GROUPS)[i % len(GROUPS)]
+        groups[store.add_candidate(_cv(rng, group), candidate_id=f"aday{i:04d}")] = group
+    return store, groups
+
+
+def test_streamed_rows_match_store():
+    """Parça parça okunan kayıtlar tüm adayları terimleriyle birlikte içermeli"""
+    store, groups = _store(120)
+    chunks = list(store.iter_term_rows('skill', chunk_size=50))
+    assert [len(chunk) for chunk in chunks] == [50, 50, 20]
+    records = [record for chunk in chunks for record in chunk]
+    assert [record['candidate_id'] for record in records] == sorted(groups)
+    assert all(record['terms'] <= {skill.lower() for skill in GROUPS[groups[record['candidate_id']]]}
+               and len(record['terms']) == 3 and record['experience_months'] == 108 for record in records)
+    assert store.term_frequencies('skill', 3)[0][1] >= store.term_frequencies('skill')[-1][1]
+
+
+def test_mini_batch_matches_running_mean():
+    """Tek kümede merkez, beslenen tüm noktaların ortalaması olmalı"""
+    points = np.random.RandomState(1).rand(90, 4).astype(np.float32)
+    model = MiniBatchKMeans(1)
+    for start in range(0, 90, 30):
+        model.partial_fit(points[start:start + 30])
+    assert np.allclose(model.centroids[0], points.mean(axis=0), atol=1e-6)
+    assert model.counts.tolist() == [90]
+
+    vectorizer = SkillVectorizer(["python", "sql"])
+    matrix = vectorizer.transform([{'terms': {"python", "sql", "excel"}, 'experience_months': 600}])
+    assert np.allclose(matrix, [[2 ** -0.5, 2 ** -0.5, 0.5]])
+
+
+def test_clusters_recover_skill_groups():
+    store, groups = _store(300)
+    clusters = TalentClusters()
+    summary = clusters.fit(store, n_clusters=3, chunk_size=40)
+
+    assert summary['candidates'] == 300 and sorted(c['size'] for c in summary['clusters']) == [100, 100, 100]
+    for cluster in summary['clusters']:
+        members = clusters.members(cluster['cluster'], limit=500)
+        assert len({groups[member['candidate_id']] for member in members}) == 1
+        group = groups[members[0]['candidate_id']]
+        assert {skill['skill'] for skill in cluster['top_skills']} == {skill.lower() for skill in GROUPS[group]}
+        assert cluster['mean_experience_years'] == pytest.approx(9.0)
+
+
+def test_incremental_updates_and_persistence(tmp_path):
+    store, groups = _store(90)
+    path = str(tmp_path / "kumeler.db")
+    clusters = TalentClusters(path)
+    assert clusters.add_candidate("erken", {"skills": ["React"]}) is None
+    with pytest.raises(ValueError):
+        clusters.update(store)
+    clusters.fit(store, n_clusters=3)
+
+    backend_cluster = clusters.cluster_of("aday0000")
+    rng = random.Random(5)
+    assert clusters.add_candidate("yeni", _cv(rng, "backend")) == backend_cluster
+    # Depoya başka yoldan eklenen adaylar update ile alınmalı, zaten uygulananlar atlanmalı
+    store.add_candidate(_cv(rng, "backend"), candidate_id="yeni")
+    store.add_candidate(_cv(rng, "veri"), candidate_id="sonraki")
+    clusters.close()
+
+    reopened = TalentClusters(path)
+    assert reopened.cluster_of("yeni") == backend_cluster
+    result = reopened.update(store)
+    assert result['applied'] == 2 and result['candidates'] == 92
+    assert reopened.cluster_of("sonraki") == reopened.cluster_of("aday0002")
+    assert reopened.update(store)['applied'] == 0
+
+
+def test_add_candidate_does_not_wait_for_running_fit():
+    store, _ = _store(30)
+    clusters = TalentClusters()
+    clusters.fit(store, n_clusters=3)
+    store.add_candidate(_cv(random.Random(1), "veri"), candidate_id="bekleyen")
+
+    holding, done = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with clusters._lock:
+            holding.set()
+            done.wait()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    holding.wait()
+    # Kümeleme sürerken aday atlanır, bir sonraki update ile uygulanır
+    assert clusters.add_candidate("bekleyen", store.get_candidate("bekleyen")) is None
+    done.set()
+    thread.join()
+    assert clusters.cluster_of("bekleyen") is None
+    assert clusters.update(store)['applied'] == 1
+    assert clusters.cluster_of("bekleyen") is not None
+
+
+def test_reanalyzed_candidates_are_reassigned_without_refitting():
+    store, _ = _store(60)
+    clusters = TalentClusters()
+    clusters.fit(store, n_clusters=3)
+    rng = random.Random(3)
+    # Regex sonucuyla eklenen aday merkezlere bir kez uygulanır
+    store.add_candidate(_cv(rng, "frontend"), candidate_id="asamali")
+    clusters.add_candidate("asamali", store.get_candidate("asamali"))
+    centroids, counts = clusters._model.centroids.copy(), clusters._model.counts.copy()
+
+    # LLM sonucu geldiğinde aday yalnızca yeniden atanır; update de merkezlere tekrar eklemez
+    llm_result = _cv(rng, "veri")
+    store.add_candidate(llm_result, candidate_id="asamali")
+    assert clusters.add_candidate("asamali", llm_result) == clusters.cluster_of("aday0002")
+    store.add_candidate(_cv(rng, "backend"), candidate_id="asamali")
+    assert clusters.update(store)['applied'] == 1
+    assert clusters.cluster_of("asamali") == clusters.cluster_of("aday0000")
+    assert np.array_equal(clusters._model.counts, counts)
+    assert np.array_equal(clusters._model.centroids, centroids)
+
+
+def test_fit_rejects_empty_pool():
+    with pytest.raises(ValueError):
+        TalentClusters().fit(CandidateStore())
+    assert TalentClusters().summary() == {'fitted': False, 'n_clusters': 0, 'candidates': 0, 'clusters': []}
@@ -0,0 +1,101 @@
+import pytest
+
+from src.core.candidate_store import CandidateStore
+from src.core.text_index import (BM25Index, DocumentTerms, QueryError, create_text_index, parse_query,
+                                 tokenize)
+
+DOCUMENTS = {
+    "a": "Kubernetes ve Golang ile mikroservis GELİŞTİRİCİ. Makine öğrenmesi projeleri. C++ ve Node.js",
+    "b": "Kubernetes, Rust ve Docker. Yaz döneminde intern olarak çalıştı.",
+    "c": "Python geliştirici; makine ve öğrenmesi ayrı geçiyor. Docker Docker Docker",
+    "d": "Muhasebe uzmanı, ISO 9001 sertifikası",
+}
+
+
+@pytest.fixture(params=["native", "fts5"])
+def index(request):
+    index = create_text_index(backend=request.param)
+    for doc_id, text in DOCUMENTS.items():
+        index.add_document(doc_id, text)
+    yield index
+    index.close()
+
+
+def _ids(result):
+    return [item["doc_id"] for item in result["results"]]
+
+
+def test_turkish_tokenization():
+    """Türkçe büyük/küçük harf ve karakterler tek biçime indirgenmeli"""
+    assert tokenize("GELİŞTİRİCİ ISPARTA") == ["gelistirici", "isparta"]
+    assert tokenize("ılık IŞIK") == ["ilik", "isik"]
+    assert tokenize("C++, C# ve node.js.") == ["c++", "c#", "ve", "node.js"]
+
+
+def test_parse_query_tree():
+    """Operatör önceliği: NOT > AND (örtük dahil) > OR"""
+    assert parse_query('kubernetes AND (golang OR rust) NOT intern') == (
+        "and", [("term", "kubernetes"), ("or", [("term", "golang"), ("term", "rust")]), ("not", ("term", "intern"))])
+    assert parse_query('"makine öğrenmesi" -stajyer') == (
+        "and", [("phrase", ["makine", "ogrenmesi"]), ("not", ("term", "stajyer"))])
+    for bad in ["", "(python", "python OR", "AND python"]:
+        with pytest.raises(QueryError):
+            parse_query(bad)
+
+
+def test_boolean_and_phrase_queries(index):
+    """Boolean, ifade ve Türkçe karakterden bağımsız sorgular doğru belgeleri döndürmeli"""
+    assert _ids(index.search("kubernetes AND (golang OR rust) NOT intern")) == ["a"]
+    assert _ids(index.search('"makine öğrenmesi"')) == ["a"]
+    assert sorted(_ids(index.search("gelistirici"))) == ["a", "c"]
+    assert _ids(index.search("c++")) == ["a"]
+    assert _ids(index.search("İNTERN")) == ["b"]
+    assert index.search("NOT docker")["total"] == 2
+    assert index.search("yok")["total"] == 0
+
+
+def test_bm25_ranking_and_paging(index):
+    """Terim sıklığı yüksek belge önde olmalı, sayfalama toplamı değiştirmemeli"""
+    result = index.search("docker", limit=1)
+    assert result["total"] == 2
+    assert _ids(result) == ["c"]
+    assert _ids(index.search("docker", limit=1, offset=1)) == ["b"]
+
+
+def test_incremental_updates(index):
+    """Belge güncellenince eski terimler kaybolmalı, silinen belge bulunmamalı"""
+    index.add_document("d", "Kubernetes yöneticisi")
+    assert "d" in _ids(index.search("kubernetes"))
+    assert index.search("muhasebe")["total"] == 0
+    assert index.remove_document("d")
+    assert not index.remove_document("d")
+    assert index.count() == 3
+
+
+def test_native_index_persists(tmp_path):
+    """Disk üzerindeki indeks yeniden açıldığında istatistikleriyle kullanılabilmeli"""
+    path = str(tmp_path / "index.db")
+    index = BM25Index(path)
+    for doc_id, text in DOCUMENTS.items():
+        index.add_document(doc_id, text)
+    before = index.search("docker")
+    index.close()
+
+    reopened = BM25Index(path)
+    assert reopened.search("docker") == before
+    assert reopened.count() == 4
+
+
+def test_document_terms_keyword_check():
+    """Anahtar kelime kontrolü alt dize değil tam terim/ifade eşleşmesi yapmalı"""
+    terms = DocumentTerms(DOCUMENTS["a"])
+    assert terms.contains("golang")
+    assert terms.contains("Makine Öğrenmesi")
+    assert not terms.contains("go")
+    assert not terms.contains("öğrenmesi makine")
+
+
+def test_candidate_names_lookup():
+    store = CandidateStore()
+    candidate_id = store.add_candidate({"personal_info": {"name": "Ayşe"}})
+    assert store.names([candidate_id, "yok"]) == {candidate_id: "Ayşe"}
@@ -0,0 +1,40 @@
+import pytest
+from src.core.token_budget import TokenBudgetPlanner, PromptTooLongError
+
+SCHEMA = 'Yanıtı şu formatta ver:\n{"kisisel_bilgiler": {"isim": ""}, "beceriler": []}\nCV:\n'
+
+@pytest.fixture
+def planner():
+    """Boşluklara göre bölen basit tokenizer'lı planlayıcı"""
+    return TokenBudgetPlanner(tokenizer=str.split, min_output=16, max_output=512)
+
+def test_counts_with_model_tokenizer(planner):
+    """Token sayısı verilen tokenizer ile hesaplanmalı, yoksa karakterden tahmin edilmeli"""
+    assert planner.count("bir iki üç") == 3
+    assert TokenBudgetPlanner().count("x" * 30) == 10
+
+def test_output_estimate_scales_with_cv(planner):
+    """Çıktı tahmini şema ve CV uzunluğuyla artmalı, sınırlar içinde kalmalı"""
+    short = planner.estimate_output(SCHEMA, "Ali Veli")
+    long = planner.estimate_output(SCHEMA, "kelime " * 400)
+    assert planner.min_output <= short < long <= planner.max_output
+    assert planner.estimate_output(SCHEMA, "kelime " * 5000) == planner.max_output
+
+def test_plan_limits_output_to_remaining_context(planner):
+    """Çıktı bütçesi bağlamda kalan yeri aşmamalı"""
+    prompt = "kelime " * 100
+    assert planner.plan(prompt, 50, context_length=1000).max_new_tokens == 50
+    budget = planner.plan(prompt, 500, context_length=180)
+    assert budget.fits and budget.max_new_tokens == 80
+
+def test_plan_rejects_prompt_that_does_not_fit(planner):
+    """Asgari çıktıya yer kalmıyorsa bütçe sığmamalı"""
+    budget = planner.plan("kelime " * 100, 50, context_length=110)
+    assert not budget.fits
+    error = PromptTooLongError(budget.prompt_tokens, budget.context_length)
+    assert isinstance(error, ValueError) and error.prompt_tokens == 100
+
+def test_context_rounded_and_capped(planner):
+    """Bağlam uzunluğu 512 katlarına yuvarlanmalı ve model sınırını aşmamalı"""
+    assert planner.context_for(1000, 700) == 2048
+    assert planner.context_for(3000, 2000, limit=4096) == 4096
@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.core.candidate_store import CandidateStore
+from src.core.vector_index import VectorIndex, embed_text, position_text
+
+BACKEND = "Python geliştirici, Django ve PostgreSQL ile REST API, Docker ve Kubernetes deneyimi"
+FRONTEND = "React ve TypeScript ile arayüz geliştirme, CSS, Figma tasarımlarını uygulama"
+ACCOUNTING = "Muhasebe uzmanı, bilanço, vergi beyannamesi, SAP ve Excel raporlama"
+
+
+def _topic_docs(count, seed=0, length=80):
+    rng = random.Random(seed)
+    topics = [[f"konu{t}kelime{i}" for i in range(40)] for t in range(20)]
+    common = [f"ortak{i}" for i in range(200)]
+    return {f"d{i}": " ".join(rng.choice(topics[i % 20]) if rng.random() < 0.6 else rng.choice(common)
+                              for _ in range(length)) for i in range(count)}
+
+
+def test_embedding_is_deterministic_and_normalized():
+    vector = embed_text(BACKEND)
+    assert vector.dtype == np.float32
+    assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-5)
+    assert np.array_equal(vector, embed_text(BACKEND))
+    assert not np.any(embed_text(""))
+    # Karakter n-gramları yazım farklarını yakalamalı
+    assert embed_text("python3 geliştirme") @ embed_text("python geliştirici") > 0.3
+
+
+def test_similar_texts_rank_first():
+    index = VectorIndex()
+    for doc_id, text in [("backend", BACKEND), ("frontend", FRONTEND), ("muhasebe", ACCOUNTING)]:
+        index.add(doc_id, text)
+
+    assert index.search("Django REST API geliştiren Python uzmanı", k=1)[0][0] == "backend"
+    assert index.search("SAP ve vergi bilgisi olan muhasebeci", k=1)[0][0] == "muhasebe"
+    position = {"title": "Frontend", "description": "Arayüz geliştirme", "requirements": {"skills": ["React"]}}
+    assert index.search(position_text(position), k=3)[0][0] == "frontend"
+
+
+def test_approximate_search_close_to_exact():
+    """LSH aday seçimi kesin taramanın ilk sonuçlarının büyük kısmını bulmalı"""
+    docs = _topic_docs(1000)
+    index = VectorIndex()
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+
+    recalls = []
+    for doc_id in list(docs)[:30]:
+        query = embed_text(docs[doc_id][:300])
+        exact = {d for d, _ in index.search_vector(query, k=10, exact=True)}
+        approximate = index.search_vector(query, k=10, candidates=100)
+        assert approximate[0][0] == doc_id
+        recalls.append(len(exact & {d for d, _ in approximate}) / 10)
+    assert np.mean(recalls) >= 0.8
+
+
+def test_persistence_growth_and_removal(tmp_path):
+    docs = _topic_docs(1100, seed=1, length=30)
+    index = VectorIndex(str(tmp_path), dim=128)
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+    assert index.remove("d3") and not index.remove("d3")
+    before = index.search(docs["d7"], k=5)
+    index.close()
+
+    reopened = VectorIndex(str(tmp_path), dim=128)
+    assert len(reopened) == 1099 and "d3" not in reopened
+    assert reopened.search(docs["d7"], k=5) == before
+    reopened.add("yeni", docs["d3"])
+    assert reopened.search(docs["d3"], k=1)[0][0] == "yeni"
+    with pytest.raises(ValueError):
+        VectorIndex(str(tmp_path), dim=256)
+
+
+def test_semantic_candidates_restrict_ranking():
+    store = CandidateStore()
+    for candidate_id, skills in [("a", ["Python"]), ("b", ["Python", "Docker"]), ("c", ["Excel"])]:
+        store.add_candidate({"skills": skills}, candidate_id=candidate_id)
+    position = {"requirements": {"skills": ["python", "docker"]}}
+
+    assert [c["candidate_id"] for c in store.rank(position)["candidates"]] == ["b", "a"]
+    result = store.rank(position, candidate_ids=["a", "c"])
+    assert result["scored"] == 1 and result["candidates"][0]["candidate_id"] == "a"